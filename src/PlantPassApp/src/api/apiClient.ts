@@ -1,4 +1,5 @@
 import { API_URL } from './config';
+import { refreshAdminToken } from './authentication/passwordAuthentication';
 import type { ApiRequestOptions } from '../types';
 
 /**
@@ -14,6 +15,7 @@ function getAuthToken(): string | null {
 export function clearAuth(): void {
   localStorage.removeItem('admin_token');
   localStorage.removeItem('staff_token');
+  localStorage.removeItem('admin_refresh_token');
   localStorage.removeItem('admin_auth');
   localStorage.removeItem('plantpass_auth');
 }
@@ -58,11 +60,13 @@ function parseErrorMessage(error: Error, response?: Response): string {
 }
 
 /**
- * Make an authenticated API request with improved error handling
+ * Make an authenticated API request with improved error handling.
+ * An expired admin access token is renewed once and the request retried.
  */
 export async function apiRequest<T = unknown>(
   endpoint: string,
-  options: ApiRequestOptions = {}
+  options: ApiRequestOptions = {},
+  allowRefresh: boolean = true
 ): Promise<T> {
   const { method = 'GET', body, headers = {}, timeout = 30000, ...rest } = options;
   
@@ -100,8 +104,11 @@ export async function apiRequest<T = unknown>(
 
     clearTimeout(timeoutId);
 
-    // Handle 401 Unauthorized - clear auth and redirect to home
+    // Handle 401 Unauthorized - renew the admin token once, otherwise clear auth and redirect to home
     if (response.status === 401) {
+      if (allowRefresh && await refreshAdminToken()) {
+        return apiRequest<T>(endpoint, options, false);
+      }
       clearAuth();
       window.location.href = '/';
       throw new Error('Session expired. Please log in again.');
@@ -2,13 +2,24 @@ import { API_URL } from "../config";
 
 interface AuthResponse {
   token: string;
+  refresh_token?: string;
   requires_password_change?: boolean;
 }
 
+interface RefreshResponse {
+  token: string;
+}
+
 interface ChangePasswordResponse {
   message: string;
+  token?: string;
+  refresh_token?: string;
 }
 
+const REFRESH_TOKEN_KEY = "admin_refresh_token";
+
+let refreshInFlight: Promise<boolean> | null = null;
+
 interface ApiErrorResponse {
   error?: string;
   status?: number;
@@ -28,10 +39,15 @@ export async function authenticateAdmin(password: string): Promise<AuthResponse>
   }
 
   const data = await response.json() as AuthResponse;
-  const { token, requires_password_change } = data;
+  const { token, refresh_token, requires_password_change } = data;
 
   // Store admin token (not the boolean flag)
   localStorage.setItem("admin_token", token);
+  if (refresh_token) {
+    localStorage.setItem(REFRESH_TOKEN_KEY, refresh_token);
+  } else {
+    localStorage.removeItem(REFRESH_TOKEN_KEY);
+  }
   
   // Remove old boolean flags - they're no longer used for authentication
   localStorage.removeItem("admin_auth");
@@ -40,6 +56,68 @@ export async function authenticateAdmin(password: string): Promise<AuthResponse>
   return { token, requires_password_change };
 }
 
+/**
+ * Renew the short-lived admin access token with the stored refresh token.
+ * Concurrent callers share one request. Resolves false when there is no
+ * refresh token or it has been revoked or has expired.
+ */
+export function refreshAdminToken(): Promise<boolean> {
+  const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY);
+  if (!refreshToken) return Promise.resolve(false);
+
+  if (!refreshInFlight) {
+    refreshInFlight = (async () => {
+      try {
+        const response = await fetch(`${API_URL}/admin/refresh`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({ refresh_token: refreshToken }),
+        });
+
+        if (!response.ok) {
+          localStorage.removeItem(REFRESH_TOKEN_KEY);
+          return false;
+        }
+
+        const { token } = await response.json() as RefreshResponse;
+        localStorage.setItem("admin_token", token);
+        return true;
+      } catch {
+        return false;
+      } finally {
+        refreshInFlight = null;
+      }
+    })();
+  }
+
+  return refreshInFlight;
+}
+
+/**
+ * End the stored refresh session on the server, so the refresh token stops
+ * working before it expires. Best effort: local state is cleared either way.
+ */
+export async function revokeAdminSession(): Promise<void> {
+  const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY);
+  if (!refreshToken) return;
+
+  try {
+    await fetch(`${API_URL}/admin/logout`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+      // Lets the request finish if the page is closing
+      keepalive: true,
+    });
+  } catch {
+    // Offline or API unreachable: the session still expires on its own
+  }
+}
+
 export async function changePassword(
   oldPassword: string,
   newPassword: string
@@ -67,5 +145,11 @@ export async function changePassword(
     throw error;
   }
 
+  // Other devices were signed out; this one continues on a new session
+  if (data.token && data.refresh_token) {
+    localStorage.setItem("admin_token", data.token);
+    localStorage.setItem(REFRESH_TOKEN_KEY, data.refresh_token);
+  }
+
   return data;
 }
@@ -0,0 +1,22 @@
+import { apiRequest } from "../apiClient";
+import type { BootstrapDocument } from "../../types";
+
+// Components mounting together at startup share one request
+const REUSE_WINDOW_MS = 5000;
+
+let pending: Promise<BootstrapDocument> | null = null;
+let fetchedAt = 0;
+
+export async function getBootstrap(): Promise<BootstrapDocument> {
+  if (pending && Date.now() - fetchedAt < REUSE_WINDOW_MS) {
+    return pending;
+  }
+
+  fetchedAt = Date.now();
+  pending = apiRequest<BootstrapDocument>("/bootstrap");
+  pending.catch(() => {
+    // Let the next caller retry instead of reusing a failure
+    pending = null;
+  });
+  return pending;
+}
@@ -0,0 +1,24 @@
+import type { CatalogSnapshotPointer } from "../../types";
+
+export type CatalogResource = "products" | "discounts" | "payment_methods";
+
+/**
+ * Read a catalog from the static snapshot CloudFront serves next to the app,
+ * without invoking the API. Rejects if no snapshot is published, so callers
+ * can fall back to the API.
+ */
+export async function getCatalogSnapshot<T>(resource: CatalogResource): Promise<T> {
+  // The pointer is tiny and short-lived; always revalidate it
+  const pointerResponse = await fetch(`/catalog/${resource}/latest.json`, { cache: "no-cache" });
+  if (!pointerResponse.ok) {
+    throw new Error(`No ${resource} snapshot published`);
+  }
+  const pointer = (await pointerResponse.json()) as CatalogSnapshotPointer;
+
+  // Versioned snapshots are immutable, so the browser cache can serve repeats
+  const snapshotResponse = await fetch(pointer.url);
+  if (!snapshotResponse.ok) {
+    throw new Error(`Failed to load ${resource} snapshot v${pointer.version}`);
+  }
+  return (await snapshotResponse.json()) as T;
+}
@@ -1,9 +1,10 @@
 import { apiRequest } from '../apiClient';
 import type { Discount } from '../../types';
 
-export const replaceAllDiscounts = async (discounts: Discount[]): Promise<void> => {
+export const replaceAllDiscounts = async (discounts: Discount[], leaseId?: string): Promise<void> => {
   return apiRequest<void>('/discounts', {
     method: 'PUT',
-    body: discounts
+    body: discounts,
+    headers: leaseId ? { 'X-Edit-Lease': leaseId } : {}
   });
-};
\ No newline at end of file
+};
@@ -1,7 +1,8 @@
 import { apiRequest } from "../apiClient";
 import type { FeatureToggles } from "../../types";
 
-export async function setFeatureToggles(features: FeatureToggles): Promise<FeatureToggles> {
+// Partial updates are accepted; omitted flags keep their stored value
+export async function setFeatureToggles(features: Partial<FeatureToggles>): Promise<FeatureToggles> {
   try {
     return await apiRequest<FeatureToggles>("/feature-toggles", {
       method: "PUT",
@@ -1,9 +1,12 @@
 import { apiRequest } from '../apiClient';
 import type { LockState } from '../../types';
 
-export async function setLockState(resourceType: string, isLocked: boolean): Promise<LockState> {
+/**
+ * Acquire (no leaseId), renew (leaseId) or release (isLocked false) an edit lease
+ */
+export async function setLockState(resourceType: string, isLocked: boolean, leaseId?: string): Promise<LockState> {
   return apiRequest<LockState>(`/lock/${resourceType}`, {
     method: 'PUT',
-    body: { isLocked }
+    body: { isLocked, leaseId }
   });
 }
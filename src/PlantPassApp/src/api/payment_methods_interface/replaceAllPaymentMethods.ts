@@ -1,9 +1,10 @@
 import { apiRequest } from "../apiClient";
 import type { PaymentMethod } from "../../types";
 
-export async function replaceAllPaymentMethods(paymentMethods: PaymentMethod[]): Promise<void> {
+export async function replaceAllPaymentMethods(paymentMethods: PaymentMethod[], leaseId?: string): Promise<void> {
   return apiRequest<void>("/payment-methods", {
     method: "PUT",
     body: paymentMethods,
+    headers: leaseId ? { "X-Edit-Lease": leaseId } : {},
   });
 }
@@ -0,0 +1,48 @@
+import { apiRequest } from '../apiClient';
+import type { ProductImportMode, ProductImportReport, ProductImportUpload } from '../../types';
+
+const POLL_INTERVAL_MS = 1000;
+const POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
+export const getProductImport = async (importId: string): Promise<ProductImportReport> => {
+  return apiRequest<ProductImportReport>(`/products/import/${importId}`);
+};
+
+/**
+ * Bulk-import a products CSV: upload it straight to S3 with a presigned PUT,
+ * then poll until the import worker has written its report. The import is
+ * refused, or stops, while another admin holds the products edit lease.
+ */
+export const importProducts = async (
+  file: Blob,
+  mode: ProductImportMode = 'merge',
+  leaseId?: string
+): Promise<ProductImportReport> => {
+  const upload = await apiRequest<ProductImportUpload>('/products/import', {
+    method: 'POST',
+    body: { mode },
+    headers: leaseId ? { 'X-Edit-Lease': leaseId } : {}
+  });
+
+  const response = await fetch(upload.uploadUrl, {
+    method: 'PUT',
+    headers: upload.uploadHeaders,
+    body: file
+  });
+  if (!response.ok) {
+    throw new Error(`Upload failed (${response.status})`);
+  }
+
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+    const report = await getProductImport(upload.importId);
+    if (report.status === 'complete') {
+      return report;
+    }
+    if (report.status === 'failed') {
+      throw new Error(report.message || 'Import failed');
+    }
+  }
+  throw new Error('Import is taking longer than expected; check back shortly');
+};
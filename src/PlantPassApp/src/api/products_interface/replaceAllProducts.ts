@@ -1,9 +1,10 @@
 import { apiRequest } from '../apiClient';
 import type { ProductDTO } from '../../types';
 
-export const replaceAllProducts = async (products: ProductDTO[]): Promise<void> => {
+export const replaceAllProducts = async (products: ProductDTO[], leaseId?: string): Promise<void> => {
   return apiRequest<void>('/products', {
     method: 'PUT',
-    body: products
+    body: products,
+    headers: leaseId ? { 'X-Edit-Lease': leaseId } : {}
   });
-};
\ No newline at end of file
+};
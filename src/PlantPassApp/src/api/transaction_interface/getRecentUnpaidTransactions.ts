@@ -1,7 +1,7 @@
 import { apiRequest } from '../apiClient';
-import type { Transaction } from '../../types';
+import type { RecentOrderSummary } from '../../types';
 
-export async function getRecentUnpaidTransactions(limit: number = 5): Promise<Transaction[]> {
-  const data = await apiRequest<{ transactions?: Transaction[] }>(`/transactions/recent-unpaid?limit=${limit}`);
+export async function getRecentUnpaidTransactions(limit: number = 5): Promise<RecentOrderSummary[]> {
+  const data = await apiRequest<{ transactions?: RecentOrderSummary[] }>(`/transactions/recent-unpaid?limit=${limit}`);
   return data.transactions || [];
 }
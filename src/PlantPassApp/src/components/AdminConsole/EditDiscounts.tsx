@@ -26,8 +26,8 @@ import { DragDropContext, Droppable, Draggable } from "@hello-pangea/dnd";
 import { getAllDiscounts } from "../../api/discounts_interface/getAllDiscounts";
 import { replaceAllDiscounts } from "../../api/discounts_interface/replaceAllDiscounts";
 import { getLockState } from "../../api/lock_interface/getLockState";
-import { setLockState } from "../../api/lock_interface/setLockState";
 import { useNotification } from "../../contexts/NotificationContext";
+import { useEditLease } from "../../hooks/useEditLease";
 import { DiscountType } from "../../types";
 import { formatPriceInput, handlePriceBlur } from "../../utils/priceFormatter";
 import LoadingSpinner from "../common/LoadingSpinner";
@@ -51,13 +51,11 @@ export default function DiscountTable() {
   const [deletedRows, setDeletedRows] = useState<DiscountRow[]>([]);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
-  const [isLocked, setIsLocked] = useState(false);
-  const [lockLoading, setLockLoading] = useState(false);
-  const [lockStateLoading, setLockStateLoading] = useState(true);
+  const { isLocked, holdsLease, leaseId, lockLoading, lockStateLoading, checkLockState, toggleLock } =
+    useEditLease('discounts', "Discounts");
 
   useEffect(() => {
     loadDiscounts();
-    checkLockState();
   }, []);
 
   const loadDiscounts = async () => {
@@ -84,32 +82,6 @@ export default function DiscountTable() {
     }
   };
 
-  const checkLockState = async () => {
-    try {
-      setLockStateLoading(true);
-      const response = await getLockState('discounts');
-      setIsLocked(response.locked || response.isLocked || false);
-    } catch {
-      // Lock state check failed, continue with default
-    } finally {
-      setLockStateLoading(false);
-    }
-  };
-
-  const toggleLock = async () => {
-    try {
-      setLockLoading(true);
-      const newLockState = !isLocked;
-      await setLockState('discounts', newLockState);
-      setIsLocked(newLockState);
-      showSuccess(newLockState ? "Discounts locked" : "Discounts unlocked");
-    } catch {
-      showError("Error updating lock state");
-    } finally {
-      setLockLoading(false);
-    }
-  };
-
   const showNotification = (message, severity = "success") => {
     if (severity === "success") {
       showSuccess(message);
@@ -235,7 +207,7 @@ export default function DiscountTable() {
     // Check current lock state before saving
     try {
       const currentLockState = await getLockState('discounts');
-      if (currentLockState.isLocked) {
+      if (currentLockState.isLocked && !holdsLease) {
         showError("Cannot save: Discounts have been locked by another admin");
         await loadDiscounts();
         await checkLockState();
@@ -260,7 +232,7 @@ export default function DiscountTable() {
           sort_order: row.sortOrder
         }));
 
-      await replaceAllDiscounts(validDiscounts);
+      await replaceAllDiscounts(validDiscounts, leaseId);
 
       await loadDiscounts();
       showNotification(`Discounts saved successfully (${validDiscounts.length} discounts)`);
@@ -289,17 +261,17 @@ export default function DiscountTable() {
           <Typography variant="h6">Edit Discounts</Typography>
           <IconButton 
             onClick={toggleLock} 
-            disabled={lockLoading}
+            disabled={lockLoading || isLocked}
             size="small"
             sx={{ 
-              color: isLocked ? 'error.main' : 'success.main',
+              color: isLocked || holdsLease ? 'error.main' : 'success.main',
               '&:hover': {
-                backgroundColor: isLocked ? 'error.light' : 'success.light',
+                backgroundColor: isLocked || holdsLease ? 'error.light' : 'success.light',
                 opacity: 0.1
               }
             }}
           >
-            {isLocked ? <LockIcon /> : <LockOpenIcon />}
+            {isLocked || holdsLease ? <LockIcon /> : <LockOpenIcon />}
           </IconButton>
         </Stack>
         <Typography variant="body1">
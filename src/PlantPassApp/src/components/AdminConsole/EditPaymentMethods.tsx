@@ -22,8 +22,8 @@ import { DragDropContext, Droppable, Draggable } from "@hello-pangea/dnd";
 import { getAllPaymentMethods } from "../../api/payment_methods_interface/getAllPaymentMethods";
 import { replaceAllPaymentMethods } from "../../api/payment_methods_interface/replaceAllPaymentMethods";
 import { getLockState } from "../../api/lock_interface/getLockState";
-import { setLockState } from "../../api/lock_interface/setLockState";
 import { useNotification } from "../../contexts/NotificationContext";
+import { useEditLease } from "../../hooks/useEditLease";
 import LoadingSpinner from "../common/LoadingSpinner";
 
 export default function EditPaymentMethods() {
@@ -34,13 +34,11 @@ export default function EditPaymentMethods() {
   const [deletedRows, setDeletedRows] = useState([]);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
-  const [isLocked, setIsLocked] = useState(false);
-  const [lockLoading, setLockLoading] = useState(false);
-  const [lockStateLoading, setLockStateLoading] = useState(true);
+  const { isLocked, holdsLease, leaseId, lockLoading, lockStateLoading, checkLockState, toggleLock } =
+    useEditLease('payment_methods', "Payment methods");
 
   useEffect(() => {
     loadPaymentMethods();
-    checkLockState();
   }, []);
 
   const loadPaymentMethods = async () => {
@@ -64,32 +62,6 @@ export default function EditPaymentMethods() {
     }
   };
 
-  const checkLockState = async () => {
-    try {
-      setLockStateLoading(true);
-      const response = await getLockState('payment_methods');
-      setIsLocked(response.isLocked || false);
-    } catch {
-      // Lock state check failed, continue with default
-    } finally {
-      setLockStateLoading(false);
-    }
-  };
-
-  const toggleLock = async () => {
-    try {
-      setLockLoading(true);
-      const newLockState = !isLocked;
-      await setLockState('payment_methods', newLockState);
-      setIsLocked(newLockState);
-      showSuccess(newLockState ? "Payment methods locked" : "Payment methods unlocked");
-    } catch {
-      showError("Error updating lock state");
-    } finally {
-      setLockLoading(false);
-    }
-  };
-
   const handleAddRow = () => {
     const maxSortOrder = Math.max(...rows.map(r => r.sortOrder || 0), 0);
     const newRow = {
@@ -166,7 +138,7 @@ export default function EditPaymentMethods() {
     // Check current lock state before saving
     try {
       const currentLockState = await getLockState('payment_methods');
-      if (currentLockState.isLocked) {
+      if (currentLockState.isLocked && !holdsLease) {
         showError("Cannot save: Payment methods have been locked by another admin");
         await loadPaymentMethods();
         await checkLockState();
@@ -187,7 +159,7 @@ export default function EditPaymentMethods() {
           sort_order: row.sortOrder
         }));
 
-      await replaceAllPaymentMethods(validMethods);
+      await replaceAllPaymentMethods(validMethods, leaseId);
 
       await loadPaymentMethods();
       showSuccess(`Payment methods saved successfully (${validMethods.length} methods)`);
@@ -218,17 +190,17 @@ export default function EditPaymentMethods() {
           <Typography variant="h6">Edit Payment Methods</Typography>
           <IconButton 
             onClick={toggleLock} 
-            disabled={lockLoading}
+            disabled={lockLoading || isLocked}
             size="small"
             sx={{ 
-              color: isLocked ? 'error.main' : 'success.main',
+              color: isLocked || holdsLease ? 'error.main' : 'success.main',
               '&:hover': {
-                backgroundColor: isLocked ? 'error.light' : 'success.light',
+                backgroundColor: isLocked || holdsLease ? 'error.light' : 'success.light',
                 opacity: 0.1
               }
             }}
           >
-            {isLocked ? <LockIcon /> : <LockOpenIcon />}
+            {isLocked || holdsLease ? <LockIcon /> : <LockOpenIcon />}
           </IconButton>
         </Stack>
       </Stack>
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, type ChangeEvent } from "react";
 import {
   Table,
   TableBody,
@@ -21,9 +21,10 @@ import LockOpenIcon from "@mui/icons-material/LockOpen";
 import { DragDropContext, Droppable, Draggable } from "@hello-pangea/dnd";
 import { getAllProducts } from "../../api/products_interface/getAllProducts";
 import { replaceAllProducts } from "../../api/products_interface/replaceAllProducts";
+import { importProducts } from "../../api/products_interface/importProducts";
 import { getLockState } from "../../api/lock_interface/getLockState";
-import { setLockState } from "../../api/lock_interface/setLockState";
 import { useNotification } from "../../contexts/NotificationContext";
+import { useEditLease } from "../../hooks/useEditLease";
 import { generateSKU } from "../../utils/skuGenerator";
 import { validateSKUs } from "../../utils/skuValidator";
 import { formatPriceInput, handlePriceBlur } from "../../utils/priceFormatter";
@@ -37,14 +38,13 @@ export default function ProductTable() {
   const [deletedRows, setDeletedRows] = useState([]);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
+  const [importing, setImporting] = useState(false);
   const [duplicateSKUs, setDuplicateSKUs] = useState([]);
-  const [isLocked, setIsLocked] = useState(false);
-  const [lockLoading, setLockLoading] = useState(false);
-  const [lockStateLoading, setLockStateLoading] = useState(true);
+  const { isLocked, holdsLease, leaseId, lockLoading, lockStateLoading, checkLockState, toggleLock } =
+    useEditLease('products', "Products");
 
   useEffect(() => {
     loadProducts();
-    checkLockState();
   }, []);
 
   useEffect(() => {
@@ -75,32 +75,6 @@ export default function ProductTable() {
     }
   };
 
-  const checkLockState = async () => {
-    try {
-      setLockStateLoading(true);
-      const response = await getLockState('products');
-      setIsLocked(response.isLocked || false);
-    } catch {
-      // Lock state check failed, continue with default
-    } finally {
-      setLockStateLoading(false);
-    }
-  };
-
-  const toggleLock = async () => {
-    try {
-      setLockLoading(true);
-      const newLockState = !isLocked;
-      await setLockState('products', newLockState);
-      setIsLocked(newLockState);
-      showSuccess(newLockState ? "Products locked" : "Products unlocked");
-    } catch {
-      showError("Error updating lock state");
-    } finally {
-      setLockLoading(false);
-    }
-  };
-
   const handleAddRow = () => {
     const maxSortOrder = Math.max(...rows.map(r => r.sortOrder || 0), 0);
     const newRow = {
@@ -215,7 +189,7 @@ export default function ProductTable() {
     // Check current lock state before saving
     try {
       const currentLockState = await getLockState('products');
-      if (currentLockState.isLocked) {
+      if (currentLockState.isLocked && !holdsLease) {
         showError("Cannot save: Products have been locked by another admin");
         await loadProducts();
         await checkLockState();
@@ -267,7 +241,7 @@ export default function ProductTable() {
           sort_order: row.sortOrder
         }));
 
-      await replaceAllProducts(validProducts);
+      await replaceAllProducts(validProducts, leaseId);
 
       await loadProducts();
       showSuccess(`Products saved successfully (${validProducts.length} products)`);
@@ -278,6 +252,43 @@ export default function ProductTable() {
     }
   };
 
+  const handleImport = async (event: ChangeEvent<HTMLInputElement>) => {
+    const file = event.target.files?.[0];
+    event.target.value = "";
+    if (!file) {
+      return;
+    }
+
+    setImporting(true);
+    try {
+      const currentLockState = await getLockState('products');
+      if (currentLockState.isLocked && !holdsLease) {
+        showError("Cannot import: Products have been locked by another admin");
+        await checkLockState();
+        return;
+      }
+
+      // Large catalogs upload straight to S3 and import server-side
+      const report = await importProducts(file, 'merge', leaseId);
+      await loadProducts();
+
+      const { created = 0, updated = 0 } = report.result || {};
+      if (report.errors && report.errors.length > 0) {
+        const first = report.errors[0];
+        showError(
+          `Imported ${report.imported} products (${created} new, ${updated} updated); ` +
+          `${report.rejected} rows rejected, e.g. row ${first.row}: ${first.errors.join(", ")}`
+        );
+      } else {
+        showSuccess(`Imported ${report.imported} products (${created} new, ${updated} updated)`);
+      }
+    } catch (error) {
+      showError(error instanceof Error ? error.message : "Error importing products");
+    } finally {
+      setImporting(false);
+    }
+  };
+
   if (loading || lockStateLoading) {
     return (
       <Paper sx={{ p: 2 }}>
@@ -298,17 +309,17 @@ export default function ProductTable() {
           <Typography variant="h6">Edit Products</Typography>
           <IconButton 
             onClick={toggleLock} 
-            disabled={lockLoading}
+            disabled={lockLoading || isLocked}
             size="small"
             sx={{ 
-              color: isLocked ? 'error.main' : 'success.main',
+              color: isLocked || holdsLease ? 'error.main' : 'success.main',
               '&:hover': {
-                backgroundColor: isLocked ? 'error.light' : 'success.light',
+                backgroundColor: isLocked || holdsLease ? 'error.light' : 'success.light',
                 opacity: 0.1
               }
             }}
           >
-            {isLocked ? <LockIcon /> : <LockOpenIcon />}
+            {isLocked || holdsLease ? <LockIcon /> : <LockOpenIcon />}
           </IconButton>
         </Stack>
       </Stack>
@@ -351,15 +362,28 @@ export default function ProductTable() {
           </Button>
         </Stack>
 
-        <Button 
-          variant="contained" 
-          size="small" 
-          onClick={handleAddRow}
-          disabled={isLocked}
-          sx={{ py: 0.5, px: 2, minHeight: 32 }}
-        >
-          Add Product
-        </Button>
+        <Stack direction="row" spacing={1}>
+          <Button
+            variant="outlined"
+            size="small"
+            component="label"
+            disabled={isLocked || importing}
+            sx={{ py: 0.5, px: 2, minHeight: 32 }}
+          >
+            {importing ? "Importing..." : "Import CSV"}
+            <input type="file" accept=".csv,text/csv" hidden onChange={handleImport} />
+          </Button>
+
+          <Button 
+            variant="contained" 
+            size="small" 
+            onClick={handleAddRow}
+            disabled={isLocked}
+            sx={{ py: 0.5, px: 2, minHeight: 32 }}
+          >
+            Add Product
+          </Button>
+        </Stack>
       </Stack>
 
       <TableContainer component={Paper}>
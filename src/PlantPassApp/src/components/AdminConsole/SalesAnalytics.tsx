@@ -48,12 +48,13 @@ import { clearAllTransactions } from "../../api/transaction_interface/clearAllTr
 import { exportData as exportDataAPI } from "../../api/transaction_interface/exportData";
 import { useNotification } from "../../contexts/NotificationContext";
 import { useWebSocket } from "../../hooks/useWebSocket";
-import { SalesAnalytics as SalesAnalyticsType } from "../../types";
+import { SalesAnalytics as SalesAnalyticsType, AnalyticsDelta } from "../../types";
 import { WEBSOCKET_URL } from "../../api/config";
 import LoadingSpinner from "../common/LoadingSpinner";
 import MetricCard from "./MetricCard";
 import ConfirmationDialog from "../common/ConfirmationDialog";
 import { formatTimestamp } from "../../utils/dateFormatter";
+import { applyAnalyticsDelta } from "../../utils/analyticsDelta";
 
 ChartJS.register(
   CategoryScale,
@@ -129,6 +130,11 @@ function SalesAnalytics() {
   
   const handleWebSocketMessage = useCallback((message) => {
     if (message.type === 'transaction_update') {
+      if (message.analytics_delta) {
+        setAnalytics((current) => applyAnalyticsDelta(current, message.analytics_delta as AnalyticsDelta));
+        return;
+      }
+
       if (refreshDebounceRef.current) {
         clearTimeout(refreshDebounceRef.current);
       }
@@ -15,6 +15,8 @@ import { createTransaction } from "../../api/transaction_interface/createTransac
 import { updateTransaction } from "../../api/transaction_interface/updateTransaction";
 import { getAllProducts } from "../../api/products_interface/getAllProducts";
 import { getAllDiscounts } from "../../api/discounts_interface/getAllDiscounts";
+import { getBootstrap } from "../../api/bootstrap_interface/getBootstrap";
+import { getCatalogSnapshot } from "../../api/catalog_snapshot/getCatalogSnapshot";
 import ShowTransactionID from "./SubComponents/ShowTransactionID";
 import { useNotification } from "../../contexts/NotificationContext";
 import { transformProductsData, initializeProductQuantities } from "../../utils/productTransformer";
@@ -22,7 +24,7 @@ import { transformDiscountsForOrder } from "../../utils/discountTransformer";
 import LoadingSpinner from "../common/LoadingSpinner";
 import { useFeatureToggles } from "../../contexts/FeatureToggleContext";
 import { validateQuantity, validatePrice, validateEmail, validateTransactionItems } from "../../utils/validation";
-import { Product, Discount, ReceiptData, ProductQuantities, ProductSubtotals } from "../../types";
+import { Product, ProductDTO, Discount, ReceiptData, ProductQuantities, ProductSubtotals } from "../../types";
 
 function OrderEntry() {
   const { showSuccess, showWarning, showError } = useNotification();
@@ -46,8 +48,7 @@ function OrderEntry() {
     .toFixed(2);
 
   const handleNewOrder = () => {
-    loadProducts();
-    loadDiscounts();
+    refreshCatalog();
     setCurrentTransactionID("");
     setTransactionIDDialogOpen(false);
     setSelectedDiscounts([]);
@@ -62,18 +63,50 @@ function OrderEntry() {
     }, 100);
   };
 
+  const applyProducts = (productsData: ProductDTO[]) => {
+    const transformedProducts = transformProductsData(productsData);
+    setProducts(transformedProducts);
+    
+    const { initialQuantities, initialSubtotals } = initializeProductQuantities(transformedProducts);
+    setQuantities(initialQuantities);
+    setSubtotals(initialSubtotals);
+    setVoucher("");
+  };
+
+  // Products and discounts in one request, falling back to the per-resource endpoints
+  const loadCatalog = async () => {
+    try {
+      setLoading(true);
+      const { products: productsData, discounts: discountsData } = await getBootstrap();
+      applyProducts(productsData);
+      setDiscounts(discountsData);
+      setLoading(false);
+    } catch (error) {
+      console.error("Error loading bootstrap configuration:", error);
+      loadProducts();
+      loadDiscounts();
+    }
+  };
+
+  // Between orders, refresh from the CloudFront snapshots so a rush never touches the API
+  const refreshCatalog = async () => {
+    try {
+      const [productsData, discountsData] = await Promise.all([
+        getCatalogSnapshot<ProductDTO[]>("products"),
+        getCatalogSnapshot<Discount[]>("discounts"),
+      ]);
+      applyProducts(productsData);
+      setDiscounts(discountsData);
+    } catch {
+      loadCatalog();
+    }
+  };
+
   const loadProducts = async () => {
     try {
       setLoading(true);
       const productsData = await getAllProducts();
-      
-      const transformedProducts = transformProductsData(productsData);
-      setProducts(transformedProducts);
-      
-      const { initialQuantities, initialSubtotals } = initializeProductQuantities(transformedProducts);
-      setQuantities(initialQuantities);
-      setSubtotals(initialSubtotals);
-      setVoucher("");
+      applyProducts(productsData);
     } catch (error) {
       console.error("Error loading products:", error);
       try {
@@ -103,8 +136,7 @@ function OrderEntry() {
   };
 
   useEffect(() => {
-    loadProducts();
-    loadDiscounts();
+    loadCatalog();
   }, []);
 
   const handleQuantityChange = (e, sku) => {
@@ -159,7 +191,10 @@ function OrderEntry() {
 
     const transaction = {
       timestamp: Math.floor(Date.now() / 1000),
-      items,
+      // Only purchased lines; the server prices them from the catalog
+      items: items
+        .filter((item) => item.quantity > 0)
+        .map(({ SKU, quantity }) => ({ SKU, quantity })),
       discounts: discountsWithSelection,
       voucher: validatePrice(voucher),
       // If email collection is disabled, always send empty string
@@ -196,15 +231,11 @@ function OrderEntry() {
 
     const updateData = {
       items: Object.entries(quantities)
-        .map(([sku, quantity]) => {
-          const product = products.find((p) => p.SKU === sku);
-          return {
-            SKU: sku,
-            item: product.Name,
-            quantity: parseInt(quantity) || 0,
-            price_ea: product.Price,
-          };
-        }),
+        .map(([sku, quantity]) => ({
+          SKU: sku,
+          quantity: parseInt(quantity) || 0,
+        }))
+        .filter((line) => line.quantity > 0),
       discounts: discountsWithSelection,
       voucher: Number(voucher) || 0,
     };
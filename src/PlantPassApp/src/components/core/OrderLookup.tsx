@@ -29,7 +29,7 @@ import { getAllPaymentMethods } from "../../api/payment_methods_interface/getAll
 import { useNotification } from "../../contexts/NotificationContext";
 import { formatOrderId } from "../../utils/orderIdFormatter";
 import { useFeatureToggles } from "../../contexts/FeatureToggleContext";
-import { Transaction, PaymentMethod, Discount, ReceiptData, ProductQuantities, ProductSubtotals, Product } from "../../types";
+import { RecentOrderSummary, PaymentMethod, Discount, ReceiptData, ProductQuantities, ProductSubtotals, Product } from "../../types";
 
 function OrderLookup() {
   const { showSuccess } = useNotification();
@@ -51,7 +51,7 @@ function OrderLookup() {
   const [transactionLoaded, setTransactionLoaded] = useState(false);
   const [isOrderCompleted, setIsOrderCompleted] = useState(false);
   
-  const [recentOrders, setRecentOrders] = useState<Transaction[]>([]);
+  const [recentOrders, setRecentOrders] = useState<RecentOrderSummary[]>([]);
   const [showRecentOrders, setShowRecentOrders] = useState(true);
   const [recentOrdersLimit, setRecentOrdersLimit] = useState(() => {
     const saved = sessionStorage.getItem("recentOrdersLimit");
@@ -274,15 +274,11 @@ function OrderLookup() {
 
       const updateData = {
         items: Object.entries(quantities)
-          .map(([sku, quantity]) => {
-            const product = products.find((p) => p.SKU === sku);
-            return {
-              SKU: sku,
-              item: product.Name,
-              quantity: parseInt(quantity) || 0,
-              price_ea: product.Price,
-            };
-          }),
+          .map(([sku, quantity]) => ({
+            SKU: sku,
+            quantity: parseInt(quantity) || 0,
+          }))
+          .filter((line) => line.quantity > 0),
         discounts: discountsWithSelection,
         voucher: Number(voucher) || 0,
         email: features.collectEmailAddresses ? (customerEmail || "") : ""
@@ -485,7 +481,7 @@ function OrderLookup() {
                         {order.purchase_id}
                       </Typography>
                       <Typography variant="body2" color="text.secondary">
-                        {order.items?.length || 0} item(s) • ${order.receipt?.total?.toFixed(2) || '0.00'}
+                        {order.line_count || 0} item(s) • ${order.total?.toFixed(2) || '0.00'}
                       </Typography>
                     </Box>
                     <Typography variant="caption" color="text.secondary">
@@ -1,5 +1,6 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from "react";
 import { getFeatureToggles } from "../api/feature_toggles_interface/getFeatureToggles";
+import { getBootstrap } from "../api/bootstrap_interface/getBootstrap";
 import type { FeatureToggles } from "../types";
 
 interface FeatureToggleContextValue {
@@ -44,9 +45,12 @@ export function FeatureToggleProvider({ children }: FeatureToggleProviderProps):
   const [features, setFeatures] = useState<FeatureToggles>(getInitialFeatures);
   const [loading, setLoading] = useState<boolean>(true);
 
-  const loadFeatureToggles = async (): Promise<void> => {
+  const loadFeatureToggles = async (fromBootstrap: boolean = false): Promise<void> => {
     try {
-      const response = await getFeatureToggles();
+      // The initial load shares the startup bootstrap request with order entry
+      const response = fromBootstrap
+        ? await getBootstrap().then((document) => document.feature_toggles).catch(() => getFeatureToggles())
+        : await getFeatureToggles();
       setFeatures(response);
       // Also cache in localStorage
       localStorage.setItem("featureToggles", JSON.stringify(response));
@@ -63,7 +67,7 @@ export function FeatureToggleProvider({ children }: FeatureToggleProviderProps):
   };
 
   useEffect(() => {
-    loadFeatureToggles();
+    loadFeatureToggles(true);
     
     // Listen for storage changes (when toggles are saved in other tabs)
     const handleStorageChange = (): void => {
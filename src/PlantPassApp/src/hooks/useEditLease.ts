@@ -0,0 +1,107 @@
+import { useState, useEffect, useCallback, useRef } from 'react';
+import { getLockState } from '../api/lock_interface/getLockState';
+import { setLockState } from '../api/lock_interface/setLockState';
+import { useNotification } from '../contexts/NotificationContext';
+
+// Renew well inside the server's lease (120s by default)
+const RENEW_INTERVAL_MS = 45 * 1000;
+
+interface UseEditLeaseReturn {
+  isLocked: boolean;
+  holdsLease: boolean;
+  leaseId: string | undefined;
+  lockLoading: boolean;
+  lockStateLoading: boolean;
+  checkLockState: () => Promise<void>;
+  toggleLock: () => Promise<void>;
+}
+
+/**
+ * Edit lease for one catalog resource
+ * isLocked means another admin holds the lease; while this admin holds it,
+ * the lease is renewed in the background and released on unmount
+ */
+export function useEditLease(resourceType: string, label: string): UseEditLeaseReturn {
+  const { showSuccess, showError } = useNotification();
+  const [isLocked, setIsLocked] = useState(false);
+  const [leaseId, setLeaseId] = useState<string | undefined>(undefined);
+  const [lockLoading, setLockLoading] = useState(false);
+  const [lockStateLoading, setLockStateLoading] = useState(true);
+  const leaseRef = useRef<string | undefined>(undefined);
+
+  const checkLockState = useCallback(async (): Promise<void> => {
+    try {
+      setLockStateLoading(true);
+      const response = await getLockState(resourceType);
+      setIsLocked(response.isLocked && !leaseRef.current);
+    } catch {
+      // Lock state check failed, continue with default
+    } finally {
+      setLockStateLoading(false);
+    }
+  }, [resourceType]);
+
+  const holdLease = (id: string | undefined) => {
+    leaseRef.current = id;
+    setLeaseId(id);
+  };
+
+  const toggleLock = async (): Promise<void> => {
+    try {
+      setLockLoading(true);
+      if (leaseRef.current) {
+        await setLockState(resourceType, false, leaseRef.current);
+        holdLease(undefined);
+        showSuccess(`${label} unlocked`);
+      } else {
+        const lease = await setLockState(resourceType, true);
+        holdLease(lease.leaseId);
+        setIsLocked(false);
+        showSuccess(`${label} locked for your edits`);
+      }
+    } catch (error) {
+      showError(error instanceof Error ? error.message : "Error updating lock state");
+      await checkLockState();
+    } finally {
+      setLockLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    checkLockState();
+  }, [checkLockState]);
+
+  useEffect(() => {
+    if (!leaseId) {
+      return;
+    }
+    const timer = setInterval(async () => {
+      try {
+        await setLockState(resourceType, true, leaseId);
+      } catch {
+        holdLease(undefined);
+        showError(`${label} are now being edited by another admin`);
+        await checkLockState();
+      }
+    }, RENEW_INTERVAL_MS);
+    return () => clearInterval(timer);
+  }, [leaseId, resourceType]);
+
+  useEffect(() => {
+    return () => {
+      if (leaseRef.current) {
+        setLockState(resourceType, false, leaseRef.current).catch(() => {});
+      }
+    };
+  }, [resourceType]);
+
+  return {
+    isLocked,
+    holdsLease: Boolean(leaseId),
+    leaseId,
+    lockLoading,
+    lockStateLoading,
+    checkLockState,
+    toggleLock,
+  };
+}
@@ -3,6 +3,7 @@ import { useEffect, useRef, useCallback, useState } from 'react';
 interface UseWebSocketOptions {
   reconnectInterval?: number;
   maxReconnectAttempts?: number;
+  heartbeatInterval?: number;
   enabled?: boolean;
 }
 
@@ -30,11 +31,13 @@ export function useWebSocket(
   const {
     reconnectInterval = 5000,
     maxReconnectAttempts = 10,
+    heartbeatInterval = 60000,
     enabled = true,
   } = options;
 
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+  const heartbeatIntervalRef = useRef<NodeJS.Timeout | null>(null);
   const reconnectAttemptsRef = useRef<number>(0);
   const onMessageRef = useRef<(data: unknown) => void>(onMessage);
   const mountedRef = useRef<boolean>(true);
@@ -46,7 +49,16 @@ export function useWebSocket(
     onMessageRef.current = onMessage;
   }, [onMessage]);
 
+  const stopHeartbeat = useCallback((): void => {
+    if (heartbeatIntervalRef.current) {
+      clearInterval(heartbeatIntervalRef.current);
+      heartbeatIntervalRef.current = null;
+    }
+  }, []);
+
   const disconnect = useCallback((): void => {
+    stopHeartbeat();
+
     // Clear any pending reconnection attempts
     if (reconnectTimeoutRef.current) {
       clearTimeout(reconnectTimeoutRef.current);
@@ -72,7 +84,7 @@ export function useWebSocket(
 
     setIsConnected(false);
     reconnectAttemptsRef.current = 0;
-  }, []);
+  }, [stopHeartbeat]);
 
   const connect = useCallback((): void => {
     // Don't connect if disabled, no URL, or component unmounted
@@ -102,6 +114,15 @@ export function useWebSocket(
         setIsConnected(true);
         setConnectionError(null);
         reconnectAttemptsRef.current = 0;
+
+        // Heartbeat keeps the server-side connection record fresh so it is
+        // not swept as stale while the page stays open
+        stopHeartbeat();
+        heartbeatIntervalRef.current = setInterval(() => {
+          if (ws.readyState === WebSocket.OPEN) {
+            ws.send(JSON.stringify({ action: 'ping' }));
+          }
+        }, heartbeatInterval);
       };
 
       ws.onmessage = (event: MessageEvent): void => {
@@ -109,6 +130,9 @@ export function useWebSocket(
         
         try {
           const data = JSON.parse(event.data as string);
+          if (data?.type === 'pong') {
+            return;
+          }
           if (onMessageRef.current) {
             onMessageRef.current(data);
           }
@@ -125,6 +149,7 @@ export function useWebSocket(
       ws.onclose = (event: CloseEvent): void => {
         if (!mountedRef.current) return;
         
+        stopHeartbeat();
         setIsConnected(false);
         wsRef.current = null;
 
@@ -147,7 +172,7 @@ export function useWebSocket(
       console.error('WebSocket connection error:', error);
       setConnectionError(error instanceof Error ? error.message : 'Unknown error');
     }
-  }, [url, enabled, reconnectInterval, maxReconnectAttempts]);
+  }, [url, enabled, reconnectInterval, maxReconnectAttempts, heartbeatInterval, stopHeartbeat]);
 
   const send = useCallback((data: unknown): boolean => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -63,6 +63,17 @@ export interface TransactionItem {
   price_ea: number;
 }
 
+/**
+ * Order line sent when creating or updating a transaction. The server
+ * prices lines from the catalog, so item and price_ea are ignored if sent.
+ */
+export interface OrderLine {
+  SKU: string;
+  quantity: number;
+  item?: string;
+  price_ea?: number;
+}
+
 /**
  * Receipt totals
  */
@@ -77,7 +88,7 @@ export interface ReceiptTotals {
  */
 export interface CreateTransactionRequest {
   timestamp: number;
-  items: TransactionItem[];
+  items: OrderLine[];
   discounts: DiscountWithSelection[];
   voucher: number;
   email?: string;
@@ -87,7 +98,7 @@ export interface CreateTransactionRequest {
  * Transaction data for updating an existing transaction
  */
 export interface UpdateTransactionRequest {
-  items?: TransactionItem[];
+  items?: OrderLine[];
   discounts?: DiscountWithSelection[];
   voucher?: number;
   payment?: {
@@ -128,6 +139,17 @@ export interface Transaction {
   };
 }
 
+/**
+ * Recent unpaid order as projected by the payment status index
+ */
+export interface RecentOrderSummary {
+  purchase_id: string;
+  timestamp: number;
+  paid: boolean;
+  total: number;
+  line_count: number;
+}
+
 // ============================================================================
 // Feature Toggles
 // ============================================================================
@@ -141,6 +163,54 @@ export interface FeatureToggles {
   protectPlantPassAccess: boolean;
 }
 
+/**
+ * Presigned upload returned by POST /products/import
+ */
+export interface ProductImportUpload {
+  importId: string;
+  uploadUrl: string;
+  uploadHeaders: Record<string, string>;
+}
+
+export type ProductImportMode = 'merge' | 'replace';
+
+/**
+ * Bulk import status and per-row report from GET /products/import/{importId}
+ */
+export interface ProductImportReport {
+  importId: string;
+  status: 'pending' | 'running' | 'complete' | 'failed';
+  mode?: ProductImportMode;
+  rows?: number;
+  imported?: number;
+  rejected?: number;
+  result?: { created: number; updated: number; deleted: number; unchanged: number };
+  errors?: { row: number; SKU: string | null; errors: string[] }[];
+  durationMs?: number;
+  message?: string;
+}
+
+/**
+ * Pointer to the latest static catalog snapshot (catalog/<resource>/latest.json)
+ */
+export interface CatalogSnapshotPointer {
+  resource: string;
+  version: number;
+  url: string;
+  published_at: number;
+}
+
+/**
+ * Whole point-of-sale configuration returned by GET /bootstrap
+ */
+export interface BootstrapDocument {
+  version: string;
+  products: ProductDTO[];
+  discounts: Discount[];
+  payment_methods: PaymentMethod[];
+  feature_toggles: FeatureToggles;
+}
+
 // ============================================================================
 // Authentication & Authorization
 // ============================================================================
@@ -151,11 +221,14 @@ export interface FeatureToggles {
 export type TokenType = 'admin_token' | 'staff_token';
 
 /**
- * Lock state for PlantPass access
+ * Edit lease on a catalog resource. leaseId is only returned to the holder.
  */
 export interface LockState {
-  locked: boolean;
-  isLocked?: boolean; // Legacy support
+  resourceType: string;
+  isLocked: boolean;
+  owner?: string | null;
+  expiresAt?: number | null;
+  leaseId?: string;
 }
 
 /**
@@ -226,6 +299,31 @@ export interface SalesAnalytics {
   transactions?: unknown[];
 }
 
+/**
+ * Incremental sales analytics change pushed over WebSocket with a transaction update
+ */
+export interface AnalyticsDelta {
+  event: 'created' | 'updated' | 'deleted' | 'cleared' | 'abandoned';
+  reset: boolean;
+  total_sales: number;
+  total_orders: number;
+  total_units_sold: number;
+  sales_over_time: Record<string, number>;
+  transaction: TransactionSummary | null;
+  removed_purchase_id: string | null;
+}
+
+/**
+ * Per-transaction row shown in the analytics transaction table
+ */
+export interface TransactionSummary {
+  purchase_id: string;
+  timestamp: number;
+  total_quantity: number;
+  grand_total: number;
+  paid: boolean;
+}
+
 // ============================================================================
 // API Response Wrappers
 // ============================================================================
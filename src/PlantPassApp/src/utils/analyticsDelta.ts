@@ -0,0 +1,62 @@
+import type { AnalyticsDelta, SalesAnalytics, TransactionSummary } from '../types';
+
+const roundTo = (value: number, places: number): number => {
+  const factor = Math.pow(10, places);
+  return Math.round(value * factor) / factor;
+};
+
+/**
+ * Applies a server-computed analytics delta to a sales analytics snapshot.
+ * Totals are accumulated and averages re-derived the same way the backend
+ * computes them, so the result matches a full refetch.
+ *
+ * @param analytics - Current analytics state (snapshot plus prior deltas)
+ * @param delta - Delta received with a transaction update
+ * @returns New analytics state
+ */
+export const applyAnalyticsDelta = (
+  analytics: SalesAnalytics,
+  delta: AnalyticsDelta
+): SalesAnalytics => {
+  if (delta.reset) {
+    return {
+      ...analytics,
+      total_sales: 0,
+      total_orders: 0,
+      total_units_sold: 0,
+      average_items_per_order: 0,
+      average_order_value: 0,
+      sales_over_time: {},
+      transactions: [],
+    };
+  }
+
+  const totalSales = roundTo((analytics.total_sales || 0) + delta.total_sales, 2);
+  const totalOrders = (analytics.total_orders || 0) + delta.total_orders;
+  const totalUnits = (analytics.total_units_sold || 0) + delta.total_units_sold;
+
+  const salesOverTime = { ...(analytics.sales_over_time as Record<string, number> || {}) };
+  Object.entries(delta.sales_over_time || {}).forEach(([bucket, amount]) => {
+    salesOverTime[bucket] = roundTo((salesOverTime[bucket] || 0) + amount, 2);
+  });
+
+  let transactions = (analytics.transactions || []) as TransactionSummary[];
+  const changedId = delta.transaction?.purchase_id || delta.removed_purchase_id;
+  if (changedId) {
+    transactions = transactions.filter((t) => t.purchase_id !== changedId);
+  }
+  if (delta.transaction) {
+    transactions = [...transactions, delta.transaction];
+  }
+
+  return {
+    ...analytics,
+    total_sales: totalSales,
+    total_orders: totalOrders,
+    total_units_sold: totalUnits,
+    average_items_per_order: totalOrders > 0 ? roundTo(totalUnits / totalOrders, 2) : 0,
+    average_order_value: totalOrders > 0 ? roundTo(totalSales / totalOrders, 2) : 0,
+    sales_over_time: salesOverTime,
+    transactions,
+  };
+};
@@ -1,6 +1,7 @@
 /**
  * Authentication utility functions
  */
+import { revokeAdminSession } from '../api/authentication/passwordAuthentication';
 
 /**
  * Check if user has any valid authentication token
@@ -24,11 +25,14 @@ export function isStaff(): boolean {
 }
 
 /**
- * Logout user by clearing all tokens and auth state
+ * Logout user: revoke the admin refresh session server-side (best effort),
+ * then clear all tokens and auth state
  */
-export function logout(): void {
+export async function logout(): Promise<void> {
+  await revokeAdminSession();
   localStorage.removeItem('admin_token');
   localStorage.removeItem('staff_token');
+  localStorage.removeItem('admin_refresh_token');
   localStorage.removeItem('admin_auth');
   localStorage.removeItem('plantpass_auth');
 }
@@ -58,6 +62,7 @@ export function setAuthToken(token: string, role: 'admin' | 'staff'): void {
 export function clearAuthToken(): void {
   localStorage.removeItem('admin_token');
   localStorage.removeItem('staff_token');
+  localStorage.removeItem('admin_refresh_token');
   localStorage.removeItem('admin_auth');
   localStorage.removeItem('plantpass_auth');
 }
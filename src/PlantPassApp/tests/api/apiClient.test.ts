@@ -93,6 +93,44 @@ describe('apiClient', () => {
       window.location = originalLocation;
     });
 
+    it('should renew an expired admin token once and retry', async () => {
+      localStorage.setItem('admin_token', 'expired-token');
+      localStorage.setItem('admin_refresh_token', 'session.secret');
+
+      vi.mocked(global.fetch)
+        .mockResolvedValueOnce({
+          ok: false,
+          status: 401,
+          json: async () => ({ error: 'Token expired' }),
+        } as Response)
+        .mockResolvedValueOnce({
+          ok: true,
+          status: 200,
+          json: async () => ({ token: 'fresh-token', expires_in: 900 }),
+        } as Response)
+        .mockResolvedValueOnce({
+          ok: true,
+          status: 200,
+          json: async () => ({ data: 'test' }),
+        } as Response);
+
+      const result = await apiRequest('/test');
+
+      expect(result).toEqual({ data: 'test' });
+      expect(localStorage.getItem('admin_token')).toBe('fresh-token');
+      expect(global.fetch).toHaveBeenNthCalledWith(
+        2,
+        expect.stringContaining('/admin/refresh'),
+        expect.objectContaining({ body: JSON.stringify({ refresh_token: 'session.secret' }) })
+      );
+      expect(global.fetch).toHaveBeenLastCalledWith(
+        expect.stringContaining('/test'),
+        expect.objectContaining({
+          headers: expect.objectContaining({ Authorization: 'Bearer fresh-token' }),
+        })
+      );
+    });
+
     it('should handle 403 Forbidden', async () => {
       vi.mocked(global.fetch).mockResolvedValueOnce({
         ok: false,
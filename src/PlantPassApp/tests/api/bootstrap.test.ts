@@ -0,0 +1,63 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+
+vi.mock('../../src/api/apiClient');
+
+// getBootstrap keeps module-level state, so each test loads a fresh copy
+let getBootstrap: typeof import('../../src/api/bootstrap_interface/getBootstrap').getBootstrap;
+let apiRequest: typeof import('../../src/api/apiClient').apiRequest;
+
+const mockDocument = {
+  version: 'abc123',
+  products: [{ SKU: 'PLANT-001', item: 'Succulent', price_ea: 5.99, sort_order: 1 }],
+  discounts: [],
+  payment_methods: [],
+  feature_toggles: {
+    collectEmailAddresses: true,
+    passwordProtectAdmin: true,
+    protectPlantPassAccess: false,
+  },
+};
+
+describe('Bootstrap API', () => {
+  beforeEach(async () => {
+    vi.resetModules();
+    vi.clearAllMocks();
+    ({ getBootstrap } = await import('../../src/api/bootstrap_interface/getBootstrap'));
+    ({ apiRequest } = await import('../../src/api/apiClient'));
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('should share one request between callers at startup', async () => {
+    vi.mocked(apiRequest).mockResolvedValue(mockDocument);
+
+    const [first, second] = await Promise.all([getBootstrap(), getBootstrap()]);
+
+    expect(apiRequest).toHaveBeenCalledTimes(1);
+    expect(apiRequest).toHaveBeenCalledWith('/bootstrap');
+    expect(first).toEqual(mockDocument);
+    expect(second).toEqual(mockDocument);
+  });
+
+  it('should refetch after the reuse window', async () => {
+    vi.useFakeTimers();
+    vi.mocked(apiRequest).mockResolvedValue(mockDocument);
+
+    await getBootstrap();
+    vi.advanceTimersByTime(6000);
+    await getBootstrap();
+
+    expect(apiRequest).toHaveBeenCalledTimes(2);
+  });
+
+  it('should retry after a failed request', async () => {
+    vi.mocked(apiRequest)
+      .mockRejectedValueOnce(new Error('Network error'))
+      .mockResolvedValueOnce(mockDocument);
+
+    await expect(getBootstrap()).rejects.toThrow('Network error');
+    await expect(getBootstrap()).resolves.toEqual(mockDocument);
+  });
+});
@@ -0,0 +1,39 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { getCatalogSnapshot } from '../../src/api/catalog_snapshot/getCatalogSnapshot';
+
+const jsonResponse = (body: unknown, ok: boolean = true) => ({
+  ok,
+  json: () => Promise.resolve(body),
+});
+
+describe('Catalog snapshot API', () => {
+  const fetchMock = vi.fn();
+
+  beforeEach(() => {
+    fetchMock.mockReset();
+    vi.stubGlobal('fetch', fetchMock);
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('should follow the pointer to the versioned snapshot', async () => {
+    const products = [{ SKU: 'PLANT-001', item: 'Succulent', price_ea: 5.99, sort_order: 1 }];
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse({ resource: 'products', version: 7, url: '/catalog/products/v7.json', published_at: 0 }))
+      .mockResolvedValueOnce(jsonResponse(products));
+
+    const result = await getCatalogSnapshot('products');
+
+    expect(fetchMock).toHaveBeenNthCalledWith(1, '/catalog/products/latest.json', { cache: 'no-cache' });
+    expect(fetchMock).toHaveBeenNthCalledWith(2, '/catalog/products/v7.json');
+    expect(result).toEqual(products);
+  });
+
+  it('should reject when no snapshot is published', async () => {
+    fetchMock.mockResolvedValueOnce(jsonResponse({}, false));
+
+    await expect(getCatalogSnapshot('discounts')).rejects.toThrow('No discounts snapshot published');
+  });
+});
@@ -0,0 +1,58 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { importProducts } from '../../src/api/products_interface/importProducts';
+import { apiRequest } from '../../src/api/apiClient';
+
+vi.mock('../../src/api/apiClient');
+
+const upload = {
+  importId: 'abc123',
+  uploadUrl: 'https://imports.example/abc123.csv',
+  uploadHeaders: { 'Content-Type': 'text/csv', 'x-amz-meta-mode': 'replace' },
+};
+
+describe('Product import API', () => {
+  const fetchMock = vi.fn();
+
+  beforeEach(() => {
+    vi.clearAllMocks();
+    vi.useFakeTimers();
+    fetchMock.mockReset();
+    vi.stubGlobal('fetch', fetchMock);
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+    vi.unstubAllGlobals();
+  });
+
+  it('should upload the file and poll until the report is complete', async () => {
+    const file = new Blob(['item,price_ea\nFern,5\n'], { type: 'text/csv' });
+    const report = { importId: 'abc123', status: 'complete', imported: 1, rejected: 0, errors: [] };
+    vi.mocked(apiRequest)
+      .mockResolvedValueOnce(upload)
+      .mockResolvedValueOnce({ importId: 'abc123', status: 'running' })
+      .mockResolvedValueOnce(report);
+    fetchMock.mockResolvedValueOnce({ ok: true });
+
+    const result = importProducts(file, 'replace');
+    await vi.runAllTimersAsync();
+
+    await expect(result).resolves.toEqual(report);
+    expect(apiRequest).toHaveBeenNthCalledWith(1, '/products/import', { method: 'POST', body: { mode: 'replace' } });
+    expect(fetchMock).toHaveBeenCalledWith(upload.uploadUrl, { method: 'PUT', headers: upload.uploadHeaders, body: file });
+    expect(apiRequest).toHaveBeenLastCalledWith('/products/import/abc123');
+  });
+
+  it('should reject when the worker reports a failure', async () => {
+    vi.mocked(apiRequest)
+      .mockResolvedValueOnce(upload)
+      .mockResolvedValueOnce({ importId: 'abc123', status: 'failed', message: 'Bad file' });
+    fetchMock.mockResolvedValueOnce({ ok: true });
+
+    const result = importProducts(new Blob([]));
+    const assertion = expect(result).rejects.toThrow('Bad file');
+    await vi.runAllTimersAsync();
+
+    await assertion;
+  });
+});
@@ -7,10 +7,12 @@ import { NotificationProvider } from '../../src/contexts/NotificationContext';
 import { FeatureToggleProvider } from '../../src/contexts/FeatureToggleContext';
 import * as productsApi from '../../src/api/products_interface/getAllProducts';
 import * as discountsApi from '../../src/api/discounts_interface/getAllDiscounts';
+import * as bootstrapApi from '../../src/api/bootstrap_interface/getBootstrap';
 
 // Mock API modules
 vi.mock('../../src/api/products_interface/getAllProducts');
 vi.mock('../../src/api/discounts_interface/getAllDiscounts');
+vi.mock('../../src/api/bootstrap_interface/getBootstrap');
 vi.mock('../../src/api/transaction_interface/createTransaction');
 vi.mock('../../src/api/transaction_interface/updateTransaction');
 
@@ -40,6 +42,17 @@ describe('Discount Selection Flow Integration', () => {
     vi.clearAllMocks();
     vi.mocked(productsApi.getAllProducts).mockResolvedValue(mockProducts);
     vi.mocked(discountsApi.getAllDiscounts).mockResolvedValue(mockDiscounts);
+    vi.mocked(bootstrapApi.getBootstrap).mockResolvedValue({
+      version: 'test-version',
+      products: mockProducts,
+      discounts: mockDiscounts,
+      payment_methods: [],
+      feature_toggles: {
+        collectEmailAddresses: true,
+        passwordProtectAdmin: true,
+        protectPlantPassAccess: false,
+      },
+    });
   });
 
   it('should maintain checkbox state when selecting and deselecting discounts', async () => {
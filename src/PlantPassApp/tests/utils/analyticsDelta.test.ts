@@ -0,0 +1,78 @@
+import { describe, it, expect } from 'vitest';
+import { applyAnalyticsDelta } from '../../src/utils/analyticsDelta';
+import type { AnalyticsDelta, SalesAnalytics } from '../../src/types';
+
+const snapshot: SalesAnalytics = {
+  total_sales: 20,
+  total_orders: 1,
+  total_units_sold: 2,
+  average_items_per_order: 2,
+  average_order_value: 20,
+  sales_over_time: { '12-20-2021 05:30 AM': 20 },
+  transactions: [{ purchase_id: 'AAA-AAA', timestamp: 1, total_quantity: 2, grand_total: 20, paid: true }],
+};
+
+const baseDelta: AnalyticsDelta = {
+  event: 'created',
+  reset: false,
+  total_sales: 0,
+  total_orders: 0,
+  total_units_sold: 0,
+  sales_over_time: {},
+  transaction: null,
+  removed_purchase_id: null,
+};
+
+describe('applyAnalyticsDelta', () => {
+  it('should add a paid order to totals and buckets', () => {
+    const result = applyAnalyticsDelta(snapshot, {
+      ...baseDelta,
+      total_sales: 5.5,
+      total_orders: 1,
+      total_units_sold: 1,
+      sales_over_time: { '12-20-2021 05:30 AM': 5.5 },
+      transaction: { purchase_id: 'BBB-BBB', timestamp: 2, total_quantity: 1, grand_total: 5.5, paid: true },
+    });
+
+    expect(result.total_sales).toBe(25.5);
+    expect(result.total_orders).toBe(2);
+    expect(result.average_order_value).toBe(12.75);
+    expect(result.sales_over_time['12-20-2021 05:30 AM']).toBe(25.5);
+    expect(result.transactions).toHaveLength(2);
+  });
+
+  it('should replace the row of an updated transaction', () => {
+    const result = applyAnalyticsDelta(snapshot, {
+      ...baseDelta,
+      event: 'updated',
+      transaction: { purchase_id: 'AAA-AAA', timestamp: 1, total_quantity: 2, grand_total: 20, paid: false },
+      total_sales: -20,
+      total_orders: -1,
+      total_units_sold: -2,
+    });
+
+    expect(result.total_orders).toBe(0);
+    expect(result.average_order_value).toBe(0);
+    expect(result.transactions).toEqual([
+      { purchase_id: 'AAA-AAA', timestamp: 1, total_quantity: 2, grand_total: 20, paid: false },
+    ]);
+  });
+
+  it('should remove a deleted transaction', () => {
+    const result = applyAnalyticsDelta(snapshot, {
+      ...baseDelta,
+      event: 'deleted',
+      removed_purchase_id: 'AAA-AAA',
+    });
+
+    expect(result.transactions).toHaveLength(0);
+  });
+
+  it('should reset on clear', () => {
+    const result = applyAnalyticsDelta(snapshot, { ...baseDelta, event: 'cleared', reset: true });
+
+    expect(result.total_sales).toBe(0);
+    expect(result.sales_over_time).toEqual({});
+    expect(result.transactions).toEqual([]);
+  });
+});
@@ -1,173 +1,245 @@
 import json
 import logging
 import os
-import boto3
 import bcrypt
 import jwt
 import datetime
+from botocore.exceptions import ClientError
 from response_utils import create_response
+from dynamodb_client import get_client
 from temp_password_manager import (
     generate_temp_password,
     store_temp_password,
     get_temp_password_hash,
     delete_temp_password
 )
+from session_manager import (
+    create_refresh_session,
+    verify_refresh_token,
+    revoke_refresh_session,
+    revoke_all_sessions,
+    reserve_login_attempt,
+    clear_login_attempts,
+    table as sessions_table
+)
+
+# Import routing from Lambda Layer
+try:
+    from shared_utils.router import Router, Route, PUBLIC
+    from shared_utils.warmup import ping_table
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.router import Router, Route, PUBLIC
+    from shared_utils.warmup import ping_table
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-s3 = boto3.client("s3")
 bucket = os.environ["PASSWORD_BUCKET"]
 key = os.environ["PASSWORD_KEY"]
 
 JWT_SECRET = os.environ["JWT_SECRET"]
 EMAIL_LAMBDA_ARN = os.environ.get("EMAIL_LAMBDA_ARN")
 
-lambda_client = boto3.client('lambda')
+# Access tokens are short-lived; clients renew them with POST /admin/refresh
+ACCESS_TOKEN_MINUTES = int(os.environ.get("ACCESS_TOKEN_MINUTES", "15"))
+
+# Last password object read from S3, revalidated by ETag on each use
+_password_cache = {"etag": None, "hash": None}
 
 def get_password_hash():
-    obj = s3.get_object(Bucket=bucket, Key=key)
+    request = {"Bucket": bucket, "Key": key}
+    if _password_cache["etag"]:
+        request["IfNoneMatch"] = _password_cache["etag"]
+    
+    try:
+        obj = get_client("s3").get_object(**request)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("304", "NotModified") and _password_cache["hash"]:
+            return _password_cache["hash"]
+        raise
+    
     data = json.loads(obj["Body"].read())
-    return data["admin_password_hash"].encode()
+    _password_cache["hash"] = data["admin_password_hash"].encode()
+    _password_cache["etag"] = obj.get("ETag")
+    return _password_cache["hash"]
 
 def set_password_hash(new_hash):
-    s3.put_object(
+    response = get_client("s3").put_object(
         Bucket=bucket,
         Key=key,
         Body=json.dumps({"admin_password_hash": new_hash.decode()})
     )
+    _password_cache["hash"] = new_hash
+    _password_cache["etag"] = response.get("ETag")
+
+def issue_access_token(minutes=None, **claims):
+    now = datetime.datetime.utcnow()
+    return jwt.encode(
+        {
+            "exp": now + datetime.timedelta(minutes=minutes or ACCESS_TOKEN_MINUTES),
+            "role": "admin",
+            "iat": now,
+            **claims
+        },
+        JWT_SECRET,
+        algorithm="HS256"
+    )
 
-def lambda_handler(event, context):
-    try:
-        logger.info(f"=== Lambda Invoked ===")
-        logger.info(f"Event: {json.dumps(event)}")
-        
-        body = json.loads(event.get("body", "{}"))
-        route_key = event.get("routeKey", "")
+def issue_session_tokens():
+    """Access token plus a new refresh token, as returned by login."""
+    return {
+        "token": issue_access_token(),
+        "refresh_token": create_refresh_session(),
+        "expires_in": ACCESS_TOKEN_MINUTES * 60
+    }
+
+def get_source_ip(event):
+    return event.get("requestContext", {}).get("http", {}).get("sourceIp", "unknown")
+
+def login(event, body):
+    logger.info("=== Admin Login Attempt ===")
+    source_ip = get_source_ip(event)
+    retry_after = reserve_login_attempt(source_ip)
+    if retry_after:
+        logger.warning(f"Login rate limit reached for {source_ip}")
+        return create_response(
+            429,
+            {"error": "Too many failed attempts. Try again later."},
+            {"Retry-After": str(retry_after)}
+        )
+    
+    pw_hash = get_password_hash()
+    password = body.get("password", "")
+    
+    logger.info(f"Password length: {len(password)}")
+    logger.info(f"Password hash from S3 exists: {bool(pw_hash)}")
+
+    # Check regular password first
+    logger.info("Checking regular password...")
+    regular_match = bcrypt.checkpw(password.encode(), pw_hash)
+    logger.info(f"Regular password match: {regular_match}")
+    
+    if regular_match:
+        logger.info("Regular password authenticated successfully")
+        clear_login_attempts(source_ip)
+        return create_response(200, {**issue_session_tokens(), "requires_password_change": False})
+    
+    # If regular password didn't match, check temp password
+    logger.info("Regular password failed, checking temporary password...")
+    temp_hash = get_temp_password_hash()
+    logger.info(f"Temp password hash exists: {bool(temp_hash)}")
+    
+    if temp_hash:
+        temp_match = bcrypt.checkpw(password.encode(), temp_hash.encode())
+        logger.info(f"Temp password match: {temp_match}")
         
-        logger.info(f"Route: {route_key}")
-        logger.info(f"Body keys: {list(body.keys())}")
+        if temp_match:
+            # Generate token but require password change; no refresh token
+            # until a real password is set
+            token = issue_access_token(minutes=60, temp=True)
+            delete_temp_password()
+            clear_login_attempts(source_ip)
+            logger.info("Temp password authenticated successfully")
+            return create_response(200, {"token": token, "requires_password_change": True})
+    else:
+        logger.info("No temp password hash found in DynamoDB")
+    
+    # The attempt was already counted by reserve_login_attempt
+    logger.warning("Authentication failed - no password matched")
+    return create_response(401, {"error": "Invalid password"})
+
+def refresh(event, body):
+    # One GetItem and one HMAC; no S3 read or bcrypt
+    if not verify_refresh_token(body.get("refresh_token", "")):
+        return create_response(401, {"error": "Invalid refresh token"})
+    
+    return create_response(200, {"token": issue_access_token(), "expires_in": ACCESS_TOKEN_MINUTES * 60})
+
+def logout(event, body):
+    revoke_refresh_session(body.get("refresh_token", ""))
+    return create_response(200, {"success": True})
+
+def change_password(event, body):
+    headers = event.get("headers", {})
+    authorization = headers.get("authorization", "")
+    token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else ""
 
-        if route_key == "POST /admin/login":
-            logger.info("=== Admin Login Attempt ===")
-            pw_hash = get_password_hash()
-            password = body.get("password", "")
-            
-            logger.info(f"Password length: {len(password)}")
-            logger.info(f"Password hash from S3 exists: {bool(pw_hash)}")
-
-            # Check regular password first
-            logger.info("Checking regular password...")
-            regular_match = bcrypt.checkpw(password.encode(), pw_hash)
-            logger.info(f"Regular password match: {regular_match}")
-            
-            if regular_match:
-                token = jwt.encode(
-                    {
-                        "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=24),
-                        "role": "admin",
-                        "iat": datetime.datetime.utcnow()
-                    },
-                    JWT_SECRET,
-                    algorithm="HS256"
-                )
-                logger.info("Regular password authenticated successfully")
-                return create_response(200, {"token": token, "requires_password_change": False})
-            
-            # If regular password didn't match, check temp password
-            logger.info("Regular password failed, checking temporary password...")
-            temp_hash = get_temp_password_hash()
-            logger.info(f"Temp password hash exists: {bool(temp_hash)}")
-            
-            if temp_hash:
-                temp_match = bcrypt.checkpw(password.encode(), temp_hash.encode())
-                logger.info(f"Temp password match: {temp_match}")
-                
-                if temp_match:
-                    # Generate token but require password change
-                    token = jwt.encode(
-                        {
-                            "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1),
-                            "temp": True,
-                            "role": "admin",
-                            "iat": datetime.datetime.utcnow()
-                        },
-                        JWT_SECRET,
-                        algorithm="HS256"
-                    )
-                    delete_temp_password()
-                    logger.info("Temp password authenticated successfully")
-                    return create_response(200, {"token": token, "requires_password_change": True})
-            else:
-                logger.info("No temp password hash found in DynamoDB")
-            
-            logger.warning("Authentication failed - no password matched")
-            return create_response(401, {"error": "Invalid password"})
-        
-        if route_key == "POST /admin/change-password":
-            headers = event.get("headers", {})
-            authorization = headers.get("authorization", "")
-            token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else ""
-
-            try:
-                decoded = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-                is_temp = decoded.get("temp", False)
-            except jwt.ExpiredSignatureError:
-                return create_response(401, {"error": "Token expired"})
-            except:
-                return create_response(401, {"error": "Invalid token"})
-
-            old_pw = body.get("old_password", "")
-            new_pw = body.get("new_password", "")
-
-            # If using temp token, skip old password check
-            if not is_temp:
-                pw_hash = get_password_hash()
-                if not bcrypt.checkpw(old_pw.encode(), pw_hash):
-                    return create_response(401, {"error": "Invalid current password"})
-
-            new_hash = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt())
-            set_password_hash(new_hash)
-            return create_response(200, {"success": True})
-
-        if route_key == "POST /admin/forgot-password":
-            logger.info("=== Forgot Password Request ===")
-            # Generate temporary password
-            temp_password = generate_temp_password()
-            logger.info(f"Generated temp password length: {len(temp_password)}")
-            
-            temp_hash = bcrypt.hashpw(temp_password.encode(), bcrypt.gensalt()).decode()
-            logger.info("Temp password hashed successfully")
-            
-            # Store temp password hash
-            store_temp_password(temp_hash)
-            logger.info("Temp password stored in DynamoDB")
+    try:
+        decoded = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+        is_temp = decoded.get("temp", False)
+    except jwt.ExpiredSignatureError:
+        return create_response(401, {"error": "Token expired"})
+    except:
+        return create_response(401, {"error": "Invalid token"})
+
+    old_pw = body.get("old_password", "")
+    new_pw = body.get("new_password", "")
+
+    # If using temp token, skip old password check
+    if not is_temp:
+        pw_hash = get_password_hash()
+        if not bcrypt.checkpw(old_pw.encode(), pw_hash):
+            return create_response(401, {"error": "Invalid current password"})
+
+    new_hash = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt())
+    set_password_hash(new_hash)
+    
+    # Sign out every other device; this one continues on a new session
+    revoke_all_sessions()
+    return create_response(200, {"success": True, **issue_session_tokens()})
+
+def forgot_password(event, body):
+    logger.info("=== Forgot Password Request ===")
+    # Generate temporary password
+    temp_password = generate_temp_password()
+    logger.info(f"Generated temp password length: {len(temp_password)}")
+    
+    temp_hash = bcrypt.hashpw(temp_password.encode(), bcrypt.gensalt()).decode()
+    logger.info("Temp password hashed successfully")
+    
+    # Store temp password hash
+    store_temp_password(temp_hash)
+    logger.info("Temp password stored in DynamoDB")
+    
+    # Send email via Email Lambda
+    if EMAIL_LAMBDA_ARN:
+        try:
+            email_payload = {
+                "routeKey": "POST /email/password-reset",
+                "body": json.dumps({"temp_password": temp_password})
+            }
             
-            # Send email via Email Lambda
-            if EMAIL_LAMBDA_ARN:
-                try:
-                    email_payload = {
-                        "routeKey": "POST /email/password-reset",
-                        "body": json.dumps({"temp_password": temp_password})
-                    }
-                    
-                    lambda_client.invoke(
-                        FunctionName=EMAIL_LAMBDA_ARN,
-                        InvocationType='Event',
-                        Payload=json.dumps(email_payload)
-                    )
-                    
-                    logger.info("Password reset email triggered successfully")
-                except Exception as e:
-                    logger.error(f"Failed to trigger email: {e}")
-                    return create_response(500, {"error": "Failed to send email"})
-            else:
-                logger.warning("EMAIL_LAMBDA_ARN not configured")
+            get_client("lambda").invoke(
+                FunctionName=EMAIL_LAMBDA_ARN,
+                InvocationType='Event',
+                Payload=json.dumps(email_payload)
+            )
             
-            return create_response(200, {"message": "Temporary password sent to registered email"})
-
-        return create_response(404, {"error": "Route not found"})
+            logger.info("Password reset email triggered successfully")
+        except Exception as e:
+            logger.error(f"Failed to trigger email: {e}")
+            return create_response(500, {"error": "Failed to send email"})
+    else:
+        logger.warning("EMAIL_LAMBDA_ARN not configured")
+    
+    return create_response(200, {"message": "Temporary password sent to registered email"})
+
+def warm_sessions_table():
+    ping_table(sessions_table, {"id": "warmup"})
+
+# Every admin route is reachable without a token: change-password checks its
+# own token, since a temporary password's token may only do that
+router = Router({
+    "POST /admin/login": Route(login, PUBLIC, body=True),
+    "POST /admin/refresh": Route(refresh, PUBLIC, body=True),
+    "POST /admin/logout": Route(logout, PUBLIC, body=True),
+    "POST /admin/change-password": Route(change_password, PUBLIC, body=True),
+    "POST /admin/forgot-password": Route(forgot_password, PUBLIC, body=True),
+}, errors={Exception: lambda e: create_response(500, {"error": "Internal server error"})},
+    warmup=[get_password_hash, warm_sessions_table])
 
-    except:
-        logger.exception("Error processing request")
-        return create_response(500, {"error": "Internal server error"})
+def lambda_handler(event, context):
+    return router.dispatch(event)
@@ -0,0 +1,123 @@
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from dynamodb_client import lazy_table
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+table = lazy_table('ADMIN_SESSIONS_TABLE', 'admin_sessions')
+
+REFRESH_TOKEN_DAYS = int(os.environ.get('REFRESH_TOKEN_DAYS', '30'))
+
+# Login attempts allowed per source IP in each window (a success starts the
+# count again) before bcrypt is skipped
+MAX_FAILED_LOGINS = int(os.environ.get('MAX_FAILED_LOGINS', '5'))
+LOGIN_WINDOW_SECONDS = int(os.environ.get('LOGIN_WINDOW_SECONDS', '900'))
+
+SESSION_PREFIX = 'session#'
+FAILURES_PREFIX = 'login_failures#'
+
+def _secret_digest(secret):
+    """Only an HMAC of the refresh secret is stored, never the secret itself."""
+    key = os.environ.get('JWT_SECRET', '').encode()
+    return hmac.new(key, secret.encode(), hashlib.sha256).hexdigest()
+
+def _split_refresh_token(refresh_token):
+    session_id, _, secret = (refresh_token or '').partition('.')
+    return (session_id, secret) if session_id and secret else (None, None)
+
+def create_refresh_session():
+    """Start a refresh session and return its token ("<session id>.<secret>")."""
+    session_id = secrets.token_urlsafe(12)
+    secret = secrets.token_urlsafe(32)
+    now = int(time.time())
+
+    table.put_item(
+        Item={
+            'id': SESSION_PREFIX + session_id,
+            'secret_hmac': _secret_digest(secret),
+            'created': now,
+            'expiration': now + REFRESH_TOKEN_DAYS * 86400
+        }
+    )
+
+    return f"{session_id}.{secret}"
+
+def verify_refresh_token(refresh_token):
+    """Check a refresh token with one GetItem and one HMAC. Returns True if valid."""
+    session_id, secret = _split_refresh_token(refresh_token)
+    if not session_id:
+        return False
+
+    item = table.get_item(Key={'id': SESSION_PREFIX + session_id}).get('Item')
+    # TTL deletion can lag, so expiry is checked here too
+    if not item or int(item.get('expiration', 0)) <= time.time():
+        return False
+
+    return hmac.compare_digest(item['secret_hmac'], _secret_digest(secret))
+
+def revoke_refresh_session(refresh_token):
+    """End the session a refresh token belongs to (logout)."""
+    if verify_refresh_token(refresh_token):
+        session_id, _ = _split_refresh_token(refresh_token)
+        table.delete_item(Key={'id': SESSION_PREFIX + session_id})
+
+def revoke_all_sessions():
+    """End every refresh session, e.g. after the admin password changes."""
+    scan_kwargs = {
+        'ProjectionExpression': 'id',
+        'FilterExpression': Attr('id').begins_with(SESSION_PREFIX)
+    }
+    response = table.scan(**scan_kwargs)
+    session_ids = [item['id'] for item in response.get('Items', [])]
+
+    while 'LastEvaluatedKey' in response:
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+        session_ids.extend(item['id'] for item in response.get('Items', []))
+
+    with table.batch_writer() as batch:
+        for session_id in session_ids:
+            batch.delete_item(Key={'id': session_id})
+
+    logger.info(f"Revoked {len(session_ids)} refresh sessions")
+
+def _failures_key(source, now):
+    return f"{FAILURES_PREFIX}{source}#{int(now) // LOGIN_WINDOW_SECONDS}"
+
+def reserve_login_attempt(source):
+    """
+    Count a login attempt against the source's current window before the
+    password hash is fetched or bcrypt runs. Check and count are one
+    conditional UpdateItem, so a concurrent burst cannot all pass the check.
+    Returns 0 if the attempt may go ahead, else the seconds until the source
+    may try again.
+    """
+    now = time.time()
+    window_end = (int(now) // LOGIN_WINDOW_SECONDS + 1) * LOGIN_WINDOW_SECONDS
+
+    try:
+        response = table.update_item(
+            Key={'id': _failures_key(source, now)},
+            UpdateExpression='ADD attempts :one SET expiration = if_not_exists(expiration, :expiration)',
+            ConditionExpression='attribute_not_exists(attempts) OR attempts < :max',
+            ExpressionAttributeValues={':one': 1, ':expiration': window_end, ':max': MAX_FAILED_LOGINS},
+            ReturnValues='UPDATED_NEW'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return window_end - int(now)
+
+    if int(response.get('Attributes', {}).get('attempts', 0)) == MAX_FAILED_LOGINS:
+        logger.warning(f"Last login attempt in this window for {source}")
+    return 0
+
+def clear_login_attempts(source):
+    """Forget the source's attempts after a successful login."""
+    table.delete_item(Key={'id': _failures_key(source, time.time())})
@@ -1,17 +1,16 @@
 import json
 import logging
 import os
-import boto3
 import secrets
 import string
 from datetime import datetime, timedelta
+from dynamodb_client import lazy_table
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
 table_name = os.environ.get('TEMP_PASSWORD_TABLE', 'temp_passwords')
-table = dynamodb.Table(table_name)
+table = lazy_table('TEMP_PASSWORD_TABLE', 'temp_passwords')
 
 def generate_temp_password(length=12):
     """Generate a secure random temporary password"""
@@ -0,0 +1,201 @@
+"""
+Authentication and authorization middleware for Lambda functions.
+Validates JWT tokens and enforces role-based access control.
+"""
+import os
+import jwt
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import wraps
+from response_utils import create_response
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+JWT_SECRET = os.environ.get("JWT_SECRET")
+
+# Verified claims for recently seen tokens; the same few tablets present the
+# same tokens all day, so repeats skip the decode and HMAC check
+TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "256"))
+
+_verified_tokens = OrderedDict()
+
+class AuthError(Exception):
+    """Custom exception for authentication errors"""
+    def __init__(self, message, status_code=401):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+
+def normalize_headers(event):
+    """
+    Lower-cased copy of the event's headers, built once per event and kept
+    on it so later lookups are a single dict access.
+    """
+    headers = event.get("_normalized_headers")
+    if headers is None:
+        headers = {key.lower(): value for key, value in (event.get("headers") or {}).items()}
+        event["_normalized_headers"] = headers
+    return headers
+
+
+def get_header(event, name):
+    """Case-insensitive header lookup; name must be lower case."""
+    return normalize_headers(event).get(name)
+
+
+def extract_token(event):
+    """Extract JWT token from Authorization header"""
+    auth_header = get_header(event, "authorization")
+    
+    if not auth_header:
+        raise AuthError("Missing Authorization header", 401)
+    
+    if not auth_header.startswith("Bearer "):
+        raise AuthError("Invalid Authorization header format", 401)
+    
+    return auth_header.replace("Bearer ", "")
+
+
+def clear_token_cache():
+    """Forget every cached verification."""
+    _verified_tokens.clear()
+
+
+def _token_digest(token):
+    # Keyed by secret as well, so a rotated secret never matches old entries
+    return hashlib.sha256(f"{JWT_SECRET}\0{token}".encode("utf-8")).digest()
+
+
+def verify_token(token):
+    """
+    Verify JWT token and return decoded payload. Verified claims are kept in
+    a bounded LRU keyed by token digest until the token's exp, so a repeat
+    token costs one hash instead of a full decode.
+    """
+    if not JWT_SECRET:
+        logger.error("JWT_SECRET not configured")
+        raise AuthError("Server configuration error", 500)
+    
+    digest = _token_digest(token)
+    cached = _verified_tokens.get(digest)
+    if cached is not None:
+        decoded, expires_at = cached
+        if expires_at is not None and expires_at <= time.time():
+            _verified_tokens.pop(digest, None)
+            raise AuthError("Token expired", 401)
+        _verified_tokens.move_to_end(digest)
+        return dict(decoded)
+    
+    try:
+        decoded = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        raise AuthError("Token expired", 401)
+    except jwt.InvalidTokenError as e:
+        logger.warning(f"Invalid token: {e}")
+        raise AuthError("Invalid token", 401)
+    
+    if TOKEN_CACHE_SIZE > 0:
+        expires_at = decoded.get("exp")
+        _verified_tokens[digest] = (dict(decoded), float(expires_at) if expires_at is not None else None)
+        while len(_verified_tokens) > TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return decoded
+
+
+def require_auth(role=None):
+    """
+    Decorator to require authentication for Lambda handlers.
+    
+    Args:
+        role: Optional role requirement ('admin' or 'staff'). 
+              If None, any authenticated user is allowed.
+    """
+    def decorator(handler_func):
+        @wraps(handler_func)
+        def wrapper(event, context):
+            try:
+                # Extract and verify token
+                token = extract_token(event)
+                decoded = verify_token(token)
+                
+                # Check role if specified
+                if role:
+                    token_role = decoded.get("role", "staff")
+                    
+                    # Admin can access everything
+                    if token_role != "admin" and role == "admin":
+                        raise AuthError("Insufficient permissions", 403)
+                
+                # Add decoded token to event for handler to use
+                event["auth"] = decoded
+                
+                # Call the actual handler
+                return handler_func(event, context)
+                
+            except AuthError as e:
+                logger.warning(f"Authentication error: {e.message}")
+                return create_response(e.status_code, {"error": e.message})
+            except Exception as e:
+                logger.error(f"Unexpected auth error: {e}", exc_info=True)
+                return create_response(500, {"error": "Internal server error"})
+        
+        return wrapper
+    return decorator
+
+
+# Routes reachable without a token; the routed handlers declare the same
+# policy per route in their route tables
+PUBLIC_ENDPOINTS = frozenset([
+    "GET /transactions/{purchase_id}",  # Customer order lookup
+    "POST /admin/login",  # Login endpoint
+    "POST /admin/refresh",  # Access token renewal (refresh token in body)
+    "POST /admin/logout",  # Refresh session revocation (refresh token in body)
+    "POST /admin/forgot-password",  # Password reset
+    "POST /plantpass-access/verify",  # PlantPass passphrase verification
+    "GET /feature-toggles",  # Feature toggles (needed for UI)
+    "GET /config",  # Public config keys (admin keys too with an admin token)
+    "GET /products",  # Products list (needed for order entry)
+    "GET /discounts",  # Discounts list (needed for order entry)
+    "GET /payment-methods",  # Payment methods (needed for checkout)
+    "GET /bootstrap",  # Whole point-of-sale configuration in one request
+])
+
+
+def is_public_endpoint(route_key):
+    """
+    Check if an endpoint should be publicly accessible.
+    """
+    return route_key in PUBLIC_ENDPOINTS
+
+
+def authorize(event, policy):
+    """
+    Enforce a route's auth policy ('public', 'staff' or 'admin'). Returns an
+    error response, or None once event["auth"] holds the verified claims.
+    """
+    if policy == "public":
+        return None
+    
+    try:
+        decoded = verify_token(extract_token(event))
+    except AuthError as e:
+        return create_response(e.status_code, {"error": e.message})
+    
+    event["auth"] = decoded
+    if policy == "admin" and decoded.get("role") != "admin":
+        return create_response(403, {"message": "Admin access required"})
+    return None
+
+
+def require_staff_auth(handler_func):
+    """Require staff-level authentication"""
+    return require_auth(role="staff")(handler_func)
+
+
+def require_admin_auth(handler_func):
+    """Require admin-level authentication"""
+    return require_auth(role="admin")(handler_func)
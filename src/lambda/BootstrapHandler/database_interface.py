@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+from dynamodb_client import get_dynamodb_client
+from decimal_utils import decimal_to_float
+from response_utils import make_etag
+
+# Import catalog cache and normalization from Lambda Layer
+try:
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import read_catalog
+    from shared_utils.config_registry import CONFIG_VERSION_RESOURCE, PUBLIC, config_cache, visible_config
+    from shared_utils.pos_config import (
+        normalize_products,
+        normalize_discounts,
+        normalize_payment_methods
+    )
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import read_catalog
+    from shared_utils.config_registry import CONFIG_VERSION_RESOURCE, PUBLIC, config_cache, visible_config
+    from shared_utils.pos_config import (
+        normalize_products,
+        normalize_discounts,
+        normalize_payment_methods
+    )
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+PRODUCTS_TABLE = os.environ.get('PRODUCTS_TABLE', 'products')
+DISCOUNTS_TABLE = os.environ.get('DISCOUNTS_TABLE', 'discounts')
+PAYMENT_METHODS_TABLE = os.environ.get('PAYMENT_METHODS_TABLE', 'payment_methods')
+CATALOG_VERSIONS_TABLE = os.environ.get('CATALOG_VERSIONS_TABLE', 'catalog_versions')
+
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+def _deserialize(item):
+    """Convert a low-level DynamoDB item to plain Python values."""
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+class ClientTable:
+    """Table-like get_item over the thread-safe client, for the shared document reader."""
+    
+    def __init__(self, table_name):
+        self.table_name = table_name
+    
+    def get_item(self, Key, **kwargs):
+        response = get_dynamodb_client().get_item(
+            TableName=self.table_name,
+            Key={key: _serializer.serialize(value) for key, value in Key.items()},
+            **kwargs
+        )
+        return {'Item': _deserialize(response['Item'])} if 'Item' in response else {}
+
+catalog_documents = ClientTable(CATALOG_VERSIONS_TABLE)
+
+def scan_all(table_name):
+    """Scan every page of a table through the thread-safe client."""
+    client = get_dynamodb_client()
+    scan_kwargs = {'TableName': table_name}
+    items = []
+    
+    while True:
+        response = client.scan(**scan_kwargs)
+        items.extend(_deserialize(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def load_products():
+    return read_catalog('products', lambda: normalize_products(scan_all(PRODUCTS_TABLE)), catalog_documents)
+
+def load_discounts():
+    scan = lambda: decimal_to_float(normalize_discounts(scan_all(DISCOUNTS_TABLE)))
+    return read_catalog('discounts', scan, catalog_documents)
+
+def load_payment_methods():
+    scan = lambda: normalize_payment_methods(scan_all(PAYMENT_METHODS_TABLE))
+    return read_catalog('payment_methods', scan, catalog_documents)
+
+# Same resources and shapes as the per-resource handlers' warm caches; each
+# reads its single catalog document and only scans when none is stored
+catalog_caches = {
+    'products': CatalogCache('products', load_products),
+    'discounts': CatalogCache('discounts', load_discounts),
+    'payment_methods': CatalogCache('payment_methods', load_payment_methods)
+}
+
+def get_catalog_versions(resources):
+    """
+    Read the version stamps of the given resources (catalogs and config)
+    with a single BatchGetItem, retrying unprocessed keys. Nothing is read
+    when every cache is fresh.
+    """
+    versions = {resource: 0 for resource in resources}
+    if not resources:
+        return versions
+    
+    client = get_dynamodb_client()
+    request_items = {
+        CATALOG_VERSIONS_TABLE: {
+            'Keys': [{'resource': {'S': resource}} for resource in resources],
+            'ProjectionExpression': '#resource, version',
+            'ExpressionAttributeNames': {'#resource': 'resource'}
+        }
+    }
+    
+    while request_items:
+        response = client.batch_get_item(RequestItems=request_items)
+        for item in response.get('Responses', {}).get(CATALOG_VERSIONS_TABLE, []):
+            item = _deserialize(item)
+            versions[item['resource']] = int(item['version'])
+        request_items = response.get('UnprocessedKeys') or {}
+    
+    return versions
+
+def get_bootstrap_document():
+    """
+    Build the whole point-of-sale configuration as one JSON document.
+    Fresh warm caches are reused as-is; stale catalogs and config are
+    revalidated from one batched version read and reloaded concurrently
+    only if changed.
+    
+    Returns (etag, document_json). The document's "version" is the ETag
+    value, so clients can tell whether any part of the configuration moved.
+    """
+    try:
+        stale = [resource for resource, cache in catalog_caches.items() if not cache.is_fresh()]
+        config_stale = not config_cache.is_fresh()
+        versions = get_catalog_versions(stale + [CONFIG_VERSION_RESOURCE] if config_stale else stale)
+        
+        bodies = {}
+        with ThreadPoolExecutor(max_workers=len(catalog_caches)) as pool:
+            futures = {resource: pool.submit(catalog_caches[resource].get, versions[resource]) for resource in stale}
+            for resource, cache in catalog_caches.items():
+                if resource not in futures:
+                    bodies[resource] = cache.get_json()
+            # Config loads through the shared boto3 resource, so on this thread
+            config = config_cache.get(versions.get(CONFIG_VERSION_RESOURCE))[1]
+            for resource, future in futures.items():
+                bodies[resource] = future.result()[1]
+        
+        feature_toggles = visible_config(config, PUBLIC)
+        
+        # Catalog bodies are already serialized; splice them instead of re-encoding
+        content = (
+            f'"products": {bodies["products"]}, '
+            f'"discounts": {bodies["discounts"]}, '
+            f'"payment_methods": {bodies["payment_methods"]}, '
+            f'"feature_toggles": {json.dumps(feature_toggles)}'
+        )
+        etag = make_etag(content)
+        
+        return etag, f'{{"version": {etag}, {content}}}'
+    
+    except ClientError as e:
+        logger.error(f"Error loading bootstrap document: {e}")
+        raise Exception(f"Failed to load bootstrap document: {e}")
@@ -0,0 +1,32 @@
+import logging
+from response_utils import create_conditional_response
+from database_interface import get_bootstrap_document
+from auth_middleware import authorize
+
+# Import routing from Lambda Layer
+try:
+    from shared_utils.router import Router, Route, PUBLIC, error_message
+except ImportError:
+    # Fallback for local development
+    import sys
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.router import Router, Route, PUBLIC, error_message
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def get_bootstrap(event, body):
+    """
+    Serve products, discounts, payment methods and feature toggles as one
+    versioned document, so a tablet starts up with a single request.
+    """
+    etag, document_json = get_bootstrap_document()
+    return create_conditional_response(event, document_json, etag)
+
+router = Router({
+    "GET /bootstrap": Route(get_bootstrap, PUBLIC),
+}, authorize, errors={Exception: error_message(500)}, warmup=[get_bootstrap_document])
+
+def lambda_handler(event, context):
+    return router.dispatch(event)
@@ -2,27 +2,42 @@ import logging
 import os
 from botocore.exceptions import ClientError
 from decimal import Decimal
-from dynamodb_client import get_table
+from dynamodb_client import lazy_table
+from decimal_utils import decimal_to_float
+
+# Import catalog sync from Lambda Layer
+try:
+    from shared_utils.catalog_sync import CatalogWriteInterrupted, diff_catalog, apply_catalog_diff_guarded
+    from shared_utils.edit_lease import lease_condition_check, raise_for_lease_conflict
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog, commit_catalog_change
+    from shared_utils.catalog_snapshot import try_publish_catalog_snapshot
+    from shared_utils.pos_config import normalize_discounts
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_sync import CatalogWriteInterrupted, diff_catalog, apply_catalog_diff_guarded
+    from shared_utils.edit_lease import lease_condition_check, raise_for_lease_conflict
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog, commit_catalog_change
+    from shared_utils.catalog_snapshot import try_publish_catalog_snapshot
+    from shared_utils.pos_config import normalize_discounts
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-table = get_table('DISCOUNTS_TABLE', 'discounts')
+table = lazy_table('DISCOUNTS_TABLE', 'discounts')
 
-def get_all_discounts():
+def get_all_discounts(consistent_read=False):
+    """
+    Read the sorted discounts: from the single-document copy when available,
+    otherwise (or for consistent reads) from a paginated scan of the table.
+    """
     try:
-        response = table.scan()
-        discounts = response.get('Items', [])
-        
-        for discount in discounts:
-            if 'value' in discount and isinstance(discount['value'], Decimal):
-                discount['value'] = float(discount['value'])
-            
-            if 'sort_order' in discount and isinstance(discount['sort_order'], Decimal):
-                discount['sort_order'] = int(discount['sort_order'])
-        
-        discounts.sort(key=lambda x: x.get('sort_order', 0))
-        return discounts
+        if consistent_read:
+            return normalize_discounts(scan_all_items(table, ConsistentRead=True))
+        return read_catalog('discounts', lambda: normalize_discounts(scan_all_items(table)))
     except ClientError as e:
         logger.error(f"Error retrieving discounts: {e}")
         raise Exception(f"Failed to retrieve discounts: {e}")
@@ -30,40 +45,100 @@ def get_all_discounts():
         logger.error(f"Unexpected error in get_all_discounts: {e}")
         raise Exception(f"Failed to retrieve discounts: {e}")
 
-def replace_all_discounts(discounts_data):
+# Warm-container cache of the serialized catalog, revalidated by version stamp
+discounts_cache = CatalogCache('discounts', lambda: decimal_to_float(get_all_discounts()))
+
+def get_all_discounts_with_etag():
+    """Return (ETag, sorted discounts as a JSON string), served from the warm cache when current."""
+    return discounts_cache.get_with_etag()
+
+def _record_discounts_change():
+    """
+    Commit a discounts write: store the next catalog document/version so every
+    warm container reloads on its next check, then publish the matching
+    static snapshot for CloudFront (best effort: the write has landed).
+    """
+    version, discounts = commit_catalog_change('discounts', lambda: decimal_to_float(get_all_discounts(consistent_read=True)))
+    discounts_cache.invalidate()
+    try_publish_catalog_snapshot('discounts', version, lambda: discounts if discounts is not None else decimal_to_float(get_all_discounts(consistent_read=True)))
+
+def _build_discount_item(discount_data):
+    """Convert incoming discount data to a DynamoDB item, or None if invalid."""
+    if 'name' not in discount_data or 'type' not in discount_data:
+        logger.warning(f"Skipping invalid discount data: {discount_data}")
+        return None
+    
+    if discount_data['type'] not in ['percent', 'dollar']:
+        logger.warning(f"Skipping discount with invalid type: {discount_data}")
+        return None
+    
+    return {
+        'name': discount_data['name'],
+        'type': discount_data['type'],
+        'value': Decimal(str(discount_data.get('value', 0))),
+        'sort_order': int(discount_data.get('sort_order', 0))
+    }
+
+def replace_all_discounts(discounts_data, lease_id=None):
+    """
+    Sync the discounts table to the given list, writing only the rows that
+    were created, changed or removed. The writes are refused (LeaseConflict)
+    while another admin holds the edit lease; lease_id is the caller's own.
+    """
     try:
-        existing_discounts = get_all_discounts()
+        # Diff against the rows themselves, not the document copy
+        existing_discounts = get_all_discounts(consistent_read=True)
+        
+        new_items = [item for item in map(_build_discount_item, discounts_data) if item]
         
-        with table.batch_writer() as batch:
-            for discount in existing_discounts:
-                batch.delete_item(Key={'name': discount['name']})
+        items_to_put, names_to_delete, counts = diff_catalog(
+            existing_discounts, new_items, 'name', normalize=decimal_to_float
+        )
+        apply_catalog_diff_guarded(table, 'name', items_to_put, names_to_delete, lease_condition_check('discounts', lease_id))
         
-        created_count = 0
-        with table.batch_writer() as batch:
-            for discount_data in discounts_data:
-                if 'name' not in discount_data or 'type' not in discount_data:
-                    logger.warning(f"Skipping invalid discount data: {discount_data}")
-                    continue
-                
-                if discount_data['type'] not in ['percent', 'dollar']:
-                    logger.warning(f"Skipping discount with invalid type: {discount_data}")
-                    continue
-                
-                item = {
-                    'name': discount_data['name'],
-                    'type': discount_data['type'],
-                    'value': Decimal(str(discount_data.get('value', 0))),
-                    'sort_order': int(discount_data.get('sort_order', 0))
-                }
-                
-                batch.put_item(Item=item)
-                created_count += 1
+        if items_to_put or names_to_delete:
+            _record_discounts_change()
         
-        return {"deleted": len(existing_discounts), "created": created_count}
+        return counts
         
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_discounts_change()
+        raise_for_lease_conflict('discounts', e.cause, e.progress)
+        logger.error(f"Error replacing discounts: {e}")
+        raise Exception(f"Failed to replace discounts: {e}")
     except ClientError as e:
+        raise_for_lease_conflict('discounts', e)
         logger.error(f"DynamoDB error replacing discounts: {e}")
         raise Exception(f"Failed to replace discounts: {e}")
     except Exception as e:
         logger.error(f"Error replacing discounts: {e}")
-        raise Exception(f"Failed to replace discounts: {e}")
\ No newline at end of file
+        raise Exception(f"Failed to replace discounts: {e}")
+
+def patch_discounts(upserts, names_to_delete, lease_id=None):
+    """
+    Apply only the given discount changes: upsert each entry and delete each name.
+    """
+    try:
+        items_to_put = [item for item in map(_build_discount_item, upserts) if item]
+        
+        apply_catalog_diff_guarded(table, 'name', items_to_put, names_to_delete, lease_condition_check('discounts', lease_id))
+        
+        if items_to_put or names_to_delete:
+            _record_discounts_change()
+        
+        return {"upserted": len(items_to_put), "deleted": len(names_to_delete)}
+        
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_discounts_change()
+        raise_for_lease_conflict('discounts', e.cause, e.progress)
+        logger.error(f"Error patching discounts: {e}")
+        raise Exception(f"Failed to patch discounts: {e}")
+    except ClientError as e:
+        raise_for_lease_conflict('discounts', e)
+        logger.error(f"DynamoDB error patching discounts: {e}")
+        raise Exception(f"Failed to patch discounts: {e}")
+    except Exception as e:
+        logger.error(f"Error patching discounts: {e}")
+        raise Exception(f"Failed to patch discounts: {e}")
@@ -0,0 +1,127 @@
+"""
+Shared AWS clients
+Every boto3 client and resource a handler uses comes from here. Each is
+created on first use, so a route that never sends email never builds an SES
+client, and all of them share one botocore session (endpoint and credential
+loading happen once). Clients are tuned for Lambda: a connection pool big
+enough for the handlers' thread pools, TCP keep-alive so pooled connections
+survive between invocations, short timeouts and adaptive retries. Every
+call is timed for the invocation's phase metrics (see metrics.py).
+"""
+import boto3
+import botocore
+import os
+import threading
+
+try:
+    from shared_utils.metrics import observe_session
+except ImportError:
+    # Functions deployed without the shared utils layer carry a flat copy
+    from metrics import observe_session
+
+AWS_CONNECT_TIMEOUT = float(os.environ.get('AWS_CONNECT_TIMEOUT', '2'))
+AWS_READ_TIMEOUT = float(os.environ.get('AWS_READ_TIMEOUT', '10'))
+AWS_MAX_ATTEMPTS = int(os.environ.get('AWS_MAX_ATTEMPTS', '4'))
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '32'))
+
+_session = None
+_clients = {}
+_resources = {}
+_lock = threading.Lock()
+
+def get_client_config():
+    """botocore Config applied to every client and resource."""
+    # boto3 imports botocore.config itself, so the attribute is always there
+    return botocore.config.Config(
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+        retries={'max_attempts': AWS_MAX_ATTEMPTS, 'mode': 'adaptive'},
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True
+    )
+
+def get_session():
+    """The boto3 session every client is created from."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = boto3.session.Session()
+                # Before any client is made: clients copy the session's hooks
+                observe_session(session)
+                _session = session
+    return _session
+
+def get_client(service_name, **kwargs):
+    """
+    Get or create a low-level client (one per service and arguments).
+    Clients are thread-safe, so one can serve a thread pool.
+    """
+    key = (service_name, tuple(sorted(kwargs.items())))
+    client = _clients.get(key)
+    if client is None:
+        session = get_session()
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = session.client(service_name, config=get_client_config(), **kwargs)
+                _clients[key] = client
+    return client
+
+def get_resource(service_name):
+    """Get or create a resource (one per service)."""
+    resource = _resources.get(service_name)
+    if resource is None:
+        session = get_session()
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                resource = session.resource(service_name, config=get_client_config())
+                _resources[service_name] = resource
+    return resource
+
+def reset_clients():
+    """Forget every client, resource and the session (tests, credential changes)."""
+    global _session
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _session = None
+
+def get_dynamodb_resource():
+    """Get or create DynamoDB resource (singleton pattern)."""
+    return get_resource('dynamodb')
+
+def get_dynamodb_client():
+    """
+    Get or create the low-level DynamoDB client (singleton pattern).
+    Unlike resources, clients are thread-safe, so one client can serve
+    a thread pool (bootstrap reads, shard queries, parallel import writers).
+    """
+    return get_client('dynamodb')
+
+def get_table(table_env_var, default_name):
+    """Get DynamoDB table by environment variable or default name."""
+    dynamodb = get_dynamodb_resource()
+    table_name = os.environ.get(table_env_var, default_name)
+    return dynamodb.Table(table_name)
+
+class LazyTable:
+    """
+    Module-level stand-in for a Table: the resource and Table are only built
+    on first use, so importing a data module makes no clients.
+    """
+
+    def __init__(self, table_env_var, default_name):
+        self._table_env_var = table_env_var
+        self._default_name = default_name
+        self._table = None
+
+    def __getattr__(self, name):
+        if self._table is None:
+            self._table = get_table(self._table_env_var, self._default_name)
+        return getattr(self._table, name)
+
+def lazy_table(table_env_var, default_name):
+    """Table by environment variable or default name, created on first use."""
+    return LazyTable(table_env_var, default_name)
@@ -1,17 +1,25 @@
 import json
 import logging
 import os
-import boto3
 from botocore.exceptions import ClientError
+from dynamodb_client import get_client
+from warmup import is_warmup, handle_warmup
+
+try:
+    from shared_utils import metrics
+except ImportError:
+    # Deployed on its own without the shared utils layer
+    import metrics
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ses = boto3.client('ses', region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
-
 SENDER_EMAIL = os.environ['SENDER_EMAIL']
 UIUC_HORT_CLUB_EMAIL = os.environ.get('UIUC_HORT_CLUB_EMAIL', 'hortclub@example.com')
 
+def get_ses_client():
+    return get_client('ses', region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+
 def create_response(status_code, body):
     return {
         'statusCode': status_code,
@@ -112,7 +120,7 @@ Items:
             text_body += f"Discount: -${receipt.get('discount', 0):.2f}\n"
         text_body += f"Total: ${receipt.get('total', 0):.2f}\n\nThank you for your purchase!\nUIUC Horticulture Club"
         
-        response = ses.send_email(
+        response = get_ses_client().send_email(
             Source=SENDER_EMAIL,
             Destination={'ToAddresses': [recipient_email]},
             Message={
@@ -170,7 +178,7 @@ Important: This temporary password will expire in 15 minutes.
 If you did not request this password reset, please contact your system administrator.
         """
         
-        response = ses.send_email(
+        response = get_ses_client().send_email(
             Source=SENDER_EMAIL,
             Destination={'ToAddresses': [UIUC_HORT_CLUB_EMAIL]},
             Message={
@@ -189,10 +197,23 @@ If you did not request this password reset, please contact your system administr
         logger.error(f"Failed to send password reset email: {e}")
         raise
 
+WARMUP_STEPS = [get_ses_client]
+
 def lambda_handler(event, context):
+    if is_warmup(event):
+        metrics.mark_warm()
+        return handle_warmup(event, WARMUP_STEPS)
+    
+    route_key = event.get("routeKey", "")
+    metrics.start(route_key)
+    response = route(route_key, event)
+    metrics.finish(response['statusCode'])
+    return response
+
+def route(route_key, event):
     try:
-        body = json.loads(event.get("body", "{}"))
-        route_key = event.get("routeKey", "")
+        with metrics.phase('body'):
+            body = json.loads(event.get("body", "{}"))
         
         if route_key == "POST /email/receipt":
             recipient_email = body.get('email')
@@ -1,12 +1,39 @@
-import boto3
+"""
+Shared AWS clients
+This function deploys with the shared utils layer, so its flat modules use
+the layer's registry: the layer modules (edit_lease, catalog_store, ...)
+and this handler's own then share one botocore session and connection pool.
+Functions deployed without the layer (EmailHandler, WebSocketHandler) carry
+the standalone registry instead (see shared/dynamodb_client.py).
+"""
+import os
 
-_dynamodb_resource = None
-
-def get_dynamodb_client():
-    """
-    Returns a singleton DynamoDB resource
-    """
-    global _dynamodb_resource
-    if _dynamodb_resource is None:
-        _dynamodb_resource = boto3.resource('dynamodb')
-    return _dynamodb_resource
+try:
+    from shared_utils.dynamodb_client import (
+        get_client_config,
+        get_session,
+        get_client,
+        get_resource,
+        reset_clients,
+        get_dynamodb_resource,
+        get_dynamodb_client,
+        get_table,
+        LazyTable,
+        lazy_table
+    )
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.dynamodb_client import (
+        get_client_config,
+        get_session,
+        get_client,
+        get_resource,
+        reset_clients,
+        get_dynamodb_resource,
+        get_dynamodb_client,
+        get_table,
+        LazyTable,
+        lazy_table
+    )
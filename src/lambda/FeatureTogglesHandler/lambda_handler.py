@@ -1,126 +1,116 @@
 import json
 import os
 import logging
-from dynamodb_client import get_dynamodb_client
-from response_utils import create_response
-from auth_middleware import is_public_endpoint, extract_token, verify_token, AuthError
+from response_utils import create_response, create_conditional_response
+from auth_middleware import authorize, extract_token, verify_token, AuthError
 
-FEATURE_TOGGLES_TABLE_NAME = os.environ.get('FEATURE_TOGGLES_TABLE_NAME', 'PlantPass-FeatureToggles')
+# Import the config registry and routing from Lambda Layer
+try:
+    from shared_utils.config_registry import ADMIN, PUBLIC, get_config, visible_config, update_config
+    from shared_utils.router import Router, Route
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.config_registry import ADMIN, PUBLIC, get_config, visible_config, update_config
+    from shared_utils.router import Router, Route
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Default feature toggle values
-DEFAULT_FEATURES = {
-    'collectEmailAddresses': True,
-    'passwordProtectAdmin': True,
-    'protectPlantPassAccess': False
-}
-
-def lambda_handler(event, context):
+def get_feature_toggles(event, body):
     """
-    Handle feature toggle operations
+    Get the current feature toggle settings (the public config keys),
+    answering a matching If-None-Match with an empty 304
     """
     try:
-        route_key = event.get('routeKey', '')
-        
-        logger.info(f"Route Key: {route_key}")
+        features = visible_config(get_config(), PUBLIC)
         
-        # Check if endpoint requires authentication
-        if not is_public_endpoint(route_key):
-            try:
-                token = extract_token(event)
-                decoded = verify_token(token)
-                event["auth"] = decoded
-                
-                # PUT /feature-toggles requires admin role
-                if route_key == "PUT /feature-toggles" and decoded.get("role") != "admin":
-                    return create_response(403, {"message": "Admin access required"})
-                    
-            except AuthError as e:
-                return create_response(e.status_code, {"error": e.message})
+        return create_conditional_response(event, json.dumps(features))
         
-        if route_key == 'GET /feature-toggles':
-            return get_feature_toggles()
-        elif route_key == 'PUT /feature-toggles':
-            body = json.loads(event.get('body', '{}'))
-            return set_feature_toggles(body)
-        else:
-            return create_response(404, {'message': f'Route not found: {route_key}'})
-            
     except Exception as e:
-        logger.error(f"Error in lambda_handler: {str(e)}", exc_info=True)
-        return create_response(500, {'message': 'Internal server error'})
+        logger.error(f"Error getting feature toggles: {str(e)}", exc_info=True)
+        return create_response(500, {'message': 'Error retrieving feature toggles'})
 
 
-def get_feature_toggles():
+def set_feature_toggles(event, body):
     """
-    Get the current feature toggle settings
+    Update any subset of the feature toggles; omitted flags keep their value
     """
     try:
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(FEATURE_TOGGLES_TABLE_NAME)
+        try:
+            config = update_config(body, access=PUBLIC)
+        except ValueError as e:
+            return create_response(400, {'message': str(e)})
         
-        response = table.get_item(
-            Key={'config_id': 'feature_toggles'}
-        )
-        
-        item = response.get('Item', {})
-        
-        # Return stored features or defaults
-        features = {
-            'collectEmailAddresses': item.get('collectEmailAddresses', DEFAULT_FEATURES['collectEmailAddresses']),
-            'passwordProtectAdmin': item.get('passwordProtectAdmin', DEFAULT_FEATURES['passwordProtectAdmin']),
-            'protectPlantPassAccess': item.get('protectPlantPassAccess', DEFAULT_FEATURES['protectPlantPassAccess'])
-        }
-        
-        return create_response(200, features)
+        return create_response(200, {
+            **visible_config(config, PUBLIC),
+            'message': 'Feature toggles updated successfully'
+        })
         
     except Exception as e:
-        logger.error(f"Error getting feature toggles: {str(e)}", exc_info=True)
-        return create_response(500, {'message': 'Error retrieving feature toggles'})
+        logger.error(f"Error setting feature toggles: {str(e)}", exc_info=True)
+        return create_response(500, {'message': 'Error updating feature toggles'})
 
 
-def set_feature_toggles(body):
+def get_request_access(event):
     """
-    Set the feature toggle settings
+    Admin tokens may also read admin config keys; GET /config stays public,
+    so a missing or invalid token just means public keys only
     """
     try:
-        collect_email = body.get('collectEmailAddresses')
-        password_protect = body.get('passwordProtectAdmin')
-        protect_plantpass = body.get('protectPlantPassAccess')
-        
-        # Validate required fields
-        if collect_email is None or password_protect is None or protect_plantpass is None:
-            return create_response(400, {
-                'message': 'All feature toggle fields are required'
-            })
-        
-        # Validate types
-        if not isinstance(collect_email, bool) or not isinstance(password_protect, bool) or not isinstance(protect_plantpass, bool):
-            return create_response(400, {
-                'message': 'Feature toggle values must be boolean'
-            })
+        decoded = verify_token(extract_token(event))
+    except AuthError:
+        return PUBLIC
+    return ADMIN if decoded.get("role") == "admin" else PUBLIC
+
+
+def get_config_values(event, body):
+    """
+    Get every config value the caller may read in one response, answering a
+    matching If-None-Match with an empty 304
+    """
+    try:
+        config = visible_config(get_config(), get_request_access(event))
         
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(FEATURE_TOGGLES_TABLE_NAME)
+        return create_conditional_response(event, json.dumps(config))
         
-        table.put_item(
-            Item={
-                'config_id': 'feature_toggles',
-                'collectEmailAddresses': collect_email,
-                'passwordProtectAdmin': password_protect,
-                'protectPlantPassAccess': protect_plantpass
-            }
-        )
+    except Exception as e:
+        logger.error(f"Error getting config: {str(e)}", exc_info=True)
+        return create_response(500, {'message': 'Error retrieving config'})
+
+
+def set_config_values(event, body):
+    """
+    Update any subset of the public and admin config keys
+    """
+    try:
+        try:
+            config = update_config(body, access=ADMIN)
+        except ValueError as e:
+            return create_response(400, {'message': str(e)})
         
         return create_response(200, {
-            'collectEmailAddresses': collect_email,
-            'passwordProtectAdmin': password_protect,
-            'protectPlantPassAccess': protect_plantpass,
-            'message': 'Feature toggles updated successfully'
+            **visible_config(config, ADMIN),
+            'message': 'Config updated successfully'
         })
         
     except Exception as e:
-        logger.error(f"Error setting feature toggles: {str(e)}", exc_info=True)
-        return create_response(500, {'message': 'Error updating feature toggles'})
+        logger.error(f"Error setting config: {str(e)}", exc_info=True)
+        return create_response(500, {'message': 'Error updating config'})
+
+
+# Config access levels double as route auth policies: reads are public,
+# writes need an admin token
+router = Router({
+    "GET /feature-toggles": Route(get_feature_toggles, PUBLIC),
+    "PUT /feature-toggles": Route(set_feature_toggles, ADMIN, body=True),
+    "GET /config": Route(get_config_values, PUBLIC),
+    "PUT /config": Route(set_config_values, ADMIN, body=True),
+}, authorize, warmup=[get_config])
+
+def lambda_handler(event, context):
+    """
+    Handle feature toggle and config operations
+    """
+    return router.dispatch(event)
@@ -1,91 +1,79 @@
-import json
 import os
 import logging
-from dynamodb_client import get_dynamodb_client
 from response_utils import create_response
-from auth_middleware import extract_token, verify_token, AuthError
+from auth_middleware import authorize
 
-LOCK_TABLE_NAME = os.environ.get('LOCK_TABLE_NAME', 'PlantPass-Locks')
+# Import edit leases and routing from Lambda Layer
+try:
+    from shared_utils.edit_lease import (
+        LOCKABLE_RESOURCES,
+        LeaseConflict,
+        get_lease,
+        acquire_lease,
+        renew_lease,
+        release_lease
+    )
+    from shared_utils.router import Router, Route, ADMIN, BadRequest
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.edit_lease import (
+        LOCKABLE_RESOURCES,
+        LeaseConflict,
+        get_lease,
+        acquire_lease,
+        renew_lease,
+        release_lease
+    )
+    from shared_utils.router import Router, Route, ADMIN, BadRequest
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def lambda_handler(event, context):
+def get_resource_type(event):
     """
-    Handle lock state operations for admin resources
+    Validated resourceType path parameter; raises BadRequest
     """
-    try:
-        # All lock operations require admin authentication
-        try:
-            token = extract_token(event)
-            decoded = verify_token(token)
-            
-            if decoded.get("role") != "admin":
-                return create_response(403, {"message": "Admin access required"})
-                
-            event["auth"] = decoded
-        except AuthError as e:
-            return create_response(e.status_code, {"error": e.message})
-        
-        route_key = event.get('routeKey', '')
-        path_parameters = event.get('pathParameters', {})
-        resource_type = path_parameters.get('resourceType', '')
-        
-        logger.info(f"Route Key: {route_key}, Resource Type: {resource_type}")
-        
-        if not resource_type:
-            return create_response(400, {'message': 'Resource type is required'})
-        
-        # Validate resource type
-        valid_resources = ['products', 'discounts', 'payment_methods']
-        if resource_type not in valid_resources:
-            return create_response(400, {'message': f'Invalid resource type. Must be one of: {", ".join(valid_resources)}'})
-        
-        # Match route pattern
-        if route_key.startswith('GET /lock/'):
-            return get_lock_state(resource_type)
-        elif route_key.startswith('PUT /lock/'):
-            body = json.loads(event.get('body', '{}'))
-            return set_lock_state(resource_type, body)
-        else:
-            return create_response(404, {'message': f'Route not found: {route_key}'})
-            
-    except Exception as e:
-        logger.error(f"Error in lambda_handler: {str(e)}", exc_info=True)
-        return create_response(500, {'message': 'Internal server error'})
+    resource_type = (event.get('pathParameters') or {}).get('resourceType', '')
+    
+    if not resource_type:
+        raise BadRequest('Resource type is required')
+    
+    if resource_type not in LOCKABLE_RESOURCES:
+        raise BadRequest(f'Invalid resource type. Must be one of: {", ".join(LOCKABLE_RESOURCES)}')
+    
+    return resource_type
 
 
-def get_lock_state(resource_type):
+def get_lock_state(event, body):
     """
-    Get the current lock state for a resource
+    Get the current edit lease on a resource: whether it is held, by whom
+    and until when
     """
+    resource_type = get_resource_type(event)
+    
     try:
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(LOCK_TABLE_NAME)
-        
-        response = table.get_item(
-            Key={'resource_type': resource_type}
-        )
-        
-        item = response.get('Item', {})
-        is_locked = item.get('is_locked', False)
-        
-        return create_response(200, {
-            'resourceType': resource_type,
-            'isLocked': is_locked
-        })
+        return create_response(200, get_lease(resource_type))
         
     except Exception as e:
-        print(f"Error getting lock state: {str(e)}")
+        logger.error(f"Error getting lock state: {str(e)}", exc_info=True)
         return create_response(500, {'message': 'Error retrieving lock state'})
 
 
-def set_lock_state(resource_type, body):
+def set_lock_state(event, body):
     """
-    Set the lock state for a resource
+    Acquire, renew or release the edit lease on a resource.
+    {"isLocked": true, "owner": ...} acquires and returns a leaseId;
+    {"isLocked": true, "leaseId": ...} renews; {"isLocked": false,
+    "leaseId": ...} releases. A lease held by someone else answers 409.
     """
+    resource_type = get_resource_type(event)
+    
     try:
         is_locked = body.get('isLocked')
+        lease_id = body.get('leaseId')
+        owner = body.get('owner') or 'admin'
         
         if is_locked is None:
             return create_response(400, {'message': 'isLocked field is required'})
@@ -93,22 +81,47 @@ def set_lock_state(resource_type, body):
         if not isinstance(is_locked, bool):
             return create_response(400, {'message': 'isLocked must be a boolean'})
         
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(LOCK_TABLE_NAME)
+        if lease_id is not None and not isinstance(lease_id, str):
+            return create_response(400, {'message': 'leaseId must be a string'})
+        
+        if not isinstance(owner, str):
+            return create_response(400, {'message': 'owner must be a string'})
         
-        table.put_item(
-            Item={
-                'resource_type': resource_type,
-                'is_locked': is_locked
-            }
-        )
+        try:
+            if not is_locked:
+                if not lease_id:
+                    return create_response(400, {'message': 'leaseId is required to release a lock'})
+                release_lease(resource_type, lease_id)
+                lease = get_lease(resource_type)
+            elif lease_id:
+                lease = renew_lease(resource_type, lease_id)
+            else:
+                lease = acquire_lease(resource_type, owner)
+        except LeaseConflict as e:
+            return create_response(409, {'message': str(e), 'lease': e.lease})
         
         return create_response(200, {
-            'resourceType': resource_type,
-            'isLocked': is_locked,
-            'message': f'Lock state updated successfully'
+            **lease,
+            'message': 'Lock state updated successfully'
         })
         
     except Exception as e:
-        print(f"Error setting lock state: {str(e)}")
+        logger.error(f"Error setting lock state: {str(e)}", exc_info=True)
         return create_response(500, {'message': 'Error updating lock state'})
+
+
+def warm_lease_table():
+    get_lease(LOCKABLE_RESOURCES[0])
+
+
+# All lock operations require admin authentication
+router = Router({
+    "GET /lock/{resourceType}": Route(get_lock_state, ADMIN),
+    "PUT /lock/{resourceType}": Route(set_lock_state, ADMIN, body=True),
+}, authorize, warmup=[warm_lease_table])
+
+def lambda_handler(event, context):
+    """
+    Handle edit lease operations for admin resources
+    """
+    return router.dispatch(event)
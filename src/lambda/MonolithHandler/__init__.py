@@ -0,0 +1 @@
+# Single-function API (all handlers mounted together)
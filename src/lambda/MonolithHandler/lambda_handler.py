@@ -0,0 +1,125 @@
+"""
+Single-function deployment of the HTTP API
+Mounts every API handler behind one route table, so one pool of warm
+containers serves all routes instead of each function keeping its own (the
+rarely used ones otherwise cold-start on almost every call). The handlers
+are unchanged and stay deployable as separate functions; the api_monolith
+Terraform variable chooses which the API routes to.
+
+The handlers use the same flat module names (database_interface,
+response_utils, ...) with different contents, so each is imported from its
+own directory and its modules are taken out of sys.modules before the next
+handler is loaded. A module identical to one an earlier handler loaded
+(auth_middleware, dynamodb_client, ...) is reused rather than loaded again,
+so all routes share one client registry and one verified-token cache.
+"""
+import hashlib
+import importlib
+import logging
+import os
+import sys
+
+# Import responses, warmup and metrics from Lambda Layer
+try:
+    from shared_utils.response_utils import create_response
+    from shared_utils.warmup import is_warmup, handle_warmup
+    from shared_utils import metrics
+except ImportError:
+    # Fallback for local development
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.response_utils import create_response
+    from shared_utils.warmup import is_warmup, handle_warmup
+    from shared_utils import metrics
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Handler directories, packaged next to this one
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HANDLERS = (
+    'TransactionHandler',
+    'ProductsHandler',
+    'DiscountsHandler',
+    'PaymentMethodsHandler',
+    'BootstrapHandler',
+    'LockHandler',
+    'FeatureTogglesHandler',
+    'PlantPassAccessHandler',
+    'AdminPassword',
+    'EmailHandler',
+)
+
+# EmailHandler routes by hand rather than through a Router
+EMAIL_ROUTES = ('POST /email/receipt', 'POST /email/password-reset')
+
+# (module name, sha256 of its source) -> module, for reuse across handlers
+_loaded_modules = {}
+
+
+def _source_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_handler(name):
+    """Import a handler's lambda_handler module in isolation from the others."""
+    directory = os.path.join(CODE_DIR, name)
+    modules = {
+        filename[:-3]: _source_digest(os.path.join(directory, filename))
+        for filename in os.listdir(directory)
+        if filename.endswith('.py') and filename != '__init__.py'
+    }
+
+    # Put aside whatever holds these names (another handler's modules, or
+    # this module itself when it was imported as lambda_handler)
+    displaced = {module: sys.modules.pop(module) for module in modules if module in sys.modules}
+    for module, digest in modules.items():
+        if (module, digest) in _loaded_modules:
+            sys.modules[module] = _loaded_modules[(module, digest)]
+
+    sys.path.insert(0, directory)
+    try:
+        handler = importlib.import_module('lambda_handler')
+    finally:
+        sys.path.remove(directory)
+        for module, digest in modules.items():
+            loaded = sys.modules.pop(module, None)
+            if loaded is not None:
+                _loaded_modules.setdefault((module, digest), loaded)
+        sys.modules.update(displaced)
+    return handler
+
+
+def route_keys(handler):
+    router = getattr(handler, 'router', None)
+    return tuple(router.routes) if router is not None else EMAIL_ROUTES
+
+
+def warmup_steps(handler):
+    router = getattr(handler, 'router', None)
+    return router.warmup if router is not None else handler.WARMUP_STEPS
+
+
+handlers = {name: load_handler(name) for name in HANDLERS}
+
+routes = {}
+for name, handler in handlers.items():
+    for route_key in route_keys(handler):
+        if route_key in routes:
+            raise ValueError(f"{name} and another handler both serve {route_key}")
+        routes[route_key] = handler.lambda_handler
+
+# Every handler's warm steps, each once (handlers share the config cache)
+warmup = list({step: None for handler in handlers.values() for step in warmup_steps(handler)})
+
+
+def lambda_handler(event, context):
+    if is_warmup(event):
+        metrics.mark_warm()
+        return handle_warmup(event, warmup)
+
+    handler = routes.get(event.get('routeKey', ''))
+    if handler is None:
+        return create_response(404, {'message': 'Route not found'})
+    return handler(event, context)
@@ -1,23 +1,41 @@
 import logging
+import os
 from botocore.exceptions import ClientError
-from dynamodb_client import get_table
+from dynamodb_client import lazy_table
+
+# Import catalog sync from Lambda Layer
+try:
+    from shared_utils.catalog_sync import CatalogWriteInterrupted, diff_catalog, apply_catalog_diff_guarded
+    from shared_utils.edit_lease import lease_condition_check, raise_for_lease_conflict
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog, commit_catalog_change
+    from shared_utils.catalog_snapshot import try_publish_catalog_snapshot
+    from shared_utils.pos_config import normalize_payment_methods
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_sync import CatalogWriteInterrupted, diff_catalog, apply_catalog_diff_guarded
+    from shared_utils.edit_lease import lease_condition_check, raise_for_lease_conflict
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog, commit_catalog_change
+    from shared_utils.catalog_snapshot import try_publish_catalog_snapshot
+    from shared_utils.pos_config import normalize_payment_methods
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-table = get_table('PAYMENT_METHODS_TABLE', 'payment_methods')
+table = lazy_table('PAYMENT_METHODS_TABLE', 'payment_methods')
 
-def get_all_payment_methods():
+def get_all_payment_methods(consistent_read=False):
+    """
+    Read the sorted payment methods: from the single-document copy when available,
+    otherwise (or for consistent reads) from a paginated scan of the table.
+    """
     try:
-        response = table.scan()
-        payment_methods = response.get('Items', [])
-        
-        for method in payment_methods:
-            if 'sort_order' in method:
-                method['sort_order'] = int(method['sort_order'])
-        
-        payment_methods.sort(key=lambda x: x.get('sort_order', 0))
-        return payment_methods
+        if consistent_read:
+            return normalize_payment_methods(scan_all_items(table, ConsistentRead=True))
+        return read_catalog('payment_methods', lambda: normalize_payment_methods(scan_all_items(table)))
     except ClientError as e:
         logger.error(f"Error retrieving payment methods: {e}")
         raise Exception(f"Failed to retrieve payment methods: {e}")
@@ -25,34 +43,93 @@ def get_all_payment_methods():
         logger.error(f"Unexpected error in get_all_payment_methods: {e}")
         raise Exception(f"Failed to retrieve payment methods: {e}")
 
-def replace_all_payment_methods(payment_methods_data):
+# Warm-container cache of the serialized catalog, revalidated by version stamp
+payment_methods_cache = CatalogCache('payment_methods', get_all_payment_methods)
+
+def get_all_payment_methods_with_etag():
+    """Return (ETag, sorted payment methods as a JSON string), served from the warm cache when current."""
+    return payment_methods_cache.get_with_etag()
+
+def _record_payment_methods_change():
+    """
+    Commit a payment methods write: store the next catalog document/version so every
+    warm container reloads on its next check, then publish the matching
+    static snapshot for CloudFront (best effort: the write has landed).
+    """
+    version, payment_methods = commit_catalog_change('payment_methods', lambda: get_all_payment_methods(consistent_read=True))
+    payment_methods_cache.invalidate()
+    try_publish_catalog_snapshot('payment_methods', version, lambda: payment_methods if payment_methods is not None else get_all_payment_methods(consistent_read=True))
+
+def _build_payment_method_item(method_data):
+    """Convert incoming payment method data to a DynamoDB item, or None if invalid."""
+    if 'name' not in method_data or not method_data['name'].strip():
+        logger.warning(f"Skipping invalid payment method data: {method_data}")
+        return None
+    
+    return {
+        'name': method_data['name'].strip(),
+        'sort_order': int(method_data.get('sort_order', 0))
+    }
+
+def replace_all_payment_methods(payment_methods_data, lease_id=None):
+    """
+    Sync the payment methods table to the given list, writing only the rows
+    that were created, changed or removed. The writes are refused
+    (LeaseConflict) while another admin holds the edit lease; lease_id is the
+    caller's own.
+    """
     try:
-        existing_methods = get_all_payment_methods()
-        
-        with table.batch_writer() as batch:
-            for method in existing_methods:
-                batch.delete_item(Key={'name': method['name']})
-        
-        created_count = 0
-        with table.batch_writer() as batch:
-            for method_data in payment_methods_data:
-                if 'name' not in method_data or not method_data['name'].strip():
-                    logger.warning(f"Skipping invalid payment method data: {method_data}")
-                    continue
-                
-                item = {
-                    'name': method_data['name'].strip(),
-                    'sort_order': int(method_data.get('sort_order', 0))
-                }
-                
-                batch.put_item(Item=item)
-                created_count += 1
-        
-        return {"deleted": len(existing_methods), "created": created_count}
+        # Diff against the rows themselves, not the document copy
+        existing_methods = get_all_payment_methods(consistent_read=True)
+        
+        new_items = [item for item in map(_build_payment_method_item, payment_methods_data) if item]
+        
+        items_to_put, names_to_delete, counts = diff_catalog(existing_methods, new_items, 'name')
+        apply_catalog_diff_guarded(table, 'name', items_to_put, names_to_delete, lease_condition_check('payment_methods', lease_id))
+        
+        if items_to_put or names_to_delete:
+            _record_payment_methods_change()
+        
+        return counts
         
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_payment_methods_change()
+        raise_for_lease_conflict('payment_methods', e.cause, e.progress)
+        logger.error(f"Error replacing payment methods: {e}")
+        raise Exception(f"Failed to replace payment methods: {e}")
     except ClientError as e:
+        raise_for_lease_conflict('payment_methods', e)
         logger.error(f"DynamoDB error replacing payment methods: {e}")
         raise Exception(f"Failed to replace payment methods: {e}")
     except Exception as e:
         logger.error(f"Error replacing payment methods: {e}")
         raise Exception(f"Failed to replace payment methods: {e}")
+
+def patch_payment_methods(upserts, names_to_delete, lease_id=None):
+    """
+    Apply only the given payment method changes: upsert each entry and delete each name.
+    """
+    try:
+        items_to_put = [item for item in map(_build_payment_method_item, upserts) if item]
+        
+        apply_catalog_diff_guarded(table, 'name', items_to_put, names_to_delete, lease_condition_check('payment_methods', lease_id))
+        
+        if items_to_put or names_to_delete:
+            _record_payment_methods_change()
+        
+        return {"upserted": len(items_to_put), "deleted": len(names_to_delete)}
+        
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_payment_methods_change()
+        raise_for_lease_conflict('payment_methods', e.cause, e.progress)
+        logger.error(f"Error patching payment methods: {e}")
+        raise Exception(f"Failed to patch payment methods: {e}")
+    except ClientError as e:
+        raise_for_lease_conflict('payment_methods', e)
+        logger.error(f"DynamoDB error patching payment methods: {e}")
+        raise Exception(f"Failed to patch payment methods: {e}")
+    except Exception as e:
+        logger.error(f"Error patching payment methods: {e}")
+        raise Exception(f"Failed to patch payment methods: {e}")
@@ -1,49 +1,60 @@
-import json
 import logging
-from response_utils import create_response
+from response_utils import create_response, create_conditional_response
 from database_interface import (
-    get_all_payment_methods,
-    replace_all_payment_methods
+    get_all_payment_methods_with_etag,
+    replace_all_payment_methods,
+    patch_payment_methods
 )
-from auth_middleware import is_public_endpoint, extract_token, verify_token, AuthError
+from auth_middleware import authorize, get_header
+
+# Import catalog sync and routing from Lambda Layer
+try:
+    from shared_utils.catalog_sync import parse_patch_body
+    from shared_utils.edit_lease import LEASE_HEADER, LeaseConflict
+    from shared_utils.router import Router, Route, PUBLIC, ADMIN, error_message
+except ImportError:
+    # Fallback for local development
+    import sys
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_sync import parse_patch_body
+    from shared_utils.edit_lease import LEASE_HEADER, LeaseConflict
+    from shared_utils.router import Router, Route, PUBLIC, ADMIN, error_message
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+def get_payment_methods(event, body):
+    # Pre-serialized catalog from the warm-container cache; a matching
+    # If-None-Match gets an empty 304
+    etag, payment_methods_json = get_all_payment_methods_with_etag()
+    return create_conditional_response(event, payment_methods_json, etag)
+
+def put_payment_methods(event, body):
+    if not isinstance(body, list):
+        return create_response(400, {"message": "Request body must be a list of payment methods"})
+    
+    result = replace_all_payment_methods(body, get_header(event, LEASE_HEADER))
+    return create_response(200, {"message": "Payment methods replaced successfully", "result": result})
+
+def patch_payment_methods_route(event, body):
+    is_valid, upserts, deletes, errors = parse_patch_body(body, 'name')
+    if not is_valid:
+        return create_response(400, {"message": "Invalid payment method patch", "errors": errors})
+    
+    result = patch_payment_methods(upserts, deletes, get_header(event, LEASE_HEADER))
+    return create_response(200, {"message": "Payment methods updated successfully", "result": result})
+
+def lease_conflict(e):
+    return create_response(409, {"message": str(e), "lease": e.lease})
+
+# PUT/PATCH /payment-methods require admin role
+router = Router({
+    "GET /payment-methods": Route(get_payment_methods, PUBLIC),
+    "PUT /payment-methods": Route(put_payment_methods, ADMIN, body=True),
+    "PATCH /payment-methods": Route(patch_payment_methods_route, ADMIN, body=True),
+}, authorize, errors={LeaseConflict: lease_conflict, Exception: error_message(500)},
+    warmup=[get_all_payment_methods_with_etag])
+
 def lambda_handler(event, context):
-    try:
-        route_key = event.get("routeKey", "")
-        
-        # Check if endpoint requires authentication
-        if not is_public_endpoint(route_key):
-            try:
-                token = extract_token(event)
-                decoded = verify_token(token)
-                event["auth"] = decoded
-                
-                # PUT /payment-methods requires admin role
-                if route_key == "PUT /payment-methods" and decoded.get("role") != "admin":
-                    return create_response(403, {"message": "Admin access required"})
-                    
-            except AuthError as e:
-                return create_response(e.status_code, {"error": e.message})
-        
-        body = json.loads(event.get("body", "{}")) if event.get("body") else {}
-
-        if route_key == "GET /payment-methods":
-            payment_methods = get_all_payment_methods()
-            return create_response(200, payment_methods)
-
-        elif route_key == "PUT /payment-methods":
-            if not isinstance(body, list):
-                return create_response(400, {"message": "Request body must be a list of payment methods"})
-            
-            result = replace_all_payment_methods(body)
-            return create_response(200, {"message": "Payment methods replaced successfully", "result": result})
-
-        else:
-            return create_response(404, {"message": "Route not found"})
-
-    except Exception as e:
-        logger.error(f"Error processing request: {e}", exc_info=True)
-        return create_response(500, {"message": str(e)})
+    return router.dispatch(event)
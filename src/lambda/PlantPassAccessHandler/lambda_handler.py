@@ -1,70 +1,44 @@
-import json
 import os
+import hmac
+import math
 import logging
 import jwt
 import datetime
-from dynamodb_client import get_dynamodb_client
 from response_utils import create_response
+from auth_middleware import authorize
 
-PLANTPASS_ACCESS_TABLE_NAME = os.environ.get('PLANTPASS_ACCESS_TABLE_NAME', 'PlantPass-Access')
+# Import config registry, rate limiting and routing from Lambda Layer
+try:
+    from shared_utils.config_registry import get_config, update_config
+    from shared_utils.rate_limit import TokenBucketLimiter
+    from shared_utils.router import Router, Route, PUBLIC, ADMIN, parse_body
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.config_registry import get_config, update_config
+    from shared_utils.rate_limit import TokenBucketLimiter
+    from shared_utils.router import Router, Route, PUBLIC, ADMIN, parse_body
+
+PASSPHRASE_KEY = 'plantpass.passphrase'
 JWT_SECRET = os.environ.get("JWT_SECRET")
 
+# Verify attempts per source IP: a burst big enough for every tablet behind
+# one venue NAT at opening time, then a slow refill
+PASSPHRASE_BURST = int(os.environ.get('PASSPHRASE_BURST', '30'))
+PASSPHRASE_RATE_PER_SECOND = float(os.environ.get('PASSPHRASE_RATE_PER_SECOND', '0.5'))
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def lambda_handler(event, context):
-    """
-    Handle PlantPass access passphrase operations
-    """
-    try:
-        route_key = event.get('routeKey', '')
-        
-        logger.info(f"Route Key: {route_key}")
-        
-        # GET and PUT require admin authentication
-        if route_key in ['GET /plantpass-access', 'PUT /plantpass-access']:
-            from auth_middleware import extract_token, verify_token, AuthError
-            try:
-                token = extract_token(event)
-                decoded = verify_token(token)
-                
-                if decoded.get("role") != "admin":
-                    return create_response(403, {"message": "Admin access required"})
-                    
-                event["auth"] = decoded
-            except AuthError as e:
-                return create_response(e.status_code, {"error": e.message})
-        
-        if route_key == 'GET /plantpass-access':
-            return get_passphrase()
-        elif route_key == 'PUT /plantpass-access':
-            body = json.loads(event.get('body', '{}'))
-            return set_passphrase(body)
-        elif route_key == 'POST /plantpass-access/verify':
-            body = json.loads(event.get('body', '{}'))
-            return verify_passphrase(body)
-        else:
-            return create_response(404, {'message': f'Route not found: {route_key}'})
-            
-    except Exception as e:
-        logger.error(f"Error in lambda_handler: {str(e)}", exc_info=True)
-        return create_response(500, {'message': 'Internal server error'})
-
+verify_limiter = TokenBucketLimiter(PASSPHRASE_RATE_PER_SECOND, PASSPHRASE_BURST)
 
-def get_passphrase():
+def get_passphrase(event, body):
     """
     Get the current PlantPass access passphrase
     """
     try:
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(PLANTPASS_ACCESS_TABLE_NAME)
-        
-        response = table.get_item(
-            Key={'config_id': 'plantpass_access'}
-        )
-        
-        item = response.get('Item', {})
-        passphrase = item.get('passphrase', '')
+        passphrase = get_config()[PASSPHRASE_KEY]
         
         return create_response(200, {'passphrase': passphrase})
         
@@ -73,7 +47,7 @@ def get_passphrase():
         return create_response(500, {'message': 'Error retrieving passphrase'})
 
 
-def set_passphrase(body):
+def set_passphrase(event, body):
     """
     Set the PlantPass access passphrase
     """
@@ -86,15 +60,8 @@ def set_passphrase(body):
         if not isinstance(passphrase, str):
             return create_response(400, {'message': 'Passphrase must be a string'})
         
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(PLANTPASS_ACCESS_TABLE_NAME)
-        
-        table.put_item(
-            Item={
-                'config_id': 'plantpass_access',
-                'passphrase': passphrase
-            }
-        )
+        # Other containers pick up the new passphrase at their next version check
+        update_config({PASSPHRASE_KEY: passphrase})
         
         return create_response(200, {
             'message': 'Passphrase updated successfully'
@@ -105,28 +72,34 @@ def set_passphrase(body):
         return create_response(500, {'message': 'Error updating passphrase'})
 
 
-def verify_passphrase(body):
+def verify_passphrase(event, body):
     """
     Verify the provided passphrase against the stored one.
     Returns a JWT token with 'staff' role on success.
     """
+    # Throttled before the body is parsed or anything is read
+    source_ip = event.get('requestContext', {}).get('http', {}).get('sourceIp', 'unknown')
+    allowed, retry_after = verify_limiter.allow(source_ip)
+    if not allowed:
+        logger.warning(f"Passphrase verify rate limit reached for {source_ip}")
+        return create_response(
+            429,
+            {'message': 'Too many attempts. Try again shortly.'},
+            {'Retry-After': str(math.ceil(retry_after))}
+        )
+    
+    body = parse_body(event)
+    
     try:
         provided_passphrase = body.get('passphrase')
         
-        if not provided_passphrase:
+        if not provided_passphrase or not isinstance(provided_passphrase, str):
             return create_response(400, {'message': 'Passphrase is required'})
         
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(PLANTPASS_ACCESS_TABLE_NAME)
-        
-        response = table.get_item(
-            Key={'config_id': 'plantpass_access'}
-        )
-        
-        item = response.get('Item', {})
-        stored_passphrase = item.get('passphrase', '')
+        stored_passphrase = get_config()[PASSPHRASE_KEY]
         
-        if provided_passphrase == stored_passphrase:
+        # Compared as bytes: hmac.compare_digest rejects non-ASCII str
+        if stored_passphrase and hmac.compare_digest(provided_passphrase.encode('utf-8'), stored_passphrase.encode('utf-8')):
             # Generate JWT token with staff role
             if not JWT_SECRET:
                 logger.error("JWT_SECRET not configured")
@@ -152,3 +125,17 @@ def verify_passphrase(body):
     except Exception as e:
         logger.error(f"Error verifying passphrase: {str(e)}", exc_info=True)
         return create_response(500, {'message': 'Error verifying passphrase'})
+
+
+# GET and PUT require admin authentication; verify is how staff get a token
+router = Router({
+    "GET /plantpass-access": Route(get_passphrase, ADMIN),
+    "PUT /plantpass-access": Route(set_passphrase, ADMIN, body=True),
+    "POST /plantpass-access/verify": Route(verify_passphrase, PUBLIC),
+}, authorize, warmup=[get_config])
+
+def lambda_handler(event, context):
+    """
+    Handle PlantPass access passphrase operations
+    """
+    return router.dispatch(event)
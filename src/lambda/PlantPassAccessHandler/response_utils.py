@@ -1,6 +1,6 @@
 import json
 
-def create_response(status_code, body):
+def create_response(status_code, body, headers=None):
     """
     Create a standardized API Gateway response
     """
@@ -10,7 +10,8 @@ def create_response(status_code, body):
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'GET,PUT,POST,OPTIONS'
+            'Access-Control-Allow-Methods': 'GET,PUT,POST,OPTIONS',
+            **(headers or {})
         },
         'body': json.dumps(body)
     }
@@ -2,64 +2,181 @@ import logging
 import os
 from botocore.exceptions import ClientError
 from decimal import Decimal
-from dynamodb_client import get_table
+from dynamodb_client import lazy_table, get_dynamodb_client
+from decimal_utils import decimal_to_float
+
+# Import catalog sync from Lambda Layer
+try:
+    from shared_utils.catalog_sync import CatalogWriteInterrupted, diff_catalog, apply_catalog_diff_guarded, apply_catalog_diff_parallel
+    from shared_utils.edit_lease import lease_condition_check, raise_for_lease_conflict
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog, commit_catalog_change
+    from shared_utils.catalog_snapshot import try_publish_catalog_snapshot
+    from shared_utils.pos_config import normalize_products
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_sync import CatalogWriteInterrupted, diff_catalog, apply_catalog_diff_guarded, apply_catalog_diff_parallel
+    from shared_utils.edit_lease import lease_condition_check, raise_for_lease_conflict
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog, commit_catalog_change
+    from shared_utils.catalog_snapshot import try_publish_catalog_snapshot
+    from shared_utils.pos_config import normalize_products
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-table = get_table('PRODUCTS_TABLE', 'products')
+table = lazy_table('PRODUCTS_TABLE', 'products')
 
-def get_all_products():
+def get_all_products(consistent_read=False):
+    """
+    Read the sorted products: from the single-document copy when available,
+    otherwise (or for consistent reads) from a paginated scan of the table.
+    """
     try:
-        response = table.scan()
-        products = response.get('Items', [])
-        
-        for product in products:
-            if 'price_ea' in product and isinstance(product['price_ea'], Decimal):
-                product['price_ea'] = float(product['price_ea'])
-            
-            if 'sort_order' in product:
-                if isinstance(product['sort_order'], Decimal):
-                    product['sort_order'] = int(product['sort_order'])
-            else:
-                product['sort_order'] = 0
-        
-        products.sort(key=lambda x: x.get('sort_order', 0))
-        return products
+        if consistent_read:
+            return normalize_products(scan_all_items(table, ConsistentRead=True))
+        return read_catalog('products', lambda: normalize_products(scan_all_items(table)))
     except ClientError as e:
         logger.error(f"Error retrieving products: {e}")
         raise Exception(f"Failed to retrieve products: {e}")
 
-def replace_all_products(products_data):
+# Warm-container cache of the serialized catalog, revalidated by version stamp
+products_cache = CatalogCache('products', get_all_products)
+
+def get_all_products_with_etag():
+    """Return (ETag, sorted products as a JSON string), served from the warm cache when current."""
+    return products_cache.get_with_etag()
+
+def _record_products_change():
+    """
+    Commit a products write: store the next catalog document/version so every
+    warm container reloads on its next check, then publish the matching
+    static snapshot for CloudFront (best effort: the write has landed).
+    """
+    version, products = commit_catalog_change('products', lambda: get_all_products(consistent_read=True))
+    products_cache.invalidate()
+    try_publish_catalog_snapshot('products', version, lambda: products if products is not None else get_all_products(consistent_read=True))
+
+def _build_product_item(product_data):
+    """Convert incoming product data to a DynamoDB item, or None if invalid."""
+    if 'SKU' not in product_data or 'item' not in product_data or 'price_ea' not in product_data:
+        logger.warning(f"Skipping invalid product data: {product_data}")
+        return None
+    
+    return {
+        'SKU': product_data['SKU'],
+        'item': product_data['item'],
+        'price_ea': Decimal(str(product_data['price_ea'])),
+        'sort_order': int(product_data.get('sort_order', 0))
+    }
+
+def replace_all_products(products_data, lease_id=None):
+    """
+    Sync the products table to the given list, writing only the rows that
+    were created, changed or removed. The writes are refused (LeaseConflict)
+    while another admin holds the edit lease; lease_id is the caller's own.
+    """
     try:
-        existing_products = get_all_products()
+        # Diff against the rows themselves, not the document copy
+        existing_products = get_all_products(consistent_read=True)
+        
+        new_items = [item for item in map(_build_product_item, products_data) if item]
         
-        with table.batch_writer() as batch:
-            for product in existing_products:
-                batch.delete_item(Key={'SKU': product['SKU']})
+        items_to_put, skus_to_delete, counts = diff_catalog(
+            existing_products, new_items, 'SKU', normalize=decimal_to_float
+        )
+        apply_catalog_diff_guarded(table, 'SKU', items_to_put, skus_to_delete, lease_condition_check('products', lease_id))
         
-        created_count = 0
-        with table.batch_writer() as batch:
-            for product_data in products_data:
-                if 'SKU' not in product_data or 'item' not in product_data or 'price_ea' not in product_data:
-                    logger.warning(f"Skipping invalid product data: {product_data}")
-                    continue
-                
-                item = {
-                    'SKU': product_data['SKU'],
-                    'item': product_data['item'],
-                    'price_ea': Decimal(str(product_data['price_ea'])),
-                    'sort_order': int(product_data.get('sort_order', 0))
-                }
-                
-                batch.put_item(Item=item)
-                created_count += 1
+        if items_to_put or skus_to_delete:
+            _record_products_change()
         
-        return {"deleted": len(existing_products), "created": created_count}
+        return counts
         
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_products_change()
+        raise_for_lease_conflict('products', e.cause, e.progress)
+        logger.error(f"Error replacing products: {e}")
+        raise Exception(f"Failed to replace products: {e}")
     except ClientError as e:
+        raise_for_lease_conflict('products', e)
         logger.error(f"DynamoDB error replacing products: {e}")
         raise Exception(f"Failed to replace products: {e}")
     except Exception as e:
         logger.error(f"Error replacing products: {e}")
-        raise Exception(f"Failed to replace products: {e}")
\ No newline at end of file
+        raise Exception(f"Failed to replace products: {e}")
+
+def patch_products(upserts, skus_to_delete, lease_id=None):
+    """
+    Apply only the given product changes: upsert each entry and delete each SKU.
+    """
+    try:
+        items_to_put = [item for item in map(_build_product_item, upserts) if item]
+        
+        apply_catalog_diff_guarded(table, 'SKU', items_to_put, skus_to_delete, lease_condition_check('products', lease_id))
+        
+        if items_to_put or skus_to_delete:
+            _record_products_change()
+        
+        return {"upserted": len(items_to_put), "deleted": len(skus_to_delete)}
+        
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_products_change()
+        raise_for_lease_conflict('products', e.cause, e.progress)
+        logger.error(f"Error patching products: {e}")
+        raise Exception(f"Failed to patch products: {e}")
+    except ClientError as e:
+        raise_for_lease_conflict('products', e)
+        logger.error(f"DynamoDB error patching products: {e}")
+        raise Exception(f"Failed to patch products: {e}")
+    except Exception as e:
+        logger.error(f"Error patching products: {e}")
+        raise Exception(f"Failed to patch products: {e}")
+
+
+def import_products(products, mode='merge', protected_skus=(), lease_id=None):
+    """
+    Apply a bulk import: diff the imported rows against the table and write
+    the changes as parallel batches. A merge import only creates and updates;
+    a replace import also deletes SKUs missing from the file, except those
+    named by rejected rows (protected_skus). Each batch is preceded by a
+    lease check, so the import stops once another admin holds the lease.
+    """
+    try:
+        existing_products = get_all_products(consistent_read=True)
+        
+        items_to_put, skus_to_delete, counts = diff_catalog(
+            existing_products, products, 'SKU', normalize=decimal_to_float
+        )
+        if mode != 'replace':
+            skus_to_delete = []
+        else:
+            skus_to_delete = [sku for sku in skus_to_delete if sku not in protected_skus]
+        counts["deleted"] = len(skus_to_delete)
+        
+        # Low-level client: thread-safe, and takes the items serialized
+        def lease_guard():
+            table.meta.client.transact_write_items(TransactItems=[lease_condition_check('products', lease_id)])
+
+        apply_catalog_diff_parallel(
+            get_dynamodb_client(), table.name, 'SKU', items_to_put, skus_to_delete, guard=lease_guard
+        )
+        
+        if items_to_put or skus_to_delete:
+            _record_products_change()
+        
+        return counts
+        
+    except CatalogWriteInterrupted as e:
+        # Earlier chunks landed: commit them so readers stop serving the old catalog
+        _record_products_change()
+        raise_for_lease_conflict('products', e.cause, e.progress)
+        logger.error(f"Error importing products: {e}")
+        raise Exception(f"Failed to import products: {e}")
+    except ClientError as e:
+        raise_for_lease_conflict('products', e)
+        logger.error(f"DynamoDB error importing products: {e}")
+        raise Exception(f"Failed to import products: {e}")
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import uuid
+from botocore.exceptions import ClientError
+from dynamodb_client import get_client
+
+# Import catalog import helpers from Lambda Layer
+try:
+    from shared_utils.catalog_import import (
+        IMPORT_MODES,
+        import_object_key,
+        import_report_key
+    )
+    from shared_utils.edit_lease import check_lease
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_import import (
+        IMPORT_MODES,
+        import_object_key,
+        import_report_key
+    )
+    from shared_utils.edit_lease import check_lease
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+UPLOAD_URL_EXPIRES_SECONDS = 900
+
+def get_s3_client():
+    """Get or create the S3 client (singleton pattern)."""
+    return get_client('s3')
+
+def get_import_bucket():
+    bucket = os.environ.get('CATALOG_IMPORT_BUCKET')
+    if not bucket:
+        raise Exception("Bulk import is not configured (CATALOG_IMPORT_BUCKET unset)")
+    return bucket
+
+def create_product_import(mode, lease_id=None):
+    """
+    Start a bulk import: return a presigned PUT URL the browser uploads the
+    CSV to, plus the headers it must send. The upload itself triggers the
+    import worker. Refused while another admin holds the products lease;
+    the caller's lease id travels with the upload so the worker's writes
+    are checked against it.
+    """
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(IMPORT_MODES)}")
+    check_lease('products', lease_id)
+
+    import_id = uuid.uuid4().hex
+    metadata = {'mode': mode}
+    if lease_id:
+        metadata['lease'] = lease_id
+    headers = {'Content-Type': 'text/csv'}
+    headers.update({f'x-amz-meta-{name}': value for name, value in metadata.items()})
+
+    try:
+        upload_url = get_s3_client().generate_presigned_url(
+            'put_object',
+            Params={
+                'Bucket': get_import_bucket(),
+                'Key': import_object_key(import_id),
+                'ContentType': headers['Content-Type'],
+                'Metadata': metadata
+            },
+            ExpiresIn=UPLOAD_URL_EXPIRES_SECONDS
+        )
+    except ClientError as e:
+        logger.error(f"Error presigning import upload: {e}")
+        raise Exception(f"Failed to start import: {e}")
+
+    return {'importId': import_id, 'uploadUrl': upload_url, 'uploadHeaders': headers}
+
+def get_import_report(import_id):
+    """Return the import's report, or {"status": "pending"} until the worker writes one."""
+    try:
+        response = get_s3_client().get_object(Bucket=get_import_bucket(), Key=import_report_key(import_id))
+        return json.loads(response['Body'].read())
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return {'importId': import_id, 'status': 'pending'}
+        logger.error(f"Error reading import report {import_id}: {e}")
+        raise Exception(f"Failed to read import report: {e}")
+
+def put_import_report(import_id, report):
+    """Write the import's report where GET /products/import/{importId} reads it."""
+    get_s3_client().put_object(
+        Bucket=get_import_bucket(),
+        Key=import_report_key(import_id),
+        Body=json.dumps(report).encode('utf-8'),
+        ContentType='application/json'
+    )
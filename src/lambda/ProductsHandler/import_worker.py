@@ -0,0 +1,70 @@
+import logging
+import os
+import time
+from urllib.parse import unquote_plus
+from database_interface import get_all_products, import_products
+from import_interface import get_s3_client, put_import_report
+
+# Import catalog import helpers from Lambda Layer
+try:
+    from shared_utils.catalog_import import import_id_from_key, read_product_import, replace_deletion_refusal
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_import import import_id_from_key, read_product_import, replace_deletion_refusal
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def run_product_import(bucket, key, import_id):
+    """
+    Stream one uploaded CSV from S3 and apply it. Valid rows are imported even
+    when others are rejected; the report lists every rejected row.
+    """
+    started = time.time()
+    s3_object = get_s3_client().get_object(Bucket=bucket, Key=key)
+    metadata = s3_object.get('Metadata', {})
+    mode = metadata.get('mode', 'merge')
+
+    existing_skus = [product['SKU'] for product in get_all_products(consistent_read=True)]
+    products, row_errors, protected_skus = read_product_import(s3_object['Body'], existing_skus)
+    # A replace import that cannot tell which products the file covers only creates and updates
+    refusal = replace_deletion_refusal(products, row_errors) if mode == 'replace' else None
+    result = import_products(products, 'merge' if refusal else mode, protected_skus, metadata.get('lease'))
+
+    report = {
+        'importId': import_id,
+        'status': 'complete',
+        'mode': mode,
+        'rows': len(products) + len(row_errors),
+        'imported': len(products),
+        'rejected': len(row_errors),
+        'result': result,
+        'errors': row_errors,
+        'durationMs': int((time.time() - started) * 1000)
+    }
+    if refusal:
+        report['message'] = f"No products were deleted: {refusal}"
+    return report
+
+def lambda_handler(event, context):
+    """Triggered by S3 when an import CSV is uploaded to the import bucket."""
+    for record in event.get("Records", []):
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])
+        import_id = import_id_from_key(key)
+        if not import_id:
+            logger.warning(f"Ignoring unexpected import object {key}")
+            continue
+
+        put_import_report(import_id, {'importId': import_id, 'status': 'running'})
+        try:
+            report = run_product_import(bucket, key, import_id)
+            logger.info(f"Import {import_id}: {report['imported']} rows imported, {report['rejected']} rejected in {report['durationMs']} ms")
+        except Exception as e:
+            logger.error(f"Import {import_id} failed: {e}", exc_info=True)
+            report = {'importId': import_id, 'status': 'failed', 'message': str(e)}
+        put_import_report(import_id, report)
+
+    return {"statusCode": 200}
@@ -1,49 +1,77 @@
-import json
 import logging
-from response_utils import create_response
+from response_utils import create_response, create_conditional_response
 from database_interface import (
-    get_all_products,
-    replace_all_products
+    get_all_products_with_etag,
+    replace_all_products,
+    patch_products
 )
-from auth_middleware import is_public_endpoint, extract_token, verify_token, AuthError
+from import_interface import create_product_import, get_import_report
+from auth_middleware import authorize, get_header
+
+# Import catalog sync and routing from Lambda Layer
+try:
+    from shared_utils.catalog_sync import parse_patch_body
+    from shared_utils.edit_lease import LEASE_HEADER, LeaseConflict
+    from shared_utils.router import Router, Route, PUBLIC, ADMIN, error_message
+except ImportError:
+    # Fallback for local development
+    import sys
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_sync import parse_patch_body
+    from shared_utils.edit_lease import LEASE_HEADER, LeaseConflict
+    from shared_utils.router import Router, Route, PUBLIC, ADMIN, error_message
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def lambda_handler(event, context):    
+def get_products(event, body):
+    # Pre-serialized catalog from the warm-container cache; a matching
+    # If-None-Match gets an empty 304
+    etag, products_json = get_all_products_with_etag()
+    return create_conditional_response(event, products_json, etag)
+
+def put_products(event, body):
+    if not isinstance(body, list):
+        return create_response(400, {"message": "Request body must be a list of products"})
+    
+    result = replace_all_products(body, get_header(event, LEASE_HEADER))
+    return create_response(200, {"message": "Products replaced successfully", "result": result})
+
+def patch_products_route(event, body):
+    is_valid, upserts, deletes, errors = parse_patch_body(body, 'SKU', required=('item', 'price_ea'))
+    if not is_valid:
+        return create_response(400, {"message": "Invalid product patch", "errors": errors})
+    
+    result = patch_products(upserts, deletes, get_header(event, LEASE_HEADER))
+    return create_response(200, {"message": "Products updated successfully", "result": result})
+
+def start_import(event, body):
+    mode = body.get("mode", "merge") if isinstance(body, dict) else None
     try:
-        route_key = event.get("routeKey", "")
-        
-        # Check if endpoint requires authentication
-        if not is_public_endpoint(route_key):
-            try:
-                token = extract_token(event)
-                decoded = verify_token(token)
-                event["auth"] = decoded
-                
-                # PUT /products requires admin role
-                if route_key == "PUT /products" and decoded.get("role") != "admin":
-                    return create_response(403, {"message": "Admin access required"})
-                    
-            except AuthError as e:
-                return create_response(e.status_code, {"error": e.message})
-        
-        body = json.loads(event.get("body", "{}")) if event.get("body") else {}
-
-        if route_key == "GET /products":
-            products = get_all_products()
-            return create_response(200, products)
-
-        elif route_key == "PUT /products":
-            if not isinstance(body, list):
-                return create_response(400, {"message": "Request body must be a list of products"})
-            
-            result = replace_all_products(body)
-            return create_response(200, {"message": "Products replaced successfully", "result": result})
-
-        else:
-            return create_response(404, {"message": "Route not found"})
-
-    except Exception as e:
-        logger.error(f"Error processing request: {e}", exc_info=True)
-        return create_response(500, {"message": str(e)})
+        upload = create_product_import(mode, get_header(event, LEASE_HEADER))
+    except ValueError as e:
+        return create_response(400, {"message": str(e)})
+    return create_response(201, upload)
+
+def get_import(event, body):
+    import_id = (event.get("pathParameters") or {}).get("importId", "")
+    if not import_id.isalnum():
+        return create_response(400, {"message": "Invalid import id"})
+    return create_response(200, get_import_report(import_id))
+
+def lease_conflict(e):
+    return create_response(409, {"message": str(e), "lease": e.lease})
+
+# Catalog writes and imports require admin role
+router = Router({
+    "GET /products": Route(get_products, PUBLIC),
+    "PUT /products": Route(put_products, ADMIN, body=True),
+    "PATCH /products": Route(patch_products_route, ADMIN, body=True),
+    "POST /products/import": Route(start_import, ADMIN, body=True),
+    "GET /products/import/{importId}": Route(get_import, ADMIN),
+}, authorize, errors={LeaseConflict: lease_conflict, Exception: error_message(500)},
+    warmup=[get_all_products_with_etag])
+
+def lambda_handler(event, context):
+    return router.dispatch(event)
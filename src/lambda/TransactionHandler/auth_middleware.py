@@ -4,7 +4,10 @@ Validates JWT tokens and enforces role-based access control.
 """
 import os
 import jwt
+import time
+import hashlib
 import logging
+from collections import OrderedDict
 from functools import wraps
 from response_utils import create_response
 
@@ -13,6 +16,12 @@ logger.setLevel(logging.INFO)
 
 JWT_SECRET = os.environ.get("JWT_SECRET")
 
+# Verified claims for recently seen tokens; the same few tablets present the
+# same tokens all day, so repeats skip the decode and HMAC check
+TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "256"))
+
+_verified_tokens = OrderedDict()
+
 class AuthError(Exception):
     """Custom exception for authentication errors"""
     def __init__(self, message, status_code=401):
@@ -21,16 +30,26 @@ class AuthError(Exception):
         super().__init__(self.message)
 
 
+def normalize_headers(event):
+    """
+    Lower-cased copy of the event's headers, built once per event and kept
+    on it so later lookups are a single dict access.
+    """
+    headers = event.get("_normalized_headers")
+    if headers is None:
+        headers = {key.lower(): value for key, value in (event.get("headers") or {}).items()}
+        event["_normalized_headers"] = headers
+    return headers
+
+
+def get_header(event, name):
+    """Case-insensitive header lookup; name must be lower case."""
+    return normalize_headers(event).get(name)
+
+
 def extract_token(event):
     """Extract JWT token from Authorization header"""
-    headers = event.get("headers", {})
-    
-    # Handle case-insensitive headers
-    auth_header = None
-    for key, value in headers.items():
-        if key.lower() == "authorization":
-            auth_header = value
-            break
+    auth_header = get_header(event, "authorization")
     
     if not auth_header:
         raise AuthError("Missing Authorization header", 401)
@@ -41,20 +60,50 @@ def extract_token(event):
     return auth_header.replace("Bearer ", "")
 
 
+def clear_token_cache():
+    """Forget every cached verification."""
+    _verified_tokens.clear()
+
+
+def _token_digest(token):
+    # Keyed by secret as well, so a rotated secret never matches old entries
+    return hashlib.sha256(f"{JWT_SECRET}\0{token}".encode("utf-8")).digest()
+
+
 def verify_token(token):
-    """Verify JWT token and return decoded payload"""
+    """
+    Verify JWT token and return decoded payload. Verified claims are kept in
+    a bounded LRU keyed by token digest until the token's exp, so a repeat
+    token costs one hash instead of a full decode.
+    """
     if not JWT_SECRET:
         logger.error("JWT_SECRET not configured")
         raise AuthError("Server configuration error", 500)
     
+    digest = _token_digest(token)
+    cached = _verified_tokens.get(digest)
+    if cached is not None:
+        decoded, expires_at = cached
+        if expires_at is not None and expires_at <= time.time():
+            _verified_tokens.pop(digest, None)
+            raise AuthError("Token expired", 401)
+        _verified_tokens.move_to_end(digest)
+        return dict(decoded)
+    
     try:
         decoded = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-        return decoded
     except jwt.ExpiredSignatureError:
         raise AuthError("Token expired", 401)
     except jwt.InvalidTokenError as e:
         logger.warning(f"Invalid token: {e}")
         raise AuthError("Invalid token", 401)
+    
+    if TOKEN_CACHE_SIZE > 0:
+        expires_at = decoded.get("exp")
+        _verified_tokens[digest] = (dict(decoded), float(expires_at) if expires_at is not None else None)
+        while len(_verified_tokens) > TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return decoded
 
 
 def require_auth(role=None):
@@ -98,22 +147,48 @@ def require_auth(role=None):
     return decorator
 
 
+# Routes reachable without a token; the routed handlers declare the same
+# policy per route in their route tables
+PUBLIC_ENDPOINTS = frozenset([
+    "GET /transactions/{purchase_id}",  # Customer order lookup
+    "POST /admin/login",  # Login endpoint
+    "POST /admin/refresh",  # Access token renewal (refresh token in body)
+    "POST /admin/logout",  # Refresh session revocation (refresh token in body)
+    "POST /admin/forgot-password",  # Password reset
+    "POST /plantpass-access/verify",  # PlantPass passphrase verification
+    "GET /feature-toggles",  # Feature toggles (needed for UI)
+    "GET /config",  # Public config keys (admin keys too with an admin token)
+    "GET /products",  # Products list (needed for order entry)
+    "GET /discounts",  # Discounts list (needed for order entry)
+    "GET /payment-methods",  # Payment methods (needed for checkout)
+    "GET /bootstrap",  # Whole point-of-sale configuration in one request
+])
+
+
 def is_public_endpoint(route_key):
     """
     Check if an endpoint should be publicly accessible.
     """
-    public_endpoints = [
-        "GET /transactions/{purchase_id}",  # Customer order lookup
-        "POST /admin/login",  # Login endpoint
-        "POST /admin/forgot-password",  # Password reset
-        "POST /plantpass-access/verify",  # PlantPass passphrase verification
-        "GET /feature-toggles",  # Feature toggles (needed for UI)
-        "GET /products",  # Products list (needed for order entry)
-        "GET /discounts",  # Discounts list (needed for order entry)
-        "GET /payment-methods",  # Payment methods (needed for checkout)
-    ]
+    return route_key in PUBLIC_ENDPOINTS
+
+
+def authorize(event, policy):
+    """
+    Enforce a route's auth policy ('public', 'staff' or 'admin'). Returns an
+    error response, or None once event["auth"] holds the verified claims.
+    """
+    if policy == "public":
+        return None
+    
+    try:
+        decoded = verify_token(extract_token(event))
+    except AuthError as e:
+        return create_response(e.status_code, {"error": e.message})
     
-    return route_key in public_endpoints
+    event["auth"] = decoded
+    if policy == "admin" and decoded.get("role") != "admin":
+        return create_response(403, {"message": "Admin access required"})
+    return None
 
 
 def require_staff_auth(handler_func):
@@ -1,20 +1,43 @@
 import os
+import copy
 import json
+import time
+import heapq
 import logging
-import boto3
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from itertools import islice
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 from decimal_utils import decimal_to_float
-from dynamodb_client import get_table
-from transaction import Transaction
+from dynamodb_client import lazy_table, get_client, get_dynamodb_resource, get_dynamodb_client
+from transaction import Transaction, summarize_record, payment_shard_key, PAYMENT_SHARDS
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-table = get_table('TRANSACTIONS_TABLE', 'transactions')
-lambda_client = boto3.client('lambda')
+table = lazy_table('TRANSACTIONS_TABLE', 'transactions')
 EMAIL_LAMBDA_ARN = os.environ.get('EMAIL_LAMBDA_ARN')
 
+# BatchGetItem accepts at most 100 keys
+BATCH_GET_SIZE = 100
+
+# Sharded on payment_shard ("unpaid#0".."unpaid#7"), sorted by timestamp
+PAYMENT_SHARD_INDEX = 'payment-shard-timestamp-index'
+
+# Unpaid orders older than this are swept to "abandoned" by the scheduled sweep
+ABANDONED_ORDER_AGE_HOURS = float(os.environ.get('ABANDONED_ORDER_AGE_HOURS', '12'))
+
+# Per shard, per sweep; anything beyond this is picked up by the next run
+SWEEP_BATCH_SIZE = 100
+SWEEP_WORKERS = 8
+
+_deserializer = TypeDeserializer()
+
+def _deserialize(item):
+    """Convert a low-level DynamoDB item to plain Python values."""
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
 def create_transaction(transaction_data):
     max_retries = 5
     
@@ -49,8 +72,7 @@ def read_transaction(transaction_id):
         if 'Item' not in response:
             return None
             
-        transaction = decimal_to_float(response['Item'])
-        return transaction
+        return Transaction.expand_db_record(decimal_to_float(response['Item']))
         
     except ClientError as e:
         logger.error(f"DynamoDB error reading transaction {transaction_id}: {e}")
@@ -59,13 +81,23 @@ def read_transaction(transaction_id):
         logger.error(f"Error reading transaction {transaction_id}: {e}")
         raise Exception(f"Failed to read transaction: {e}")
 
-def update_transaction(transaction_id, updated_data):
+def update_transaction(transaction_id, updated_data, return_previous=False, existing_data=None):
+    """
+    Apply a partial update to a stored transaction. existing_data is the
+    stored record if the caller has already read it (read_transaction).
+    
+    When return_previous is True, returns (previous_record, updated_record) so
+    callers can derive analytics deltas without a second read.
+    """
     try:
-        existing_data = read_transaction(transaction_id)
+        if existing_data is None:
+            existing_data = read_transaction(transaction_id)
         if not existing_data:
             raise Exception(f"Transaction {transaction_id} not found")
         
-        transaction = Transaction.from_db_record(existing_data)
+        # Transaction updates payment and discounts in place; work on a copy
+        # so existing_data stays the pre-update record returned below
+        transaction = Transaction.from_db_record(copy.deepcopy(existing_data))
         
         # Track if payment status changed to paid
         was_paid = transaction.payment.get('paid', False)
@@ -99,7 +131,7 @@ def update_transaction(transaction_id, updated_data):
                     })
                 }
                 
-                lambda_client.invoke(
+                get_client('lambda').invoke(
                     FunctionName=EMAIL_LAMBDA_ARN,
                     InvocationType='Event',
                     Payload=json.dumps(email_payload)
@@ -109,6 +141,8 @@ def update_transaction(transaction_id, updated_data):
             except Exception as e:
                 logger.error(f"Failed to trigger receipt email: {e}")
         
+        if return_previous:
+            return existing_data, transaction_dict
         return transaction_dict
         
     except ClientError as e:
@@ -119,8 +153,15 @@ def update_transaction(transaction_id, updated_data):
         raise Exception(f"Failed to update transaction: {e}")
 
 def delete_transaction(transaction_id):
+    """Delete a transaction and return the removed record (None if it did not exist)."""
     try:
-        table.delete_item(Key={'purchase_id': transaction_id})
+        response = table.delete_item(
+            Key={'purchase_id': transaction_id},
+            ReturnValues='ALL_OLD'
+        )
+        
+        deleted = response.get('Attributes')
+        return Transaction.expand_db_record(decimal_to_float(deleted)) if deleted else None
         
     except ClientError as e:
         logger.error(f"DynamoDB error deleting transaction {transaction_id}: {e}")
@@ -129,26 +170,98 @@ def delete_transaction(transaction_id):
         logger.error(f"Error deleting transaction {transaction_id}: {e}")
         raise Exception(f"Failed to delete transaction: {e}")
 
-def get_recent_unpaid_transactions(limit=5):
+def batch_get_transactions(purchase_ids):
     """
-    Get recent unpaid transactions using GSI for optimal performance.
-    Falls back to scan if GSI is not available.
+    Hydrate full records for the given ids with BatchGetItem, retrying
+    unprocessed keys. Returns expanded records in the order of purchase_ids,
+    skipping ids that no longer exist.
+    """
+    try:
+        records = {}
+        dynamodb = get_dynamodb_resource()
+        
+        for start in range(0, len(purchase_ids), BATCH_GET_SIZE):
+            request_items = {
+                table.name: {'Keys': [{'purchase_id': pid} for pid in purchase_ids[start:start + BATCH_GET_SIZE]]}
+            }
+            while request_items:
+                response = dynamodb.batch_get_item(RequestItems=request_items)
+                for item in response.get('Responses', {}).get(table.name, []):
+                    records[item['purchase_id']] = item
+                request_items = response.get('UnprocessedKeys') or {}
+        
+        return [
+            Transaction.expand_db_record(decimal_to_float(records[pid]))
+            for pid in purchase_ids if pid in records
+        ]
+        
+    except ClientError as e:
+        logger.error(f"DynamoDB error reading transactions: {e}")
+        raise Exception(f"Failed to read transactions: {e}")
+
+def query_payment_shard(payment_status, shard, limit=None, before=None):
+    """
+    Newest-first index items for one payment status shard, optionally only
+    those with a timestamp before the given epoch second.
+    """
+    client = get_dynamodb_client()
+    query_kwargs = {
+        'TableName': table.name,
+        'IndexName': PAYMENT_SHARD_INDEX,
+        'KeyConditionExpression': 'payment_shard = :shard',
+        'ExpressionAttributeValues': {':shard': {'S': f'{payment_status}#{shard}'}},
+        'ScanIndexForward': False
+    }
+    if before is not None:
+        query_kwargs['KeyConditionExpression'] += ' AND #ts < :before'
+        query_kwargs['ExpressionAttributeNames'] = {'#ts': 'timestamp'}
+        query_kwargs['ExpressionAttributeValues'][':before'] = {'N': str(before)}
+    if limit:
+        query_kwargs['Limit'] = limit
+    
+    items = []
+    while True:
+        response = client.query(**query_kwargs)
+        items.extend(_deserialize(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response or (limit and len(items) >= limit):
+            return items[:limit] if limit else items
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def query_payment_status(payment_status, limit):
+    """
+    Scatter-gather the newest `limit` index items for a payment status:
+    query every shard in parallel for its newest `limit`, then k-way merge
+    the newest-first shard results by timestamp.
+    """
+    if limit < 1:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=PAYMENT_SHARDS) as executor:
+        shard_items = list(executor.map(
+            lambda shard: query_payment_shard(payment_status, shard, limit),
+            range(PAYMENT_SHARDS)
+        ))
+    
+    merged = heapq.merge(*shard_items, key=lambda item: item.get('timestamp', 0), reverse=True)
+    return list(islice(merged, limit))
+
+def get_recent_unpaid_transactions(limit=5, hydrate=False):
+    """
+    Get recent unpaid transactions from the sharded payment index (see
+    query_payment_status). Falls back to scan if GSI is not available.
+    
+    Returns list-view summaries (see summarize_record) straight from the
+    index projection; with hydrate=True, full records via BatchGetItem.
     """
     try:
         # Try to use GSI for better performance
         try:
-            response = table.query(
-                IndexName='payment-status-timestamp-index',
-                KeyConditionExpression='payment_status = :status',
-                ExpressionAttributeValues={
-                    ':status': 'unpaid'
-                },
-                ScanIndexForward=False,  # Sort descending (newest first)
-                Limit=limit
-            )
-            
-            transactions = response['Items']
-            result = decimal_to_float(transactions)
+            index_items = decimal_to_float(query_payment_status('unpaid', limit))
+            purchase_ids = [item['purchase_id'] for item in index_items]
+            if hydrate:
+                result = batch_get_transactions(purchase_ids)
+            else:
+                result = [summarize_record(item) for item in index_items]
             logger.info(f"Retrieved {len(result)} unpaid transactions using GSI")
             return result
             
@@ -169,7 +282,7 @@ def get_recent_unpaid_transactions(limit=5):
         
         unpaid_transactions = [
             t for t in transactions 
-            if not t.get('payment', {}).get('paid', False)
+            if not t.get('payment', {}).get('paid', False) and t.get('payment_status') != 'abandoned'
         ]
         
         unpaid_transactions.sort(
@@ -177,8 +290,11 @@ def get_recent_unpaid_transactions(limit=5):
             reverse=True
         )
         
-        limited_transactions = unpaid_transactions[:limit]
-        result = decimal_to_float(limited_transactions)
+        limited_transactions = decimal_to_float(unpaid_transactions[:limit])
+        if hydrate:
+            result = [Transaction.expand_db_record(t) for t in limited_transactions]
+        else:
+            result = [summarize_record(t) for t in limited_transactions]
         logger.info(f"Retrieved {len(result)} unpaid transactions using table scan")
         return result
         
@@ -187,4 +303,110 @@ def get_recent_unpaid_transactions(limit=5):
         raise Exception(f"Failed to get recent unpaid transactions: {e}")
     except Exception as e:
         logger.error(f"Error getting recent unpaid transactions: {e}")
-        raise Exception(f"Failed to get recent unpaid transactions: {e}")
\ No newline at end of file
+        raise Exception(f"Failed to get recent unpaid transactions: {e}")
+
+def mark_abandoned(purchase_id, cutoff):
+    """
+    Move one unpaid order onto the abandoned index keys. The condition skips
+    orders paid (or deleted) since the sweep queried them. Saving an
+    abandoned order again recomputes its status, so a cashier who reopens
+    one puts it back on the unpaid list.
+    
+    Returns True if the order was marked.
+    """
+    try:
+        get_dynamodb_client().update_item(
+            TableName=table.name,
+            Key={'purchase_id': {'S': purchase_id}},
+            UpdateExpression='SET payment_status = :abandoned, payment_shard = :shard',
+            ConditionExpression='payment_status = :unpaid AND #ts < :cutoff',
+            ExpressionAttributeNames={'#ts': 'timestamp'},
+            ExpressionAttributeValues={
+                ':abandoned': {'S': 'abandoned'},
+                ':shard': {'S': payment_shard_key(purchase_id, 'abandoned')},
+                ':unpaid': {'S': 'unpaid'},
+                ':cutoff': {'N': str(cutoff)}
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+def backfill_payment_shards():
+    """
+    Give records written before the sharded payment index their
+    payment_shard (and the projected total and line_count), so their
+    unpaid orders appear in the recent-unpaid panel and the abandoned sweep.
+    Records saved meanwhile are left alone. A full table scan, so it is run
+    once as a migration (python -m tools.backfill_payment_shards), not by
+    the sweep.
+    
+    Returns the number of records updated.
+    """
+    scan_kwargs = {'FilterExpression': 'attribute_not_exists(payment_shard)'}
+    updated = 0
+    
+    response = table.scan(**scan_kwargs)
+    while True:
+        for record in response.get('Items', []):
+            payment_status = record.get('payment_status') or (
+                'paid' if record.get('payment', {}).get('paid') else 'unpaid'
+            )
+            summary = summarize_record(record)
+            try:
+                table.update_item(
+                    Key={'purchase_id': record['purchase_id']},
+                    UpdateExpression='SET payment_shard = :shard, payment_status = :status, #total = :total, line_count = :count',
+                    ConditionExpression='attribute_not_exists(payment_shard)',
+                    ExpressionAttributeNames={'#total': 'total'},
+                    ExpressionAttributeValues={
+                        ':shard': payment_shard_key(record['purchase_id'], payment_status),
+                        ':status': payment_status,
+                        ':total': Decimal(str(summary['total'])),
+                        ':count': summary['line_count']
+                    }
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+        
+        if 'LastEvaluatedKey' not in response:
+            break
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+    
+    if updated:
+        logger.info(f"Backfilled payment_shard on {updated} records")
+    return updated
+
+def sweep_abandoned_orders(max_age_hours=None):
+    """
+    Mark unpaid orders older than max_age_hours (default
+    ABANDONED_ORDER_AGE_HOURS) as abandoned, so they drop out of the unpaid
+    index the cashier panel reads. Stale orders are found with a parallel
+    query per shard and marked with parallel conditional updates.
+    
+    Returns {"abandoned": [purchase_id, ...], "skipped": n, "cutoff": epoch}.
+    """
+    if max_age_hours is None:
+        max_age_hours = ABANDONED_ORDER_AGE_HOURS
+    cutoff = int(time.time() - max_age_hours * 3600)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=SWEEP_WORKERS) as executor:
+            shard_items = executor.map(
+                lambda shard: query_payment_shard('unpaid', shard, SWEEP_BATCH_SIZE, before=cutoff),
+                range(PAYMENT_SHARDS)
+            )
+            stale_ids = [item['purchase_id'] for items in shard_items for item in items]
+            marked = list(executor.map(lambda purchase_id: mark_abandoned(purchase_id, cutoff), stale_ids))
+        
+        abandoned = [purchase_id for purchase_id, was_marked in zip(stale_ids, marked) if was_marked]
+        logger.info(f"Marked {len(abandoned)} orders abandoned, skipped {len(stale_ids) - len(abandoned)} changed since query")
+        return {'abandoned': abandoned, 'skipped': len(stale_ids) - len(abandoned), 'cutoff': cutoff}
+        
+    except ClientError as e:
+        logger.error(f"DynamoDB error sweeping abandoned orders: {e}")
+        raise Exception(f"Failed to sweep abandoned orders: {e}")
@@ -6,178 +6,232 @@ from database_interface import (
     read_transaction,
     update_transaction,
     delete_transaction,
-    get_recent_unpaid_transactions
+    get_recent_unpaid_transactions,
+    sweep_abandoned_orders,
+    table as transactions_table
 )
 from sales_analytics import (
     compute_sales_analytics,
+    compute_analytics_delta,
     export_transaction_data,
     clear_all_transactions
 )
 from csv_export import generate_csv_export
-from websocket_notifier import notify_transaction_update
-from auth_middleware import require_auth, is_public_endpoint
+from pricing import price_order_lines, product_index
+from websocket_notifier import notify_transaction_update, get_api_gateway_client
+from auth_middleware import authorize
 
-# Import validation from Lambda Layer
+# Import validation and routing from Lambda Layer
 try:
     from shared_utils.validation import validate_transaction_data, validate_order_id
+    from shared_utils.router import Router, Route, PUBLIC, STAFF, ADMIN, error_message
+    from shared_utils.warmup import ping_table
+    from shared_utils.metrics import phase
 except ImportError:
     # Fallback for local development
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
     from shared_utils.validation import validate_transaction_data, validate_order_id
+    from shared_utils.router import Router, Route, PUBLIC, STAFF, ADMIN, error_message
+    from shared_utils.warmup import ping_table
+    from shared_utils.metrics import phase
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def lambda_handler(event, context):
+def handle_abandoned_sweep():
+    """
+    Scheduled EventBridge invocation: mark old unpaid orders abandoned and
+    tell connected clients what was swept.
+    """
     try:
-        route_key = event.get("routeKey", "")
-        
-        # Check if endpoint requires authentication
-        if not is_public_endpoint(route_key):
-            # Apply authentication check
-            from auth_middleware import extract_token, verify_token, AuthError
-            try:
-                token = extract_token(event)
-                decoded = verify_token(token)
-                event["auth"] = decoded
-                
-                # Check role-based permissions for admin-only operations
-                admin_only_routes = [
-                    "DELETE /transactions/clear-all",
-                    "GET /transactions/export-data",
-                ]
-                
-                if route_key in admin_only_routes:
-                    if decoded.get("role") != "admin":
-                        return create_response(403, {"message": "Admin access required"})
-                        
-            except AuthError as e:
-                return create_response(e.status_code, {"error": e.message})
+        result = sweep_abandoned_orders()
         
-        path_params = event.get("pathParameters") or {}
-        body = json.loads(event.get("body") or "{}")
-
-        if route_key == "POST /transactions":
-            # Validate transaction data
-            is_valid, validation_errors = validate_transaction_data(body)
-            if not is_valid:
-                logger.warning(f"Transaction validation failed: {validation_errors}")
-                return create_response(400, {
-                    "message": "Invalid transaction data",
-                    "errors": validation_errors
-                })
-            
-            transaction = create_transaction(body)
-            
+        if result["abandoned"]:
             try:
-                notify_transaction_update('created', transaction)
+                notify_transaction_update(
+                    'abandoned',
+                    {**result, 'count': len(result['abandoned'])},
+                    analytics_delta=compute_analytics_delta('abandoned')
+                )
             except Exception as notify_error:
                 logger.error(f"Failed to send WebSocket notification: {notify_error}")
-            
-            return create_response(201, {"message": "Transaction created successfully", "transaction": transaction})
-
-        elif route_key == "GET /transactions/{purchase_id}":
-            purchase_id = path_params.get("purchase_id")
-            if not purchase_id:
-                return create_response(400, {"message": "purchase_id required"})
-            
-            # Validate order ID format
-            if not validate_order_id(purchase_id):
-                return create_response(400, {"message": "Invalid order ID format. Expected format: ABC-DEF"})
-            
-            transaction = read_transaction(purchase_id)
-            if not transaction:
-                return create_response(404, {"message": "Transaction not found"})
-            
-            return create_response(200, transaction)
         
-        elif route_key == "GET /transactions/recent-unpaid":
-            query_params = event.get("queryStringParameters") or {}
-            limit = int(query_params.get("limit", 5))
-            
-            recent_transactions = get_recent_unpaid_transactions(limit)
-            return create_response(200, {"transactions": recent_transactions})
+        return {"statusCode": 200, "body": json.dumps({"abandoned": len(result["abandoned"]), "skipped": result["skipped"]})}
+    
+    except Exception as e:
+        logger.error(f"Error sweeping abandoned orders: {e}", exc_info=True)
+        return {"statusCode": 500, "body": str(e)}
 
-        elif route_key == "PUT /transactions/{purchase_id}":
-            purchase_id = path_params.get("purchase_id")
-            if not purchase_id:
-                return create_response(400, {"message": "purchase_id required"})
-            
-            # Validate order ID format
-            if not validate_order_id(purchase_id):
-                return create_response(400, {"message": "Invalid order ID format. Expected format: ABC-DEF"})
-            
-            # Validate update data (partial validation - only validate provided fields)
-            if 'items' in body or 'discounts' in body or 'voucher' in body:
-                is_valid, validation_errors = validate_transaction_data(body)
-                if not is_valid:
-                    logger.warning(f"Transaction update validation failed: {validation_errors}")
-                    return create_response(400, {
-                        "message": "Invalid transaction data",
-                        "errors": validation_errors
-                    })
-            
-            updated_transaction = update_transaction(purchase_id, body)
-            
-            try:
-                notify_transaction_update('updated', updated_transaction)
-            except Exception as notify_error:
-                logger.error(f"Failed to send WebSocket notification: {notify_error}")
-            
-            return create_response(200, {"transaction": updated_transaction})
+def post_transaction(event, body):
+    # Validate transaction data; lines are priced from the catalog below
+    with phase('validation'):
+        is_valid, validation_errors = validate_transaction_data(body, server_priced=True)
+        if is_valid:
+            body["items"], validation_errors = price_order_lines(body["items"])
+            is_valid = not validation_errors
+    if not is_valid:
+        logger.warning(f"Transaction validation failed: {validation_errors}")
+        return create_response(400, {
+            "message": "Invalid transaction data",
+            "errors": validation_errors
+        })
+    
+    transaction = create_transaction(body)
+    
+    try:
+        delta = compute_analytics_delta('created', after=transaction)
+        notify_transaction_update('created', transaction, analytics_delta=delta)
+    except Exception as notify_error:
+        logger.error(f"Failed to send WebSocket notification: {notify_error}")
+    
+    return create_response(201, {"message": "Transaction created successfully", "transaction": transaction})
 
-        elif route_key == "DELETE /transactions/{purchase_id}":
-            purchase_id = path_params.get("purchase_id")
-            if not purchase_id:
-                return create_response(400, {"message": "purchase_id required"})
-            
-            delete_transaction(purchase_id)
-            
-            try:
-                notify_transaction_update('deleted', {'purchase_id': purchase_id})
-            except Exception as notify_error:
-                logger.error(f"Failed to send WebSocket notification: {notify_error}")
-            
-            return create_response(204, {})
-        
-        elif route_key == "GET /transactions/sales-analytics":
-            analytics = compute_sales_analytics()
-            return create_response(200, analytics)
+def get_transaction(event, body):
+    purchase_id = (event.get("pathParameters") or {}).get("purchase_id")
+    if not purchase_id:
+        return create_response(400, {"message": "purchase_id required"})
+    
+    # Validate order ID format
+    if not validate_order_id(purchase_id):
+        return create_response(400, {"message": "Invalid order ID format. Expected format: ABC-DEF"})
+    
+    transaction = read_transaction(purchase_id)
+    if not transaction:
+        return create_response(404, {"message": "Transaction not found"})
+    
+    return create_response(200, transaction)
 
-        elif route_key == "GET /transactions/export-data":
-            transactions = export_transaction_data()
-            csv_export = generate_csv_export(transactions)
-            
-            return {
-                "statusCode": 200,
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
-                    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                    "Content-Type": "application/json"
-                },
-                "body": json.dumps({
-                    "filename": csv_export['filename'],
-                    "content": csv_export['content'],
-                    "content_type": csv_export['content_type']
-                })
-            }
+def get_recent_unpaid(event, body):
+    query_params = event.get("queryStringParameters") or {}
+    limit = int(query_params.get("limit", 5))
+    hydrate = str(query_params.get("hydrate", "")).lower() == "true"
+    
+    recent_transactions = get_recent_unpaid_transactions(limit, hydrate=hydrate)
+    return create_response(200, {"transactions": recent_transactions})
 
-        elif route_key == "DELETE /transactions/clear-all":
-            cleared_count = clear_all_transactions()
-            
-            try:
-                notify_transaction_update('cleared', {'cleared_count': cleared_count})
-            except Exception as notify_error:
-                logger.error(f"Failed to send WebSocket notification: {notify_error}")
-            
-            return create_response(200, {"message": f"Successfully cleared {cleared_count} transactions", "cleared_count": cleared_count})
+def put_transaction(event, body):
+    purchase_id = (event.get("pathParameters") or {}).get("purchase_id")
+    if not purchase_id:
+        return create_response(400, {"message": "purchase_id required"})
+    
+    # Validate order ID format
+    if not validate_order_id(purchase_id):
+        return create_response(400, {"message": "Invalid order ID format. Expected format: ABC-DEF"})
+    
+    # The stored order, read once whether pricing or the update needs it first
+    stored = []
+    def stored_transaction():
+        if not stored:
+            stored.append(read_transaction(purchase_id))
+        return stored[0]
+    
+    # Validate update data (partial validation - only validate provided fields)
+    if 'items' in body or 'discounts' in body or 'voucher' in body:
+        with phase('validation'):
+            is_valid, validation_errors = validate_transaction_data(body, server_priced=True)
+            if is_valid and 'items' in body:
+                # Lines for products removed since the order was placed keep their stored price
+                body["items"], validation_errors = price_order_lines(
+                    body["items"], stored_items=lambda: (stored_transaction() or {}).get("items", [])
+                )
+                is_valid = not validation_errors
+        if not is_valid:
+            logger.warning(f"Transaction update validation failed: {validation_errors}")
+            return create_response(400, {
+                "message": "Invalid transaction data",
+                "errors": validation_errors
+            })
+    
+    previous_transaction, updated_transaction = update_transaction(
+        purchase_id, body, return_previous=True, existing_data=stored_transaction()
+    )
+    
+    try:
+        delta = compute_analytics_delta(
+            'updated', before=previous_transaction, after=updated_transaction
+        )
+        notify_transaction_update('updated', updated_transaction, analytics_delta=delta)
+    except Exception as notify_error:
+        logger.error(f"Failed to send WebSocket notification: {notify_error}")
+    
+    return create_response(200, {"transaction": updated_transaction})
 
-        else:
-            return create_response(404, {"message": "Route not found"})
+def delete_transaction_route(event, body):
+    purchase_id = (event.get("pathParameters") or {}).get("purchase_id")
+    if not purchase_id:
+        return create_response(400, {"message": "purchase_id required"})
+    
+    deleted_transaction = delete_transaction(purchase_id)
+    
+    try:
+        delta = compute_analytics_delta('deleted', before=deleted_transaction)
+        notify_transaction_update('deleted', {'purchase_id': purchase_id}, analytics_delta=delta)
+    except Exception as notify_error:
+        logger.error(f"Failed to send WebSocket notification: {notify_error}")
+    
+    return create_response(204, {})
 
-    except Exception as e:
-        logger.error(f"Error processing request: {e}", exc_info=True)
-        return create_response(500, {"message": str(e)})
+def get_sales_analytics(event, body):
+    analytics = compute_sales_analytics()
+    return create_response(200, analytics)
+
+def export_data(event, body):
+    transactions = export_transaction_data()
+    csv_export = generate_csv_export(transactions)
+    
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+            "Access-Control-Allow-Headers": "Content-Type,Authorization",
+            "Content-Type": "application/json"
+        },
+        "body": json.dumps({
+            "filename": csv_export['filename'],
+            "content": csv_export['content'],
+            "content_type": csv_export['content_type']
+        })
+    }
+
+def clear_all(event, body):
+    cleared_count = clear_all_transactions()
+    
+    try:
+        notify_transaction_update(
+            'cleared',
+            {'cleared_count': cleared_count},
+            analytics_delta=compute_analytics_delta('cleared')
+        )
+    except Exception as notify_error:
+        logger.error(f"Failed to send WebSocket notification: {notify_error}")
+    
+    return create_response(200, {"message": f"Successfully cleared {cleared_count} transactions", "cleared_count": cleared_count})
+
+def warm_transactions_table():
+    ping_table(transactions_table, {"purchase_id": "warmup"})
+
+def warm_product_index():
+    product_index.get()
+
+# Customers look up their own order by id; clearing and exporting every
+# transaction is admin-only; everything else needs a staff token
+router = Router({
+    "POST /transactions": Route(post_transaction, STAFF, body=True),
+    "GET /transactions/{purchase_id}": Route(get_transaction, PUBLIC),
+    "GET /transactions/recent-unpaid": Route(get_recent_unpaid, STAFF),
+    "PUT /transactions/{purchase_id}": Route(put_transaction, STAFF, body=True),
+    "DELETE /transactions/{purchase_id}": Route(delete_transaction_route, STAFF),
+    "GET /transactions/sales-analytics": Route(get_sales_analytics, STAFF),
+    "GET /transactions/export-data": Route(export_data, ADMIN),
+    "DELETE /transactions/clear-all": Route(clear_all, ADMIN),
+}, authorize, errors={Exception: error_message(500)},
+    warmup=[warm_transactions_table, warm_product_index, get_api_gateway_client])
+
+def lambda_handler(event, context):
+    if event.get("source") == "aws.events":
+        return handle_abandoned_sweep()
+    
+    return router.dispatch(event)
@@ -0,0 +1,66 @@
+import logging
+import os
+from decimal_utils import decimal_to_float
+from dynamodb_client import lazy_table
+
+# Import catalog helpers from Lambda Layer
+try:
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog
+    from shared_utils.validation import validate_quantity
+except ImportError:
+    # Fallback for local development
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../layers/python'))
+    from shared_utils.catalog_cache import CatalogCache
+    from shared_utils.catalog_store import scan_all_items, read_catalog
+    from shared_utils.validation import validate_quantity
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+products_table = lazy_table('PRODUCTS_TABLE', 'products')
+
+def load_products():
+    return decimal_to_float(read_catalog('products', lambda: scan_all_items(products_table)))
+
+def index_products(products):
+    return {product['SKU']: product for product in products}
+
+# SKU -> product, revalidated against the products version stamp like the
+# ProductsHandler's own cache, so a price change reaches new orders within the TTL
+product_index = CatalogCache('products', load_products, build=index_products)
+
+def price_order_lines(lines, stored_items=None):
+    """
+    Resolve client order lines ({SKU, quantity}) against the product index.
+    Names and unit prices always come from the catalog; any item or price_ea
+    the client sends is ignored. When editing an order, stored_items (a
+    callable returning the order's stored items, only called if needed)
+    supplies name and price for SKUs since removed from the catalog.
+    
+    Returns (items, errors); errors name every SKU found in neither.
+    """
+    products = product_index.get()[1]
+    stored = None
+    items = []
+    errors = []
+    
+    for idx, line in enumerate(lines):
+        product = products.get(line.get('SKU'))
+        if product is None and stored_items is not None:
+            if stored is None:
+                stored = index_products(item for item in stored_items() if 'SKU' in item)
+            product = stored.get(line.get('SKU'))
+        if product is None:
+            errors.append(f"Item {idx + 1}: Unknown SKU {line.get('SKU')}")
+            continue
+        
+        items.append({
+            "SKU": product['SKU'],
+            "item": product['item'],
+            "quantity": validate_quantity(line.get('quantity', 0)),
+            "price_ea": product['price_ea']
+        })
+    
+    return items, errors
@@ -3,7 +3,7 @@ import logging
 from datetime import datetime, timezone, timedelta
 from botocore.exceptions import ClientError
 from decimal_utils import decimal_to_float
-from dynamodb_client import get_table
+from dynamodb_client import lazy_table
 from transaction import Transaction
 
 CST = timezone(timedelta(hours=-6))
@@ -11,7 +11,21 @@ CST = timezone(timedelta(hours=-6))
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-table = get_table('TRANSACTIONS_TABLE', 'transactions')
+table = lazy_table('TRANSACTIONS_TABLE', 'transactions')
+
+
+def time_bucket_key(timestamp):
+    """Return the 30-minute CST bucket label a timestamp falls into."""
+    dt = datetime.fromtimestamp(timestamp, tz=CST)
+    minute = 0 if dt.minute < 30 else 30
+    bucket_time = dt.replace(minute=minute, second=0, microsecond=0)
+    return bucket_time.strftime("%m-%d-%Y %I:%M %p")
+
+
+def is_paid_summary(summary):
+    """Check the paid flag of a transaction summary, tolerating string values."""
+    is_paid = summary.get("paid", False)
+    return is_paid is True or is_paid == "true" or str(is_paid).lower() == "true"
 
 
 def compute_sales_analytics():
@@ -57,18 +71,14 @@ def compute_sales_analytics():
             
             transaction_summaries.append(summary)
             
-            is_paid = summary.get("paid", False)
-            if is_paid is True or is_paid == "true" or str(is_paid).lower() == "true":
+            if is_paid_summary(summary):
                 paid_transactions.append(transaction)
                 total_sales += summary["grand_total"]
                 total_units_sold += summary["total_quantity"]
                 
                 timestamp = transaction.timestamp
                 if timestamp:
-                    dt = datetime.fromtimestamp(timestamp, tz=CST)
-                    minute = 0 if dt.minute < 30 else 30
-                    bucket_time = dt.replace(minute=minute, second=0, microsecond=0)
-                    bucket_key = bucket_time.strftime("%m-%d-%Y %I:%M %p")
+                    bucket_key = time_bucket_key(timestamp)
                     
                     if bucket_key not in sales_by_time_bucket:
                         sales_by_time_bucket[bucket_key] = 0.0
@@ -89,9 +99,7 @@ def compute_sales_analytics():
                 end_time = datetime.fromtimestamp(max_time, tz=CST)
                 
                 while current_time <= end_time:
-                    minute = 0 if current_time.minute < 30 else 30
-                    bucket_time = current_time.replace(minute=minute, second=0, microsecond=0)
-                    bucket_key = bucket_time.strftime("%m-%d-%Y %I:%M %p")
+                    bucket_key = time_bucket_key(current_time.timestamp())
                     
                     if bucket_key not in sales_by_time_bucket:
                         sales_by_time_bucket[bucket_key] = 0.0
@@ -119,6 +127,92 @@ def compute_sales_analytics():
         raise Exception(f"Failed to compute analytics: {e}")
 
 
+def _paid_contribution(transaction_data):
+    """
+    Return the summary of a transaction and its contribution to the paid-only
+    analytics totals (zero contribution when the transaction is unpaid).
+    """
+    transaction = Transaction.from_db_record(decimal_to_float(transaction_data))
+    summary = transaction.get_summary()
+    
+    contribution = {
+        "total_sales": 0.0,
+        "total_orders": 0,
+        "total_units_sold": 0,
+        "bucket": None
+    }
+    
+    if is_paid_summary(summary):
+        contribution["total_sales"] = summary["grand_total"]
+        contribution["total_orders"] = 1
+        contribution["total_units_sold"] = summary["total_quantity"]
+        if transaction.timestamp:
+            contribution["bucket"] = time_bucket_key(transaction.timestamp)
+    
+    return summary, contribution
+
+
+def compute_analytics_delta(event_type, before=None, after=None):
+    """
+    Compute the incremental change to the sales analytics caused by a single
+    transaction event, using the same summary and bucketing rules as
+    compute_sales_analytics so a client applying deltas to a snapshot stays
+    in agreement with a full recompute.
+    
+    Args:
+        event_type: 'created', 'updated', 'deleted' or 'cleared'
+        before: Transaction record prior to the change (None when created)
+        after: Transaction record after the change (None when deleted)
+    
+    Returns:
+        dict with signed increments for total_sales, total_orders and
+        total_units_sold, per-bucket sales_over_time increments, the upserted
+        transaction summary and/or the removed purchase_id. A 'cleared' event
+        returns a delta with reset set so clients zero their state.
+    """
+    delta = {
+        "event": event_type,
+        "reset": event_type == "cleared",
+        "total_sales": 0.0,
+        "total_orders": 0,
+        "total_units_sold": 0,
+        "sales_over_time": {},
+        "transaction": None,
+        "removed_purchase_id": None
+    }
+    
+    if delta["reset"]:
+        return delta
+    
+    for record, sign in ((before, -1), (after, 1)):
+        if not record:
+            continue
+        
+        summary, contribution = _paid_contribution(record)
+        delta["total_sales"] += sign * contribution["total_sales"]
+        delta["total_orders"] += sign * contribution["total_orders"]
+        delta["total_units_sold"] += sign * contribution["total_units_sold"]
+        
+        bucket_key = contribution["bucket"]
+        if bucket_key:
+            buckets = delta["sales_over_time"]
+            buckets[bucket_key] = buckets.get(bucket_key, 0.0) + sign * contribution["total_sales"]
+        
+        if sign > 0:
+            delta["transaction"] = summary
+        elif not after:
+            delta["removed_purchase_id"] = summary["purchase_id"]
+    
+    # Drop buckets whose increments cancel out (e.g. an edit that did not touch the total)
+    delta["sales_over_time"] = {
+        key: round(value, 2) for key, value in delta["sales_over_time"].items()
+        if round(value, 2) != 0
+    }
+    delta["total_sales"] = round(delta["total_sales"], 2)
+    
+    return delta
+
+
 def export_transaction_data():
     """
     Export all transaction data in a format suitable for export (e.g., CSV, JSON).
@@ -132,7 +226,7 @@ def export_transaction_data():
             response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
             transactions.extend(response['Items'])
         
-        transactions = decimal_to_float(transactions)
+        transactions = [Transaction.expand_db_record(t) for t in decimal_to_float(transactions)]
         
         logger.info(f"Exported {len(transactions)} transactions")
         return transactions
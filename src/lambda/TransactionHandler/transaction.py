@@ -1,5 +1,6 @@
 import json
 import logging
+import zlib
 from datetime import datetime, timezone
 from decimal import Decimal
 from utils import generate_random_id
@@ -7,6 +8,66 @@ from utils import generate_random_id
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Orders with more purchased lines than this store them zlib-compressed
+COMPRESS_LINES_OVER = 32
+
+# Write shards per payment status in the unpaid-orders index; spreads a rush
+# of new orders over several index partitions instead of one hot key
+PAYMENT_SHARDS = 8
+
+
+def payment_shard_key(purchase_id, payment_status):
+    """Index hash key for a record, e.g. "unpaid#3". Stable for a given order."""
+    return f"{payment_status}#{zlib.crc32(purchase_id.encode('utf-8')) % PAYMENT_SHARDS}"
+
+
+def compact_lines(items):
+    """Purchased lines only, as [SKU, item, quantity, unit price in cents]."""
+    return [
+        [item["SKU"], item["item"], int(item["quantity"]), int(round(item["price_ea"] * 100))]
+        for item in items
+        if item.get("quantity", 0) > 0
+    ]
+
+
+def expand_lines(record):
+    """
+    Item dicts from a stored record: compressed lines (lines_z), compact lines,
+    or the full items list written before records were compacted.
+    """
+    if "lines_z" in record:
+        packed = record["lines_z"]
+        lines = json.loads(zlib.decompress(bytes(getattr(packed, "value", packed))))
+    elif "lines" in record:
+        lines = record["lines"]
+    else:
+        return record.get("items", [])
+    
+    return [
+        {"SKU": sku, "item": name, "quantity": int(quantity), "price_ea": int(cents) / 100}
+        for sku, name, quantity, cents in lines
+    ]
+
+
+def summarize_record(record):
+    """
+    List-view summary of a stored record. Index items carry the projected
+    total and line_count; older records are summarized from their lines.
+    """
+    if "total" in record and "line_count" in record:
+        total, line_count = record["total"], record["line_count"]
+    else:
+        total = record.get("receipt", {}).get("total", 0)
+        line_count = sum(1 for item in expand_lines(record) if item.get("quantity", 0) > 0)
+    
+    return {
+        "purchase_id": record["purchase_id"],
+        "timestamp": record.get("timestamp"),
+        "paid": record.get("payment_status") == "paid",
+        "total": total,
+        "line_count": int(line_count)
+    }
+
 
 class Transaction:
     
@@ -41,7 +102,7 @@ class Transaction:
     def _initialize_from_db(self):
         self.purchase_id = self.data.get("purchase_id")
         self.timestamp = self.data.get("timestamp")
-        self.items = self.data.get("items", [])
+        self.items = expand_lines(self.data)
         self.discounts = self.data.get("discounts", [])
         self.club_voucher = self.data.get("club_voucher", 0)
         self.customer_email = self.data.get("customer_email", "")
@@ -96,6 +157,8 @@ class Transaction:
         return discount_amount + self.club_voucher
     
     def update_items(self, new_items):
+        # Lines already on the order keep the price they were sold at; new
+        # lines arrive priced from the catalog
         preserved_items = []
         for updated_item in new_items:
             sku = updated_item["SKU"]
@@ -185,8 +248,24 @@ class Transaction:
         }
     
     def to_db_record(self):
+        """
+        Stored form: only purchased lines, compacted (see compact_lines) and
+        compressed into a binary attribute for large orders. from_db_record
+        expands either form back to item dicts.
+        """
         transaction_dict = self.to_dict()
-        return json.loads(json.dumps(transaction_dict), parse_float=Decimal)
+        lines = compact_lines(transaction_dict.pop("items"))
+        
+        db_record = json.loads(json.dumps(transaction_dict), parse_float=Decimal)
+        # Projected into the list-view indexes, so lists need no full reads
+        db_record["total"] = db_record["receipt"]["total"]
+        db_record["line_count"] = len(lines)
+        db_record["payment_shard"] = payment_shard_key(self.purchase_id, self.payment_status)
+        if len(lines) > COMPRESS_LINES_OVER:
+            db_record["lines_z"] = zlib.compress(json.dumps(lines, separators=(",", ":")).encode("utf-8"))
+        else:
+            db_record["lines"] = lines
+        return db_record
     
     @classmethod
     def from_json(cls, json_data):
@@ -196,6 +275,11 @@ class Transaction:
     def from_db_record(cls, db_record):
         return cls(db_record, source="db")
     
+    @classmethod
+    def expand_db_record(cls, db_record):
+        """Stored record -> API dict with full item lines."""
+        return cls.from_db_record(db_record).to_dict()
+    
     def get_summary(self):
         return {
             "purchase_id": self.purchase_id,
@@ -1,43 +1,35 @@
 import json
 import logging
 import os
-import boto3
+import time
+from boto3.dynamodb.conditions import Attr
 from botocore.exceptions import ClientError
+from dynamodb_client import get_client, get_dynamodb_resource
 
 logger = logging.getLogger()
 
-# Initialize clients
-dynamodb = boto3.resource('dynamodb')
-apigateway_management = None  # Will be initialized when needed
-
 def get_api_gateway_client():
     """
     Lazy initialization of API Gateway Management API client.
     """
-    global apigateway_management
-    
-    if apigateway_management is None:
-        # Get WebSocket endpoint from environment
-        websocket_endpoint = os.environ.get('WEBSOCKET_ENDPOINT')
-        if not websocket_endpoint:
-            logger.warning("WEBSOCKET_ENDPOINT not configured, notifications disabled")
-            return None
-        
-        apigateway_management = boto3.client(
-            'apigatewaymanagementapi',
-            endpoint_url=websocket_endpoint
-        )
+    # Get WebSocket endpoint from environment
+    websocket_endpoint = os.environ.get('WEBSOCKET_ENDPOINT')
+    if not websocket_endpoint:
+        logger.warning("WEBSOCKET_ENDPOINT not configured, notifications disabled")
+        return None
     
-    return apigateway_management
+    return get_client('apigatewaymanagementapi', endpoint_url=websocket_endpoint)
 
 
-def notify_transaction_update(event_type, transaction_data):
+def notify_transaction_update(event_type, transaction_data, analytics_delta=None):
     """
     Broadcast transaction update to all connected WebSocket clients.
     
     Args:
-        event_type: Type of event ('created', 'updated', 'deleted', 'cleared')
+        event_type: Type of event ('created', 'updated', 'deleted', 'cleared', 'abandoned')
         transaction_data: Transaction data to send
+        analytics_delta: Optional incremental sales analytics change, carried in
+            the same message so live dashboards can update without refetching
     """
     try:
         client = get_api_gateway_client()
@@ -50,12 +42,21 @@ def notify_transaction_update(event_type, transaction_data):
             logger.warning("CONNECTIONS_TABLE not configured")
             return
         
-        connections_table = dynamodb.Table(connections_table_name)
+        connections_table = get_dynamodb_resource().Table(connections_table_name)
         
-        # Get all active connections
-        response = connections_table.scan()
+        # Get all active connections, skipping rows whose heartbeat TTL has
+        # lapsed but which DynamoDB has not yet expired
+        scan_kwargs = {
+            'ProjectionExpression': 'connectionId',
+            'FilterExpression': Attr('ttl').gt(int(time.time()))
+        }
+        response = connections_table.scan(**scan_kwargs)
         connections = response.get('Items', [])
         
+        while 'LastEvaluatedKey' in response:
+            response = connections_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+            connections.extend(response.get('Items', []))
+        
         if not connections:
             logger.info("No active WebSocket connections")
             return
@@ -68,6 +69,9 @@ def notify_transaction_update(event_type, transaction_data):
             'timestamp': transaction_data.get('timestamp') if isinstance(transaction_data, dict) else None
         }
         
+        if analytics_delta is not None:
+            message['analytics_delta'] = analytics_delta
+        
         message_data = json.dumps(message).encode('utf-8')
         
         # Send to all connections
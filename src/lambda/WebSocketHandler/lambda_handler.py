@@ -1,27 +1,42 @@
 import json
 import logging
 import os
-import boto3
 from datetime import datetime, timedelta
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from dynamodb_client import get_dynamodb_resource
+from warmup import is_warmup, handle_warmup, ping_table
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# A connection that has not pinged within this window is considered stale.
+# Clients ping well inside it (see useWebSocket heartbeatInterval).
+CONNECTION_TIMEOUT_SECONDS = int(os.environ.get('CONNECTION_TIMEOUT_SECONDS', 300))
 
 def get_connections_table():
     """Get the connections table, with error handling."""
     table_name = os.environ.get('CONNECTIONS_TABLE')
     if not table_name:
         raise ValueError("CONNECTIONS_TABLE environment variable not set")
-    return dynamodb.Table(table_name)
+    return get_dynamodb_resource().Table(table_name)
+
+def warm_connections_table():
+    ping_table(get_connections_table(), {'connectionId': 'warmup'})
 
 def lambda_handler(event, context):
     """
     Handle WebSocket connections, disconnections, and default messages.
+    Scheduled EventBridge invocations sweep stale connections.
     """
     logger.info(f"Received event: {json.dumps(event)}")
     
+    if event.get('source') == 'aws.events':
+        return handle_sweep()
+    
+    if is_warmup(event):
+        return handle_warmup(event, [warm_connections_table])
+    
     route_key = event.get('requestContext', {}).get('routeKey')
     connection_id = event.get('requestContext', {}).get('connectionId')
     
@@ -48,13 +63,16 @@ def handle_connect(connection_id):
     try:
         connections_table = get_connections_table()
         
-        # TTL set to 2 hours from now (in case disconnect doesn't fire)
-        ttl = int((datetime.now() + timedelta(hours=2)).timestamp())
+        now = int(datetime.now().timestamp())
+        
+        # TTL is a backstop in case disconnect doesn't fire; heartbeats push it forward
+        ttl = int((datetime.now() + timedelta(seconds=CONNECTION_TIMEOUT_SECONDS)).timestamp())
         
         connections_table.put_item(
             Item={
                 'connectionId': connection_id,
-                'connectedAt': int(datetime.now().timestamp()),
+                'connectedAt': now,
+                'lastSeen': now,
                 'ttl': ttl
             }
         )
@@ -88,7 +106,83 @@ def handle_disconnect(connection_id):
 
 def handle_default(connection_id, event):
     """
-    Handle any other messages (ping/pong, etc).
+    Handle any other messages. A {"action": "ping"} heartbeat refreshes the
+    connection's lastSeen/ttl and is answered with a pong.
+    """
+    try:
+        message = json.loads(event.get('body') or '{}')
+    except (ValueError, TypeError):
+        message = {}
+    
+    if not isinstance(message, dict) or message.get('action') != 'ping':
+        logger.info(f"Default route called for connection: {connection_id}")
+        return {'statusCode': 200, 'body': 'Message received'}
+    
+    return handle_ping(connection_id)
+
+
+def handle_ping(connection_id):
+    """
+    Refresh a live connection's heartbeat with a single conditional UpdateItem.
+    The condition keeps a ping racing a disconnect from resurrecting the row.
     """
-    logger.info(f"Default route called for connection: {connection_id}")
-    return {'statusCode': 200, 'body': 'Message received'}
+    try:
+        connections_table = get_connections_table()
+        
+        now = int(datetime.now().timestamp())
+        
+        connections_table.update_item(
+            Key={'connectionId': connection_id},
+            UpdateExpression='SET lastSeen = :now, #ttl = :ttl',
+            ConditionExpression='attribute_exists(connectionId)',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ExpressionAttributeValues={
+                ':now': now,
+                ':ttl': now + CONNECTION_TIMEOUT_SECONDS
+            }
+        )
+        
+        return {'statusCode': 200, 'body': json.dumps({'type': 'pong', 'timestamp': now})}
+    
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.info(f"Ping from unknown connection: {connection_id}")
+            return {'statusCode': 410, 'body': 'Connection not registered'}
+        logger.error(f"Error refreshing connection {connection_id}: {e}", exc_info=True)
+        return {'statusCode': 500, 'body': str(e)}
+
+
+def handle_sweep():
+    """
+    Batch-remove connections that have not been seen within the heartbeat
+    window. DynamoDB TTL deletion can lag by hours, so this keeps the
+    notifier's fan-out set accurate.
+    """
+    try:
+        connections_table = get_connections_table()
+        
+        cutoff = int(datetime.now().timestamp()) - CONNECTION_TIMEOUT_SECONDS
+        
+        scan_kwargs = {
+            'ProjectionExpression': 'connectionId',
+            'FilterExpression': Attr('lastSeen').lt(cutoff) | Attr('lastSeen').not_exists()
+        }
+        
+        stale_ids = []
+        response = connections_table.scan(**scan_kwargs)
+        stale_ids.extend(item['connectionId'] for item in response.get('Items', []))
+        
+        while 'LastEvaluatedKey' in response:
+            response = connections_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+            stale_ids.extend(item['connectionId'] for item in response.get('Items', []))
+        
+        with connections_table.batch_writer() as batch:
+            for connection_id in stale_ids:
+                batch.delete_item(Key={'connectionId': connection_id})
+        
+        logger.info(f"Swept {len(stale_ids)} stale connections")
+        return {'statusCode': 200, 'body': json.dumps({'removed': len(stale_ids)})}
+    
+    except Exception as e:
+        logger.error(f"Error sweeping connections: {e}", exc_info=True)
+        return {'statusCode': 500, 'body': str(e)}
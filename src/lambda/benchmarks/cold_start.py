@@ -0,0 +1,330 @@
+"""
+Cold-start benchmark for every Lambda handler.
+
+Each handler is imported in a fresh interpreter (python -X importtime), as a
+new Lambda container would, then answers one representative request against
+moto. Records per handler: import time, wall time from import to the first
+response, the import-time breakdown by top-level package, and peak resident
+memory after import. moto is only imported once the handler is, so it is
+not counted in the import figures (it does slow the first request a little,
+equally for every run). Run from src/lambda:
+
+    python -m benchmarks.cold_start [--runs N] [--output results.json]
+    python -m benchmarks.cold_start --compare baseline.json [--threshold 0.2]
+
+With --compare, handlers whose median import time, first response or memory
+grew by more than the threshold (and by more than a small absolute margin,
+so noise on fast handlers is not flagged) are reported and the exit status
+is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from decimal import Decimal
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAYER_DIR = os.path.join(LAMBDA_DIR, 'layers', 'python')
+
+SECRET = 'benchmark-secret-key-long-enough-for-hs256'
+SENDER = 'plantpass@example.com'
+HORT_CLUB = 'hortclub@example.com'
+
+IMPORT_BEGIN = 'cold-start: import begin'
+IMPORT_END = 'cold-start: import end'
+
+# Absolute margins below which a slowdown is treated as noise
+MIN_REGRESSION = {'import_ms': 5.0, 'first_response_ms': 10.0, 'max_rss_kb': 2048}
+
+# Handler directory -> the first request its container typically serves.
+# 'auth' is the role of the bearer token sent with it, if any.
+HANDLERS = {
+    'TransactionHandler': {
+        'auth': 'staff',
+        'event': {'routeKey': 'GET /transactions/recent-unpaid', 'queryStringParameters': {'limit': '20'}},
+    },
+    'ProductsHandler': {'event': {'routeKey': 'GET /products'}},
+    'DiscountsHandler': {'event': {'routeKey': 'GET /discounts'}},
+    'PaymentMethodsHandler': {'event': {'routeKey': 'GET /payment-methods'}},
+    'LockHandler': {
+        'auth': 'admin',
+        'event': {'routeKey': 'GET /lock/{resourceType}', 'pathParameters': {'resourceType': 'products'}},
+    },
+    'FeatureTogglesHandler': {'event': {'routeKey': 'GET /feature-toggles'}},
+    'BootstrapHandler': {'event': {'routeKey': 'GET /bootstrap'}},
+    'PlantPassAccessHandler': {
+        'event': {
+            'routeKey': 'POST /plantpass-access/verify',
+            'requestContext': {'http': {'sourceIp': '198.51.100.7'}},
+            'body': json.dumps({'passphrase': 'not-the-passphrase'}),
+        },
+    },
+    'AdminPassword': {
+        'event': {'routeKey': 'POST /admin/refresh', 'body': json.dumps({'refresh_token': 'unknown.session'})},
+    },
+    'EmailHandler': {
+        'event': {'routeKey': 'POST /email/password-reset', 'body': json.dumps({'temp_password': 'Tmp-123456'})},
+    },
+    'WebSocketHandler': {
+        'event': {'requestContext': {'routeKey': '$connect', 'connectionId': 'benchmark-connection'}},
+    },
+    # Every API handler in one function (see benchmarks/monolith.py)
+    'MonolithHandler': {
+        'auth': 'staff',
+        'event': {'routeKey': 'GET /transactions/recent-unpaid', 'queryStringParameters': {'limit': '20'}},
+    },
+}
+
+# Table name -> (hash key, type), as in terraform/dynamodb.tf
+TABLES = {
+    'products': ('SKU', 'S'),
+    'discounts': ('name', 'S'),
+    'payment_methods': ('name', 'S'),
+    'transactions': ('purchase_id', 'S'),
+    'catalog_versions': ('resource', 'S'),
+    'admin_sessions': ('id', 'S'),
+    'temp_passwords': ('id', 'S'),
+    'PlantPass-Config': ('config_key', 'S'),
+    'PlantPass-FeatureToggles': ('config_id', 'S'),
+    'PlantPass-Locks': ('resource_type', 'S'),
+    'PlantPass-Access': ('config_id', 'S'),
+    'websocket_connections': ('connectionId', 'S'),
+}
+
+ENVIRONMENT = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_SESSION_TOKEN': 'testing',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'JWT_SECRET': SECRET,
+    'PASSWORD_BUCKET': 'plantpass-admin-password',
+    'PASSWORD_KEY': 'admin_password.txt',
+    'SENDER_EMAIL': SENDER,
+    'UIUC_HORT_CLUB_EMAIL': HORT_CLUB,
+    'CONNECTIONS_TABLE': 'websocket_connections',
+    'CONFIG_TABLE_NAME': 'PlantPass-Config',
+    'FEATURE_TOGGLES_TABLE_NAME': 'PlantPass-FeatureToggles',
+    'LOCK_TABLE_NAME': 'PlantPass-Locks',
+    'PLANTPASS_ACCESS_TABLE_NAME': 'PlantPass-Access',
+}
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def create_tables(session):
+    """Create and seed the tables a first request reads (inside mock_aws)."""
+    dynamodb = session.resource('dynamodb')
+    for name, (key, key_type) in TABLES.items():
+        kwargs = {}
+        attributes = [{'AttributeName': key, 'AttributeType': key_type}]
+        if name == 'transactions':
+            attributes += [
+                {'AttributeName': 'timestamp', 'AttributeType': 'N'},
+                {'AttributeName': 'payment_shard', 'AttributeType': 'S'},
+            ]
+            kwargs['GlobalSecondaryIndexes'] = [
+                {
+                    'IndexName': 'timestamp-index',
+                    'KeySchema': [{'AttributeName': 'timestamp', 'KeyType': 'HASH'}],
+                    'Projection': {'ProjectionType': 'KEYS_ONLY'},
+                },
+                {
+                    'IndexName': 'payment-shard-timestamp-index',
+                    'KeySchema': [
+                        {'AttributeName': 'payment_shard', 'KeyType': 'HASH'},
+                        {'AttributeName': 'timestamp', 'KeyType': 'RANGE'},
+                    ],
+                    'Projection': {
+                        'ProjectionType': 'INCLUDE',
+                        'NonKeyAttributes': ['payment_status', 'total', 'line_count'],
+                    },
+                },
+            ]
+        dynamodb.create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=attributes,
+            BillingMode='PAY_PER_REQUEST',
+            **kwargs
+        )
+
+    # Items in the shape the catalog handlers write them
+    with dynamodb.Table('products').batch_writer() as batch:
+        for index in range(40):
+            batch.put_item(Item={
+                'SKU': f'P{index:03d}', 'item': f'Plant {index}',
+                'price_ea': Decimal(5 + index % 7), 'sort_order': index
+            })
+    dynamodb.Table('discounts').put_item(
+        Item={'name': 'Club member', 'type': 'percent', 'value': Decimal(10), 'sort_order': 0}
+    )
+    dynamodb.Table('payment_methods').put_item(Item={'name': 'Cash', 'sort_order': 0})
+
+    ses = session.client('ses')
+    for address in (SENDER, HORT_CLUB):
+        ses.verify_email_identity(EmailAddress=address)
+
+
+def make_event(spec):
+    event = {'headers': {'content-type': 'application/json'}, **json.loads(json.dumps(spec['event']))}
+    if spec.get('auth'):
+        import jwt
+        token = jwt.encode({'role': spec['auth'], 'exp': int(time.time()) + 3600}, SECRET, algorithm='HS256')
+        event['headers']['authorization'] = f'Bearer {token}'
+    return event
+
+
+def max_rss_kb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def child(name):
+    """Runs in the fresh interpreter: import one handler, serve one request."""
+    spec = HANDLERS[name]
+    # Lambda puts the function code first and the layer (/opt/python) after it
+    sys.path[:0] = [os.path.join(LAMBDA_DIR, name), LAYER_DIR]
+
+    print(IMPORT_BEGIN, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    import lambda_handler
+    imported = time.perf_counter()
+    print(IMPORT_END, file=sys.stderr, flush=True)
+    rss = max_rss_kb()
+
+    import boto3
+    from moto import mock_aws
+    with mock_aws():
+        create_tables(boto3.session.Session())
+        event = make_event(spec)
+        request_start = time.perf_counter()
+        response = lambda_handler.lambda_handler(event, None)
+        responded = time.perf_counter()
+
+    print(json.dumps({
+        'import_ms': (imported - start) * 1e3,
+        'first_response_ms': (responded - request_start) * 1e3,
+        'max_rss_kb': rss,
+        'status_code': response.get('statusCode'),
+    }))
+
+
+def import_breakdown(stderr):
+    """Self time (ms) per top-level package for the imports between the markers."""
+    packages = {}
+    recording = False
+    for line in stderr.splitlines():
+        if line == IMPORT_BEGIN:
+            recording = True
+        elif line == IMPORT_END:
+            break
+        elif recording:
+            match = _IMPORTTIME_LINE.match(line)
+            if match:
+                package = match.group(4).split('.')[0]
+                packages[package] = packages.get(package, 0.0) + int(match.group(1)) / 1e3
+    return dict(sorted(packages.items(), key=lambda item: -item[1]))
+
+
+def measure(name):
+    """One cold start of one handler, in a fresh interpreter."""
+    env = {key: value for key, value in os.environ.items() if not key.startswith('AWS_')}
+    env.update(ENVIRONMENT)
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'benchmarks.cold_start', '--child', name],
+        cwd=LAMBDA_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f'{name} failed:\n{completed.stderr[-4000:]}')
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['import_breakdown_ms'] = import_breakdown(completed.stderr)
+    return result
+
+
+def summarize(samples):
+    """Median of each measurement over the runs; breakdown from the median-import run."""
+    by_import = sorted(samples, key=lambda sample: sample['import_ms'])
+    summary = {
+        metric: statistics.median(sample[metric] for sample in samples)
+        for metric in ('import_ms', 'first_response_ms', 'max_rss_kb')
+    }
+    summary['cold_start_ms'] = summary['import_ms'] + summary['first_response_ms']
+    summary['status_code'] = samples[-1]['status_code']
+    summary['import_breakdown_ms'] = dict(list(by_import[len(by_import) // 2]['import_breakdown_ms'].items())[:10])
+    return summary
+
+
+def compare(results, baseline, threshold):
+    """Regressions of results against baseline as (handler, metric, before, after)."""
+    regressions = []
+    for name, current in results['handlers'].items():
+        before = baseline.get('handlers', {}).get(name)
+        if before is None:
+            continue
+        for metric, margin in MIN_REGRESSION.items():
+            if current[metric] > before[metric] * (1 + threshold) and current[metric] - before[metric] > margin:
+                regressions.append((name, metric, before[metric], current[metric]))
+    return regressions
+
+
+def run(names, runs, output=None, baseline_path=None, threshold=0.2):
+    handlers = {}
+    for name in names:
+        handlers[name] = summarize([measure(name) for _ in range(runs)])
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': runs,
+        'handlers': handlers,
+    }
+
+    print(f'{"handler":<24}{"import":>10}{"first req":>11}{"cold start":>12}{"max rss":>11}  top imports')
+    for name, result in handlers.items():
+        top = ', '.join(f'{package} {ms:.0f}' for package, ms in list(result['import_breakdown_ms'].items())[:3])
+        print(
+            f'{name:<24}{result["import_ms"]:>8.1f}ms{result["first_response_ms"]:>9.1f}ms'
+            f'{result["cold_start_ms"]:>10.1f}ms{result["max_rss_kb"] / 1024:>8.1f}MiB  {top}'
+        )
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'\nWrote {output}')
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = compare(results, json.load(f), threshold)
+        if regressions:
+            print(f'\nRegressions against {baseline_path} (threshold {threshold:.0%}):')
+            for name, metric, before, after in regressions:
+                print(f'  {name}: {metric} {before:.1f} -> {after:.1f}')
+        else:
+            print(f'\nNo regressions against {baseline_path}')
+    return results, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help='cold starts per handler (median is reported)')
+    parser.add_argument('--handler', action='append', choices=sorted(HANDLERS), help='only these handlers')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='flag regressions against a results file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative slowdown flagged by --compare')
+    parser.add_argument('--child', choices=sorted(HANDLERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+    else:
+        _, regressions = run(args.handler or list(HANDLERS), args.runs, args.output, args.compare, args.threshold)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,175 @@
+"""
+Split functions vs. one monolith function under a simulated fair day.
+
+Replays a synthetic fair-day request mix (an opening rush that tails off,
+per-order transaction traffic plus the occasional admin, bootstrap and
+email call) against a model of Lambda's container pools: a request reuses
+the most recently used idle container of its function, or starts a new one
+and pays the cold start; idle containers are reclaimed after a few minutes.
+The same arrivals run once with one pool per handler function and once
+with a single pool for MonolithHandler. Cold-start penalties are the
+measured import times from benchmarks.cold_start plus a fixed sandbox start.
+Run from src/lambda:
+
+    python -m benchmarks.monolith [--cold-start results.json] [--days N] [--orders-per-hour N]
+
+Without --cold-start, import times are measured first (one fresh
+interpreter per handler, which takes a little while).
+"""
+import argparse
+import json
+import random
+import statistics
+
+from benchmarks import cold_start
+
+# (route key, handler function, requests per order, warm latency in ms)
+PER_ORDER = (
+    ('POST /transactions', 'TransactionHandler', 1.0, 70),
+    ('GET /transactions/recent-unpaid', 'TransactionHandler', 3.0, 45),
+    ('GET /transactions/{purchase_id}', 'TransactionHandler', 1.0, 30),
+    ('PUT /transactions/{purchase_id}', 'TransactionHandler', 1.0, 60),
+    ('GET /transactions/sales-analytics', 'TransactionHandler', 0.1, 120),
+    ('POST /email/receipt', 'EmailHandler', 0.2, 150),
+)
+
+# (route key, handler function, requests per hour, warm latency in ms)
+PER_HOUR = (
+    ('GET /bootstrap', 'BootstrapHandler', 6, 40),
+    ('GET /products', 'ProductsHandler', 2, 30),
+    ('GET /discounts', 'DiscountsHandler', 2, 30),
+    ('GET /payment-methods', 'PaymentMethodsHandler', 2, 30),
+    ('GET /feature-toggles', 'FeatureTogglesHandler', 4, 25),
+    ('POST /plantpass-access/verify', 'PlantPassAccessHandler', 3, 35),
+    ('POST /admin/refresh', 'AdminPassword', 4, 30),
+    ('POST /admin/login', 'AdminPassword', 0.5, 300),
+    ('GET /lock/{resourceType}', 'LockHandler', 1, 25),
+    ('PUT /products', 'ProductsHandler', 0.2, 400),
+)
+
+# Relative traffic for each hour the sale is open: a rush at opening
+HOURLY_PROFILE = (2.5, 1.5, 1.2, 1.0, 0.8, 0.5)
+
+MONOLITH = 'MonolithHandler'
+
+
+def arrivals(rng, orders_per_hour):
+    """One day's (time_s, route, function, warm_ms) requests, sorted by time."""
+    requests = []
+    for hour, weight in enumerate(HOURLY_PROFILE):
+        rates = [(route, function, per_order * orders_per_hour * weight, warm_ms)
+                 for route, function, per_order, warm_ms in PER_ORDER]
+        rates += [(route, function, per_hour, warm_ms) for route, function, per_hour, warm_ms in PER_HOUR]
+        for route, function, rate, warm_ms in rates:
+            # Poisson arrivals within the hour
+            t = hour * 3600 + rng.expovariate(rate / 3600)
+            while t < (hour + 1) * 3600:
+                requests.append((t, route, function, warm_ms))
+                t += rng.expovariate(rate / 3600)
+    requests.sort()
+    return requests
+
+
+def simulate(requests, cold_ms, rng, idle_minutes, monolith):
+    """
+    Replay requests against container pools. Returns (latencies_ms,
+    cold starts, {function: (requests, cold starts)}).
+    """
+    # pool -> containers as [free_at, reclaim_after_idle_s]
+    pools = {}
+    latencies = []
+    cold_starts = 0
+    by_function = {}
+    for t, route, function, warm_ms in requests:
+        pool_name = MONOLITH if monolith else function
+        # Reclaim containers idle too long, then reuse the most recently used free one
+        pool = [c for c in pools.get(pool_name, []) if t - c[0] < c[1]]
+        pools[pool_name] = pool
+        free = [c for c in pool if c[0] <= t]
+        container = max(free) if free else None
+
+        latency = warm_ms * rng.lognormvariate(0, 0.3)
+        cold = container is None
+        if cold:
+            latency += cold_ms[pool_name]
+            cold_starts += 1
+            container = [0, 0]
+            pool.append(container)
+        container[0] = t + latency / 1e3
+        container[1] = idle_minutes * 60 * rng.uniform(0.5, 1.5)
+
+        latencies.append(latency)
+        total, cold_total = by_function.get(function, (0, 0))
+        by_function[function] = (total + 1, cold_total + cold)
+    return latencies, cold_starts, by_function
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure_cold_starts(sandbox_ms, results=None):
+    """Cold-start penalty per function: sandbox start plus measured import time."""
+    functions = {function for _, function, _, _ in PER_ORDER + PER_HOUR} | {MONOLITH}
+    if results is None:
+        results = {'handlers': {name: cold_start.summarize([cold_start.measure(name)]) for name in sorted(functions)}}
+    return {name: sandbox_ms + results['handlers'][name]['import_ms'] for name in functions}
+
+
+def run(days, orders_per_hour, idle_minutes, sandbox_ms, results=None, seed=7):
+    cold_ms = measure_cold_starts(sandbox_ms, results)
+
+    report = {}
+    for label, monolith in (('split', False), ('monolith', True)):
+        rng = random.Random(seed)
+        latencies, cold_starts, by_function = [], 0, {}
+        for _ in range(days):
+            day_latencies, day_cold, day_functions = simulate(
+                arrivals(rng, orders_per_hour), cold_ms, rng, idle_minutes, monolith
+            )
+            latencies += day_latencies
+            cold_starts += day_cold
+            for function, (total, cold) in day_functions.items():
+                before = by_function.get(function, (0, 0))
+                by_function[function] = (before[0] + total, before[1] + cold)
+        report[label] = {
+            'requests': len(latencies),
+            'cold_starts': cold_starts,
+            'cold_start_rate': cold_starts / len(latencies),
+            'p50_ms': statistics.median(latencies),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'cold_start_rate_by_function': {
+                function: cold / total for function, (total, cold) in sorted(by_function.items())
+            },
+        }
+
+    print(f'{days} simulated days, {orders_per_hour} orders/hour at the base rate')
+    print('cold start penalty: ' + ', '.join(f'{name} {ms:.0f}ms' for name, ms in sorted(cold_ms.items())))
+    print(f'\n{"":<10}{"requests":>10}{"cold":>8}{"cold %":>8}{"p50":>9}{"p95":>9}{"p99":>9}')
+    for label, result in report.items():
+        print(
+            f'{label:<10}{result["requests"]:>10}{result["cold_starts"]:>8}{result["cold_start_rate"]:>7.2%}'
+            f'{result["p50_ms"]:>7.0f}ms{result["p95_ms"]:>7.0f}ms{result["p99_ms"]:>7.0f}ms'
+        )
+    print('\ncold-start rate by function (split -> monolith):')
+    for function, rate in report['split']['cold_start_rate_by_function'].items():
+        print(f'  {function:<24}{rate:>7.1%} -> {report["monolith"]["cold_start_rate_by_function"][function]:>6.1%}')
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cold-start', metavar='RESULTS', help='benchmarks.cold_start --output file to take import times from')
+    parser.add_argument('--days', type=int, default=20)
+    parser.add_argument('--orders-per-hour', type=float, default=60)
+    parser.add_argument('--idle-minutes', type=float, default=10, help='typical idle time before a container is reclaimed')
+    parser.add_argument('--sandbox-ms', type=float, default=250, help='cold start cost outside the handler import')
+    args = parser.parse_args()
+
+    results = None
+    if args.cold_start:
+        with open(args.cold_start) as f:
+            results = json.load(f)
+    run(args.days, args.orders_per_hour, args.idle_minutes, args.sandbox_ms, results)
@@ -0,0 +1,129 @@
+"""
+Warm-container catalog cache
+Keeps the sorted, serialized catalog (products, discounts, payment methods)
+in memory and revalidates it against a per-resource version stamp that the
+write paths bump, so a cache hit costs one small GetItem (or nothing within
+the TTL) instead of a full table scan
+"""
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Optional, Tuple
+from botocore.exceptions import ClientError
+from shared_utils.dynamodb_client import get_table
+from shared_utils.response_utils import make_etag
+
+logger = logging.getLogger()
+
+# How long a cached catalog is served without re-checking its version
+CACHE_TTL_SECONDS = float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', 5))
+
+_versions_table = None
+
+
+def get_versions_table():
+    """Get the catalog versions table (created on first use)."""
+    global _versions_table
+    if _versions_table is None:
+        _versions_table = get_table('CATALOG_VERSIONS_TABLE', 'catalog_versions')
+    return _versions_table
+
+
+def get_catalog_version(resource: str) -> int:
+    """Read the current version stamp of a catalog resource (0 if never written)."""
+    response = get_versions_table().get_item(
+        Key={'resource': resource},
+        ProjectionExpression='version'
+    )
+    return int(response.get('Item', {}).get('version', 0))
+
+
+def bump_catalog_version(resource: str) -> int:
+    """Atomically increment a catalog resource's version stamp and return it."""
+    response = get_versions_table().update_item(
+        Key={'resource': resource},
+        UpdateExpression='ADD version :one',
+        ExpressionAttributeValues={':one': 1},
+        ReturnValues='UPDATED_NEW'
+    )
+    return int(response['Attributes']['version'])
+
+
+class CatalogCache:
+    """
+    Version-checked cache of one catalog resource's serialized JSON (or,
+    with a custom build function, any structure derived from the catalog).
+
+    The version is read before the loader runs, so a write racing a reload
+    can only leave the cache one version behind, never ahead; the next
+    check then reloads.
+    """
+
+    def __init__(
+        self,
+        resource: str,
+        loader: Callable[[], Any],
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        build: Callable[[Any], Any] = json.dumps
+    ):
+        self.resource = resource
+        self.loader = loader
+        self.build = build
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.version: Optional[int] = None
+        self.body: Any = None
+        self.etag: Optional[str] = None
+        self.checked_at = 0.0
+
+    def is_fresh(self) -> bool:
+        """Whether the cached body can be served without a version check."""
+        return self.body is not None and self.clock() - self.checked_at < self.ttl_seconds
+
+    def get(self, current_version: Optional[int] = None) -> Tuple[Optional[int], Any]:
+        """
+        Return (version, serialized JSON body) for the resource, or the built
+        value when the cache has a custom build function.
+        Callers that already fetched the version stamp (e.g. in a batch) pass
+        it as current_version to skip the GetItem. Version is None when the
+        versions table could not be read and the catalog was loaded uncached.
+        """
+        now = self.clock()
+
+        if self.body is not None and now - self.checked_at < self.ttl_seconds:
+            return self.version, self.body
+
+        if current_version is None:
+            try:
+                current_version = get_catalog_version(self.resource)
+            except ClientError as e:
+                logger.warning(f"Catalog version check failed for {self.resource}, serving uncached: {e}")
+                return None, self.build(self.loader())
+
+        if self.body is None or current_version != self.version:
+            self.body = self.build(self.loader())
+            self.etag = make_etag(self.body) if isinstance(self.body, str) else None
+            self.version = current_version
+            logger.info(f"Catalog cache loaded {self.resource} at version {current_version}")
+
+        self.checked_at = now
+        return self.version, self.body
+
+    def get_json(self) -> str:
+        """Return the serialized JSON body for the resource."""
+        return self.get()[1]
+
+    def get_with_etag(self) -> Tuple[str, str]:
+        """Return (strong ETag, serialized JSON body) for the resource."""
+        version, body = self.get()
+        # Uncached fallback bodies are hashed per request
+        return (self.etag if version is not None else make_etag(body)), body
+
+    def invalidate(self) -> None:
+        """Drop the cached body so the next read reloads."""
+        self.version = None
+        self.body = None
+        self.etag = None
+        self.checked_at = 0.0
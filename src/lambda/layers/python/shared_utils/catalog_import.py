@@ -0,0 +1,209 @@
+"""
+Streaming catalog import
+Parses an uploaded products CSV one row at a time, validates each row with
+the shared validation rules, fills in missing SKUs the same way the admin UI
+does, and collects a per-row error report
+"""
+import codecs
+import csv
+import re
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from shared_utils.validation import sanitize_string, validate_sku
+
+IMPORT_PREFIX = 'imports/products/'
+
+# Upper bound on rows per file; keeps the desired-catalog map small
+MAX_IMPORT_ROWS = 10000
+
+IMPORT_MODES = ('merge', 'replace')
+
+# Accepted header spellings for each product field (matched case-insensitively)
+COLUMN_ALIASES = {
+    'SKU': ('sku',),
+    'item': ('item', 'name', 'product'),
+    'price_ea': ('price_ea', 'price'),
+    'sort_order': ('sort_order', 'sort order', 'order'),
+}
+
+# Columns without which no row can be valid
+REQUIRED_COLUMNS = ('item', 'price_ea')
+
+
+def import_object_key(import_id: str) -> str:
+    return f'{IMPORT_PREFIX}{import_id}.csv'
+
+
+def import_report_key(import_id: str) -> str:
+    return f'{IMPORT_PREFIX}{import_id}.report.json'
+
+
+def import_id_from_key(key: str) -> Optional[str]:
+    match = re.fullmatch(re.escape(IMPORT_PREFIX) + r'([A-Za-z0-9-]+)\.csv', key)
+    return match.group(1) if match else None
+
+
+class SkuGenerator:
+    """
+    Generates SKUs like the admin UI's generateSKU: the first two letters of
+    the item name plus the lowest free three-digit number for that prefix.
+    """
+
+    def __init__(self, existing_skus: Iterable[str]):
+        self.used: Dict[str, Set[int]] = defaultdict(set)
+        for sku in existing_skus:
+            self.reserve(sku)
+
+    def reserve(self, sku: str) -> None:
+        if len(sku) == 5 and sku[2:].isdigit():
+            self.used[sku[:2]].add(int(sku[2:]))
+
+    def generate(self, item_name: str) -> str:
+        prefix = (re.sub(r'[^a-zA-Z]', '', item_name)[:2].upper() + 'XX')[:2]
+        used = self.used[prefix]
+        number = 1
+        while number in used:
+            number += 1
+        sku = f'{prefix}{number:03d}'
+        self.reserve(sku)
+        return sku
+
+
+def iter_csv_rows(stream) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yield (row_number, {field: value}) from a binary CSV stream without
+    reading it all into memory. Row numbers match the spreadsheet (header is
+    row 1); a UTF-8 BOM from Excel exports is ignored. Raises ValueError if
+    the header has no item or price column (e.g. a semicolon-delimited
+    export), since every row would otherwise be rejected.
+    """
+    reader = csv.reader(codecs.getreader('utf-8-sig')(stream))
+    header = next(reader, None)
+    if header is None:
+        return
+
+    columns = {}
+    for index, name in enumerate(header):
+        name = name.strip().lower()
+        for field, aliases in COLUMN_ALIASES.items():
+            if name in aliases and field not in columns:
+                columns[field] = index
+
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        found = ', '.join(name.strip() for name in header if name.strip()) or 'none'
+        raise ValueError(f"Header must include {' and '.join(missing)} columns (found: {found})")
+
+    for row_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        yield row_number, {
+            field: row[index].strip() if index < len(row) else ''
+            for field, index in columns.items()
+        }
+
+
+def parse_product_row(row: Dict[str, str]) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Validate one CSV row. Returns (product, errors); product has no SKU when
+    the row left it blank, and is None when the row is invalid.
+    """
+    errors = []
+
+    name = sanitize_string(row.get('item', ''))
+    if not name:
+        errors.append('Item name is required')
+
+    sku = row.get('SKU', '')
+    if sku and not validate_sku(sku):
+        errors.append(f'Invalid SKU "{sku}"')
+
+    price = None
+    try:
+        price = Decimal(row.get('price_ea', '').lstrip('$').replace(',', ''))
+        if not price.is_finite() or price < 0:
+            raise InvalidOperation
+    except InvalidOperation:
+        errors.append(f'Invalid price "{row.get("price_ea", "")}"')
+
+    sort_order = None
+    if row.get('sort_order'):
+        try:
+            sort_order = int(row['sort_order'])
+        except ValueError:
+            errors.append(f'Invalid sort order "{row["sort_order"]}"')
+
+    if errors:
+        return None, errors
+
+    product = {
+        'item': name,
+        'price_ea': price.quantize(Decimal('0.01')),
+    }
+    if sku:
+        product['SKU'] = sku
+    if sort_order is not None:
+        product['sort_order'] = sort_order
+    return product, []
+
+
+def read_product_import(stream, existing_skus: Iterable[str]) -> Tuple[List[Dict], List[Dict], Set[str]]:
+    """
+    Stream a products CSV into the desired catalog rows.
+
+    Returns (products, row_errors, protected_skus). Rows without a SKU get a
+    generated one; rows without a sort order keep their file order. Each
+    error is {"row", "SKU", "errors"}. protected_skus are SKUs named by
+    rejected rows, which a replace import must not delete.
+    """
+    products_by_sku = {}
+    row_errors = []
+    protected_skus = set()
+    pending = []
+
+    for row_number, row in iter_csv_rows(stream):
+        if row_number - 1 > MAX_IMPORT_ROWS:
+            row_errors.append({'row': row_number, 'SKU': None, 'errors': [f'Import is limited to {MAX_IMPORT_ROWS} rows']})
+            break
+
+        product, errors = parse_product_row(row)
+        sku = row.get('SKU') or None
+        if product and sku in products_by_sku:
+            errors = [f'Duplicate SKU "{sku}" (first seen on row {products_by_sku[sku][0]})']
+            product = None
+
+        if product is None:
+            row_errors.append({'row': row_number, 'SKU': sku, 'errors': errors})
+            if sku:
+                protected_skus.add(sku)
+            continue
+
+        product.setdefault('sort_order', row_number - 1)
+        if sku:
+            products_by_sku[sku] = (row_number, product)
+        else:
+            pending.append((row_number, product))
+
+    # Generate after every explicit SKU in the file is known, so new SKUs never collide
+    generator = SkuGenerator(list(existing_skus) + list(products_by_sku) + list(protected_skus))
+    for row_number, product in pending:
+        product['SKU'] = generator.generate(product['item'])
+        products_by_sku[product['SKU']] = (row_number, product)
+
+    products = [product for _, product in sorted(products_by_sku.values(), key=lambda entry: entry[0])]
+    return products, row_errors, protected_skus
+
+
+def replace_deletion_refusal(products: List[Dict], row_errors: List[Dict]) -> Optional[str]:
+    """
+    Why a replace import must not delete SKUs missing from the file, or None
+    if it may. With no valid rows every product would be deleted, and a
+    rejected row without a SKU (or a file cut off at MAX_IMPORT_ROWS) may
+    stand for an existing product that cannot be protected by SKU.
+    """
+    if not products:
+        return 'the file has no valid rows'
+    if any(not error['SKU'] for error in row_errors):
+        return 'some rejected rows have no SKU, so the products they stand for are unknown'
+    return None
@@ -0,0 +1,114 @@
+"""
+Static catalog snapshots
+Publishes each catalog as a versioned, pre-sorted, gzip-compressed JSON object
+in S3 plus a small latest.json pointer, so CloudFront can serve catalog reads
+without invoking Lambda
+"""
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, Optional
+from botocore.exceptions import ClientError
+from shared_utils.dynamodb_client import get_client
+
+logger = logging.getLogger()
+
+SNAPSHOT_PREFIX = 'catalog'
+
+# Versioned snapshots never change; the pointer is re-checked every few seconds
+SNAPSHOT_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+POINTER_CACHE_CONTROL = 'public, max-age=10'
+
+def get_s3_client():
+    """Get or create the S3 client (singleton pattern)."""
+    return get_client('s3')
+
+
+def snapshot_key(resource: str, version: int) -> str:
+    return f'{SNAPSHOT_PREFIX}/{resource}/v{version}.json'
+
+
+def pointer_key(resource: str) -> str:
+    return f'{SNAPSHOT_PREFIX}/{resource}/latest.json'
+
+
+def _get_published_version(s3, bucket: str, resource: str) -> int:
+    """Version the pointer currently names (0 if none published yet)."""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=pointer_key(resource))
+        return int(json.loads(response['Body'].read()).get('version', 0))
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return 0
+        raise
+
+
+def publish_catalog_snapshot(
+    resource: str,
+    version: int,
+    loader: Callable[[], object],
+    bucket: Optional[str] = None,
+    s3=None
+) -> Optional[Dict]:
+    """
+    Upload the catalog returned by loader as snapshot `version` and point
+    latest.json at it. The versioned object is written before the pointer, so
+    the pointer never names a missing snapshot, and an older version never
+    replaces a newer pointer.
+
+    Returns the pointer written, or None when snapshots are not configured
+    (CATALOG_SNAPSHOT_BUCKET unset) or a newer snapshot is already live.
+    """
+    bucket = bucket or os.environ.get('CATALOG_SNAPSHOT_BUCKET')
+    if not bucket:
+        return None
+
+    s3 = s3 or get_s3_client()
+    key = snapshot_key(resource, version)
+    body = json.dumps(loader()).encode('utf-8')
+
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        # mtime=0 keeps identical catalogs byte-identical
+        Body=gzip.compress(body, mtime=0),
+        ContentType='application/json',
+        ContentEncoding='gzip',
+        CacheControl=SNAPSHOT_CACHE_CONTROL
+    )
+
+    if _get_published_version(s3, bucket, resource) > version:
+        logger.info(f"Snapshot {resource} v{version} superseded before publishing pointer")
+        return None
+
+    pointer = {
+        'resource': resource,
+        'version': version,
+        'url': f'/{key}',
+        'published_at': int(time.time())
+    }
+    s3.put_object(
+        Bucket=bucket,
+        Key=pointer_key(resource),
+        Body=json.dumps(pointer).encode('utf-8'),
+        ContentType='application/json',
+        CacheControl=POINTER_CACHE_CONTROL
+    )
+
+    logger.info(f"Published {resource} snapshot v{version} ({len(body)} bytes uncompressed)")
+    return pointer
+
+
+def try_publish_catalog_snapshot(resource: str, version: int, loader: Callable[[], object], **kwargs) -> Optional[Dict]:
+    """
+    publish_catalog_snapshot for use after a committed catalog write: a
+    failure is logged instead of raised, so the write still succeeds. The
+    pointer keeps naming the previous snapshot until the next write publishes.
+    """
+    try:
+        return publish_catalog_snapshot(resource, version, loader, **kwargs)
+    except Exception as e:
+        logger.error(f"Failed to publish {resource} snapshot v{version}: {e}", exc_info=True)
+        return None
@@ -0,0 +1,187 @@
+"""
+Single-document catalog storage
+Keeps each catalog (products, discounts, payment methods) as one
+zlib-compressed JSON document on its catalog_versions row, next to the
+version stamp, so a read is one GetItem regardless of catalog size.
+Documents larger than one item are split across a few chunk rows, keyed
+by the write that stored them so concurrent writers never share a row.
+The per-row tables stay the source of truth; reads fall back to a fully
+paginated scan when no document has been written yet (legacy tables) or
+CATALOG_STORAGE_MODE=table.
+"""
+import json
+import logging
+import os
+import uuid
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+from botocore.exceptions import ClientError
+from shared_utils.decimal_utils import decimal_to_float
+
+logger = logging.getLogger()
+
+CATALOG_STORAGE_MODE = os.environ.get('CATALOG_STORAGE_MODE', 'document')
+
+# Stay well under DynamoDB's 400 KB item limit
+MAX_CHUNK_BYTES = 350 * 1024
+
+# Concurrent writers retry with a fresh scan this many times
+MAX_COMMIT_ATTEMPTS = 3
+
+
+def _versions_table(table):
+    if table is not None:
+        return table
+    from shared_utils.catalog_cache import get_versions_table
+    return get_versions_table()
+
+
+def _binary(value) -> bytes:
+    """Binary attributes come back wrapped in boto3's Binary type."""
+    return bytes(getattr(value, 'value', value))
+
+
+def chunk_key(resource: str, index: int, write_id: Optional[str] = None) -> str:
+    """Chunk row of one document write (documents stored before write ids: none)."""
+    if write_id is None:
+        return f'{resource}#{index}'
+    return f'{resource}#{write_id}#{index}'
+
+
+def _delete_chunks(table, resource: str, write_id: Optional[str], chunk_count: int) -> None:
+    """Remove a write's extra chunk rows (best effort; leftovers are never read)."""
+    try:
+        for index in range(1, chunk_count):
+            table.delete_item(Key={'resource': chunk_key(resource, index, write_id)})
+    except ClientError as e:
+        logger.warning(f"Could not remove {resource} chunks of write {write_id}: {e}")
+
+
+def scan_all_items(table, **scan_kwargs) -> List[Dict]:
+    """Scan every page of a table, following LastEvaluatedKey past 1 MB."""
+    response = table.scan(**scan_kwargs)
+    items = response.get('Items', [])
+
+    while 'LastEvaluatedKey' in response:
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+        items.extend(response.get('Items', []))
+
+    return items
+
+
+def encode_catalog_document(items: List[Dict]) -> List[bytes]:
+    """Compress a catalog to JSON+zlib and split it into item-sized chunks."""
+    payload = zlib.compress(json.dumps(decimal_to_float(items)).encode('utf-8'))
+    return [payload[i:i + MAX_CHUNK_BYTES] for i in range(0, len(payload), MAX_CHUNK_BYTES)]
+
+
+def load_catalog_document(resource: str, table=None) -> Optional[List[Dict]]:
+    """
+    Read a catalog document. Returns None when there is no document, its
+    chunks were replaced mid-read, or it does not decode, so the caller
+    falls back to a scan.
+    """
+    table = _versions_table(table)
+    item = table.get_item(Key={'resource': resource}).get('Item')
+    if not item or 'document' not in item:
+        return None
+
+    version = int(item['version'])
+    write_id = item.get('write_id')
+    chunks = [_binary(item['document'])]
+
+    for index in range(1, int(item.get('chunk_count', 1))):
+        part = table.get_item(Key={'resource': chunk_key(resource, index, write_id)}).get('Item')
+        if not part or int(part['version']) != version:
+            logger.warning(f"Catalog document {resource} v{version} is mid-rewrite, falling back to scan")
+            return None
+        chunks.append(_binary(part['data']))
+
+    try:
+        return json.loads(zlib.decompress(b''.join(chunks)))
+    except (zlib.error, ValueError) as e:
+        logger.error(f"Catalog document {resource} v{version} does not decode, falling back to scan: {e}")
+        return None
+
+
+def store_catalog_document(resource: str, items: List[Dict], table=None) -> int:
+    """
+    Store a catalog document as the next version. Extra chunks are written
+    first under this write's own id, then the head row's document, version
+    and write id are swapped in one conditional update, so readers see
+    either the old or the new document and never a mix of two writers'.
+
+    Raises ClientError (ConditionalCheckFailedException) if another writer
+    committed first.
+    """
+    table = _versions_table(table)
+    chunks = encode_catalog_document(items)
+
+    current = table.get_item(
+        Key={'resource': resource},
+        ProjectionExpression='version, write_id, chunk_count'
+    ).get('Item')
+    current_version = int(current['version']) if current and 'version' in current else None
+    next_version = (current_version or 0) + 1
+    write_id = f'{next_version}#{uuid.uuid4().hex[:12]}'
+
+    for index, chunk in enumerate(chunks[1:], start=1):
+        table.put_item(Item={'resource': chunk_key(resource, index, write_id), 'version': next_version, 'data': chunk})
+
+    condition = 'attribute_not_exists(version)' if current_version is None else 'version = :current'
+    values = {':doc': chunks[0], ':count': len(chunks), ':next': next_version, ':write': write_id}
+    if current_version is not None:
+        values[':current'] = current_version
+
+    try:
+        table.update_item(
+            Key={'resource': resource},
+            UpdateExpression='SET document = :doc, chunk_count = :count, version = :next, write_id = :write',
+            ConditionExpression=condition,
+            ExpressionAttributeValues=values
+        )
+    except ClientError:
+        _delete_chunks(table, resource, write_id, len(chunks))
+        raise
+
+    if current and int(current.get('chunk_count', 1)) > 1:
+        _delete_chunks(table, resource, current.get('write_id'), int(current['chunk_count']))
+
+    logger.info(f"Stored {resource} document v{next_version} ({sum(map(len, chunks))} bytes, {len(chunks)} chunks)")
+    return next_version
+
+
+def read_catalog(resource: str, scan: Callable[[], List[Dict]], table=None) -> List[Dict]:
+    """Read a catalog from its document, falling back to the paginated table scan."""
+    if CATALOG_STORAGE_MODE == 'document':
+        items = load_catalog_document(resource, table)
+        if items is not None:
+            return items
+    return scan()
+
+
+def commit_catalog_change(
+    resource: str,
+    load_items: Callable[[], List[Dict]],
+    table=None
+) -> Tuple[int, Optional[List[Dict]]]:
+    """
+    Record a catalog write that has already been applied to the per-row
+    table. In document mode, reload the rows (load_items should read
+    consistently) and store them as the next version; otherwise just bump
+    the version stamp.
+
+    Returns (new_version, items), where items is None in table mode.
+    """
+    if CATALOG_STORAGE_MODE != 'document':
+        from shared_utils.catalog_cache import bump_catalog_version
+        return bump_catalog_version(resource), None
+
+    for attempt in range(1, MAX_COMMIT_ATTEMPTS + 1):
+        items = load_items()
+        try:
+            return store_catalog_document(resource, items, table), items
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException' or attempt == MAX_COMMIT_ATTEMPTS:
+                raise
+            logger.info(f"Concurrent {resource} commit, retrying ({attempt}/{MAX_COMMIT_ATTEMPTS})")
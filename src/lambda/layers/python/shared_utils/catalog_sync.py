@@ -0,0 +1,264 @@
+"""
+Catalog synchronization utilities
+Computes the minimal set of writes needed to move a catalog table
+(products, discounts, payment methods) from its current rows to a desired list
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# BatchWriteItem accepts at most 25 requests
+BATCH_WRITE_SIZE = 25
+
+# TransactWriteItems accepts at most 100 actions; one is the guard check
+TRANSACT_WRITE_SIZE = 99
+MAX_BATCH_ATTEMPTS = 8
+
+
+class CatalogWriteInterrupted(Exception):
+    """
+    A diff written in several transactions or batches failed part-way:
+    `written` of its `total` changes had already landed. `cause` is the
+    failure that stopped it.
+    """
+
+    def __init__(self, written: int, total: int, cause: Exception):
+        self.written = written
+        self.total = total
+        self.cause = cause
+        super().__init__(f"{self.progress} before the write failed: {cause}")
+
+    @property
+    def progress(self) -> str:
+        return f"{self.written} of {self.total} changes were saved"
+
+
+def diff_catalog(
+    existing_items: Iterable[Dict],
+    desired_items: Iterable[Dict],
+    key: str,
+    normalize: Optional[Callable[[Dict], Any]] = None
+) -> Tuple[List[Dict], List[Any], Dict[str, int]]:
+    """
+    Diff the current catalog rows against the desired rows by primary key.
+
+    Args:
+        existing_items: Rows currently stored
+        desired_items: Rows that should be stored after the sync
+        key: Primary key attribute name
+        normalize: Optional function mapping a row to a comparable value, used
+                   to ignore representation differences (e.g. Decimal vs float)
+
+    Returns:
+        (items_to_put, keys_to_delete, counts) where counts has
+        created/updated/deleted/unchanged totals
+    """
+    normalize = normalize or (lambda item: item)
+    existing_by_key = {item[key]: item for item in existing_items}
+
+    # Later duplicates win, matching the previous rewrite behavior
+    desired_by_key = {}
+    for item in desired_items:
+        desired_by_key[item[key]] = item
+
+    items_to_put = []
+    counts = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    for item_key, item in desired_by_key.items():
+        current = existing_by_key.get(item_key)
+        if current is None:
+            items_to_put.append(item)
+            counts["created"] += 1
+        elif normalize(current) != normalize(item):
+            items_to_put.append(item)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    keys_to_delete = [item_key for item_key in existing_by_key if item_key not in desired_by_key]
+    counts["deleted"] = len(keys_to_delete)
+
+    return items_to_put, keys_to_delete, counts
+
+
+def apply_catalog_diff(table, key: str, items_to_put: List[Dict], keys_to_delete: List[Any]) -> None:
+    """
+    Write a catalog diff through a single batch writer. Puts and deletes only
+    touch changed rows, so readers never observe an empty catalog.
+    """
+    if not items_to_put and not keys_to_delete:
+        return
+
+    with table.batch_writer() as batch:
+        for item in items_to_put:
+            batch.put_item(Item=item)
+        for item_key in keys_to_delete:
+            batch.delete_item(Key={key: item_key})
+
+
+def apply_catalog_diff_guarded(
+    table,
+    key: str,
+    items_to_put: List[Dict],
+    keys_to_delete: List[Any],
+    guard: Dict
+) -> None:
+    """
+    Write a catalog diff as TransactWriteItems, each led by the guard
+    ConditionCheck (e.g. an edit lease check), so no row is written unless
+    the guard holds at that moment. Only a diff of up to TRANSACT_WRITE_SIZE
+    rows is atomic. A larger one is written in several transactions, each
+    re-checking the guard, and a failure stops before the next one but
+    leaves the earlier ones written. Raises ClientError
+    (TransactionCanceledException) if nothing was written, else
+    CatalogWriteInterrupted with how many changes landed, so the caller can
+    commit them and report the failure as partial.
+    """
+    actions = [{'Put': {'TableName': table.name, 'Item': item}} for item in items_to_put]
+    actions += [{'Delete': {'TableName': table.name, 'Key': {key: item_key}}} for item_key in keys_to_delete]
+
+    written = 0
+    for start in range(0, len(actions), TRANSACT_WRITE_SIZE):
+        chunk = actions[start:start + TRANSACT_WRITE_SIZE]
+        try:
+            # The table resource's client takes plain Python values
+            table.meta.client.transact_write_items(TransactItems=[guard] + chunk)
+        except Exception as e:
+            if written:
+                raise CatalogWriteInterrupted(written, len(actions), e) from e
+            raise
+        written += len(chunk)
+
+
+def _write_batch(client, table_name: str, requests: List[Dict]) -> int:
+    """
+    Send one BatchWriteItem, retrying unprocessed requests with backoff.
+    Returns how many requests were still unprocessed after the last attempt.
+    """
+    pending = {table_name: requests}
+    for attempt in range(MAX_BATCH_ATTEMPTS):
+        response = client.batch_write_item(RequestItems=pending)
+        pending = response.get('UnprocessedItems') or {}
+        if not pending:
+            return 0
+        time.sleep(min(0.05 * 2 ** attempt, 1))
+    return sum(map(len, pending.values()))
+
+
+def apply_catalog_diff_parallel(
+    client,
+    table_name: str,
+    key: str,
+    items_to_put: List[Dict],
+    keys_to_delete: List[Any],
+    max_workers: int = 8,
+    guard: Optional[Callable[[], None]] = None
+) -> None:
+    """
+    Write a large catalog diff as concurrent 25-item BatchWriteItem calls.
+    client must be a low-level DynamoDB client (thread-safe, unlike the
+    resource API); items are serialized here. BatchWriteItem takes no
+    conditions, so a guard (e.g. an edit lease check) is called before each
+    batch instead; once it raises, no further batch is written. A failure
+    raises CatalogWriteInterrupted if any write had landed, else the error.
+    """
+    from boto3.dynamodb.types import TypeSerializer
+    serializer = TypeSerializer()
+
+    def serialize(item):
+        return {name: serializer.serialize(value) for name, value in item.items()}
+
+    requests = [{'PutRequest': {'Item': serialize(item)}} for item in items_to_put]
+    requests += [{'DeleteRequest': {'Key': serialize({key: item_key})}} for item_key in keys_to_delete]
+    if not requests:
+        return
+
+    batches = [requests[i:i + BATCH_WRITE_SIZE] for i in range(0, len(requests), BATCH_WRITE_SIZE)]
+    failed = threading.Event()
+    lock = threading.Lock()
+    written = 0
+
+    def write(batch):
+        nonlocal written
+        if failed.is_set():
+            return
+        try:
+            if guard:
+                guard()
+            unprocessed = _write_batch(client, table_name, batch)
+            with lock:
+                written += len(batch) - unprocessed
+            if unprocessed:
+                raise RuntimeError(f'{unprocessed} writes to {table_name} were still unprocessed')
+        except Exception:
+            failed.set()
+            raise
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            # list() re-raises the first failed batch
+            list(pool.map(write, batches))
+    except Exception as e:
+        # Leaving the pool waited for every batch already started
+        if written:
+            raise CatalogWriteInterrupted(written, len(requests), e) from e
+        raise
+
+
+def parse_patch_body(
+    body: Any,
+    key: str,
+    required: Iterable[str] = (),
+    choices: Optional[Dict[str, Iterable[Any]]] = None
+) -> Tuple[bool, List[Dict], List[Any], List[str]]:
+    """
+    Validate a catalog PATCH body of the form
+    {"upsert": [ {...}, ... ], "delete": [ <key>, ... ]}
+    Each upsert needs the key plus every `required` field, and fields named
+    in `choices` must take one of the listed values, so no upsert is
+    dropped later as an invalid row.
+
+    Returns (is_valid, upserts, deletes, error_messages)
+    """
+    errors = []
+
+    if not isinstance(body, dict):
+        return False, [], [], ['Request body must be an object with "upsert" and/or "delete" lists']
+
+    upserts = body.get('upsert', [])
+    deletes = body.get('delete', [])
+
+    if not isinstance(upserts, list):
+        errors.append('"upsert" must be a list')
+    if not isinstance(deletes, list):
+        errors.append('"delete" must be a list')
+    if errors:
+        return False, [], [], errors
+
+    for idx, item in enumerate(upserts):
+        if not isinstance(item, dict) or not isinstance(item.get(key), str) or not item.get(key).strip():
+            errors.append(f'Upsert {idx + 1}: Must be an object with a non-empty "{key}"')
+            continue
+        missing = [field for field in required if item.get(field) is None]
+        if missing:
+            errors.append(f'Upsert {idx + 1} ({item[key]}): Missing {", ".join(missing)}')
+        for field, allowed in (choices or {}).items():
+            if field in item and item[field] not in allowed:
+                errors.append(f'Upsert {idx + 1} ({item[key]}): "{field}" must be one of {", ".join(map(str, allowed))}')
+
+    for idx, item_key in enumerate(deletes):
+        if not isinstance(item_key, str) or not item_key:
+            errors.append(f'Delete {idx + 1}: Must be a non-empty {key} string')
+
+    if errors:
+        return False, [], [], errors
+
+    # A key may only be touched once per batch write
+    touched = Counter([item[key] for item in upserts] + deletes)
+    duplicates = sorted(str(k) for k, count in touched.items() if count > 1)
+    if duplicates:
+        errors.append(f'Each {key} may appear only once per patch: {", ".join(duplicates)}')
+
+    return len(errors) == 0, upserts, deletes, errors
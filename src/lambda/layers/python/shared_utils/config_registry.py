@@ -0,0 +1,225 @@
+"""
+Typed configuration registry
+Feature toggles and the PlantPass passphrase live in one config
+table, one item per key. Every key, its type, default and who may read it is
+declared in CONFIG_KEYS; the whole config is read with one BatchGetItem and
+served from a warm-container cache revalidated against the "config" version
+stamp, so a new key needs only its declaration and costs no extra reads.
+Keys never written to the config table fall back to the row they lived in
+before (feature toggles and access tables), fetched in the same batch.
+"""
+import logging
+import os
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from shared_utils.catalog_cache import CatalogCache, bump_catalog_version
+from shared_utils.dynamodb_client import get_dynamodb_resource
+
+logger = logging.getLogger()
+
+CONFIG_TABLE_ENV = 'CONFIG_TABLE_NAME'
+DEFAULT_CONFIG_TABLE = 'PlantPass-Config'
+
+# Version stamp (in catalog_versions) bumped by every config write
+CONFIG_VERSION_RESOURCE = 'config'
+CONFIG_CACHE_TTL_SECONDS = float(os.environ.get('CONFIG_CACHE_TTL_SECONDS', 5))
+
+# BatchGetItem takes at most 100 keys per request
+BATCH_SIZE = 100
+
+# Who may read a key: public keys ship to every client (GET /config and the
+# bootstrap document), admin keys only to admin tokens, and secret keys are
+# never listed, only read by the endpoint that owns them
+PUBLIC = 'public'
+ADMIN = 'admin'
+SECRET = 'secret'
+
+VISIBLE_TO = {
+    PUBLIC: (PUBLIC,),
+    ADMIN: (PUBLIC, ADMIN),
+}
+
+TYPE_NAMES = {bool: 'a boolean', int: 'an integer', str: 'a string'}
+
+
+class ConfigKey:
+    """
+    One typed configuration value. `legacy` is ((table env var, default
+    table name, row key), attribute) locating the value's pre-registry home.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        value_type: type,
+        default: Any,
+        access: str = PUBLIC,
+        legacy: Optional[Tuple[Tuple[str, str, Dict[str, str]], str]] = None
+    ):
+        if value_type not in TYPE_NAMES:
+            raise ValueError(f"Unsupported config type for {name}: {value_type.__name__}")
+        self.name = name
+        self.type = value_type
+        self.default = default
+        self.access = access
+        self.legacy = legacy
+
+    def validate(self, value: Any) -> Any:
+        """Return value if it has the key's type, else raise ValueError."""
+        # bool is a subclass of int, so it has to be told apart explicitly
+        if not isinstance(value, self.type) or isinstance(value, bool) != (self.type is bool):
+            raise ValueError(f"{self.name} must be {TYPE_NAMES[self.type]}")
+        return value
+
+    def coerce(self, stored: Any) -> Any:
+        """Convert a stored value to the key's type (numbers come back as Decimal)."""
+        if isinstance(stored, Decimal) and self.type is int:
+            return int(stored)
+        return stored
+
+
+def _feature_toggles_row():
+    return ('FEATURE_TOGGLES_TABLE_NAME', 'PlantPass-FeatureToggles', {'config_id': 'feature_toggles'})
+
+
+def _access_row():
+    return ('PLANTPASS_ACCESS_TABLE_NAME', 'PlantPass-Access', {'config_id': 'plantpass_access'})
+
+
+CONFIG_KEYS: List[ConfigKey] = [
+    ConfigKey('collectEmailAddresses', bool, True, legacy=(_feature_toggles_row(), 'collectEmailAddresses')),
+    ConfigKey('passwordProtectAdmin', bool, True, legacy=(_feature_toggles_row(), 'passwordProtectAdmin')),
+    ConfigKey('protectPlantPassAccess', bool, False, legacy=(_feature_toggles_row(), 'protectPlantPassAccess')),
+    ConfigKey('plantpass.passphrase', str, '', SECRET, legacy=(_access_row(), 'passphrase')),
+]
+
+REGISTRY: Dict[str, ConfigKey] = {key.name: key for key in CONFIG_KEYS}
+
+
+def get_config_table_name() -> str:
+    return os.environ.get(CONFIG_TABLE_ENV, DEFAULT_CONFIG_TABLE)
+
+
+def _batch_get(keys_by_table: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """BatchGetItem every key, BATCH_SIZE per request, retrying unprocessed keys."""
+    dynamodb = get_dynamodb_resource()
+    pending = [(table_name, key) for table_name, keys in keys_by_table.items() for key in keys]
+    items_by_table: Dict[str, List[Dict]] = {}
+
+    for start in range(0, len(pending), BATCH_SIZE):
+        request_items: Dict[str, Dict] = {}
+        for table_name, key in pending[start:start + BATCH_SIZE]:
+            request_items.setdefault(table_name, {'Keys': []})['Keys'].append(key)
+
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for table_name, items in response.get('Responses', {}).items():
+                items_by_table.setdefault(table_name, []).extend(items)
+            request_items = response.get('UnprocessedKeys') or {}
+
+    return items_by_table
+
+
+def _find_row(items: List[Dict], row_key: Dict[str, str]) -> Dict:
+    for item in items:
+        if all(item.get(name) == value for name, value in row_key.items()):
+            return item
+    return {}
+
+
+def load_config() -> Dict[str, Any]:
+    """
+    Read every registered key, plus the legacy rows of keys that may not
+    have been migrated yet, in one batch. Missing keys get their default.
+    """
+    config_table = get_config_table_name()
+    keys_by_table = {config_table: [{'config_key': key.name} for key in CONFIG_KEYS]}
+
+    for key in CONFIG_KEYS:
+        if key.legacy:
+            (env_var, default_table, row_key), _ = key.legacy
+            table_keys = keys_by_table.setdefault(os.environ.get(env_var, default_table), [])
+            if row_key not in table_keys:
+                table_keys.append(row_key)
+
+    items_by_table = _batch_get(keys_by_table)
+    stored = {
+        item['config_key']: item['value']
+        for item in items_by_table.get(config_table, [])
+        if 'value' in item
+    }
+
+    values = {}
+    for key in CONFIG_KEYS:
+        if key.name in stored:
+            values[key.name] = key.coerce(stored[key.name])
+            continue
+
+        value = key.default
+        if key.legacy:
+            (env_var, default_table, row_key), attribute = key.legacy
+            row = _find_row(items_by_table.get(os.environ.get(env_var, default_table), []), row_key)
+            value = key.coerce(row.get(attribute, key.default))
+        values[key.name] = value
+
+    return values
+
+
+config_cache = CatalogCache(
+    CONFIG_VERSION_RESOURCE,
+    load_config,
+    ttl_seconds=CONFIG_CACHE_TTL_SECONDS,
+    build=dict
+)
+
+
+def get_config() -> Dict[str, Any]:
+    """Return every config value, from the warm cache when it is current."""
+    return dict(config_cache.get()[1])
+
+
+def visible_config(values: Dict[str, Any], access: str = PUBLIC) -> Dict[str, Any]:
+    """The subset of values readable at the given access level (never secrets)."""
+    readable = VISIBLE_TO[access]
+    return {name: value for name, value in values.items() if REGISTRY[name].access in readable}
+
+
+def validate_changes(changes: Any, access: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Check a partial update against the registry. With access set, only keys
+    readable at that level may be changed. Raises ValueError.
+    """
+    if not isinstance(changes, dict) or not changes:
+        raise ValueError('At least one config value is required')
+
+    for name, value in changes.items():
+        key = REGISTRY.get(name)
+        if key is None or (access is not None and key.access not in VISIBLE_TO[access]):
+            raise ValueError(f"Unknown config key: {name}")
+        key.validate(value)
+
+    return changes
+
+
+def update_config(changes: Dict[str, Any], access: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write only the given keys in one transaction (all or nothing), then bump
+    the config version so every warm container reloads. Returns the full
+    config afterwards.
+    """
+    validate_changes(changes, access)
+    config_table = get_config_table_name()
+
+    # The resource's client takes plain Python values, like Table calls
+    get_dynamodb_resource().meta.client.transact_write_items(
+        TransactItems=[
+            {'Put': {'TableName': config_table, 'Item': {'config_key': name, 'value': value}}}
+            for name, value in changes.items()
+        ]
+    )
+
+    bump_catalog_version(CONFIG_VERSION_RESOURCE)
+    config_cache.invalidate()
+    logger.info(f"Updated config keys: {', '.join(sorted(changes))}")
+
+    return get_config()
@@ -0,0 +1,192 @@
+"""
+Edit leases for catalog resources
+An admin editing products, discounts or payment methods takes a lease on the
+resource's row in the locks table: who holds it, a lease id the holder
+presents with each write, and an expiry. Acquire, renew and release are
+conditional UpdateItems. Catalog writes put lease_condition_check in the same
+transaction as their row writes, so no write lands while another admin holds
+a live lease; writes without a lease id only succeed when nobody does.
+"""
+import logging
+import os
+import secrets
+import time
+from typing import Any, Dict, Optional
+from botocore.exceptions import ClientError
+from shared_utils.dynamodb_client import get_table
+
+logger = logging.getLogger()
+
+LOCK_TABLE_ENV = 'LOCK_TABLE_NAME'
+DEFAULT_LOCK_TABLE = 'PlantPass-Locks'
+
+# An abandoned editor blocks others at most this long
+LEASE_SECONDS = int(os.environ.get('EDIT_LEASE_SECONDS', '120'))
+
+# Request header carrying the lease id on catalog writes
+LEASE_HEADER = 'x-edit-lease'
+
+LOCKABLE_RESOURCES = ('products', 'discounts', 'payment_methods')
+
+# Free or expired; writes presenting a lease id may also match the holder
+FREE_CONDITION = 'attribute_not_exists(lease_expires) OR lease_expires <= :now'
+
+
+class LeaseConflict(Exception):
+    """Raised when another admin holds the resource's edit lease."""
+
+    def __init__(self, resource: str, lease: Dict[str, Any], progress: Optional[str] = None):
+        self.resource = resource
+        self.lease = lease
+        holder = lease.get('owner') or 'another admin'
+        message = f"{resource} is being edited by {holder}"
+        # A multi-transaction write that lost the lease part-way says how far it got
+        super().__init__(f"{message}; {progress}" if progress else message)
+
+
+def get_lock_table_name() -> str:
+    return os.environ.get(LOCK_TABLE_ENV, DEFAULT_LOCK_TABLE)
+
+
+def _table():
+    return get_table(LOCK_TABLE_ENV, DEFAULT_LOCK_TABLE)
+
+
+def _describe(resource: str, item: Optional[Dict], now: int) -> Dict[str, Any]:
+    """API shape of a lease row; expired leases read as unlocked."""
+    expires = int(item.get('lease_expires', 0)) if item else 0
+    if expires <= now:
+        return {'resourceType': resource, 'isLocked': False, 'owner': None, 'expiresAt': None}
+    return {'resourceType': resource, 'isLocked': True, 'owner': item.get('owner'), 'expiresAt': expires}
+
+
+def get_lease(resource: str) -> Dict[str, Any]:
+    """Current lease state of a resource (never includes the lease id)."""
+    item = _table().get_item(Key={'resource_type': resource}, ConsistentRead=True).get('Item')
+    return _describe(resource, item, int(time.time()))
+
+
+def check_lease(resource: str, lease_id: Optional[str] = None) -> None:
+    """
+    Raise LeaseConflict unless the resource is free or leased to lease_id.
+    A read, for work that starts now but writes later (bulk imports); the
+    writes themselves still carry lease_condition_check.
+    """
+    item = _table().get_item(Key={'resource_type': resource}, ConsistentRead=True).get('Item')
+    lease = _describe(resource, item, int(time.time()))
+    if lease['isLocked'] and not (lease_id and item.get('lease_id') == lease_id):
+        raise LeaseConflict(resource, lease)
+
+
+def _is_condition_failure(error: ClientError) -> bool:
+    return error.response['Error']['Code'] == 'ConditionalCheckFailedException'
+
+
+def acquire_lease(resource: str, owner: str) -> Dict[str, Any]:
+    """
+    Take the lease if it is free or expired. Returns the lease including the
+    new lease id; raises LeaseConflict if someone else holds it.
+    """
+    now = int(time.time())
+    lease_id = secrets.token_urlsafe(16)
+
+    try:
+        _table().update_item(
+            Key={'resource_type': resource},
+            UpdateExpression='SET lease_id = :lease_id, #owner = :owner, lease_expires = :expires',
+            ConditionExpression=FREE_CONDITION,
+            ExpressionAttributeNames={'#owner': 'owner'},
+            ExpressionAttributeValues={
+                ':lease_id': lease_id,
+                ':owner': owner,
+                ':expires': now + LEASE_SECONDS,
+                ':now': now
+            }
+        )
+    except ClientError as e:
+        if not _is_condition_failure(e):
+            raise
+        raise LeaseConflict(resource, get_lease(resource))
+
+    logger.info(f"Edit lease on {resource} acquired by {owner}")
+    return {
+        'resourceType': resource,
+        'isLocked': True,
+        'owner': owner,
+        'expiresAt': now + LEASE_SECONDS,
+        'leaseId': lease_id
+    }
+
+
+def renew_lease(resource: str, lease_id: str) -> Dict[str, Any]:
+    """
+    Extend the caller's lease. A lapsed lease nobody else took can still be
+    renewed; raises LeaseConflict once another admin has taken it.
+    """
+    now = int(time.time())
+
+    try:
+        response = _table().update_item(
+            Key={'resource_type': resource},
+            UpdateExpression='SET lease_expires = :expires',
+            ConditionExpression='lease_id = :lease_id',
+            ExpressionAttributeValues={':lease_id': lease_id, ':expires': now + LEASE_SECONDS},
+            ReturnValues='ALL_NEW'
+        )
+    except ClientError as e:
+        if not _is_condition_failure(e):
+            raise
+        raise LeaseConflict(resource, get_lease(resource))
+
+    return {**_describe(resource, response['Attributes'], now), 'leaseId': lease_id}
+
+
+def release_lease(resource: str, lease_id: str) -> None:
+    """Give up the caller's lease. Releasing a lease already lost is a no-op."""
+    try:
+        _table().update_item(
+            Key={'resource_type': resource},
+            UpdateExpression='REMOVE lease_id, #owner, lease_expires',
+            ConditionExpression='lease_id = :lease_id',
+            ExpressionAttributeNames={'#owner': 'owner'},
+            ExpressionAttributeValues={':lease_id': lease_id}
+        )
+        logger.info(f"Edit lease on {resource} released")
+    except ClientError as e:
+        if not _is_condition_failure(e):
+            raise
+
+
+def lease_condition_check(resource: str, lease_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    TransactWriteItems action that fails unless the resource is free or
+    leased to lease_id. Values are plain Python types, for a resource's client.
+    """
+    condition = FREE_CONDITION
+    values: Dict[str, Any] = {':now': int(time.time())}
+    if lease_id:
+        condition += ' OR lease_id = :lease_id'
+        values[':lease_id'] = lease_id
+
+    return {
+        'ConditionCheck': {
+            'TableName': get_lock_table_name(),
+            'Key': {'resource_type': resource},
+            'ConditionExpression': condition,
+            'ExpressionAttributeValues': values
+        }
+    }
+
+
+def raise_for_lease_conflict(resource: str, error: Exception, progress: Optional[str] = None) -> None:
+    """
+    Turn a cancelled catalog transaction whose first action (the lease
+    check) failed into LeaseConflict; anything else is left to the caller.
+    progress describes writes that landed before it (see LeaseConflict).
+    """
+    response = getattr(error, 'response', None) or {}
+    if response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+        return
+    reasons = response.get('CancellationReasons') or []
+    if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+        raise LeaseConflict(resource, get_lease(resource), progress)
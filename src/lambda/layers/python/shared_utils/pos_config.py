@@ -0,0 +1,47 @@
+"""
+Point-of-sale configuration normalization
+Turns raw DynamoDB rows for products, discounts and payment methods into the
+shapes the API returns, so the per-resource handlers and the bootstrap
+endpoint serve identical documents (feature toggles live in config_registry)
+"""
+from decimal import Decimal
+from typing import Dict, List
+
+def normalize_products(products: List[Dict]) -> List[Dict]:
+    """Convert product prices/sort orders from Decimal and sort by sort_order."""
+    for product in products:
+        if 'price_ea' in product and isinstance(product['price_ea'], Decimal):
+            product['price_ea'] = float(product['price_ea'])
+
+        if 'sort_order' in product:
+            if isinstance(product['sort_order'], Decimal):
+                product['sort_order'] = int(product['sort_order'])
+        else:
+            product['sort_order'] = 0
+
+    products.sort(key=lambda x: x.get('sort_order', 0))
+    return products
+
+
+def normalize_discounts(discounts: List[Dict]) -> List[Dict]:
+    """Convert discount values/sort orders from Decimal and sort by sort_order."""
+    for discount in discounts:
+        if 'value' in discount and isinstance(discount['value'], Decimal):
+            discount['value'] = float(discount['value'])
+
+        if 'sort_order' in discount and isinstance(discount['sort_order'], Decimal):
+            discount['sort_order'] = int(discount['sort_order'])
+
+    discounts.sort(key=lambda x: x.get('sort_order', 0))
+    return discounts
+
+
+def normalize_payment_methods(payment_methods: List[Dict]) -> List[Dict]:
+    """Convert payment method sort orders to int and sort by sort_order."""
+    for method in payment_methods:
+        if 'sort_order' in method:
+            method['sort_order'] = int(method['sort_order'])
+
+    payment_methods.sort(key=lambda x: x.get('sort_order', 0))
+    return payment_methods
+
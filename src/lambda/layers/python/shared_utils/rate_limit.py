@@ -0,0 +1,50 @@
+"""
+In-memory token-bucket rate limiting
+Per-source buckets held in the warm container, so a throttled request is
+rejected without touching DynamoDB. Limits apply per container; concurrent
+containers each keep their own buckets.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+
+class TokenBucketLimiter:
+    """
+    One bucket per source (e.g. client IP) holding up to `burst` tokens and
+    refilling at `rate` tokens per second. Each request spends one token.
+    Only the `max_sources` most recently seen sources are tracked; an
+    evicted source starts again with a full bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_sources: int = 4096,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_sources = max_sources
+        self.clock = clock
+        self.buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+
+    def allow(self, source: str) -> Tuple[bool, float]:
+        """
+        Spend a token for source. Returns (allowed, retry_after_seconds);
+        retry_after is 0 when allowed.
+        """
+        now = self.clock()
+        tokens, updated_at = self.buckets.pop(source, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self.buckets[source] = (tokens, now)
+        while len(self.buckets) > self.max_sources:
+            self.buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / self.rate
@@ -0,0 +1,137 @@
+"""
+Table-driven request routing for the API handlers
+Each handler declares its routes once, at import: route key -> function,
+auth policy and whether the body is JSON. Dispatch is one dict lookup, and
+auth, body parsing and exception-to-response mapping work the same way in
+every handler. Each dispatch is timed by phase and logged as one metrics
+record (shared_utils.metrics).
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Sequence
+from shared_utils import metrics
+from shared_utils.response_utils import create_response
+from shared_utils.warmup import is_warmup, handle_warmup
+
+logger = logging.getLogger()
+
+# Auth policies: public routes skip auth, staff routes take any valid token
+# (staff or admin), admin routes need the admin role
+PUBLIC = 'public'
+STAFF = 'staff'
+ADMIN = 'admin'
+
+POLICIES = (PUBLIC, STAFF, ADMIN)
+
+
+class BadRequest(Exception):
+    """Raised by route functions (and body parsing) to answer 400."""
+
+
+def parse_body(event: Dict[str, Any]) -> Any:
+    """JSON request body; an absent or empty body is {}. Raises BadRequest."""
+    raw = event.get('body')
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        raise BadRequest('Request body must be valid JSON')
+
+
+def error_message(status_code: int) -> Callable[[Exception], Dict[str, Any]]:
+    """Error mapping answering status_code with the exception's message."""
+    return lambda e: create_response(status_code, {'message': str(e)})
+
+
+class Route:
+    """
+    One route: the function called as handler(event, body), its auth policy,
+    and whether the body is parsed as JSON first (otherwise body is None).
+    """
+
+    __slots__ = ('handler', 'auth', 'body')
+
+    def __init__(self, handler: Callable[[Dict[str, Any], Any], Dict[str, Any]], auth: str = STAFF, body: bool = False):
+        if auth not in POLICIES:
+            raise ValueError(f"Unknown auth policy: {auth}")
+        self.handler = handler
+        self.auth = auth
+        self.body = body
+
+
+class Router:
+    """
+    Dispatches API Gateway events by routeKey.
+    `authorize(event, policy)` (from auth_middleware) returns an error
+    response or None; `errors` maps exception types to response builders,
+    most specific class first by MRO, with anything unmapped answered 500.
+    `warmup` lists the steps run for a warmup invocation (shared_utils.warmup).
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, Route],
+        authorize: Optional[Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]]] = None,
+        errors: Optional[Dict[type, Callable[[Exception], Dict[str, Any]]]] = None,
+        respond: Callable[[int, Any], Dict[str, Any]] = create_response,
+        warmup: Sequence[Callable[[], Any]] = ()
+    ):
+        protected = [key for key, route in routes.items() if route.auth != PUBLIC]
+        if protected and authorize is None:
+            raise ValueError(f"Routes need an authorize function: {', '.join(protected)}")
+        self.routes = dict(routes)
+        self.authorize = authorize
+        self.respond = respond
+        self.warmup = tuple(warmup)
+        self.errors = {
+            BadRequest: lambda e: respond(400, {'message': str(e)}),
+            Exception: lambda e: respond(500, {'message': 'Internal server error'}),
+            **(errors or {})
+        }
+
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        for cls in type(error).__mro__:
+            mapper = self.errors.get(cls)
+            if mapper is not None:
+                response = mapper(error)
+                break
+        if response['statusCode'] >= 500:
+            logger.error(f"Error processing request: {error}", exc_info=True)
+        return response
+
+    def dispatch(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        if is_warmup(event):
+            metrics.mark_warm()
+            return handle_warmup(event, self.warmup)
+
+        route_key = event.get('routeKey', '')
+        metrics.start(route_key)
+        status = 500
+        try:
+            response = self._route(route_key, event)
+            status = response['statusCode']
+            return response
+        finally:
+            metrics.finish(status)
+
+    def _route(self, route_key: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        route = self.routes.get(route_key)
+        if route is None:
+            return self.respond(404, {'message': 'Route not found'})
+
+        try:
+            if route.auth != PUBLIC:
+                with metrics.phase('auth'):
+                    denied = self.authorize(event, route.auth)
+                if denied is not None:
+                    return denied
+
+            body = None
+            if route.body:
+                with metrics.phase('body'):
+                    body = parse_body(event)
+            with metrics.phase('handler'):
+                return route.handler(event, body)
+        except Exception as e:
+            return self._error_response(e)
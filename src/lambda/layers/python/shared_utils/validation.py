@@ -159,6 +159,39 @@ def validate_transaction_items(items: List[Dict]) -> Tuple[bool, List[str]]:
     return len(errors) == 0, errors
 
 
+def validate_order_lines(lines: List[Dict]) -> Tuple[bool, List[str]]:
+    """
+    Validate server-priced order lines ({SKU, quantity}); names and prices
+    come from the catalog, so only the shape and quantities are checked here
+    Returns (is_valid, error_messages)
+    """
+    errors = []
+    
+    if not isinstance(lines, list):
+        return False, ['Items must be an array']
+    
+    if len(lines) == 0:
+        return False, ['At least one item is required']
+    
+    has_valid_items = False
+    
+    for idx, line in enumerate(lines):
+        if not isinstance(line, dict):
+            errors.append(f'Item {idx + 1}: Must be an object')
+            continue
+        
+        if not validate_sku(line.get('SKU', '')):
+            errors.append(f'Item {idx + 1}: Invalid SKU')
+        
+        if validate_quantity(line.get('quantity', 0)) > 0:
+            has_valid_items = True
+    
+    if not has_valid_items:
+        errors.append('At least one item must have a quantity greater than 0')
+    
+    return len(errors) == 0, errors
+
+
 def validate_discounts(discounts: List[Dict]) -> Tuple[bool, List[str]]:
     """
     Validate discounts array
@@ -233,16 +266,18 @@ def clamp_number(value: Any, min_val: float = 0, max_val: float = float('inf'))
         return min_val
 
 
-def validate_transaction_data(data: Dict) -> Tuple[bool, List[str]]:
+def validate_transaction_data(data: Dict, server_priced: bool = False) -> Tuple[bool, List[str]]:
     """
     Comprehensive validation for transaction data
+    With server_priced, items are {SKU, quantity} lines priced from the catalog
     Returns (is_valid, error_messages)
     """
     errors = []
     
     # Validate items
     items = data.get('items', [])
-    items_valid, items_errors = validate_transaction_items(items)
+    validate_items = validate_order_lines if server_priced else validate_transaction_items
+    items_valid, items_errors = validate_items(items)
     if not items_valid:
         errors.extend(items_errors)
     
@@ -0,0 +1,74 @@
+"""
+Pre-warm invocations
+A direct invoke with {"source": "plantpass.warmup"} (sent by tools/warmup.py)
+runs the handler's warm steps instead of a route: each builds its clients
+and opens a pooled connection with one cheap read, or fills a warm-container
+cache (catalogs, config, password hash). No business logic runs and nothing
+is written. API Gateway events never carry a top-level source, so a warmup
+event cannot arrive through the API.
+"""
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, Sequence
+
+logger = logging.getLogger()
+
+WARMUP_SOURCE = 'plantpass.warmup'
+
+# Longest a warmup invocation is held open; holding keeps concurrent
+# warmups from being served one after another by the same container
+MAX_HOLD_MS = int(os.environ.get('WARMUP_MAX_HOLD_MS', '1000'))
+
+# Identifies this container in warmup responses, so the caller can count
+# how many distinct containers it reached
+CONTAINER_ID = uuid.uuid4().hex[:12]
+
+_warmups = 0
+
+
+def is_warmup(event: Dict[str, Any]) -> bool:
+    """True for a warmup invocation."""
+    return event.get('source') == WARMUP_SOURCE
+
+
+def ping_table(table, key: Dict[str, str]) -> None:
+    """
+    Open a connection to a table with a GetItem of a key that need not exist
+    (handler roles allow GetItem but not DescribeTable).
+    """
+    table.get_item(Key=key, ProjectionExpression=next(iter(key)))
+
+
+def handle_warmup(event: Dict[str, Any], steps: Sequence[Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run each warm step, logging (not raising) failures, then hold until
+    hold_ms (from the event) has passed. Returns a summary for the caller.
+    """
+    global _warmups
+    start = time.perf_counter()
+    _warmups += 1
+
+    warmed, failed = [], []
+    for step in steps:
+        name = getattr(step, '__name__', repr(step))
+        try:
+            step()
+            warmed.append(name)
+        except Exception as e:
+            logger.warning(f"Warmup step {name} failed: {e}")
+            failed.append(name)
+
+    elapsed_ms = (time.perf_counter() - start) * 1e3
+    hold_ms = min(max(int(event.get('hold_ms', 0)), 0), MAX_HOLD_MS)
+    if hold_ms > elapsed_ms:
+        time.sleep((hold_ms - elapsed_ms) / 1e3)
+
+    return {
+        'warmed': warmed,
+        'failed': failed,
+        'container': CONTAINER_ID,
+        'first_warmup': _warmups == 1,
+        'duration_ms': round(elapsed_ms, 1)
+    }
@@ -0,0 +1,147 @@
+"""
+Per-invocation phase timing, logged as CloudWatch Embedded Metric Format
+Each API invocation gets one JSON log line with its route, status, whether
+it was the container's first invocation, and how long it spent in each
+phase: auth, body parsing, validation and the route function (timed by the
+router and handlers), plus time inside AWS calls by service (timed by
+botocore hooks on the shared client session). CloudWatch turns the line into
+metrics per route, so p50/p99 per phase can be graphed without an agent.
+
+Phases are summed monotonic (perf_counter) durations in milliseconds. AWS
+call time overlaps the route function's, and calls made from thread pools
+add up, so phases need not sum to the total. Recording a phase costs a few
+microseconds; outside an invocation (imports, warmups, sweeps) it is a no-op.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'PlantPass')
+FUNCTION_NAME = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', '')
+
+# AWS service (as named in botocore events) -> phase
+SERVICE_PHASES = {
+    'dynamodb': 'dynamodb',
+    'apigatewaymanagementapi': 'websocket',
+    # Lambda invokes go to EmailHandler; SES is EmailHandler's own sending
+    'lambda': 'email',
+    'ses': 'email',
+    's3': 's3',
+}
+
+_current = None
+_cold = True
+
+
+class Invocation:
+    """Timings for the invocation being handled."""
+
+    __slots__ = ('route', 'cold_start', 'started', 'phases', '_lock')
+
+    def __init__(self, route: str, cold_start: bool):
+        self.route = route
+        self.cold_start = cold_start
+        self.started = time.perf_counter()
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        # AWS calls may finish on several pool threads at once
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record(self, status: int) -> Dict[str, Any]:
+        """The EMF log record for this invocation."""
+        duration = time.perf_counter() - self.started
+        record = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': NAMESPACE,
+                    'Dimensions': [['Route']],
+                    'Metrics': [
+                        {'Name': 'duration_ms', 'Unit': 'Milliseconds'},
+                        {'Name': 'cold_start', 'Unit': 'Count'},
+                    ] + [{'Name': f'{phase}_ms', 'Unit': 'Milliseconds'} for phase in self.phases],
+                }],
+            },
+            'Route': self.route,
+            'function': FUNCTION_NAME,
+            'status': status,
+            'duration_ms': round(duration * 1e3, 3),
+            'cold_start': int(self.cold_start),
+        }
+        for phase, seconds in self.phases.items():
+            record[f'{phase}_ms'] = round(seconds * 1e3, 3)
+        return record
+
+
+class _Phase:
+    __slots__ = ('name', 'invocation', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.invocation = _current
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.invocation is not None:
+            self.invocation.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def phase(name: str) -> _Phase:
+    """Context manager adding the time spent inside it to phase `name`."""
+    return _Phase(name)
+
+
+def start(route: str) -> Invocation:
+    """Begin recording an invocation; the container's first one is the cold start."""
+    global _current, _cold
+    _current = Invocation(route, _cold)
+    _cold = False
+    return _current
+
+
+def mark_warm() -> None:
+    """An unrecorded invocation (a warmup) took the container's cold start."""
+    global _cold
+    _cold = False
+
+
+def finish(status: int) -> Optional[Dict[str, Any]]:
+    """Log the current invocation's EMF record and stop recording. Returns the record."""
+    global _current
+    invocation, _current = _current, None
+    if invocation is None:
+        return None
+    record = invocation.record(status)
+    # Straight to stdout: the runtime's log formatter would prefix the line
+    # and CloudWatch only extracts metrics from lines that are pure JSON
+    sys.stdout.write(json.dumps(record) + '\n')
+    return record
+
+
+def _before_call(context, **kwargs):
+    context['metrics_started'] = time.perf_counter()
+
+
+def _after_call(event_name, context, **kwargs):
+    invocation = _current
+    started = context.get('metrics_started')
+    if invocation is not None and started is not None:
+        service = event_name.split('.')[1]
+        invocation.add(SERVICE_PHASES.get(service, service), time.perf_counter() - started)
+
+
+def observe_session(session) -> None:
+    """Time every AWS call made by clients later created from `session`."""
+    session.events.register('before-call', _before_call)
+    session.events.register('after-call', _after_call)
+    session.events.register('after-call-error', _after_call)
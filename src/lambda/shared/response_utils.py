@@ -1,13 +1,51 @@
+import hashlib
 import json
 
-def create_response(status_code, body):
+# Catalog/config reads may be stored but must be revalidated (cheap 304s)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET,PUT,POST,DELETE,OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization"
+}
+
+def create_response(status_code, body, headers=None):
     """Create standardized API Gateway response with CORS headers."""
+    return create_json_response(status_code, json.dumps(body), headers)
+
+def create_json_response(status_code, json_body, headers=None):
+    """Create a response from an already-serialized JSON body (e.g. a cached catalog)."""
     return {
         "statusCode": status_code,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET,PUT,POST,DELETE,OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization"
-        },
-        "body": json.dumps(body)
+        "headers": {**CORS_HEADERS, **(headers or {})},
+        "body": json_body
     }
+
+def make_etag(json_body):
+    """Strong ETag from the SHA-256 of a serialized body."""
+    return '"' + hashlib.sha256(json_body.encode("utf-8")).hexdigest()[:32] + '"'
+
+def etag_matches(event, etag):
+    """Check the request's If-None-Match header against an ETag."""
+    headers = event.get("headers") or {}
+    if_none_match = next((v for k, v in headers.items() if k.lower() == "if-none-match"), None)
+    if not if_none_match:
+        return False
+    
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+def create_conditional_response(event, json_body, etag=None, cache_control=REVALIDATE_CACHE_CONTROL):
+    """
+    200 with ETag/Cache-Control validators, or an empty 304 when the client's
+    If-None-Match already names the current representation.
+    """
+    etag = etag or make_etag(json_body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    
+    if etag_matches(event, etag):
+        return create_json_response(304, "", headers)
+    
+    return create_json_response(200, json_body, headers)
@@ -0,0 +1,57 @@
+"""
+Real boto3/botocore and moto for moto-backed tests
+
+Other test modules replace boto3/botocore with MagicMocks at import time.
+This module imports the real libraries once and puts the mocks back; because
+it is only imported once, every moto test shares the same botocore, which
+moto needs since it hooks the botocore it was first imported with.
+"""
+import importlib
+import sys
+from contextlib import ExitStack, contextmanager
+from unittest.mock import patch
+
+_mocked_modules = {
+    name: sys.modules.pop(name) for name in list(sys.modules)
+    if name.split('.')[0] in ('boto3', 'botocore')
+}
+
+import boto3
+# boto3 loads these lazily; load them now so they are captured below
+import boto3.dynamodb.conditions
+import boto3.dynamodb.transform
+import boto3.dynamodb.types
+import boto3.s3.inject
+import botocore.exceptions
+try:
+    from moto import mock_aws
+except ImportError:  # moto < 5 (requirements-test.txt pins 4.x)
+    from moto import mock_dynamodb, mock_s3
+
+    @contextmanager
+    def mock_aws():
+        with mock_dynamodb(), mock_s3():
+            yield
+
+real_modules = {
+    name: module for name, module in sys.modules.items()
+    if name.split('.')[0] in ('boto3', 'botocore')
+}
+sys.modules.update(_mocked_modules)
+
+
+def real_aws():
+    """Context manager: real AWS libraries live in sys.modules, calls go to moto."""
+    stack = ExitStack()
+    stack.enter_context(patch.dict(sys.modules, real_modules))
+    stack.enter_context(mock_aws())
+    return stack
+
+
+def import_real(module_name):
+    """(Re)import a module so it binds the real boto3/botocore, not the mocks."""
+    for name in [n for n in sys.modules if n == module_name or n.startswith(module_name + '.')]:
+        del sys.modules[name]
+    with patch.dict(sys.modules, real_modules):
+        module = importlib.import_module(module_name)
+    return module
@@ -0,0 +1,223 @@
+"""
+Tests for AdminPassword Lambda: refresh sessions, password hash caching and
+login rate limiting
+"""
+import pytest
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import jwt
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['boto3.dynamodb'] = MagicMock()
+sys.modules['boto3.dynamodb.conditions'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+JWT_SECRET = 'test-secret-key-long-enough-for-hs256'
+
+# AdminPassword shares flat module names with the other handlers, so import
+# it in isolation and put back whatever other test modules had loaded
+HANDLER_MODULES = ['lambda_handler', 'response_utils', 'dynamodb_client', 'decimal_utils', 'temp_password_manager', 'session_manager']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+admin_handler_path = os.path.join(os.path.dirname(__file__), '../AdminPassword')
+sys.path.insert(0, admin_handler_path)
+
+with patch.dict(os.environ, {'PASSWORD_BUCKET': 'passwords', 'PASSWORD_KEY': 'password.json', 'JWT_SECRET': JWT_SECRET}):
+    import lambda_handler as admin_lambda
+    import session_manager
+
+sys.path.remove(admin_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+PASSWORD = 'correct horse'
+
+
+class FakeClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeSessionsTable:
+    """In-memory stand-in for the admin_sessions table"""
+
+    def __init__(self):
+        self.items = {}
+        self.lock = threading.Lock()
+
+    def get_item(self, Key):
+        item = self.items.get(Key['id'])
+        return {'Item': dict(item)} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item['id']] = dict(Item)
+
+    def delete_item(self, Key):
+        self.items.pop(Key['id'], None)
+
+    def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+        # Check and count happen under one lock, as one UpdateItem does
+        with self.lock:
+            item = self.items.get(Key['id'], {'id': Key['id']})
+            if item.get('attempts', 0) >= ExpressionAttributeValues[':max']:
+                raise FakeClientError('ConditionalCheckFailedException')
+            item['attempts'] = item.get('attempts', 0) + ExpressionAttributeValues[':one']
+            item.setdefault('expiration', ExpressionAttributeValues[':expiration'])
+            self.items[Key['id']] = item
+            return {'Attributes': {'attempts': item['attempts'], 'expiration': item['expiration']}}
+
+    def scan(self, **kwargs):
+        return {'Items': [{'id': key} for key in self.items if key.startswith(session_manager.SESSION_PREFIX)]}
+
+    def batch_writer(self):
+        table = self
+
+        class Batch:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def delete_item(self, Key):
+                table.delete_item(Key)
+
+        return Batch()
+
+
+@pytest.fixture
+def admin():
+    """Handler with an in-memory sessions table and an S3 password object"""
+    sessions = FakeSessionsTable()
+    s3 = MagicMock()
+    password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4))
+    s3.get_object.return_value = {
+        'Body': MagicMock(read=lambda: json.dumps({'admin_password_hash': password_hash.decode()})),
+        'ETag': '"v1"'
+    }
+    s3.put_object.return_value = {'ETag': '"v2"'}
+
+    with patch.object(session_manager, 'table', sessions), \
+         patch.object(admin_lambda, 'get_client', return_value=s3), \
+         patch.object(admin_lambda, 'ClientError', FakeClientError), \
+         patch.object(session_manager, 'ClientError', FakeClientError), \
+         patch.object(admin_lambda, 'get_temp_password_hash', return_value=None), \
+         patch.dict(admin_lambda._password_cache, {'etag': None, 'hash': None}), \
+         patch.dict(os.environ, {'JWT_SECRET': JWT_SECRET}):
+        yield sessions, s3
+
+
+def call(route_key, body=None, token=None, source_ip='10.0.0.1'):
+    event = {
+        'routeKey': route_key,
+        'body': json.dumps(body or {}),
+        'headers': {'authorization': f'Bearer {token}'} if token else {},
+        'requestContext': {'http': {'sourceIp': source_ip}}
+    }
+    response = admin_lambda.lambda_handler(event, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+class TestRefreshSessions:
+    def test_login_issues_short_access_and_refresh_token(self, admin):
+        """Test login returns a short-lived access token plus a refresh token"""
+        status, body = call('POST /admin/login', {'password': PASSWORD})
+
+        assert status == 200
+        claims = jwt.decode(body['token'], JWT_SECRET, algorithms=['HS256'])
+        assert claims['role'] == 'admin'
+        assert claims['exp'] - time.time() <= admin_lambda.ACCESS_TOKEN_MINUTES * 60 + 5
+        assert body['expires_in'] == admin_lambda.ACCESS_TOKEN_MINUTES * 60
+        assert body['refresh_token']
+
+    def test_refresh_skips_password_check(self, admin):
+        """Test a refresh token renews access without S3 or bcrypt"""
+        sessions, s3 = admin
+        _, login = call('POST /admin/login', {'password': PASSWORD})
+        s3.get_object.reset_mock()
+
+        with patch.object(admin_lambda.bcrypt, 'checkpw') as checkpw:
+            status, body = call('POST /admin/refresh', {'refresh_token': login['refresh_token']})
+
+        assert status == 200
+        assert jwt.decode(body['token'], JWT_SECRET, algorithms=['HS256'])['role'] == 'admin'
+        checkpw.assert_not_called()
+        s3.get_object.assert_not_called()
+
+    def test_refresh_rejects_tampered_and_revoked_tokens(self, admin):
+        """Test a wrong secret and a logged-out session both fail"""
+        _, login = call('POST /admin/login', {'password': PASSWORD})
+        session_id = login['refresh_token'].split('.')[0]
+
+        assert call('POST /admin/refresh', {'refresh_token': f'{session_id}.guess'})[0] == 401
+
+        call('POST /admin/logout', {'refresh_token': login['refresh_token']})
+        assert call('POST /admin/refresh', {'refresh_token': login['refresh_token']})[0] == 401
+
+    def test_password_change_revokes_other_sessions(self, admin):
+        """Test changing the password signs out every existing refresh session"""
+        _, first = call('POST /admin/login', {'password': PASSWORD})
+        _, second = call('POST /admin/login', {'password': PASSWORD})
+
+        status, body = call('POST /admin/change-password',
+                            {'old_password': PASSWORD, 'new_password': 'new password'},
+                            token=second['token'])
+
+        assert status == 200
+        assert call('POST /admin/refresh', {'refresh_token': first['refresh_token']})[0] == 401
+        assert call('POST /admin/refresh', {'refresh_token': body['refresh_token']})[0] == 200
+
+
+class TestPasswordHashCache:
+    def test_unchanged_hash_revalidated_by_etag(self, admin):
+        """Test the cached hash is reused when S3 answers 304 Not Modified"""
+        sessions, s3 = admin
+        first = admin_lambda.get_password_hash()
+        s3.get_object.side_effect = FakeClientError('304')
+
+        assert admin_lambda.get_password_hash() == first
+        assert s3.get_object.call_args.kwargs['IfNoneMatch'] == '"v1"'
+
+
+class TestLoginRateLimit:
+    def test_failed_attempts_are_limited_per_source(self, admin):
+        """Test bcrypt stops running once a source exceeds the failure limit"""
+        for _ in range(session_manager.MAX_FAILED_LOGINS):
+            assert call('POST /admin/login', {'password': 'wrong'})[0] == 401
+
+        with patch.object(admin_lambda.bcrypt, 'checkpw') as checkpw:
+            status, body = call('POST /admin/login', {'password': PASSWORD})
+
+        assert status == 429
+        checkpw.assert_not_called()
+        assert call('POST /admin/login', {'password': PASSWORD}, source_ip='10.0.0.2')[0] == 200
+
+    def test_concurrent_burst_runs_bcrypt_at_most_the_limit(self, admin):
+        """Test attempts are reserved before bcrypt, so a parallel burst cannot overrun the limit"""
+        attempts = session_manager.MAX_FAILED_LOGINS + 5
+        with patch.object(admin_lambda.bcrypt, 'checkpw', return_value=False) as checkpw, \
+                ThreadPoolExecutor(max_workers=attempts) as pool:
+            statuses = list(pool.map(lambda _: call('POST /admin/login', {'password': 'wrong'})[0], range(attempts)))
+
+        assert checkpw.call_count == session_manager.MAX_FAILED_LOGINS
+        assert sorted(statuses) == [401] * session_manager.MAX_FAILED_LOGINS + [429] * 5
+
+    def test_success_resets_the_count(self, admin):
+        """Test a successful login gives the source its full allowance again"""
+        for _ in range(session_manager.MAX_FAILED_LOGINS - 1):
+            assert call('POST /admin/login', {'password': 'wrong'})[0] == 401
+        assert call('POST /admin/login', {'password': PASSWORD})[0] == 200
+
+        for _ in range(session_manager.MAX_FAILED_LOGINS):
+            assert call('POST /admin/login', {'password': 'wrong'})[0] == 401
+        assert call('POST /admin/login', {'password': 'wrong'})[0] == 429
@@ -5,6 +5,7 @@ import pytest
 import os
 import sys
 from unittest.mock import patch, MagicMock
+import time
 from datetime import datetime, timedelta
 
 # Mock AWS dependencies before importing
@@ -18,14 +19,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../TransactionHandle
 
 @pytest.fixture
 def auth_middleware():
-    """Import and return auth middleware"""
+    """Import and return auth middleware, with an empty verified-token cache"""
     from auth_middleware import (
         extract_token,
         verify_token,
         require_auth,
         is_public_endpoint,
+        clear_token_cache,
         AuthError
     )
+    clear_token_cache()
     return {
         'extract_token': extract_token,
         'verify_token': verify_token,
@@ -66,6 +69,17 @@ class TestExtractToken:
         token = auth_middleware['extract_token'](event)
         assert token == 'test-token-123'
     
+    def test_headers_normalized_once_per_event(self, auth_middleware):
+        """Test the lower-cased header map is built once and reused"""
+        from auth_middleware import get_header
+        event = {'headers': {'Authorization': 'Bearer test-token-123', 'If-None-Match': '"x"'}}
+        
+        auth_middleware['extract_token'](event)
+        normalized = event['_normalized_headers']
+        
+        assert get_header(event, 'if-none-match') == '"x"'
+        assert event['_normalized_headers'] is normalized
+    
     def test_extract_token_missing_header(self, auth_middleware):
         """Test extraction fails when Authorization header is missing"""
         event = {'headers': {}}
@@ -143,6 +157,61 @@ class TestVerifyToken:
             assert 'Server configuration error' in exc_info.value.message
 
 
+class TestVerifiedTokenCache:
+    def test_repeat_token_skips_decode(self, auth_middleware, jwt_secret):
+        """Test a token already verified is served from the cache"""
+        with patch('auth_middleware.JWT_SECRET', jwt_secret), \
+             patch('auth_middleware.jwt.decode') as mock_decode:
+            mock_decode.return_value = {'role': 'staff', 'exp': time.time() + 3600}
+            
+            first = auth_middleware['verify_token']('staff-token')
+            first['role'] = 'admin'
+            second = auth_middleware['verify_token']('staff-token')
+            
+            assert second['role'] == 'staff'
+            mock_decode.assert_called_once()
+    
+    def test_cached_token_expires(self, auth_middleware, jwt_secret):
+        """Test a cached token is rejected once its exp has passed"""
+        with patch('auth_middleware.JWT_SECRET', jwt_secret), \
+             patch('auth_middleware.jwt.decode') as mock_decode, \
+             patch('auth_middleware.time.time') as mock_time:
+            mock_time.return_value = 1000
+            mock_decode.return_value = {'role': 'staff', 'exp': 1060}
+            auth_middleware['verify_token']('short-token')
+            
+            mock_time.return_value = 1061
+            with pytest.raises(auth_middleware['AuthError']) as exc_info:
+                auth_middleware['verify_token']('short-token')
+            
+            assert 'Token expired' in exc_info.value.message
+            mock_decode.assert_called_once()
+    
+    def test_cache_is_bounded(self, auth_middleware, jwt_secret):
+        """Test the least recently used token is evicted past the size limit"""
+        with patch('auth_middleware.JWT_SECRET', jwt_secret), \
+             patch('auth_middleware.TOKEN_CACHE_SIZE', 2), \
+             patch('auth_middleware.jwt.decode') as mock_decode:
+            mock_decode.return_value = {'role': 'staff'}
+            for token in ('a', 'b', 'a', 'c', 'a', 'b'):
+                auth_middleware['verify_token'](token)
+            
+            # a, b, c decoded once each; b was evicted by c and decoded again
+            assert mock_decode.call_count == 4
+    
+    def test_real_token_round_trip(self, auth_middleware):
+        """Test a genuine HS256 token verifies and a tampered one does not"""
+        import jwt as jwt_lib
+        secret = 'test-secret-key-long-enough-for-hs256'
+        token = jwt_lib.encode({'role': 'admin', 'exp': int(time.time()) + 60}, secret, algorithm='HS256')
+        
+        with patch('auth_middleware.JWT_SECRET', secret):
+            assert auth_middleware['verify_token'](token)['role'] == 'admin'
+            assert auth_middleware['verify_token'](token)['role'] == 'admin'
+            with pytest.raises(auth_middleware['AuthError']):
+                auth_middleware['verify_token'](token[:-10] + ('A' if token[-10] != 'A' else 'B') + token[-9:])
+
+
 class TestRequireAuth:
     def test_require_auth_success(self, auth_middleware, jwt_secret):
         """Test successful authentication"""
@@ -220,6 +289,7 @@ class TestIsPublicEndpoint:
             'GET /discounts',
             'GET /payment-methods',
             'GET /feature-toggles',
+            'GET /bootstrap',
         ]
         
         for route in public_routes:
@@ -0,0 +1,113 @@
+"""
+Tests for BootstrapHandler Lambda
+"""
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['boto3.dynamodb'] = MagicMock()
+sys.modules['boto3.dynamodb.types'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+# BootstrapHandler shares flat module names with the other handlers, so import
+# it in isolation and put back whatever other test modules had loaded
+HANDLER_MODULES = ['lambda_handler', 'database_interface', 'dynamodb_client', 'response_utils', 'decimal_utils', 'auth_middleware']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+bootstrap_handler_path = os.path.join(os.path.dirname(__file__), '../BootstrapHandler')
+sys.path.insert(0, bootstrap_handler_path)
+
+import lambda_handler as bootstrap_lambda_module
+import database_interface as bootstrap_db
+
+sys.path.remove(bootstrap_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+from shared_utils import config_registry
+
+
+TABLE_ITEMS = {
+    'products': [
+        {'SKU': 'B', 'item': 'Moss', 'price_ea': 3.0, 'sort_order': 2},
+        {'SKU': 'A', 'item': 'Fern', 'price_ea': 5.0, 'sort_order': 1},
+    ],
+    'discounts': [{'name': 'Member', 'type': 'percent', 'value': 10.0, 'sort_order': 0}],
+    'payment_methods': [{'name': 'Cash', 'sort_order': 0}],
+}
+
+
+@pytest.fixture
+def dynamodb():
+    """Fake low-level client returning already-deserialized items"""
+    client = MagicMock()
+    # No catalog documents stored yet, so the caches fall back to scans
+    client.get_item.return_value = {}
+    client.scan.side_effect = lambda TableName, **kwargs: {'Items': [dict(item) for item in TABLE_ITEMS[TableName]]}
+    client.batch_get_item.return_value = {
+        'Responses': {'catalog_versions': [{'resource': 'products', 'version': 3}]}
+    }
+    resource = MagicMock()
+    resource.batch_get_item.return_value = {
+        'Responses': {'PlantPass-Config': [{'config_key': 'collectEmailAddresses', 'value': False}]}
+    }
+    for cache in bootstrap_db.catalog_caches.values():
+        cache.invalidate()
+    config_registry.config_cache.invalidate()
+    with patch.object(bootstrap_db, 'get_dynamodb_client', return_value=client), \
+         patch.object(bootstrap_db, '_deserialize', side_effect=lambda item: item), \
+         patch.object(config_registry, 'get_dynamodb_resource', return_value=resource):
+        yield client
+
+
+def bootstrap_event(headers=None):
+    return {'routeKey': 'GET /bootstrap', 'headers': headers or {}}
+
+
+class TestBootstrap:
+    def test_returns_whole_configuration(self, dynamodb):
+        """Test one request returns every section in the per-resource shapes"""
+        response = bootstrap_lambda_module.lambda_handler(bootstrap_event(), {})
+
+        assert response['statusCode'] == 200
+        document = json.loads(response['body'])
+        assert [p['SKU'] for p in document['products']] == ['A', 'B']
+        assert document['discounts'][0]['name'] == 'Member'
+        assert document['payment_methods'] == [{'name': 'Cash', 'sort_order': 0}]
+        assert document['feature_toggles'] == {
+            'collectEmailAddresses': False,
+            'passwordProtectAdmin': True,
+            'protectPlantPassAccess': False,
+        }
+        assert response['headers']['ETag'] == f'"{document["version"]}"'
+        dynamodb.batch_get_item.assert_called_once()
+
+    def test_warm_caches_skip_scans(self, dynamodb):
+        """Test a second request inside the cache TTL reads nothing"""
+        bootstrap_lambda_module.lambda_handler(bootstrap_event(), {})
+        bootstrap_lambda_module.lambda_handler(bootstrap_event(), {})
+
+        assert dynamodb.scan.call_count == 3
+        dynamodb.batch_get_item.assert_called_once()
+        request_items = dynamodb.batch_get_item.call_args.kwargs['RequestItems']
+        # Config is revalidated in the same batch as the catalogs
+        assert [key['resource']['S'] for key in request_items['catalog_versions']['Keys']] == [
+            'products', 'discounts', 'payment_methods', 'config'
+        ]
+
+    def test_matching_etag_returns_304(self, dynamodb):
+        """Test an unchanged configuration revalidates with an empty 304"""
+        first = bootstrap_lambda_module.lambda_handler(bootstrap_event(), {})
+
+        response = bootstrap_lambda_module.lambda_handler(
+            bootstrap_event({'if-none-match': first['headers']['ETag']}), {}
+        )
+
+        assert response['statusCode'] == 304
+        assert response['body'] == ''
@@ -0,0 +1,94 @@
+"""
+Tests for the shared warm-container catalog cache
+"""
+import pytest
+import json
+from unittest.mock import patch, MagicMock
+from shared_utils import catalog_cache
+from shared_utils.catalog_cache import CatalogCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class VersionReadError(Exception):
+    pass
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def version():
+    """Mock the version stamp GetItem"""
+    with patch.object(catalog_cache, 'get_catalog_version', return_value=1) as get_version:
+        yield get_version
+
+
+class TestCatalogCache:
+    def test_serves_cached_body_within_ttl(self, clock, version):
+        """Test repeated reads inside the TTL skip both the version check and the scan"""
+        loader = MagicMock(return_value=[{'SKU': 'A'}])
+        cache = CatalogCache('products', loader, ttl_seconds=5, clock=clock)
+
+        first = cache.get_json()
+        clock.now = 4
+        second = cache.get_json()
+
+        assert first == second == json.dumps([{'SKU': 'A'}])
+        loader.assert_called_once()
+        version.assert_called_once()
+
+    def test_unchanged_version_skips_reload(self, clock, version):
+        """Test an expired TTL only re-reads the version stamp"""
+        loader = MagicMock(return_value=[])
+        cache = CatalogCache('products', loader, ttl_seconds=5, clock=clock)
+
+        cache.get_json()
+        clock.now = 10
+        cache.get_json()
+
+        assert version.call_count == 2
+        loader.assert_called_once()
+
+    def test_bumped_version_reloads(self, clock, version):
+        """Test a newer version stamp reloads the catalog"""
+        loader = MagicMock(side_effect=[[{'name': 'Cash'}], [{'name': 'Card'}]])
+        cache = CatalogCache('payment_methods', loader, ttl_seconds=5, clock=clock)
+
+        cache.get_json()
+        version.return_value = 2
+        clock.now = 10
+
+        assert cache.get() == (2, json.dumps([{'name': 'Card'}]))
+
+    def test_etag_follows_content(self, clock, version):
+        """Test the cached ETag is computed once per load and changes with the body"""
+        loader = MagicMock(side_effect=[[{'SKU': 'A'}], [{'SKU': 'B'}]])
+        cache = CatalogCache('products', loader, ttl_seconds=5, clock=clock)
+
+        first_etag, _ = cache.get_with_etag()
+        assert cache.get_with_etag()[0] == first_etag
+
+        version.return_value = 2
+        clock.now = 10
+        assert cache.get_with_etag()[0] != first_etag
+
+    def test_version_read_failure_serves_uncached(self, clock, version):
+        """Test a failed version check falls back to loading directly"""
+        version.side_effect = VersionReadError('table missing')
+        loader = MagicMock(return_value=[])
+        cache = CatalogCache('discounts', loader, clock=clock)
+
+        with patch.object(catalog_cache, 'ClientError', VersionReadError):
+            assert cache.get() == (None, '[]')
+            assert cache.get() == (None, '[]')
+
+        assert loader.call_count == 2
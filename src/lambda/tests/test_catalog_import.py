@@ -0,0 +1,146 @@
+"""
+Tests for streaming catalog import and parallel catalog writes
+"""
+import pytest
+import io
+import sys
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['boto3.dynamodb'] = MagicMock()
+sys.modules['boto3.dynamodb.types'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+from shared_utils.catalog_import import (
+    SkuGenerator, import_id_from_key, import_object_key, read_product_import, replace_deletion_refusal
+)
+from shared_utils import catalog_sync
+
+
+def csv_stream(text):
+    return io.BytesIO(text.encode('utf-8'))
+
+
+class TestSkuGenerator:
+    def test_matches_admin_ui_rules(self):
+        """Test SKUs use the name's first two letters and the lowest free number"""
+        generator = SkuGenerator(['FE001', 'FE003'])
+
+        assert generator.generate('Fern') == 'FE002'
+        assert generator.generate('fern, maidenhair') == 'FE004'
+        assert generator.generate('7 Up') == 'UP001'
+        assert generator.generate('1') == 'XX001'
+
+
+class TestReadProductImport:
+    def test_parses_rows_and_generates_skus(self):
+        """Test valid rows become products, with Excel BOM and header aliases handled"""
+        stream = csv_stream('\ufeffName,Price,SKU\nFern,$5.00,\nMoss,"1,234.5",MO001\n\n')
+
+        products, errors, protected = read_product_import(stream, ['FE001'])
+
+        assert errors == []
+        assert products == [
+            {'item': 'Fern', 'price_ea': Decimal('5.00'), 'sort_order': 1, 'SKU': 'FE002'},
+            {'item': 'Moss', 'price_ea': Decimal('1234.50'), 'SKU': 'MO001', 'sort_order': 2},
+        ]
+
+    def test_reports_rejected_rows(self):
+        """Test invalid and duplicate rows are reported by spreadsheet row and protected from deletion"""
+        stream = csv_stream(
+            'SKU,item,price_ea,sort_order\n'
+            'AB001,Aster,3,1\n'
+            'AB001,Aster again,3,2\n'
+            'CD 002,,free,x\n'
+        )
+
+        products, errors, protected = read_product_import(stream, [])
+
+        assert [p['SKU'] for p in products] == ['AB001']
+        assert [e['row'] for e in errors] == [3, 4]
+        assert 'Duplicate SKU' in errors[0]['errors'][0]
+        assert len(errors[1]['errors']) == 4
+        assert protected == {'AB001', 'CD 002'}
+
+    def test_generated_skus_skip_skus_later_in_file(self):
+        """Test generated SKUs never collide with explicit SKUs further down the file"""
+        stream = csv_stream('item,price_ea,SKU\nFern,1,\nFern two,1,FE001\n')
+
+        products, errors, protected = read_product_import(stream, [])
+
+        assert sorted(p['SKU'] for p in products) == ['FE001', 'FE002']
+
+    def test_unrecognised_header_fails_before_any_row(self):
+        """Test a header without item and price columns fails the import instead of rejecting every row"""
+        with pytest.raises(ValueError, match='price_ea'):
+            read_product_import(csv_stream('Name,Cost\nBasil,3\n'), ['BA001'])
+        with pytest.raises(ValueError, match='item and price_ea'):
+            read_product_import(csv_stream('item;price_ea\nBasil;3\n'), ['BA001'])
+
+    def test_replace_deletions_refused_when_file_coverage_is_unknown(self):
+        """Test a replace import may not delete with no valid rows or with rejected rows lacking a SKU"""
+        products, errors, _ = read_product_import(csv_stream('item,price_ea\nBasil,free\n'), ['BA001'])
+        assert products == [] and replace_deletion_refusal(products, errors)
+
+        products, errors, _ = read_product_import(csv_stream('item,price_ea\nFern,1\nBasil,free\n'), [])
+        assert 'no SKU' in replace_deletion_refusal(products, errors)
+
+        products, errors, _ = read_product_import(csv_stream('SKU,item,price_ea\nFE001,Fern,1\nBA001,Basil,free\n'), [])
+        assert replace_deletion_refusal(products, errors) is None
+
+
+class TestImportKeys:
+    def test_round_trip(self):
+        """Test import ids are recovered only from import upload keys"""
+        assert import_id_from_key(import_object_key('abc123')) == 'abc123'
+        assert import_id_from_key('imports/products/abc123.report.json') is None
+
+
+class TestApplyCatalogDiffParallel:
+    def test_batches_and_retries_unprocessed(self, monkeypatch):
+        """Test writes go out in 25-item batches and unprocessed items are resent"""
+        monkeypatch.setattr(catalog_sync.time, 'sleep', lambda seconds: None)
+        client = MagicMock()
+        calls = []
+
+        def batch_write_item(RequestItems):
+            requests = RequestItems['products']
+            calls.append(len(requests))
+            # Throttle the first request once
+            if len(calls) == 1:
+                return {'UnprocessedItems': {'products': requests[:1]}}
+            return {}
+
+        client.batch_write_item.side_effect = batch_write_item
+        items = [{'SKU': f'AB{i:03d}'} for i in range(30)]
+
+        catalog_sync.apply_catalog_diff_parallel(client, 'products', 'SKU', items, ['ZZ001'], max_workers=1)
+
+        assert calls == [25, 1, 6]
+
+    def test_guard_failure_stops_later_batches(self):
+        """Test a failing guard (a lost edit lease) stops the import before the next batch"""
+        client = MagicMock()
+        client.batch_write_item.return_value = {}
+        guard = MagicMock(side_effect=[None, RuntimeError('lease lost'), None])
+        items = [{'SKU': f'AB{i:03d}'} for i in range(60)]
+
+        with pytest.raises(catalog_sync.CatalogWriteInterrupted, match='lease lost') as interrupted:
+            catalog_sync.apply_catalog_diff_parallel(client, 'products', 'SKU', items, [], max_workers=1, guard=guard)
+
+        assert client.batch_write_item.call_count == 1
+        assert guard.call_count == 2
+        # The first batch landed, so the caller must still commit it
+        assert (interrupted.value.written, interrupted.value.total) == (25, 60)
+
+    def test_failure_before_any_write_raises_the_error(self):
+        """Test nothing is reported as landed when the first batch already fails"""
+        client = MagicMock()
+        guard = MagicMock(side_effect=RuntimeError('lease lost'))
+
+        with pytest.raises(RuntimeError, match='lease lost'):
+            catalog_sync.apply_catalog_diff_parallel(client, 'products', 'SKU', [{'SKU': 'AB001'}], [], guard=guard)
+        client.batch_write_item.assert_not_called()
@@ -0,0 +1,69 @@
+"""
+Tests for static catalog snapshot publishing (moto S3)
+"""
+import pytest
+import gzip
+import json
+
+from tests.real_aws import real_aws, import_real
+
+catalog_snapshot = import_real('shared_utils.catalog_snapshot')
+publish_catalog_snapshot = catalog_snapshot.publish_catalog_snapshot
+snapshot_key = catalog_snapshot.snapshot_key
+pointer_key = catalog_snapshot.pointer_key
+
+BUCKET = 'plantpass-catalog-snapshots'
+
+
+@pytest.fixture
+def s3():
+    """Real S3 client against a moto bucket"""
+    with real_aws():
+        import boto3
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def read_json(s3, key):
+    return json.loads(s3.get_object(Bucket=BUCKET, Key=key)['Body'].read())
+
+
+class TestPublishCatalogSnapshot:
+    def test_writes_compressed_snapshot_and_pointer(self, s3):
+        """Test the versioned gzip snapshot and latest.json pointer are published"""
+        products = [{'SKU': 'A', 'item': 'Fern', 'price_ea': 5.0, 'sort_order': 1}]
+
+        pointer = publish_catalog_snapshot('products', 4, lambda: products, bucket=BUCKET, s3=s3)
+
+        snapshot = s3.get_object(Bucket=BUCKET, Key=snapshot_key('products', 4))
+        assert snapshot['ContentEncoding'] == 'gzip'
+        assert snapshot['CacheControl'] == catalog_snapshot.SNAPSHOT_CACHE_CONTROL
+        assert json.loads(gzip.decompress(snapshot['Body'].read())) == products
+        assert read_json(s3, pointer_key('products')) == pointer
+        assert pointer['url'] == '/catalog/products/v4.json'
+
+    def test_older_version_does_not_replace_newer_pointer(self, s3):
+        """Test a delayed publish of an older version leaves the pointer alone"""
+        publish_catalog_snapshot('discounts', 6, lambda: [], bucket=BUCKET, s3=s3)
+
+        assert publish_catalog_snapshot('discounts', 5, lambda: [], bucket=BUCKET, s3=s3) is None
+        assert read_json(s3, pointer_key('discounts'))['version'] == 6
+
+    def test_disabled_without_bucket(self, s3, monkeypatch):
+        """Test nothing is loaded or written when no snapshot bucket is configured"""
+        monkeypatch.delenv('CATALOG_SNAPSHOT_BUCKET', raising=False)
+
+        def loader():
+            raise AssertionError('loader should not run')
+
+        assert publish_catalog_snapshot('payment_methods', 1, loader, s3=s3) is None
+        assert s3.list_objects_v2(Bucket=BUCKET)['KeyCount'] == 0
+
+    def test_failed_publish_after_write_is_logged_not_raised(self, s3):
+        """Test a snapshot failure after a committed write does not fail the write"""
+        def loader():
+            raise RuntimeError('S3 unavailable')
+
+        assert catalog_snapshot.try_publish_catalog_snapshot('products', 2, loader, bucket=BUCKET, s3=s3) is None
+        assert s3.list_objects_v2(Bucket=BUCKET)['KeyCount'] == 0
@@ -0,0 +1,160 @@
+"""
+Tests for single-document catalog storage (moto DynamoDB)
+"""
+import pytest
+from unittest.mock import patch
+
+from tests.real_aws import real_aws, import_real
+
+catalog_store = import_real('shared_utils.catalog_store')
+ClientError = catalog_store.ClientError
+scan_all_items = catalog_store.scan_all_items
+load_catalog_document = catalog_store.load_catalog_document
+store_catalog_document = catalog_store.store_catalog_document
+read_catalog = catalog_store.read_catalog
+commit_catalog_change = catalog_store.commit_catalog_change
+chunk_key = catalog_store.chunk_key
+
+PRODUCTS = [
+    {'SKU': 'AB001', 'item': 'Fern', 'price_ea': 5.0, 'sort_order': 1},
+    {'SKU': 'CD002', 'item': 'Moss', 'price_ea': 3.5, 'sort_order': 2},
+]
+
+
+@pytest.fixture
+def dynamodb():
+    """Real DynamoDB resource against moto tables"""
+    with real_aws():
+        import boto3
+        resource = boto3.resource('dynamodb', region_name='us-east-1')
+        for name, key in (('catalog_versions', 'resource'), ('products', 'SKU')):
+            resource.create_table(
+                TableName=name,
+                KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST'
+            )
+        yield resource
+
+
+@pytest.fixture
+def versions(dynamodb):
+    return dynamodb.Table('catalog_versions')
+
+
+class TestCatalogDocument:
+    def test_round_trip(self, versions):
+        """Test a stored document reads back as the same catalog and bumps the version"""
+        assert load_catalog_document('products', versions) is None
+
+        assert store_catalog_document('products', PRODUCTS, versions) == 1
+        assert store_catalog_document('products', PRODUCTS[:1], versions) == 2
+
+        assert load_catalog_document('products', versions) == PRODUCTS[:1]
+        assert int(versions.get_item(Key={'resource': 'products'})['Item']['version']) == 2
+
+    def test_large_document_is_chunked(self, versions):
+        """Test a document bigger than one chunk is split and reassembled"""
+        products = [{'SKU': f'{i:05d}', 'item': f'Plant {i}' * 20, 'price_ea': i} for i in range(200)]
+
+        with patch.object(catalog_store, 'MAX_CHUNK_BYTES', 1024):
+            store_catalog_document('products', products, versions)
+
+        head = versions.get_item(Key={'resource': 'products'})['Item']
+        assert int(head['chunk_count']) > 1
+        assert load_catalog_document('products', versions) == products
+
+    def test_torn_chunks_fall_back_to_scan(self, versions):
+        """Test a document whose chunks are gone (replaced mid-read) is treated as no document"""
+        with patch.object(catalog_store, 'MAX_CHUNK_BYTES', 16):
+            store_catalog_document('products', PRODUCTS, versions)
+        head = versions.get_item(Key={'resource': 'products'})['Item']
+        versions.delete_item(Key={'resource': chunk_key('products', 1, head['write_id'])})
+
+        assert load_catalog_document('products', versions) is None
+        assert read_catalog('products', lambda: ['scanned'], versions) == ['scanned']
+
+    def test_undecodable_document_falls_back_to_scan(self, versions):
+        """Test a corrupt document is read from the table instead of failing the request"""
+        store_catalog_document('products', PRODUCTS, versions)
+        versions.update_item(
+            Key={'resource': 'products'},
+            UpdateExpression='SET document = :doc',
+            ExpressionAttributeValues={':doc': b'not zlib'}
+        )
+
+        assert read_catalog('products', lambda: ['scanned'], versions) == ['scanned']
+
+    def test_concurrent_writers_keep_separate_chunks(self, versions):
+        """Test a writer losing the swap neither touches nor leaves behind the winner's chunks"""
+        store_catalog_document('products', [], versions)
+        get_item = versions.get_item
+        winner = [{'SKU': f'{i:05d}', 'item': f'Winner {i}' * 10} for i in range(50)]
+
+        def racing_get_item(**kwargs):
+            response = get_item(**kwargs)
+            if kwargs.get('ProjectionExpression'):
+                # Another writer stores the same next version first
+                with patch.object(versions, 'get_item', get_item):
+                    store_catalog_document('products', winner, versions)
+            return response
+
+        with patch.object(catalog_store, 'MAX_CHUNK_BYTES', 256):
+            with patch.object(versions, 'get_item', racing_get_item):
+                with pytest.raises(ClientError):
+                    store_catalog_document('products', PRODUCTS * 20, versions)
+
+        assert load_catalog_document('products', versions) == winner
+        head = versions.get_item(Key={'resource': 'products'})['Item']
+        rows = versions.scan()['Items']
+        assert len(rows) == int(head['chunk_count'])
+
+        # Replacing the document removes the previous write's chunks too
+        store_catalog_document('products', [], versions)
+        assert [row['resource'] for row in versions.scan()['Items']] == ['products']
+
+
+class TestScanAllItems:
+    def test_follows_every_page(self, dynamodb):
+        """Test scans keep reading past LastEvaluatedKey"""
+        table = dynamodb.Table('products')
+        for product in PRODUCTS:
+            table.put_item(Item={'SKU': product['SKU'], 'item': product['item']})
+
+        items = scan_all_items(table, Limit=1)
+
+        assert sorted(item['SKU'] for item in items) == ['AB001', 'CD002']
+
+
+class TestCommitCatalogChange:
+    def test_retries_after_concurrent_commit(self, versions):
+        """Test a writer that loses the conditional swap reloads and commits the next version"""
+        store_catalog_document('products', [], versions)
+        get_item = versions.get_item
+        raced = []
+
+        def racing_get_item(**kwargs):
+            response = get_item(**kwargs)
+            if kwargs.get('ProjectionExpression') and not raced:
+                # Another writer commits between our version read and our swap
+                raced.append(1)
+                store_catalog_document('products', PRODUCTS[:1], versions)
+            return response
+
+        with patch.object(versions, 'get_item', racing_get_item):
+            version, items = commit_catalog_change('products', lambda: PRODUCTS, versions)
+
+        assert items == PRODUCTS
+        assert load_catalog_document('products', versions) == PRODUCTS
+        assert version == 3
+
+    def test_conditional_swap_rejects_stale_writer(self, versions):
+        """Test the head row only accepts the version the writer read"""
+        store_catalog_document('products', PRODUCTS, versions)
+
+        with patch.object(versions, 'get_item', return_value={}):
+            with pytest.raises(ClientError) as error:
+                store_catalog_document('products', [], versions)
+
+        assert error.value.response['Error']['Code'] == 'ConditionalCheckFailedException'
+        assert load_catalog_document('products', versions) == PRODUCTS
@@ -0,0 +1,117 @@
+"""
+Tests for shared catalog sync utilities
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from shared_utils.catalog_sync import (
+    diff_catalog,
+    apply_catalog_diff,
+    parse_patch_body,
+)
+from shared_utils.decimal_utils import decimal_to_float
+
+
+class TestDiffCatalog:
+    def test_single_price_change_writes_one_row(self):
+        existing = [
+            {'SKU': 'A', 'item': 'Fern', 'price_ea': 5.0, 'sort_order': 1},
+            {'SKU': 'B', 'item': 'Moss', 'price_ea': 3.0, 'sort_order': 2},
+        ]
+        desired = [
+            {'SKU': 'A', 'item': 'Fern', 'price_ea': Decimal('6.00'), 'sort_order': 1},
+            {'SKU': 'B', 'item': 'Moss', 'price_ea': Decimal('3.0'), 'sort_order': 2},
+        ]
+
+        puts, deletes, counts = diff_catalog(existing, desired, 'SKU', normalize=decimal_to_float)
+
+        assert [item['SKU'] for item in puts] == ['A']
+        assert deletes == []
+        assert counts == {'created': 0, 'updated': 1, 'deleted': 0, 'unchanged': 1}
+
+    def test_creates_and_deletes(self):
+        existing = [{'name': 'Cash', 'sort_order': 0}]
+        desired = [{'name': 'Card', 'sort_order': 0}]
+
+        puts, deletes, counts = diff_catalog(existing, desired, 'name')
+
+        assert puts == desired
+        assert deletes == ['Cash']
+        assert counts['created'] == 1
+        assert counts['deleted'] == 1
+
+    def test_duplicate_desired_keys_last_wins(self):
+        desired = [{'name': 'Cash', 'sort_order': 0}, {'name': 'Cash', 'sort_order': 3}]
+
+        puts, _, counts = diff_catalog([], desired, 'name')
+
+        assert puts == [{'name': 'Cash', 'sort_order': 3}]
+        assert counts['created'] == 1
+
+
+class TestApplyCatalogDiff:
+    def test_no_changes_skips_batch_writer(self):
+        table = MagicMock()
+
+        apply_catalog_diff(table, 'SKU', [], [])
+
+        table.batch_writer.assert_not_called()
+
+    def test_writes_puts_and_deletes(self):
+        table = MagicMock()
+        batch = table.batch_writer.return_value.__enter__.return_value
+
+        apply_catalog_diff(table, 'SKU', [{'SKU': 'A'}], ['B'])
+
+        batch.put_item.assert_called_once_with(Item={'SKU': 'A'})
+        batch.delete_item.assert_called_once_with(Key={'SKU': 'B'})
+
+
+class TestParsePatchBody:
+    def test_valid_patch(self):
+        is_valid, upserts, deletes, errors = parse_patch_body(
+            {'upsert': [{'SKU': 'A', 'item': 'Fern', 'price_ea': 5}], 'delete': ['B']}, 'SKU'
+        )
+
+        assert is_valid
+        assert len(upserts) == 1
+        assert deletes == ['B']
+        assert errors == []
+
+    def test_rejects_non_object(self):
+        is_valid, _, _, errors = parse_patch_body([], 'SKU')
+
+        assert not is_valid
+        assert errors
+
+    def test_rejects_key_touched_twice(self):
+        is_valid, _, _, errors = parse_patch_body(
+            {'upsert': [{'SKU': 'A'}], 'delete': ['A']}, 'SKU'
+        )
+
+        assert not is_valid
+        assert 'A' in errors[0]
+
+    def test_rejects_missing_key(self):
+        is_valid, _, _, errors = parse_patch_body({'upsert': [{'item': 'Fern'}]}, 'SKU')
+
+        assert not is_valid
+        assert 'Upsert 1' in errors[0]
+
+    def test_rejects_upserts_missing_required_fields(self):
+        is_valid, _, _, errors = parse_patch_body(
+            {'upsert': [{'SKU': 'A', 'item': 'Fern', 'price_ea': 5}, {'SKU': 'B', 'item': 'Moss'}]},
+            'SKU', required=('item', 'price_ea')
+        )
+
+        assert not is_valid
+        assert errors == ['Upsert 2 (B): Missing price_ea']
+
+    def test_rejects_values_outside_choices(self):
+        is_valid, _, _, errors = parse_patch_body(
+            {'upsert': [{'name': 'Member', 'type': 'bogus'}]},
+            'name', required=('type',), choices={'type': ('percent', 'dollar')}
+        )
+
+        assert not is_valid
+        assert 'Upsert 1 (Member)' in errors[0]
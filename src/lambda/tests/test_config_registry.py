@@ -0,0 +1,173 @@
+"""
+Tests for the typed config registry and the config routes of
+FeatureTogglesHandler
+"""
+import pytest
+import json
+import os
+import sys
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+from shared_utils import config_registry
+
+# FeatureTogglesHandler shares flat module names with the other handlers, so
+# import it in isolation and put back whatever other test modules had loaded
+HANDLER_MODULES = ['lambda_handler', 'dynamodb_client', 'response_utils', 'auth_middleware']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+toggles_handler_path = os.path.join(os.path.dirname(__file__), '../FeatureTogglesHandler')
+sys.path.insert(0, toggles_handler_path)
+
+import lambda_handler as toggles_lambda
+import auth_middleware as toggles_auth
+
+sys.path.remove(toggles_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+
+class FakeDynamoDB:
+    """Resource stand-in answering BatchGetItem from in-memory rows"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.batch_get_item = MagicMock(side_effect=self._batch_get_item)
+        self.meta = MagicMock()
+        self.meta.client.transact_write_items.side_effect = self._transact_write_items
+
+    def _batch_get_item(self, RequestItems):
+        responses = {}
+        for table_name, request in RequestItems.items():
+            rows = self.tables.get(table_name, [])
+            responses[table_name] = [
+                dict(row) for row in rows
+                if any(all(row.get(k) == v for k, v in key.items()) for key in request['Keys'])
+            ]
+        return {'Responses': responses}
+
+    def _transact_write_items(self, TransactItems):
+        for operation in TransactItems:
+            put = operation['Put']
+            rows = self.tables.setdefault(put['TableName'], [])
+            rows[:] = [row for row in rows if row['config_key'] != put['Item']['config_key']]
+            rows.append(dict(put['Item']))
+
+
+@pytest.fixture
+def dynamodb():
+    """Config store holding one migrated toggle plus legacy rows"""
+    fake = FakeDynamoDB({
+        'PlantPass-Config': [{'config_key': 'passwordProtectAdmin', 'value': False}],
+        'PlantPass-FeatureToggles': [
+            {'config_id': 'feature_toggles', 'passwordProtectAdmin': True, 'protectPlantPassAccess': True}
+        ],
+    })
+    config_registry.config_cache.invalidate()
+    with patch.object(config_registry, 'get_dynamodb_resource', return_value=fake), \
+         patch('shared_utils.catalog_cache.get_catalog_version', return_value=1), \
+         patch.object(config_registry, 'bump_catalog_version') as bump:
+        yield fake, bump
+    config_registry.config_cache.invalidate()
+
+
+def call(route_key, body=None, role=None):
+    event = {
+        'routeKey': route_key,
+        'body': json.dumps(body) if body is not None else None,
+        'headers': {'authorization': 'Bearer token'} if role else {}
+    }
+    claims = {'role': role}
+    with patch.object(toggles_lambda, 'verify_token', return_value=claims), \
+         patch.object(toggles_auth, 'verify_token', return_value=claims):
+        response = toggles_lambda.lambda_handler(event, None)
+    return response['statusCode'], json.loads(response['body']) if response['body'] else None
+
+
+class TestLoadConfig:
+    def test_one_batch_with_defaults_and_legacy_fallback(self, dynamodb):
+        """Test the config table wins, legacy rows fill gaps, defaults fill the rest"""
+        fake, _ = dynamodb
+
+        config = config_registry.get_config()
+
+        assert config['passwordProtectAdmin'] is False
+        assert config['protectPlantPassAccess'] is True
+        assert config['collectEmailAddresses'] is True
+        assert config['plantpass.passphrase'] == ''
+        fake.batch_get_item.assert_called_once()
+
+    def test_warm_cache_reads_nothing(self, dynamodb):
+        """Test repeat reads inside the TTL are served from memory"""
+        fake, _ = dynamodb
+        config_registry.get_config()
+        config_registry.get_config()
+
+        fake.batch_get_item.assert_called_once()
+
+    def test_numbers_coerced_to_declared_type(self):
+        """Test stored Decimals come back as int for integer keys"""
+        key = config_registry.ConfigKey('retries', int, 3)
+
+        assert key.coerce(Decimal('5')) == 5
+        assert isinstance(key.coerce(Decimal('5')), int)
+
+
+class TestUpdateConfig:
+    def test_partial_update_writes_only_given_keys(self, dynamodb):
+        """Test an update touches only its keys and bumps the config version"""
+        fake, bump = dynamodb
+
+        config = config_registry.update_config({'collectEmailAddresses': False})
+
+        written = fake.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert [op['Put']['Item'] for op in written] == [{'config_key': 'collectEmailAddresses', 'value': False}]
+        bump.assert_called_once_with('config')
+        assert config['collectEmailAddresses'] is False
+        assert config['protectPlantPassAccess'] is True
+
+    def test_rejects_wrong_types_and_unknown_keys(self, dynamodb):
+        """Test validation runs before anything is written"""
+        fake, _ = dynamodb
+
+        for changes in ({'collectEmailAddresses': 1}, {'plantpass.passphrase': True}, {'noSuchFlag': True}, {}):
+            with pytest.raises(ValueError):
+                config_registry.update_config(changes)
+
+        with pytest.raises(ValueError):
+            config_registry.update_config({'plantpass.passphrase': 'moss'}, access=config_registry.PUBLIC)
+
+        fake.meta.client.transact_write_items.assert_not_called()
+
+
+class TestConfigRoutes:
+    def test_feature_toggles_partial_put(self, dynamodb):
+        """Test PUT /feature-toggles accepts a single flag"""
+        status, body = call('PUT /feature-toggles', {'collectEmailAddresses': False}, role='admin')
+
+        assert status == 200
+        assert body['collectEmailAddresses'] is False
+        assert body['passwordProtectAdmin'] is False
+        assert 'plantpass.passphrase' not in body
+
+    def test_get_config_by_role(self, dynamodb):
+        """Test admin tokens also see admin keys and nobody sees secrets"""
+        admin_key = config_registry.ConfigKey('receiptFooter', str, 'Thank you!', config_registry.ADMIN)
+        with patch.object(config_registry, 'CONFIG_KEYS', config_registry.CONFIG_KEYS + [admin_key]), \
+             patch.dict(config_registry.REGISTRY, {admin_key.name: admin_key}):
+            _, public = call('GET /config')
+            _, admin = call('GET /config', role='admin')
+
+        assert set(public) == {'collectEmailAddresses', 'passwordProtectAdmin', 'protectPlantPassAccess'}
+        assert admin == {**public, 'receiptFooter': 'Thank you!'}
+
+    def test_put_config_requires_admin(self, dynamodb):
+        """Test staff tokens cannot write config"""
+        assert call('PUT /config', {'collectEmailAddresses': False}, role='staff')[0] == 403
+        assert call('PUT /config', {'collectEmailAddresses': 'no'}, role='admin')[0] == 400
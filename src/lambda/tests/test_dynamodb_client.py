@@ -0,0 +1,77 @@
+"""
+Tests for the shared, lazily created AWS client registry
+"""
+import importlib.util
+import os
+import pytest
+from unittest.mock import patch
+
+from tests.real_aws import real_aws, import_real
+
+dynamodb_client = import_real('shared_utils.dynamodb_client')
+
+
+@pytest.fixture
+def registry():
+    """Empty registry whose clients talk to moto"""
+    dynamodb_client.reset_clients()
+    with real_aws(), patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-east-1'}):
+        yield dynamodb_client
+    dynamodb_client.reset_clients()
+
+
+class TestClientRegistry:
+    def test_clients_created_once_and_tuned(self, registry):
+        """Test repeat lookups share one client built with the tuned config"""
+        client = registry.get_dynamodb_client()
+
+        assert registry.get_client('dynamodb') is client
+        config = client.meta.config
+        assert config.retries['mode'] == 'adaptive'
+        assert config.max_pool_connections == registry.AWS_MAX_POOL_CONNECTIONS
+        assert config.tcp_keepalive is True
+        assert config.connect_timeout == registry.AWS_CONNECT_TIMEOUT
+
+    def test_client_arguments_get_their_own_client(self, registry):
+        """Test clients with different arguments (e.g. endpoint) are kept apart"""
+        default = registry.get_client('s3')
+        regional = registry.get_client('s3', region_name='eu-west-1')
+
+        assert default is not regional
+        assert registry.get_client('s3', region_name='eu-west-1') is regional
+
+    def test_lazy_table_builds_nothing_until_used(self, registry):
+        """Test a module-level lazy table makes no resource at import"""
+        registry.get_dynamodb_resource().create_table(
+            TableName='products',
+            KeySchema=[{'AttributeName': 'SKU', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'SKU', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        registry.reset_clients()
+
+        table = registry.lazy_table('PRODUCTS_TABLE', 'products')
+        assert registry._resources == {}
+
+        table.put_item(Item={'SKU': 'A'})
+        assert table.name == 'products'
+        assert list(registry._resources) == ['dynamodb']
+
+
+class TestFlatCopies:
+    def load_flat(self, handler):
+        path = os.path.join(os.path.dirname(__file__), '..', handler, 'dynamodb_client.py')
+        spec = importlib.util.spec_from_file_location(f'{handler}_dynamodb_client', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_layered_handlers_share_the_layer_registry(self):
+        """Test a handler deployed with the layer builds no second session or pool"""
+        import shared_utils.dynamodb_client as layer
+        flat = self.load_flat('ProductsHandler')
+
+        assert flat.get_session is layer.get_session
+        assert flat.lazy_table is layer.lazy_table
+        # Handlers without the layer keep a standalone registry
+        assert self.load_flat('EmailHandler').get_session is not layer.get_session
@@ -0,0 +1,152 @@
+"""
+Tests for edit leases and lease-guarded catalog writes (moto DynamoDB)
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from tests.real_aws import real_aws, import_real
+
+edit_lease = import_real('shared_utils.edit_lease')
+catalog_sync = import_real('shared_utils.catalog_sync')
+ClientError = edit_lease.ClientError
+LeaseConflict = edit_lease.LeaseConflict
+
+
+@pytest.fixture
+def tables():
+    """Real locks and products tables in moto, with a controllable clock"""
+    with real_aws():
+        import boto3
+        resource = boto3.resource('dynamodb', region_name='us-east-1')
+        for name, key in (('PlantPass-Locks', 'resource_type'), ('products', 'SKU')):
+            resource.create_table(
+                TableName=name,
+                KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST'
+            )
+        clock = MagicMock()
+        clock.time.return_value = 1000
+        with patch.object(edit_lease, '_table', return_value=resource.Table('PlantPass-Locks')), \
+             patch.object(edit_lease, 'time', clock):
+            yield resource.Table('products'), clock
+
+
+def write_products(products, lease_id=None):
+    """Guarded write as the catalog handlers do it"""
+    try:
+        catalog_sync.apply_catalog_diff_guarded(
+            products, 'SKU', [{'SKU': 'A', 'item': 'Fern'}], [],
+            edit_lease.lease_condition_check('products', lease_id)
+        )
+    except ClientError as e:
+        edit_lease.raise_for_lease_conflict('products', e)
+        raise
+
+
+class TestLeaseLifecycle:
+    def test_second_editor_is_refused(self, tables):
+        """Test a live lease cannot be acquired by anyone else"""
+        lease = edit_lease.acquire_lease('products', 'front desk')
+
+        with pytest.raises(LeaseConflict) as conflict:
+            edit_lease.acquire_lease('products', 'back office')
+
+        assert conflict.value.lease['owner'] == 'front desk'
+        assert conflict.value.lease['expiresAt'] == lease['expiresAt']
+        assert 'leaseId' not in edit_lease.get_lease('products')
+
+    def test_expired_lease_is_taken_over(self, tables):
+        """Test an abandoned lease expires, and its old holder can no longer renew it"""
+        _, clock = tables
+        first = edit_lease.acquire_lease('products', 'front desk')
+        clock.time.return_value += edit_lease.LEASE_SECONDS
+
+        second = edit_lease.acquire_lease('products', 'back office')
+
+        with pytest.raises(LeaseConflict):
+            edit_lease.renew_lease('products', first['leaseId'])
+        # Releasing a lost lease leaves the new holder's lease alone
+        edit_lease.release_lease('products', first['leaseId'])
+        assert edit_lease.get_lease('products')['owner'] == 'back office'
+
+        clock.time.return_value += 60
+        assert edit_lease.renew_lease('products', second['leaseId'])['expiresAt'] == 1180 + edit_lease.LEASE_SECONDS
+
+    def test_check_lease_before_deferred_writes(self, tables):
+        """Test the read-side check passes for the holder or a free resource and refuses others"""
+        edit_lease.check_lease('products')
+
+        lease = edit_lease.acquire_lease('products', 'front desk')
+        edit_lease.check_lease('products', lease['leaseId'])
+        with pytest.raises(LeaseConflict) as conflict:
+            edit_lease.check_lease('products', 'someone-elses-guess')
+        assert conflict.value.lease['owner'] == 'front desk'
+        with pytest.raises(LeaseConflict):
+            edit_lease.check_lease('products')
+
+    def test_release_frees_the_resource(self, tables):
+        """Test a released lease can be acquired straight away"""
+        lease = edit_lease.acquire_lease('products', 'front desk')
+        edit_lease.release_lease('products', lease['leaseId'])
+
+        assert edit_lease.get_lease('products')['isLocked'] is False
+        assert edit_lease.acquire_lease('products', 'back office')['owner'] == 'back office'
+
+
+class TestGuardedCatalogWrites:
+    def test_write_refused_while_another_admin_holds_the_lease(self, tables):
+        """Test the lease check and row writes succeed or fail together"""
+        products, _ = tables
+        edit_lease.acquire_lease('products', 'front desk')
+
+        with pytest.raises(LeaseConflict):
+            write_products(products)
+        with pytest.raises(LeaseConflict):
+            write_products(products, lease_id='someone-elses-guess')
+
+        assert products.scan()['Items'] == []
+
+    def test_holder_and_unleased_writes_succeed(self, tables):
+        """Test the lease holder may write, as may anyone when nothing is leased"""
+        products, _ = tables
+        write_products(products)
+
+        lease = edit_lease.acquire_lease('products', 'front desk')
+        write_products(products, lease_id=lease['leaseId'])
+
+        assert products.get_item(Key={'SKU': 'A'})['Item']['item'] == 'Fern'
+
+    def test_large_diff_split_into_guarded_transactions(self):
+        """Test every transaction carries the guard and stays within 100 actions"""
+        table = MagicMock()
+        table.name = 'products'
+        guard = {'ConditionCheck': {'TableName': 'PlantPass-Locks'}}
+
+        catalog_sync.apply_catalog_diff_guarded(
+            table, 'SKU', [{'SKU': str(i)} for i in range(150)], ['old'], guard
+        )
+
+        calls = table.meta.client.transact_write_items.call_args_list
+        assert [len(call.kwargs['TransactItems']) for call in calls] == [100, 53]
+        assert all(call.kwargs['TransactItems'][0] is guard for call in calls)
+
+    def test_interrupted_large_write_reports_what_landed(self, tables):
+        """Test a lease lost between transactions reports the rows already written"""
+        edit_lease.acquire_lease('products', 'front desk')
+        table = MagicMock()
+        table.name = 'products'
+        cancelled = ClientError({
+            'Error': {'Code': 'TransactionCanceledException'},
+            'CancellationReasons': [{'Code': 'ConditionalCheckFailed'}]
+        }, 'TransactWriteItems')
+        table.meta.client.transact_write_items.side_effect = [None, cancelled]
+
+        with pytest.raises(catalog_sync.CatalogWriteInterrupted) as interrupted:
+            catalog_sync.apply_catalog_diff_guarded(
+                table, 'SKU', [{'SKU': str(i)} for i in range(150)], [], edit_lease.lease_condition_check('products')
+            )
+
+        assert (interrupted.value.written, interrupted.value.total) == (99, 150)
+        with pytest.raises(LeaseConflict, match='99 of 150 changes were saved'):
+            edit_lease.raise_for_lease_conflict('products', interrupted.value.cause, interrupted.value.progress)
@@ -0,0 +1,95 @@
+"""
+Tests for per-invocation phase timing (EMF records)
+"""
+import json
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+from shared_utils import metrics, warmup
+from shared_utils.router import Router, Route, ADMIN, PUBLIC
+from tests.real_aws import real_aws, import_real
+
+
+@pytest.fixture(autouse=True)
+def fresh_container():
+    with patch.object(metrics, '_cold', True), patch.object(metrics, '_current', None), \
+            patch.object(warmup, '_warmups', 0):
+        yield
+
+
+def emitted(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+class TestRouterMetrics:
+    def test_one_record_per_invocation(self, capsys):
+        """Test each dispatch logs one EMF record with route, status, cold start and phases"""
+        def create_plant(event, body):
+            with metrics.phase('validation'):
+                pass
+            return {'statusCode': 201, 'body': '{}'}
+
+        router = Router({'POST /plants': Route(create_plant, ADMIN, body=True)}, authorize=lambda event, policy: None)
+        event = {'routeKey': 'POST /plants', 'body': '{"name": "Fern"}'}
+
+        router.dispatch(event)
+        router.dispatch(event)
+        first, second = emitted(capsys)
+
+        assert first['Route'] == 'POST /plants'
+        assert first['status'] == 201
+        assert (first['cold_start'], second['cold_start']) == (1, 0)
+        for phase in ('auth', 'body', 'validation', 'handler'):
+            assert 0 <= first[f'{phase}_ms'] <= first['duration_ms']
+        definition = first['_aws']['CloudWatchMetrics'][0]
+        assert definition['Dimensions'] == [['Route']]
+        assert {m['Name'] for m in definition['Metrics']} >= {'duration_ms', 'cold_start', 'auth_ms', 'handler_ms'}
+
+    def test_errors_and_warmups(self, capsys):
+        """Test a failing route is recorded as 500; a warmup is not recorded but takes the cold start"""
+        def broken(event, body):
+            raise RuntimeError('boom')
+
+        router = Router({'GET /plants': Route(broken, PUBLIC)})
+        router.dispatch({'source': warmup.WARMUP_SOURCE})
+        router.dispatch({'routeKey': 'GET /plants'})
+
+        [record] = emitted(capsys)
+        assert record['status'] == 500
+        assert record['cold_start'] == 0
+        assert 'auth_ms' not in record
+
+    def test_phase_overhead_is_microseconds(self):
+        """Test timing a phase adds only microseconds, inside or outside an invocation"""
+        metrics.start('GET /plants')
+        started = time.perf_counter()
+        for _ in range(10000):
+            with metrics.phase('handler'):
+                pass
+        per_phase = (time.perf_counter() - started) / 10000
+        metrics.finish(200)
+
+        assert per_phase < 50e-6
+
+
+class TestAwsCallTiming:
+    def test_calls_timed_by_service(self, capsys):
+        """Test AWS calls made through the client registry add to their service's phase"""
+        registry = import_real('shared_utils.dynamodb_client')
+        registry.reset_clients()
+        with real_aws(), patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-east-1'}):
+            client = registry.get_dynamodb_client()
+            client.list_tables()  # outside an invocation: not recorded
+
+            metrics.start('GET /tables')
+            client.list_tables()
+            with pytest.raises(Exception):
+                client.describe_table(TableName='missing')
+            record = metrics.finish(200)
+        registry.reset_clients()
+
+        assert record['dynamodb_ms'] > 0
+        assert set(record) & {'s3_ms', 'email_ms', 'websocket_ms'} == set()
+        assert len(emitted(capsys)) == 1
@@ -0,0 +1,144 @@
+"""
+Tests for PlantPassAccessHandler passphrase verification
+"""
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+from shared_utils import config_registry
+from shared_utils.catalog_cache import CatalogCache
+from shared_utils.rate_limit import TokenBucketLimiter
+
+# PlantPassAccessHandler shares flat module names with the other handlers, so
+# import it in isolation and put back whatever other test modules had loaded
+HANDLER_MODULES = ['lambda_handler', 'dynamodb_client', 'response_utils', 'auth_middleware']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+access_handler_path = os.path.join(os.path.dirname(__file__), '../PlantPassAccessHandler')
+sys.path.insert(0, access_handler_path)
+
+import lambda_handler as access_lambda
+
+sys.path.remove(access_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+JWT_SECRET = 'test-secret-key-long-enough-for-hs256'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def access():
+    """Handler with a fresh config cache, limiter and stored passphrase"""
+    clock = FakeClock()
+    load = MagicMock(return_value='ferns & fronds')
+    cache = CatalogCache('config', load, ttl_seconds=30, clock=clock,
+                         build=lambda passphrase: {'plantpass.passphrase': passphrase})
+    limiter = TokenBucketLimiter(rate=0.5, burst=3, clock=clock)
+
+    with patch.object(config_registry, 'config_cache', cache), \
+         patch.object(access_lambda, 'verify_limiter', limiter), \
+         patch.object(access_lambda, 'JWT_SECRET', JWT_SECRET), \
+         patch('shared_utils.catalog_cache.get_catalog_version', return_value=1) as get_version:
+        yield load, get_version, clock
+
+
+def verify(passphrase, source_ip='10.0.0.1'):
+    event = {
+        'routeKey': 'POST /plantpass-access/verify',
+        'body': json.dumps({'passphrase': passphrase}),
+        'requestContext': {'http': {'sourceIp': source_ip}}
+    }
+    return access_lambda.lambda_handler(event, None)
+
+
+class TestVerifyPassphrase:
+    def test_cache_hits_cost_no_reads(self, access):
+        """Test repeat verifications within the TTL read nothing"""
+        load, get_version, clock = access
+
+        assert verify('ferns & fronds')['statusCode'] == 200
+        assert verify('wrong')['statusCode'] == 401
+
+        load.assert_called_once()
+        get_version.assert_called_once()
+
+    def test_changed_passphrase_picked_up_after_version_bump(self, access):
+        """Test a new version stamp reloads the stored passphrase"""
+        load, get_version, clock = access
+        verify('ferns & fronds')
+
+        load.return_value = 'moss'
+        get_version.return_value = 2
+        clock.now += 31
+
+        assert verify('moss')['statusCode'] == 200
+        assert verify('ferns & fronds')['statusCode'] == 401
+
+    def test_non_ascii_passphrase(self, access):
+        """Test constant-time comparison handles non-ASCII passphrases"""
+        load, get_version, clock = access
+        load.return_value = 'fougère'
+
+        assert verify('fougère')['statusCode'] == 200
+        assert verify('fougere')['statusCode'] == 401
+
+    def test_unset_passphrase_never_matches(self, access):
+        """Test an empty stored passphrase rejects every attempt"""
+        load, get_version, clock = access
+        load.return_value = ''
+
+        assert verify('anything')['statusCode'] == 401
+
+
+class TestVerifyRateLimit:
+    def test_burst_then_throttled_before_any_read(self, access):
+        """Test a source past its burst gets 429 without touching DynamoDB"""
+        load, get_version, clock = access
+        for _ in range(3):
+            verify('wrong')
+        load.reset_mock()
+        get_version.reset_mock()
+        # An allowed request would now have to read the passphrase
+        config_registry.config_cache.invalidate()
+
+        response = verify('ferns & fronds')
+
+        assert response['statusCode'] == 429
+        assert response['headers']['Retry-After'] == '2'
+        load.assert_not_called()
+        get_version.assert_not_called()
+        assert verify('ferns & fronds', source_ip='10.0.0.2')['statusCode'] == 200
+
+    def test_tokens_refill(self):
+        """Test a throttled source is allowed again once a token refills"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=0.5, burst=1, clock=clock)
+
+        assert limiter.allow('a') == (True, 0.0)
+        assert limiter.allow('a') == (False, 2.0)
+        clock.now += 2
+        assert limiter.allow('a')[0] is True
+
+    def test_tracked_sources_are_bounded(self):
+        """Test the least recently seen source is forgotten past max_sources"""
+        limiter = TokenBucketLimiter(rate=0.5, burst=1, max_sources=2, clock=FakeClock())
+        for source in ('a', 'b', 'c'):
+            limiter.allow(source)
+
+        assert list(limiter.buckets) == ['b', 'c']
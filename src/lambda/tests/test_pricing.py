@@ -0,0 +1,84 @@
+"""
+Tests for TransactionHandler server-side pricing
+"""
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+# Import with TransactionHandler's flat modules, then put back whatever other
+# test modules had loaded
+HANDLER_MODULES = ['pricing', 'decimal_utils', 'dynamodb_client']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+transaction_handler_path = os.path.join(os.path.dirname(__file__), '../TransactionHandler')
+sys.path.insert(0, transaction_handler_path)
+
+import pricing
+
+sys.path.remove(transaction_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+
+CATALOG = [
+    {'SKU': 'FE001', 'item': 'Fern', 'price_ea': 5.0, 'sort_order': 1},
+    {'SKU': 'MO001', 'item': 'Moss', 'price_ea': 3.5, 'sort_order': 2},
+]
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """Product index backed by an in-memory catalog at version 1"""
+    monkeypatch.setattr(pricing.product_index, 'loader', lambda: [dict(p) for p in CATALOG])
+    monkeypatch.setattr(pricing.product_index, 'ttl_seconds', 60)
+    pricing.product_index.invalidate()
+    pricing.product_index.get(current_version=1)
+    yield
+    pricing.product_index.invalidate()
+
+
+class TestPriceOrderLines:
+    def test_prices_come_from_catalog(self, catalog):
+        """Test names and prices are taken from the index, not the request"""
+        items, errors = pricing.price_order_lines([
+            {'SKU': 'FE001', 'quantity': 2, 'price_ea': 0.01, 'item': 'Free fern'},
+            {'SKU': 'MO001', 'quantity': '3'},
+        ])
+
+        assert errors == []
+        assert items == [
+            {'SKU': 'FE001', 'item': 'Fern', 'quantity': 2, 'price_ea': 5.0},
+            {'SKU': 'MO001', 'item': 'Moss', 'quantity': 3, 'price_ea': 3.5},
+        ]
+
+    def test_unknown_sku_is_rejected(self, catalog):
+        """Test lines for SKUs missing from the catalog are reported"""
+        items, errors = pricing.price_order_lines([{'SKU': 'ZZ999', 'quantity': 1}])
+
+        assert items == []
+        assert errors == ['Item 1: Unknown SKU ZZ999']
+
+    def test_removed_sku_keeps_stored_price_on_edit(self, catalog):
+        """Test an order line for a product no longer in the catalog keeps its stored name and price"""
+        stored = [{'SKU': 'OL001', 'item': 'Old orchid', 'quantity': 1, 'price_ea': 12.0}]
+
+        items, errors = pricing.price_order_lines(
+            [{'SKU': 'OL001', 'quantity': 2, 'price_ea': 0.01}, {'SKU': 'FE001', 'quantity': 1}],
+            stored_items=lambda: stored
+        )
+
+        assert errors == []
+        assert items == [
+            {'SKU': 'OL001', 'item': 'Old orchid', 'quantity': 2, 'price_ea': 12.0},
+            {'SKU': 'FE001', 'item': 'Fern', 'quantity': 1, 'price_ea': 5.0},
+        ]
+
+        items, errors = pricing.price_order_lines([{'SKU': 'ZZ999', 'quantity': 1}], stored_items=lambda: stored)
+        assert errors == ['Item 1: Unknown SKU ZZ999']
@@ -25,6 +25,8 @@ sys.path.insert(0, products_handler_path)
 
 # Now import - this should get ProductsHandler's lambda_handler
 import lambda_handler as products_lambda_module
+# The auth middleware the handler's router calls
+import auth_middleware as products_auth_module
 
 
 @pytest.fixture
@@ -36,7 +38,8 @@ def products_handler():
 @pytest.fixture
 def mock_database():
     """Mock database operations"""
-    with patch.object(products_lambda_module, 'get_all_products') as get_all, \
+    get_all = MagicMock()
+    with patch.object(products_lambda_module, 'get_all_products_with_etag', side_effect=lambda: ('"etag"', json.dumps(get_all()))), \
          patch.object(products_lambda_module, 'replace_all_products') as replace:
         yield {'get_all': get_all, 'replace': replace}
 
@@ -44,21 +47,19 @@ def mock_database():
 @pytest.fixture
 def mock_auth():
     """Mock authentication"""
-    with patch('auth_middleware.JWT_SECRET', 'test-secret-key'), \
-         patch.object(products_lambda_module, 'extract_token') as extract, \
-         patch.object(products_lambda_module, 'verify_token') as verify, \
-         patch.object(products_lambda_module, 'is_public_endpoint') as is_public:
+    with patch.object(products_auth_module, 'JWT_SECRET', 'test-secret-key'), \
+         patch.object(products_auth_module, 'extract_token') as extract, \
+         patch.object(products_auth_module, 'verify_token') as verify:
         verify.return_value = {'role': 'admin', 'user_id': 'test-admin'}
-        is_public.return_value = False  # Default to protected endpoints
-        yield {'extract': extract, 'verify': verify, 'is_public': is_public}
+        yield {'extract': extract, 'verify': verify}
 
 
 @pytest.fixture
 def mock_public_endpoint():
-    """Mock public endpoint check"""
-    with patch.object(products_lambda_module, 'is_public_endpoint') as is_public:
-        is_public.return_value = True
-        yield is_public
+    """Public routes must not verify a token"""
+    with patch.object(products_auth_module, 'verify_token') as verify:
+        yield verify
+    verify.assert_not_called()
 
 
 class TestGetProducts:
@@ -89,6 +90,20 @@ class TestGetProducts:
         assert response['statusCode'] == 200
         body = json.loads(response['body'])
         assert body == []
+    
+    def test_get_products_not_modified(self, products_handler, mock_database, mock_public_endpoint, api_gateway_event):
+        """Test a matching If-None-Match returns 304 with no body"""
+        mock_database['get_all'].return_value = []
+        
+        event = api_gateway_event.copy()
+        event['routeKey'] = 'GET /products'
+        event['headers']['If-None-Match'] = '"etag"'
+        
+        response = products_handler(event, {})
+        
+        assert response['statusCode'] == 304
+        assert response['body'] == ''
+        assert response['headers']['ETag'] == '"etag"'
 
 
 class TestReplaceProducts:
@@ -106,16 +121,14 @@ class TestReplaceProducts:
         assert response['statusCode'] == 200
         body = json.loads(response['body'])
         assert 'Products replaced successfully' in body['message']
-        mock_database['replace'].assert_called_once_with(sample_product_data)
+        mock_database['replace'].assert_called_once_with(sample_product_data, None)
     
     def test_replace_products_requires_admin(self, products_handler, api_gateway_event):
         """Test that replace products requires admin role"""
-        with patch('auth_middleware.JWT_SECRET', 'test-secret-key'), \
-             patch.object(products_lambda_module, 'extract_token') as extract, \
-             patch.object(products_lambda_module, 'verify_token') as verify, \
-             patch.object(products_lambda_module, 'is_public_endpoint') as is_public:
+        with patch.object(products_auth_module, 'JWT_SECRET', 'test-secret-key'), \
+             patch.object(products_auth_module, 'extract_token') as extract, \
+             patch.object(products_auth_module, 'verify_token') as verify:
             verify.return_value = {'role': 'staff', 'user_id': 'test'}
-            is_public.return_value = False
             
             event = api_gateway_event.copy()
             event['routeKey'] = 'PUT /products'
@@ -142,15 +155,39 @@ class TestReplaceProducts:
         assert 'must be a list' in body['message']
 
 
+class TestProductImport:
+    def test_start_import_returns_upload_url(self, products_handler, mock_auth, api_gateway_event):
+        """Test starting an import returns the presigned upload for the requested mode"""
+        upload = {'importId': 'abc123', 'uploadUrl': 'https://upload', 'uploadHeaders': {}}
+        with patch.object(products_lambda_module, 'create_product_import', return_value=upload) as create:
+            event = api_gateway_event.copy()
+            event['routeKey'] = 'POST /products/import'
+            event['body'] = json.dumps({'mode': 'replace'})
+            
+            response = products_handler(event, {})
+        
+        assert response['statusCode'] == 201
+        assert json.loads(response['body']) == upload
+        create.assert_called_once_with('replace', None)
+    
+    def test_import_report_rejects_bad_id(self, products_handler, mock_auth, api_gateway_event):
+        """Test report lookups only accept generated import ids"""
+        event = api_gateway_event.copy()
+        event['routeKey'] = 'GET /products/import/{importId}'
+        event['pathParameters'] = {'importId': '../secrets'}
+        
+        response = products_handler(event, {})
+        
+        assert response['statusCode'] == 400
+
+
 class TestErrorHandling:
     def test_route_not_found(self, products_handler, api_gateway_event):
         """Test handling of unknown routes"""
-        with patch('auth_middleware.JWT_SECRET', 'test-secret-key'), \
-             patch.object(products_lambda_module, 'extract_token') as mock_extract, \
-             patch.object(products_lambda_module, 'verify_token') as mock_verify, \
-             patch.object(products_lambda_module, 'is_public_endpoint') as is_public:
+        with patch.object(products_auth_module, 'JWT_SECRET', 'test-secret-key'), \
+             patch.object(products_auth_module, 'extract_token') as mock_extract, \
+             patch.object(products_auth_module, 'verify_token') as mock_verify:
             mock_verify.return_value = {'role': 'admin', 'user_id': 'test'}
-            is_public.return_value = False
             
             event = api_gateway_event.copy()
             event['routeKey'] = 'DELETE /products'
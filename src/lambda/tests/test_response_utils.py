@@ -3,7 +3,7 @@ Tests for shared response utilities
 """
 import pytest
 import json
-from response_utils import create_response
+from response_utils import create_response, create_conditional_response, make_etag
 
 
 class TestCreateResponse:
@@ -56,3 +56,31 @@ class TestCreateResponse:
         }
         response = create_response(201, body)
         assert json.loads(response['body']) == body
+
+
+class TestConditionalResponse:
+    """Test ETag / If-None-Match handling"""
+    
+    def test_sets_validators(self):
+        """Test a fresh request gets the body plus ETag and Cache-Control"""
+        response = create_conditional_response({'headers': {}}, '[1]')
+        assert response['statusCode'] == 200
+        assert response['body'] == '[1]'
+        assert response['headers']['ETag'] == make_etag('[1]')
+        assert response['headers']['Cache-Control'] == 'no-cache'
+    
+    def test_matching_etag_returns_304(self):
+        """Test a matching If-None-Match (any case, weak or in a list) gets an empty 304"""
+        etag = make_etag('[1]')
+        event = {'headers': {'If-None-Match': f'"stale", W/{etag}'}}
+        response = create_conditional_response(event, '[1]', etag)
+        assert response['statusCode'] == 304
+        assert response['body'] == ''
+        assert response['headers']['ETag'] == etag
+    
+    def test_changed_body_returns_200(self):
+        """Test a stale If-None-Match gets the new representation"""
+        event = {'headers': {'if-none-match': make_etag('[1]')}}
+        response = create_conditional_response(event, '[2]')
+        assert response['statusCode'] == 200
+        assert response['body'] == '[2]'
@@ -0,0 +1,100 @@
+"""
+Tests for the shared table-driven router
+"""
+import pytest
+import json
+from unittest.mock import MagicMock
+
+from shared_utils.router import Router, Route, BadRequest, PUBLIC, STAFF, ADMIN, error_message
+
+
+class Conflict(Exception):
+    pass
+
+
+def authorize(event, policy):
+    """Stand-in for auth_middleware.authorize keyed on a role header"""
+    role = (event.get('headers') or {}).get('role')
+    if role is None:
+        return {'statusCode': 401, 'body': json.dumps({'error': 'Missing Authorization header'})}
+    event['auth'] = {'role': role}
+    if policy == ADMIN and role != 'admin':
+        return {'statusCode': 403, 'body': json.dumps({'message': 'Admin access required'})}
+    return None
+
+
+@pytest.fixture
+def handlers():
+    return {
+        'read': MagicMock(return_value={'statusCode': 200, 'body': '[]'}),
+        'write': MagicMock(return_value={'statusCode': 200, 'body': '{}'}),
+        'report': MagicMock(return_value={'statusCode': 200, 'body': '{}'}),
+    }
+
+
+@pytest.fixture
+def router(handlers):
+    return Router({
+        'GET /plants': Route(handlers['read'], PUBLIC),
+        'PUT /plants': Route(handlers['write'], ADMIN, body=True),
+        'GET /plants/report': Route(handlers['report'], STAFF),
+    }, authorize, errors={Conflict: error_message(409)})
+
+
+def request(router, route_key, role=None, body=None):
+    event = {'routeKey': route_key, 'headers': {'role': role} if role else {}, 'body': body}
+    return router.dispatch(event)
+
+
+class TestDispatch:
+    def test_public_route_skips_auth(self, router, handlers):
+        """Test public routes are called without a token and get no body"""
+        assert request(router, 'GET /plants')['statusCode'] == 200
+        event, body = handlers['read'].call_args.args
+        assert body is None
+        assert 'auth' not in event
+
+    def test_policies(self, router, handlers):
+        """Test staff routes take any token and admin routes need the admin role"""
+        assert request(router, 'GET /plants/report')['statusCode'] == 401
+        assert request(router, 'GET /plants/report', role='staff')['statusCode'] == 200
+        assert request(router, 'PUT /plants', role='staff', body='[]')['statusCode'] == 403
+        assert request(router, 'PUT /plants', role='admin', body='[]')['statusCode'] == 200
+
+        handlers['write'].assert_called_once()
+        assert handlers['write'].call_args.args[1] == []
+
+    def test_unknown_route(self, router):
+        """Test unknown route keys answer 404 before any auth"""
+        assert request(router, 'DELETE /plants')['statusCode'] == 404
+
+    def test_missing_authorize_rejected_at_import(self, handlers):
+        """Test a table with protected routes needs an authorize function"""
+        with pytest.raises(ValueError):
+            Router({'PUT /plants': Route(handlers['write'], ADMIN)})
+        with pytest.raises(ValueError):
+            Route(handlers['write'], 'owner')
+
+
+class TestErrors:
+    def test_malformed_json_is_bad_request(self, router, handlers):
+        """Test a body that is not JSON answers 400 without calling the route"""
+        response = request(router, 'PUT /plants', role='admin', body='{not json')
+
+        assert response['statusCode'] == 400
+        handlers['write'].assert_not_called()
+
+    def test_exceptions_mapped_by_class(self, router, handlers):
+        """Test mapped exceptions (and their subclasses) use their mapping, others 500"""
+        handlers['read'].side_effect = type('LeaseTaken', (Conflict,), {})('plants are being edited')
+        response = request(router, 'GET /plants')
+        assert response['statusCode'] == 409
+        assert json.loads(response['body']) == {'message': 'plants are being edited'}
+
+        handlers['read'].side_effect = BadRequest('limit must be a number')
+        assert request(router, 'GET /plants')['statusCode'] == 400
+
+        handlers['read'].side_effect = KeyError('boom')
+        response = request(router, 'GET /plants')
+        assert response['statusCode'] == 500
+        assert json.loads(response['body']) == {'message': 'Internal server error'}
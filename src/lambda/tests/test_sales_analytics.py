@@ -0,0 +1,127 @@
+"""
+Tests for TransactionHandler sales analytics (snapshot and live deltas)
+"""
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+# Add TransactionHandler to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../TransactionHandler'))
+
+import sales_analytics
+
+
+def make_transaction(purchase_id, timestamp, quantity, price_ea, paid):
+    """Build a stored transaction record"""
+    total = quantity * price_ea
+    return {
+        'purchase_id': purchase_id,
+        'timestamp': timestamp,
+        'items': [{'SKU': 'TEST-001', 'item': 'Test Product', 'quantity': quantity, 'price_ea': price_ea}],
+        'discounts': [],
+        'club_voucher': 0,
+        'customer_email': '',
+        'payment': {'method': 'Cash' if paid else '', 'paid': paid},
+        'receipt': {'subtotal': total, 'discount': 0, 'total': total},
+    }
+
+
+def run_full_compute(transactions):
+    """Run compute_sales_analytics against an in-memory table"""
+    with patch.object(sales_analytics, 'table') as table:
+        table.scan.return_value = {'Items': [dict(t) for t in transactions]}
+        return sales_analytics.compute_sales_analytics()
+
+
+def apply_delta(snapshot, delta):
+    """Apply a delta the way the dashboard does"""
+    if delta['reset']:
+        return {'total_sales': 0.0, 'total_orders': 0, 'total_units_sold': 0, 'sales_over_time': {}}
+    buckets = dict(snapshot['sales_over_time'])
+    for key, value in delta['sales_over_time'].items():
+        buckets[key] = buckets.get(key, 0.0) + value
+    return {
+        'total_sales': round(snapshot['total_sales'] + delta['total_sales'], 2),
+        'total_orders': snapshot['total_orders'] + delta['total_orders'],
+        'total_units_sold': snapshot['total_units_sold'] + delta['total_units_sold'],
+        'sales_over_time': buckets,
+    }
+
+
+class TestAnalyticsDelta:
+    def test_created_paid_transaction(self):
+        """Test a paid order contributes to every total and its bucket"""
+        transaction = make_transaction('ABC-DEF', 1640000000, 2, 10.5, True)
+
+        delta = sales_analytics.compute_analytics_delta('created', after=transaction)
+
+        assert delta['total_sales'] == 21.0
+        assert delta['total_orders'] == 1
+        assert delta['total_units_sold'] == 2
+        assert delta['sales_over_time'] == {sales_analytics.time_bucket_key(1640000000): 21.0}
+        assert delta['transaction']['purchase_id'] == 'ABC-DEF'
+        assert delta['reset'] is False
+
+    def test_created_unpaid_transaction(self):
+        """Test an unpaid order only adds a table row"""
+        transaction = make_transaction('ABC-DEF', 1640000000, 2, 10.5, False)
+
+        delta = sales_analytics.compute_analytics_delta('created', after=transaction)
+
+        assert delta['total_sales'] == 0
+        assert delta['total_orders'] == 0
+        assert delta['sales_over_time'] == {}
+        assert delta['transaction']['paid'] is False
+
+    def test_paid_update_moves_order_into_totals(self):
+        """Test marking an order paid adds it to the totals"""
+        before = make_transaction('ABC-DEF', 1640000000, 3, 4.0, False)
+        after = make_transaction('ABC-DEF', 1640000000, 3, 4.0, True)
+
+        delta = sales_analytics.compute_analytics_delta('updated', before=before, after=after)
+
+        assert delta['total_sales'] == 12.0
+        assert delta['total_orders'] == 1
+        assert delta['total_units_sold'] == 3
+        assert delta['removed_purchase_id'] is None
+
+    def test_deleted_paid_transaction(self):
+        """Test deleting a paid order subtracts its contribution"""
+        before = make_transaction('ABC-DEF', 1640000000, 1, 7.25, True)
+
+        delta = sales_analytics.compute_analytics_delta('deleted', before=before)
+
+        assert delta['total_sales'] == -7.25
+        assert delta['total_orders'] == -1
+        assert delta['removed_purchase_id'] == 'ABC-DEF'
+        assert delta['transaction'] is None
+
+    def test_cleared_resets(self):
+        """Test clearing all transactions produces a reset delta"""
+        delta = sales_analytics.compute_analytics_delta('cleared')
+
+        assert delta['reset'] is True
+
+    def test_deltas_match_full_recompute(self):
+        """Test a snapshot plus deltas equals a full recompute"""
+        first = make_transaction('AAA-AAA', 1640000000, 2, 10.0, True)
+        second = make_transaction('BBB-BBB', 1640000100, 1, 5.5, False)
+        second_paid = make_transaction('BBB-BBB', 1640000100, 1, 5.5, True)
+
+        state = run_full_compute([first])
+        state = apply_delta(state, sales_analytics.compute_analytics_delta('created', after=second))
+        state = apply_delta(state, sales_analytics.compute_analytics_delta('updated', before=second, after=second_paid))
+        state = apply_delta(state, sales_analytics.compute_analytics_delta('deleted', before=first))
+
+        expected = run_full_compute([second_paid])
+        assert state['total_sales'] == expected['total_sales']
+        assert state['total_orders'] == expected['total_orders']
+        assert state['total_units_sold'] == expected['total_units_sold']
+        for key, value in expected['sales_over_time'].items():
+            assert state['sales_over_time'][key] == pytest.approx(value)
@@ -0,0 +1,261 @@
+"""
+Tests for TransactionHandler list queries
+"""
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['boto3.dynamodb'] = MagicMock()
+sys.modules['boto3.dynamodb.types'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+# Import with TransactionHandler's flat modules, then put back whatever other
+# test modules had loaded
+HANDLER_MODULES = ['database_interface', 'transaction', 'sales_analytics', 'utils', 'decimal_utils', 'dynamodb_client']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+transaction_handler_path = os.path.join(os.path.dirname(__file__), '../TransactionHandler')
+sys.path.insert(0, transaction_handler_path)
+
+import database_interface as transaction_db
+import transaction as transaction_module
+import sales_analytics
+
+sys.path.remove(transaction_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+
+def stored_record(purchase_id, timestamp, total=10.0):
+    return {
+        'purchase_id': purchase_id,
+        'timestamp': timestamp,
+        'lines': [['FE001', 'Fern', 2, 500]],
+        'discounts': [],
+        'club_voucher': 0,
+        'customer_email': '',
+        'payment': {'method': '', 'paid': False},
+        'payment_status': 'unpaid',
+        'receipt': {'subtotal': total, 'discount': 0, 'total': total},
+        'total': total,
+        'line_count': 1,
+    }
+
+
+class FakeClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+@pytest.fixture
+def transactions():
+    """
+    Transactions table and index backed by in-memory records. Index queries
+    go through the low-level client; items are passed through undeserialized.
+    """
+    records = {}
+    table = MagicMock()
+    table.name = 'transactions'
+    dynamodb = MagicMock()
+    client = MagicMock()
+
+    def batch_get_item(RequestItems):
+        keys = RequestItems['transactions']['Keys']
+        return {'Responses': {'transactions': [records[k['purchase_id']] for k in keys if k['purchase_id'] in records]}}
+
+    def query(IndexName, ExpressionAttributeValues, Limit=None, **kwargs):
+        assert IndexName == transaction_db.PAYMENT_SHARD_INDEX
+        shard = ExpressionAttributeValues[':shard']['S']
+        before = int(ExpressionAttributeValues[':before']['N']) if ':before' in ExpressionAttributeValues else None
+        items = sorted(
+            (summary_item(r) for r in records.values()
+             if r.get('payment_shard') == shard and (before is None or r['timestamp'] < before)),
+            key=lambda item: item['timestamp'], reverse=True
+        )
+        return {'Items': items[:Limit]}
+
+    def update_item(Key, ExpressionAttributeValues, **kwargs):
+        record = records.get(Key['purchase_id']['S'])
+        if not record or record['payment_status'] != 'unpaid':
+            raise FakeClientError('ConditionalCheckFailedException')
+        record['payment_status'] = ExpressionAttributeValues[':abandoned']['S']
+        record['payment_shard'] = ExpressionAttributeValues[':shard']['S']
+
+    def scan(FilterExpression, ExclusiveStartKey=None):
+        assert FilterExpression == 'attribute_not_exists(payment_shard)'
+        return {'Items': [dict(r) for r in records.values() if 'payment_shard' not in r]}
+
+    def backfill_item(Key, ExpressionAttributeValues, **kwargs):
+        record = records[Key['purchase_id']]
+        if 'payment_shard' in record:
+            raise FakeClientError('ConditionalCheckFailedException')
+        values = ExpressionAttributeValues
+        record.update(payment_shard=values[':shard'], payment_status=values[':status'],
+                      total=values[':total'], line_count=values[':count'])
+
+    table.scan.side_effect = scan
+    table.update_item.side_effect = backfill_item
+    dynamodb.batch_get_item.side_effect = batch_get_item
+    client.query.side_effect = query
+    client.update_item.side_effect = update_item
+    with patch.object(transaction_db, 'table', table), \
+         patch.object(transaction_db, 'get_dynamodb_resource', return_value=dynamodb), \
+         patch.object(transaction_db, 'get_dynamodb_client', return_value=client), \
+         patch.object(transaction_db, '_deserialize', side_effect=lambda item: item), \
+         patch.object(transaction_db, 'ClientError', FakeClientError):
+        yield records, client, dynamodb
+
+
+def summary_item(record):
+    """What the index projects for a record"""
+    return {key: record[key] for key in ('purchase_id', 'timestamp', 'payment_shard', 'payment_status', 'total', 'line_count')}
+
+
+def add_orders(records, count, payment_status='unpaid'):
+    for n in range(count):
+        purchase_id = f'A{n:02d}-BCD'
+        record = stored_record(purchase_id, 1000 + n)
+        record['payment_status'] = payment_status
+        record['payment_shard'] = transaction_module.payment_shard_key(purchase_id, payment_status)
+        records[purchase_id] = record
+
+
+class TestPaymentShards:
+    def test_shard_key_is_stable_and_bounded(self):
+        """Test an order always maps to the same shard within PAYMENT_SHARDS"""
+        key = transaction_module.payment_shard_key('ABC-DEF', 'unpaid')
+
+        assert key == transaction_module.payment_shard_key('ABC-DEF', 'unpaid')
+        status, shard = key.split('#')
+        assert status == 'unpaid'
+        assert 0 <= int(shard) < transaction_module.PAYMENT_SHARDS
+
+    def test_orders_spread_across_shards(self):
+        """Test a batch of orders does not pile onto one index key"""
+        shards = {transaction_module.payment_shard_key(f'A{n:02d}-BCD', 'unpaid') for n in range(40)}
+
+        assert len(shards) > transaction_module.PAYMENT_SHARDS // 2
+
+
+class TestRecentUnpaid:
+    def test_merges_newest_across_shards(self, transactions):
+        """Test the newest N come back in timestamp order from every shard"""
+        records, client, dynamodb = transactions
+        add_orders(records, 40)
+        records['PAI-DDD'] = dict(stored_record('PAI-DDD', 5000), payment_status='paid',
+                                  payment_shard=transaction_module.payment_shard_key('PAI-DDD', 'paid'))
+
+        result = transaction_db.get_recent_unpaid_transactions(5)
+
+        assert [t['timestamp'] for t in result] == [1039, 1038, 1037, 1036, 1035]
+        assert all(t['paid'] is False for t in result)
+        assert client.query.call_count == transaction_module.PAYMENT_SHARDS
+        dynamodb.batch_get_item.assert_not_called()
+
+    def test_zero_limit_queries_nothing(self, transactions):
+        """Test a disabled panel (limit 0) does not read the index"""
+        records, client, dynamodb = transactions
+
+        assert transaction_db.get_recent_unpaid_transactions(0) == []
+        client.query.assert_not_called()
+
+    def test_hydrate_returns_full_records_in_index_order(self, transactions):
+        """Test hydration batch-reads full records and keeps newest-first order"""
+        records, client, dynamodb = transactions
+        add_orders(records, 3)
+
+        result = transaction_db.get_recent_unpaid_transactions(5, hydrate=True)
+
+        assert [t['purchase_id'] for t in result] == ['A02-BCD', 'A01-BCD', 'A00-BCD']
+        assert result[0]['items'] == [{'SKU': 'FE001', 'item': 'Fern', 'quantity': 2, 'price_ea': 5.0}]
+
+
+class TestUpdateTransaction:
+    def test_previous_record_is_not_changed_by_update(self, transactions):
+        """Test marking an order paid returns the unpaid record as previous, so the delta counts it"""
+        records, client, dynamodb = transactions
+        stored = stored_record('ABC-DEF', 1640000000)
+        transaction_db.table.get_item.return_value = {'Item': stored}
+
+        before, after = transaction_db.update_transaction('ABC-DEF', {'payment': {'paid': True, 'method': 'Cash'}},
+                                                          return_previous=True)
+
+        assert before['payment'] == {'method': '', 'paid': False}
+        assert after['payment'] == {'method': 'Cash', 'paid': True}
+        assert stored['payment'] == {'method': '', 'paid': False}
+        delta = sales_analytics.compute_analytics_delta('updated', before=before, after=after)
+        assert delta['total_orders'] == 1
+        assert delta['total_sales'] == 10.0
+
+    def test_record_read_by_caller_is_not_read_again(self, transactions):
+        """Test an update given the stored record (read for pricing) makes no second GetItem"""
+        existing = transaction_module.Transaction.expand_db_record(stored_record('ABC-DEF', 1640000000))
+
+        before, after = transaction_db.update_transaction('ABC-DEF', {'payment': {'paid': True, 'method': 'Cash'}},
+                                                          return_previous=True, existing_data=existing)
+
+        transaction_db.table.get_item.assert_not_called()
+        assert before['payment']['paid'] is False and after['payment']['paid'] is True
+
+
+class TestAbandonedSweep:
+    def test_marks_only_old_unpaid_orders(self, transactions):
+        """Test orders past the age limit leave the unpaid index; recent ones stay"""
+        records, client, dynamodb = transactions
+        add_orders(records, 4)
+        records['NEW-ORD'] = dict(stored_record('NEW-ORD', 10 ** 10),
+                                  payment_shard=transaction_module.payment_shard_key('NEW-ORD', 'unpaid'))
+
+        result = transaction_db.sweep_abandoned_orders(max_age_hours=1)
+
+        assert sorted(result['abandoned']) == ['A00-BCD', 'A01-BCD', 'A02-BCD', 'A03-BCD']
+        assert result['skipped'] == 0
+        assert records['A00-BCD']['payment_status'] == 'abandoned'
+        assert records['A00-BCD']['payment_shard'].startswith('abandoned#')
+        assert [t['purchase_id'] for t in transaction_db.get_recent_unpaid_transactions(10)] == ['NEW-ORD']
+
+    def test_skips_orders_paid_since_query(self, transactions):
+        """Test an order paid between the index query and the update is left alone"""
+        records, client, dynamodb = transactions
+        add_orders(records, 2)
+        original_query = client.query.side_effect
+
+        def query_then_pay(**kwargs):
+            response = original_query(**kwargs)
+            if records['A00-BCD']['payment_status'] == 'unpaid' and response['Items']:
+                records['A00-BCD']['payment_status'] = 'paid'
+            return response
+
+        client.query.side_effect = query_then_pay
+
+        result = transaction_db.sweep_abandoned_orders(max_age_hours=1)
+
+        assert result['abandoned'] == ['A01-BCD']
+        assert result['skipped'] == 1
+        assert records['A00-BCD']['payment_status'] == 'paid'
+
+    def test_backfills_records_written_before_shards(self, transactions):
+        """Test the backfill migration indexes legacy records without payment_shard; the sweep never scans"""
+        records, client, dynamodb = transactions
+        records['OLD-ORD'] = dict(stored_record('OLD-ORD', 2000))
+        for key in ('payment_shard', 'total', 'line_count'):
+            records['OLD-ORD'].pop(key, None)
+
+        assert transaction_db.get_recent_unpaid_transactions(5) == []
+
+        transaction_db.sweep_abandoned_orders(max_age_hours=10 ** 7)
+        transaction_db.table.scan.assert_not_called()
+
+        assert transaction_db.backfill_payment_shards() == 1
+        assert records['OLD-ORD']['payment_shard'] == transaction_module.payment_shard_key('OLD-ORD', 'unpaid')
+        [summary] = transaction_db.get_recent_unpaid_transactions(5)
+        assert summary['purchase_id'] == 'OLD-ORD'
+        assert summary['total'] == 10.0
+        # Re-running the migration changes nothing
+        assert transaction_db.backfill_payment_shards() == 0
@@ -0,0 +1,108 @@
+"""
+Tests for compact transaction records
+"""
+import os
+import sys
+import zlib
+from decimal import Decimal
+
+# Import with TransactionHandler's flat modules, then put back whatever other
+# test modules had loaded
+HANDLER_MODULES = ['transaction', 'utils']
+saved_modules = {name: sys.modules.pop(name) for name in HANDLER_MODULES if name in sys.modules}
+
+transaction_handler_path = os.path.join(os.path.dirname(__file__), '../TransactionHandler')
+sys.path.insert(0, transaction_handler_path)
+
+import transaction as transaction_module
+from transaction import Transaction
+
+sys.path.remove(transaction_handler_path)
+for name in HANDLER_MODULES:
+    sys.modules.pop(name, None)
+sys.modules.update(saved_modules)
+
+
+def make_order(items):
+    return Transaction.from_json({'timestamp': 1700000000, 'items': items, 'discounts': [], 'voucher': 0})
+
+
+class TestCompactRecords:
+    def test_stores_only_purchased_lines(self):
+        """Test zero-quantity lines are dropped and prices are stored in cents"""
+        order = make_order([
+            {'SKU': 'FE001', 'item': 'Fern', 'quantity': 2, 'price_ea': 5.99},
+            {'SKU': 'MO001', 'item': 'Moss', 'quantity': 0, 'price_ea': 3.5},
+        ])
+
+        record = order.to_db_record()
+
+        assert 'items' not in record
+        assert record['lines'] == [['FE001', 'Fern', 2, 599]]
+        assert record['receipt']['subtotal'] == Decimal('11.98')
+
+    def test_round_trip_expands_lines(self):
+        """Test from_db_record restores full item dicts"""
+        order = make_order([{'SKU': 'FE001', 'item': 'Fern', 'quantity': 2, 'price_ea': 5.99}])
+
+        expanded = Transaction.expand_db_record(order.to_db_record())
+
+        assert expanded['items'] == [{'SKU': 'FE001', 'item': 'Fern', 'quantity': 2, 'price_ea': 5.99}]
+        assert expanded['purchase_id'] == order.purchase_id
+
+    def test_large_orders_are_compressed(self):
+        """Test orders over the line threshold store a zlib binary attribute"""
+        items = [
+            {'SKU': f'PL{i:03d}', 'item': f'Plant {i}', 'quantity': 1, 'price_ea': 4.25}
+            for i in range(transaction_module.COMPRESS_LINES_OVER + 1)
+        ]
+
+        record = make_order(items).to_db_record()
+
+        assert 'lines' not in record
+        assert zlib.decompress(record['lines_z'])
+        assert Transaction.from_db_record(record).items == items
+
+    def test_legacy_records_still_read(self):
+        """Test records written with full item lists load unchanged"""
+        items = [{'SKU': 'FE001', 'item': 'Fern', 'quantity': 0, 'price_ea': 5.0}]
+
+        assert Transaction.from_db_record({'purchase_id': 'ABC-DEF', 'items': items}).items == items
+
+
+class TestSummaries:
+    def test_projected_summary_attributes(self):
+        """Test records carry the total and line count the list indexes project"""
+        order = make_order([
+            {'SKU': 'FE001', 'item': 'Fern', 'quantity': 2, 'price_ea': 5.0},
+            {'SKU': 'MO001', 'item': 'Moss', 'quantity': 0, 'price_ea': 3.5},
+        ])
+
+        record = order.to_db_record()
+
+        assert record['total'] == Decimal('10.0')
+        assert record['line_count'] == 1
+        assert transaction_module.summarize_record(record) == {
+            'purchase_id': order.purchase_id,
+            'timestamp': 1700000000,
+            'paid': False,
+            'total': Decimal('10.0'),
+            'line_count': 1,
+        }
+
+    def test_legacy_record_summary(self):
+        """Test records without projected attributes are summarized from their lines"""
+        record = {
+            'purchase_id': 'ABC-DEF',
+            'timestamp': 1,
+            'payment_status': 'paid',
+            'items': [{'SKU': 'FE001', 'item': 'Fern', 'quantity': 1, 'price_ea': 5.0},
+                      {'SKU': 'MO001', 'item': 'Moss', 'quantity': 0, 'price_ea': 3.5}],
+            'receipt': {'total': 5.0},
+        }
+
+        summary = transaction_module.summarize_record(record)
+
+        assert summary['total'] == 5.0
+        assert summary['line_count'] == 1
+        assert summary['paid'] is True
@@ -12,6 +12,7 @@ from shared_utils.validation import (
     sanitize_string,
     validate_discount_value,
     validate_transaction_items,
+    validate_order_lines,
     validate_discounts,
     validate_payment_method,
     validate_boolean,
@@ -185,6 +186,19 @@ class TestValidateTransactionItems:
         assert any('quantity greater than 0' in e for e in errors)
 
 
+class TestValidateOrderLines:
+    def test_sku_and_quantity_lines(self):
+        is_valid, errors = validate_order_lines([{'SKU': 'FE001', 'quantity': 2}, {'SKU': 'MO001', 'quantity': 0}])
+        assert is_valid is True
+        assert len(errors) == 0
+    
+    def test_invalid_sku_and_no_quantity(self):
+        is_valid, errors = validate_order_lines([{'SKU': 'bad sku!', 'quantity': 0}])
+        assert is_valid is False
+        assert 'Item 1: Invalid SKU' in errors
+        assert any('quantity greater than 0' in e for e in errors)
+
+
 class TestValidateDiscounts:
     def test_valid_discounts(self):
         discounts = [
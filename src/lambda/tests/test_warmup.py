@@ -0,0 +1,99 @@
+"""
+Tests for warmup invocations and the warmup fan-out tool
+"""
+import io
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from shared_utils import warmup
+from shared_utils.router import Router, Route, ADMIN
+
+WARMUP_EVENT = {'source': warmup.WARMUP_SOURCE}
+
+
+@pytest.fixture(autouse=True)
+def fresh_container():
+    with patch.object(warmup, '_warmups', 0):
+        yield
+
+
+class TestHandleWarmup:
+    def test_runs_steps_and_reports_failures(self):
+        """Test every step runs, a failing step is reported instead of raised"""
+        def fill_cache():
+            pass
+
+        def open_connection():
+            raise RuntimeError('throttled')
+
+        result = warmup.handle_warmup(WARMUP_EVENT, [fill_cache, open_connection])
+
+        assert result['warmed'] == ['fill_cache']
+        assert result['failed'] == ['open_connection']
+        assert result['container'] == warmup.CONTAINER_ID
+        assert result['first_warmup'] is True
+        assert warmup.handle_warmup(WARMUP_EVENT, [])['first_warmup'] is False
+
+    def test_hold_is_capped(self):
+        """Test the invocation is held for hold_ms, at most MAX_HOLD_MS"""
+        with patch.object(warmup.time, 'sleep') as sleep:
+            warmup.handle_warmup({**WARMUP_EVENT, 'hold_ms': 60000}, [])
+        assert 0 < sleep.call_args.args[0] <= warmup.MAX_HOLD_MS / 1e3
+
+        with patch.object(warmup.time, 'sleep') as sleep:
+            warmup.handle_warmup(WARMUP_EVENT, [])
+        sleep.assert_not_called()
+
+    def test_router_runs_warmup_without_auth(self):
+        """Test a router answers a warmup event with its steps, skipping routing and auth"""
+        step = MagicMock(__name__='warm_table')
+        authorize = MagicMock()
+        route = MagicMock()
+        router = Router({'GET /plants': Route(route, ADMIN)}, authorize, warmup=[step])
+
+        result = router.dispatch(dict(WARMUP_EVENT))
+
+        assert result['warmed'] == ['warm_table']
+        step.assert_called_once_with()
+        authorize.assert_not_called()
+        route.assert_not_called()
+
+    def test_api_events_are_not_warmups(self):
+        """Test API Gateway and scheduled events are not taken for warmups"""
+        assert not warmup.is_warmup({'routeKey': 'GET /products', 'headers': {}})
+        assert not warmup.is_warmup({'source': 'aws.events'})
+
+
+class TestWarmupTool:
+    def test_fans_out_and_counts_containers(self, capsys):
+        """Test each function gets its concurrency in invocations and containers are counted"""
+        from tools import warmup as tool
+
+        containers = iter(['a', 'b', 'b'])
+
+        def invoke(FunctionName, InvocationType, Payload):
+            assert json.loads(Payload) == {'source': warmup.WARMUP_SOURCE, 'hold_ms': 100}
+            if FunctionName == 'EmailHandler':
+                return {'FunctionError': 'Unhandled', 'Payload': io.BytesIO(b'{"errorMessage": "boom"}')}
+            body = {'warmed': [], 'failed': [], 'container': next(containers), 'first_warmup': True}
+            return {'Payload': io.BytesIO(json.dumps(body).encode())}
+
+        client = MagicMock()
+        client.invoke.side_effect = invoke
+
+        assert tool.run([('ProductsHandler', 3)], hold_ms=100, client=client) is True
+        assert '2 containers' in capsys.readouterr().out
+
+        assert tool.run([('EmailHandler', 1)], hold_ms=100, client=client) is False
+        assert 'boom' in capsys.readouterr().out
+
+    def test_function_list_follows_deployment_layout(self):
+        """Test the monolith layout warms PlantPassApi instead of the per-handler API functions"""
+        from tools import warmup as tool
+
+        assert 'PlantPassApi' not in tool.deployed_functions()
+        monolith = tool.deployed_functions(monolith=True)
+        assert 'PlantPassApi' in monolith and 'ProductsHandler' not in monolith
+        # Invoked directly, so warmed in either layout
+        assert {'EmailHandler', 'WebSocketHandler'} <= set(monolith) & set(tool.deployed_functions())
@@ -0,0 +1,91 @@
+"""
+Tests for WebSocketHandler Lambda (heartbeats and stale connection sweep)
+"""
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Mock AWS dependencies FIRST
+sys.modules['boto3'] = MagicMock()
+sys.modules['boto3.dynamodb'] = MagicMock()
+sys.modules['boto3.dynamodb.conditions'] = MagicMock()
+sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.exceptions'] = MagicMock()
+
+# Clear any cached lambda_handler imports to ensure we get the right one
+for module_name in list(sys.modules.keys()):
+    if 'lambda_handler' in module_name:
+        del sys.modules[module_name]
+
+websocket_handler_path = os.path.join(os.path.dirname(__file__), '../WebSocketHandler')
+sys.path.insert(0, websocket_handler_path)
+
+import lambda_handler as websocket_lambda_module
+
+sys.path.remove(websocket_handler_path)
+del sys.modules['lambda_handler']
+
+
+@pytest.fixture
+def connections_table():
+    """Mock the connections table"""
+    table = MagicMock()
+    with patch.object(websocket_lambda_module, 'get_connections_table', return_value=table):
+        yield table
+
+
+def websocket_event(route_key, body=None):
+    return {
+        'requestContext': {'routeKey': route_key, 'connectionId': 'conn-1'},
+        'body': body,
+    }
+
+
+class TestHeartbeat:
+    def test_connect_records_last_seen(self, connections_table):
+        """Test new connections get a heartbeat-window TTL"""
+        response = websocket_lambda_module.lambda_handler(websocket_event('$connect'), {})
+
+        assert response['statusCode'] == 200
+        item = connections_table.put_item.call_args.kwargs['Item']
+        assert item['lastSeen'] == item['connectedAt']
+        assert item['ttl'] == item['lastSeen'] + websocket_lambda_module.CONNECTION_TIMEOUT_SECONDS
+
+    def test_ping_refreshes_ttl(self, connections_table):
+        """Test a ping updates lastSeen and ttl and answers with a pong"""
+        event = websocket_event('$default', json.dumps({'action': 'ping'}))
+
+        response = websocket_lambda_module.lambda_handler(event, {})
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['type'] == 'pong'
+        kwargs = connections_table.update_item.call_args.kwargs
+        assert kwargs['Key'] == {'connectionId': 'conn-1'}
+        assert kwargs['ConditionExpression'] == 'attribute_exists(connectionId)'
+
+    def test_other_messages_do_not_write(self, connections_table):
+        """Test non-ping messages are acknowledged without a write"""
+        event = websocket_event('$default', 'not json')
+
+        response = websocket_lambda_module.lambda_handler(event, {})
+
+        assert response['statusCode'] == 200
+        connections_table.update_item.assert_not_called()
+
+
+class TestSweep:
+    def test_scheduled_event_removes_stale_connections(self, connections_table):
+        """Test the scheduled sweep batch-deletes every stale row across pages"""
+        connections_table.scan.side_effect = [
+            {'Items': [{'connectionId': 'stale-1'}], 'LastEvaluatedKey': {'connectionId': 'stale-1'}},
+            {'Items': [{'connectionId': 'stale-2'}]},
+        ]
+        batch = connections_table.batch_writer.return_value.__enter__.return_value
+
+        response = websocket_lambda_module.lambda_handler({'source': 'aws.events'}, {})
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == {'removed': 2}
+        assert batch.delete_item.call_count == 2
@@ -0,0 +1,34 @@
+"""
+Backfill payment_shard on transactions written before the sharded index.
+
+One-off migration: records saved before the payment-shard index existed
+have no payment_shard, so their unpaid orders are missing from the
+recent-unpaid panel and the abandoned-order sweep. Scans the transactions
+table once and gives each such record its shard, total and line count (see
+backfill_payment_shards in TransactionHandler/database_interface.py). Safe
+to re-run; records that already have a shard are left alone. Run from
+src/lambda with credentials for the deployment:
+
+    python -m tools.backfill_payment_shards [--table NAME] [--region REGION]
+"""
+import argparse
+import os
+import sys
+
+# The backfill lives with the rest of the transactions data code
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TransactionHandler'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--table', help='transactions table name (default: TRANSACTIONS_TABLE or "transactions")')
+    parser.add_argument('--region')
+    args = parser.parse_args()
+
+    if args.table:
+        os.environ['TRANSACTIONS_TABLE'] = args.table
+    if args.region:
+        os.environ['AWS_DEFAULT_REGION'] = args.region
+
+    from database_interface import backfill_payment_shards
+    print(f'Backfilled payment_shard on {backfill_payment_shards()} records')
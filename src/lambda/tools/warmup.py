@@ -0,0 +1,151 @@
+"""
+Warm Lambda containers before the sale opens.
+
+Invokes each function N times at once with a warmup event
+({"source": "plantpass.warmup"}, see shared_utils/warmup.py). Every
+invocation is held open for --hold-ms, so Lambda starts N containers rather
+than serving the invocations one after another from one container; each
+builds its clients, opens its connections and fills its caches. Run from
+src/lambda with credentials for the deployment:
+
+    python -m tools.warmup [--monolith] [--concurrency N] [--function NAME[=N] ...] [--at HH:MM]
+
+Pass --monolith when the deployment sets api_monolith, so the single API
+function is warmed instead of the per-handler ones the API no longer calls.
+
+Lambda keeps idle containers for a while but not indefinitely, so run it
+shortly before opening (or a few minutes after a deploy).
+"""
+import argparse
+import datetime
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+
+WARMUP_SOURCE = 'plantpass.warmup'
+
+# Deployed function names (terraform/lambda.tf, websocket.tf)
+FUNCTIONS = (
+    'TransactionHandler',
+    'ProductsHandler',
+    'DiscountsHandler',
+    'PaymentMethodsHandler',
+    'BootstrapHandler',
+    'FeatureTogglesHandler',
+    'PlantPassAccessHandler',
+    'LockHandler',
+    'plantpass-admin',
+    'EmailHandler',
+    'WebSocketHandler',
+)
+
+# With api_monolith every API route goes to PlantPassApi; EmailHandler is
+# still invoked directly for receipts and password resets
+MONOLITH_FUNCTIONS = (
+    'PlantPassApi',
+    'EmailHandler',
+    'WebSocketHandler',
+)
+
+
+def deployed_functions(monolith=False):
+    """Functions serving traffic in the split or the single-function layout."""
+    return MONOLITH_FUNCTIONS if monolith else FUNCTIONS
+
+
+def parse_function(value, default_concurrency):
+    """NAME or NAME=N -> (name, concurrency)."""
+    name, _, count = value.partition('=')
+    return name, int(count) if count else default_concurrency
+
+
+def wait_until(clock_time):
+    """Sleep until the next HH:MM local time."""
+    hour, minute = (int(part) for part in clock_time.split(':'))
+    now = datetime.datetime.now()
+    start = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if start <= now:
+        start += datetime.timedelta(days=1)
+    print(f'Waiting until {start:%Y-%m-%d %H:%M}')
+    time.sleep((start - now).total_seconds())
+
+
+def invoke(client, function_name, hold_ms):
+    """One synchronous warmup invocation; returns the handler's summary or {'error': ...}."""
+    try:
+        response = client.invoke(
+            FunctionName=function_name,
+            InvocationType='RequestResponse',
+            Payload=json.dumps({'source': WARMUP_SOURCE, 'hold_ms': hold_ms}).encode()
+        )
+        payload = json.loads(response['Payload'].read() or b'null')
+    except Exception as e:
+        return {'error': str(e)}
+    if not isinstance(payload, dict):
+        return {'error': f'unexpected response: {payload!r}'}
+    if response.get('FunctionError'):
+        return {'error': payload.get('errorMessage') or response['FunctionError']}
+    return payload
+
+
+def summarize(function_name, results, elapsed):
+    errors = [result['error'] for result in results if 'error' in result]
+    warmed = [result for result in results if 'error' not in result]
+    containers = {result.get('container') for result in warmed}
+    new = sum(1 for result in warmed if result.get('first_warmup'))
+    failed_steps = sorted({step for result in warmed for step in result.get('failed', [])})
+
+    line = f'{function_name:<24}{len(containers):>3} containers ({new} new) in {elapsed:6.2f}s'
+    if failed_steps:
+        line += f'  failed steps: {", ".join(failed_steps)}'
+    if errors:
+        line += f'  {len(errors)} errors: {errors[0]}'
+    print(line)
+    return not errors
+
+
+def run(functions, hold_ms=300, region=None, client=None):
+    """
+    Warm every (function name, concurrency) pair, all functions at once.
+    Returns True if every invocation succeeded.
+    """
+    total = sum(concurrency for _, concurrency in functions)
+    if client is None:
+        client = boto3.client('lambda', region_name=region, config=Config(
+            max_pool_connections=total,
+            read_timeout=60,
+            retries={'max_attempts': 2, 'mode': 'standard'}
+        ))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=total) as pool:
+        futures = {
+            name: [pool.submit(invoke, client, name, hold_ms) for _ in range(concurrency)]
+            for name, concurrency in functions
+        }
+        ok = True
+        for name, pending in futures.items():
+            results = [future.result() for future in pending]
+            ok = summarize(name, results, time.perf_counter() - start) and ok
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--monolith', action='store_true', help='the API is deployed as one function (api_monolith)')
+    parser.add_argument('--concurrency', type=int, default=4, help='containers to warm per function')
+    parser.add_argument('--function', action='append', metavar='NAME[=N]',
+                        help='only these functions, optionally with their own concurrency')
+    parser.add_argument('--hold-ms', type=int, default=300, help='how long each invocation is held open')
+    parser.add_argument('--at', metavar='HH:MM', help='wait until this local time first')
+    parser.add_argument('--region')
+    args = parser.parse_args()
+
+    functions = [parse_function(value, args.concurrency) for value in (args.function or deployed_functions(args.monolith))]
+    if args.at:
+        wait_until(args.at)
+    sys.exit(0 if run(functions, args.hold_ms, args.region) else 1)
@@ -6,9 +6,10 @@ resource "aws_apigatewayv2_api" "frontend_api" {
   protocol_type = "HTTP"
 
   cors_configuration {
-    allow_origins = ["*"]
-    allow_methods = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
-    allow_headers = ["content-type", "authorization"]
+    allow_origins  = ["*"]
+    allow_methods  = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+    allow_headers  = ["content-type", "authorization", "if-none-match", "x-edit-lease"]
+    expose_headers = ["etag"]
   }
 
   tags = {
@@ -19,59 +20,68 @@ resource "aws_apigatewayv2_api" "frontend_api" {
 # -------------------------
 # Lambda Integrations
 # -------------------------
+# Each integration targets its handler's function, or the single API
+# function when api_monolith is set (see lambda.tf)
 resource "aws_apigatewayv2_integration" "transaction_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.transaction_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.transaction_handler.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "admin_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.admin.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.admin.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "products_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.products_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.products_handler.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "discounts_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.discounts_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.discounts_handler.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "payment_methods_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.payment_methods_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.payment_methods_handler.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "lock_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.lock_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.lock_handler.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "feature_toggles_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.feature_toggles_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.feature_toggles_handler.arn
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_integration" "bootstrap_lambda_integration" {
+  api_id                 = aws_apigatewayv2_api.frontend_api.id
+  integration_type       = "AWS_PROXY"
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.bootstrap_handler.arn
   payload_format_version = "2.0"
 }
 
 resource "aws_apigatewayv2_integration" "plantpass_access_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.plantpass_access_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.plantpass_access_handler.arn
   payload_format_version = "2.0"
 }
 
@@ -148,6 +158,18 @@ resource "aws_apigatewayv2_route" "admin_login_route" {
   target    = "integrations/${aws_apigatewayv2_integration.admin_lambda_integration.id}"
 }
 
+resource "aws_apigatewayv2_route" "admin_refresh_route" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "POST /admin/refresh"
+  target    = "integrations/${aws_apigatewayv2_integration.admin_lambda_integration.id}"
+}
+
+resource "aws_apigatewayv2_route" "admin_logout_route" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "POST /admin/logout"
+  target    = "integrations/${aws_apigatewayv2_integration.admin_lambda_integration.id}"
+}
+
 resource "aws_apigatewayv2_route" "admin_change_route" {
   api_id    = aws_apigatewayv2_api.frontend_api.id
   route_key = "POST /admin/change-password"
@@ -175,12 +197,30 @@ resource "aws_apigatewayv2_route" "replace_all_products" {
   target    = "integrations/${aws_apigatewayv2_integration.products_lambda_integration.id}"
 }
 
+resource "aws_apigatewayv2_route" "patch_products" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "PATCH /products"
+  target    = "integrations/${aws_apigatewayv2_integration.products_lambda_integration.id}"
+}
+
 resource "aws_apigatewayv2_route" "create_product" {
   api_id    = aws_apigatewayv2_api.frontend_api.id
   route_key = "POST /products"
   target    = "integrations/${aws_apigatewayv2_integration.products_lambda_integration.id}"
 }
 
+resource "aws_apigatewayv2_route" "start_product_import" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "POST /products/import"
+  target    = "integrations/${aws_apigatewayv2_integration.products_lambda_integration.id}"
+}
+
+resource "aws_apigatewayv2_route" "get_product_import" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "GET /products/import/{importId}"
+  target    = "integrations/${aws_apigatewayv2_integration.products_lambda_integration.id}"
+}
+
 resource "aws_apigatewayv2_route" "update_product" {
   api_id    = aws_apigatewayv2_api.frontend_api.id
   route_key = "PUT /products/{SKU}"
@@ -208,6 +248,12 @@ resource "aws_apigatewayv2_route" "replace_all_discounts" {
   target    = "integrations/${aws_apigatewayv2_integration.discounts_lambda_integration.id}"
 }
 
+resource "aws_apigatewayv2_route" "patch_discounts" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "PATCH /discounts"
+  target    = "integrations/${aws_apigatewayv2_integration.discounts_lambda_integration.id}"
+}
+
 resource "aws_apigatewayv2_route" "create_discount" {
   api_id    = aws_apigatewayv2_api.frontend_api.id
   route_key = "POST /discounts"
@@ -241,6 +287,12 @@ resource "aws_apigatewayv2_route" "replace_all_payment_methods" {
   target    = "integrations/${aws_apigatewayv2_integration.payment_methods_lambda_integration.id}"
 }
 
+resource "aws_apigatewayv2_route" "patch_payment_methods" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "PATCH /payment-methods"
+  target    = "integrations/${aws_apigatewayv2_integration.payment_methods_lambda_integration.id}"
+}
+
 # -------------------------
 # Lock Lambda Routes
 # -------------------------
@@ -271,6 +323,27 @@ resource "aws_apigatewayv2_route" "set_feature_toggles" {
   target    = "integrations/${aws_apigatewayv2_integration.feature_toggles_lambda_integration.id}"
 }
 
+resource "aws_apigatewayv2_route" "get_config" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "GET /config"
+  target    = "integrations/${aws_apigatewayv2_integration.feature_toggles_lambda_integration.id}"
+}
+
+resource "aws_apigatewayv2_route" "set_config" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "PUT /config"
+  target    = "integrations/${aws_apigatewayv2_integration.feature_toggles_lambda_integration.id}"
+}
+
+# -------------------------
+# Bootstrap Lambda Routes
+# -------------------------
+resource "aws_apigatewayv2_route" "get_bootstrap" {
+  api_id    = aws_apigatewayv2_api.frontend_api.id
+  route_key = "GET /bootstrap"
+  target    = "integrations/${aws_apigatewayv2_integration.bootstrap_lambda_integration.id}"
+}
+
 # -------------------------
 # PlantPass Access Lambda Routes
 # -------------------------
@@ -318,7 +391,7 @@ resource "aws_apigatewayv2_route" "email_password_reset" {
 resource "aws_apigatewayv2_integration" "email_lambda_integration" {
   api_id                 = aws_apigatewayv2_api.frontend_api.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.email_handler.arn
+  integration_uri        = var.api_monolith ? aws_lambda_function.api_monolith[0].arn : aws_lambda_function.email_handler.arn
   payload_format_version = "2.0"
 }
 
@@ -27,6 +27,36 @@ resource "aws_cloudfront_distribution" "frontend" {
     }
   }
 
+  origin {
+    domain_name = aws_s3_bucket.catalog_snapshots.bucket_regional_domain_name
+    origin_id   = "S3-PlantPass-Catalog"
+
+    s3_origin_config {
+      origin_access_identity = aws_cloudfront_origin_access_identity.oai.cloudfront_access_identity_path
+    }
+  }
+
+  # -------------------------
+  # Catalog snapshots (TTL follows each object's Cache-Control)
+  # -------------------------
+  ordered_cache_behavior {
+    path_pattern           = "/catalog/*"
+    allowed_methods        = ["GET", "HEAD"]
+    cached_methods         = ["GET", "HEAD"]
+    target_origin_id       = "S3-PlantPass-Catalog"
+    viewer_protocol_policy = "redirect-to-https"
+    min_ttl                = 0
+    default_ttl            = 10
+    max_ttl                = 31536000
+
+    forwarded_values {
+      query_string = false
+      cookies {
+        forward = "none"
+      }
+    }
+  }
+
   default_cache_behavior {
     allowed_methods        = ["GET", "HEAD"]
     cached_methods         = ["GET", "HEAD"]
@@ -44,22 +44,29 @@ resource "aws_dynamodb_table" "transactions" {
   }
 
   attribute {
-    name = "payment_status"
+    name = "payment_shard"
     type = "S"
   }
 
   global_secondary_index {
     name            = "timestamp-index"
     hash_key        = "timestamp"
-    projection_type = "ALL"
+    projection_type = "KEYS_ONLY"
   }
 
-  # New GSI for efficient unpaid transactions query
+  # GSI for the recent unpaid orders panel. Keyed on payment_shard
+  # ("unpaid#0".."unpaid#7", see PAYMENT_SHARDS) rather than the two-valued
+  # payment_status, so a rush of orders spreads over several partitions;
+  # readers query every shard and merge by timestamp. Projects only the
+  # summary fields the panel renders; full records are batch-read on demand.
+  # Changing the key or projection makes Terraform replace the index (it
+  # rebuilds online, but queries against it fail until it is ACTIVE again).
   global_secondary_index {
-    name            = "payment-status-timestamp-index"
-    hash_key        = "payment_status"
-    range_key       = "timestamp"
-    projection_type = "ALL"
+    name               = "payment-shard-timestamp-index"
+    hash_key           = "payment_shard"
+    range_key          = "timestamp"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["payment_status", "total", "line_count"]
   }
 
   # Enable point-in-time recovery for data protection
@@ -0,0 +1,24 @@
+# -------------------------
+# DynamoDB Table for Admin Refresh Sessions and Login Rate Limits
+# -------------------------
+
+resource "aws_dynamodb_table" "admin_sessions" {
+  name         = "admin_sessions"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "id"
+
+  attribute {
+    name = "id"
+    type = "S"
+  }
+
+  # Expires both refresh sessions and failed-login counters
+  ttl {
+    attribute_name = "expiration"
+    enabled        = true
+  }
+
+  tags = {
+    application = "plantpass"
+  }
+}
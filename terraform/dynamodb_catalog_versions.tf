@@ -0,0 +1,17 @@
+# One row per catalog resource (products, discounts, payment_methods) holding
+# a version stamp bumped on every write; warm Lambdas revalidate their cached
+# catalog against it instead of rescanning
+resource "aws_dynamodb_table" "catalog_versions" {
+  name         = "catalog_versions"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "resource"
+
+  attribute {
+    name = "resource"
+    type = "S"
+  }
+
+  tags = {
+    application = "plantpass"
+  }
+}
@@ -0,0 +1,18 @@
+# Typed config store: one row per registered key (feature toggles, lock
+# states, PlantPass passphrase), read together with one BatchGetItem. Writes
+# bump the "config" row in catalog_versions so warm Lambdas reload.
+resource "aws_dynamodb_table" "config" {
+  name         = "PlantPass-Config"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "config_key"
+
+  attribute {
+    name = "config_key"
+    type = "S"
+  }
+
+  tags = {
+    application = "plantpass"
+    purpose     = "config"
+  }
+}
@@ -1,3 +1,5 @@
+# One row per lockable catalog resource holding its edit lease (owner,
+# lease_id, lease_expires); catalog writes check it in the same transaction
 resource "aws_dynamodb_table" "locks" {
   name         = "PlantPass-Locks"
   billing_mode = "PAY_PER_REQUEST"
@@ -35,6 +35,34 @@ resource "aws_iam_role_policy" "lambda_s3_access" {
           "s3:PutObject"
         ]
         Resource = "${aws_s3_bucket.admin_password.arn}/*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject"
+        ]
+        Resource = "${aws_s3_bucket.catalog_snapshots.arn}/*"
+      },
+      {
+        # Lets a missing snapshot pointer read as NoSuchKey rather than AccessDenied
+        Effect   = "Allow"
+        Action   = "s3:ListBucket"
+        Resource = aws_s3_bucket.catalog_snapshots.arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject"
+        ]
+        Resource = "${aws_s3_bucket.catalog_imports.arn}/*"
+      },
+      {
+        # Lets a pending import report read as NoSuchKey rather than AccessDenied
+        Effect   = "Allow"
+        Action   = "s3:ListBucket"
+        Resource = aws_s3_bucket.catalog_imports.arn
       }
     ]
   })
@@ -51,9 +79,11 @@ resource "aws_iam_role_policy" "lambda_dynamodb_access" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
+          "dynamodb:ConditionCheckItem",
           "dynamodb:BatchWriteItem",
           "dynamodb:Scan",
           "dynamodb:Query"
@@ -65,10 +95,13 @@ resource "aws_iam_role_policy" "lambda_dynamodb_access" {
           "${aws_dynamodb_table.transactions.arn}/index/*",
           aws_dynamodb_table.websocket_connections.arn,
           aws_dynamodb_table.temp_passwords.arn,
+          aws_dynamodb_table.admin_sessions.arn,
           aws_dynamodb_table.payment_methods.arn,
           aws_dynamodb_table.locks.arn,
           aws_dynamodb_table.feature_toggles.arn,
-          aws_dynamodb_table.plantpass_access.arn
+          aws_dynamodb_table.plantpass_access.arn,
+          aws_dynamodb_table.config.arn,
+          aws_dynamodb_table.catalog_versions.arn
         ]
       }
     ]
@@ -102,6 +135,15 @@ resource "aws_cloudwatch_log_group" "products_handler_logs" {
   }
 }
 
+resource "aws_cloudwatch_log_group" "product_import_worker_logs" {
+  name              = "/aws/lambda/ProductImportWorker"
+  retention_in_days = 14
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
 resource "aws_cloudwatch_log_group" "discounts_handler_logs" {
   name              = "/aws/lambda/DiscountsHandler"
   retention_in_days = 14
@@ -138,6 +180,15 @@ resource "aws_cloudwatch_log_group" "feature_toggles_handler_logs" {
   }
 }
 
+resource "aws_cloudwatch_log_group" "bootstrap_handler_logs" {
+  name              = "/aws/lambda/BootstrapHandler"
+  retention_in_days = 14
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
 resource "aws_cloudwatch_log_group" "plantpass_access_handler_logs" {
   name              = "/aws/lambda/PlantPassAccessHandler"
   retention_in_days = 14
@@ -165,11 +216,16 @@ resource "aws_lambda_function" "transaction_handler" {
 
   environment {
     variables = {
-      TRANSACTIONS_TABLE = aws_dynamodb_table.transactions.name
-      CONNECTIONS_TABLE  = aws_dynamodb_table.websocket_connections.name
-      WEBSOCKET_ENDPOINT = "https://${aws_apigatewayv2_api.websocket_api.id}.execute-api.${var.aws_region}.amazonaws.com/${aws_apigatewayv2_stage.websocket_stage.name}"
-      EMAIL_LAMBDA_ARN   = aws_lambda_function.email_handler.arn
-      JWT_SECRET         = "super-secret-key"
+      TRANSACTIONS_TABLE        = aws_dynamodb_table.transactions.name
+      CONNECTIONS_TABLE         = aws_dynamodb_table.websocket_connections.name
+      WEBSOCKET_ENDPOINT        = "https://${aws_apigatewayv2_api.websocket_api.id}.execute-api.${var.aws_region}.amazonaws.com/${aws_apigatewayv2_stage.websocket_stage.name}"
+      EMAIL_LAMBDA_ARN          = aws_lambda_function.email_handler.arn
+      PRODUCTS_TABLE            = aws_dynamodb_table.products.name
+      CATALOG_VERSIONS_TABLE    = aws_dynamodb_table.catalog_versions.name
+      CATALOG_CACHE_TTL_SECONDS = "5"
+      CATALOG_STORAGE_MODE      = "document"
+      ABANDONED_ORDER_AGE_HOURS = "12"
+      JWT_SECRET                = "super-secret-key"
     }
   }
 
@@ -178,6 +234,32 @@ resource "aws_lambda_function" "transaction_handler" {
   }
 }
 
+# -------------------------
+# Scheduled Sweep of Abandoned Unpaid Orders
+# -------------------------
+resource "aws_cloudwatch_event_rule" "abandoned_order_sweep" {
+  name                = "plantpass-abandoned-order-sweep"
+  description         = "Mark unpaid orders older than ABANDONED_ORDER_AGE_HOURS as abandoned"
+  schedule_expression = "rate(1 hour)"
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+resource "aws_cloudwatch_event_target" "abandoned_order_sweep" {
+  rule = aws_cloudwatch_event_rule.abandoned_order_sweep.name
+  arn  = aws_lambda_function.transaction_handler.arn
+}
+
+resource "aws_lambda_permission" "abandoned_order_sweep" {
+  statement_id  = "AllowEventBridgeInvokeAbandonedOrderSweep"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.transaction_handler.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.abandoned_order_sweep.arn
+}
+
 resource "aws_lambda_function" "admin" {
   function_name    = "plantpass-admin"
   filename         = var.admin_lambda_zip_path
@@ -194,11 +276,16 @@ resource "aws_lambda_function" "admin" {
 
   environment {
     variables = {
-      PASSWORD_BUCKET = aws_s3_bucket.admin_password.bucket
-      PASSWORD_KEY    = "password.json"
-      JWT_SECRET      = "super-secret-key"
-      EMAIL_LAMBDA_ARN = aws_lambda_function.email_handler.arn
-      TEMP_PASSWORD_TABLE = aws_dynamodb_table.temp_passwords.name
+      PASSWORD_BUCKET      = aws_s3_bucket.admin_password.bucket
+      PASSWORD_KEY         = "password.json"
+      JWT_SECRET           = "super-secret-key"
+      EMAIL_LAMBDA_ARN     = aws_lambda_function.email_handler.arn
+      TEMP_PASSWORD_TABLE  = aws_dynamodb_table.temp_passwords.name
+      ADMIN_SESSIONS_TABLE = aws_dynamodb_table.admin_sessions.name
+      ACCESS_TOKEN_MINUTES = "15"
+      REFRESH_TOKEN_DAYS   = "30"
+      MAX_FAILED_LOGINS    = "5"
+      LOGIN_WINDOW_SECONDS = "900"
     }
   }
 
@@ -229,8 +316,51 @@ resource "aws_lambda_function" "products_handler" {
 
   environment {
     variables = {
-      PRODUCTS_TABLE = aws_dynamodb_table.products.name
-      JWT_SECRET     = "super-secret-key"
+      PRODUCTS_TABLE            = aws_dynamodb_table.products.name
+      CATALOG_VERSIONS_TABLE    = aws_dynamodb_table.catalog_versions.name
+      LOCK_TABLE_NAME           = aws_dynamodb_table.locks.name
+      EDIT_LEASE_SECONDS        = "120"
+      CATALOG_CACHE_TTL_SECONDS = "5"
+      CATALOG_STORAGE_MODE      = "document"
+      CATALOG_SNAPSHOT_BUCKET   = aws_s3_bucket.catalog_snapshots.bucket
+      CATALOG_IMPORT_BUCKET     = aws_s3_bucket.catalog_imports.bucket
+      JWT_SECRET                = "super-secret-key"
+    }
+  }
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+# Same package as ProductsHandler; runs bulk CSV imports uploaded to S3
+resource "aws_lambda_function" "product_import_worker" {
+  function_name    = "ProductImportWorker"
+  filename         = var.products_lambda_zip_path
+  handler          = "import_worker.lambda_handler"
+  runtime          = "python3.11"
+  role             = aws_iam_role.lambda_exec.arn
+  source_code_hash = filebase64sha256(var.products_lambda_zip_path)
+  timeout          = 300
+  memory_size      = 512
+  depends_on = [
+    aws_cloudwatch_log_group.product_import_worker_logs
+  ]
+
+  layers = [
+    aws_lambda_layer_version.auth_deps.arn,
+    aws_lambda_layer_version.shared_utils.arn
+  ]
+
+  environment {
+    variables = {
+      PRODUCTS_TABLE            = aws_dynamodb_table.products.name
+      CATALOG_VERSIONS_TABLE    = aws_dynamodb_table.catalog_versions.name
+      LOCK_TABLE_NAME           = aws_dynamodb_table.locks.name
+      CATALOG_CACHE_TTL_SECONDS = "5"
+      CATALOG_STORAGE_MODE      = "document"
+      CATALOG_SNAPSHOT_BUCKET   = aws_s3_bucket.catalog_snapshots.bucket
+      CATALOG_IMPORT_BUCKET     = aws_s3_bucket.catalog_imports.bucket
     }
   }
 
@@ -257,8 +387,14 @@ resource "aws_lambda_function" "discounts_handler" {
 
   environment {
     variables = {
-      DISCOUNTS_TABLE = aws_dynamodb_table.discounts.name
-      JWT_SECRET      = "super-secret-key"
+      DISCOUNTS_TABLE           = aws_dynamodb_table.discounts.name
+      CATALOG_VERSIONS_TABLE    = aws_dynamodb_table.catalog_versions.name
+      LOCK_TABLE_NAME           = aws_dynamodb_table.locks.name
+      EDIT_LEASE_SECONDS        = "120"
+      CATALOG_CACHE_TTL_SECONDS = "5"
+      CATALOG_STORAGE_MODE      = "document"
+      CATALOG_SNAPSHOT_BUCKET   = aws_s3_bucket.catalog_snapshots.bucket
+      JWT_SECRET                = "super-secret-key"
     }
   }
 
@@ -285,8 +421,14 @@ resource "aws_lambda_function" "payment_methods_handler" {
 
   environment {
     variables = {
-      PAYMENT_METHODS_TABLE = aws_dynamodb_table.payment_methods.name
-      JWT_SECRET            = "super-secret-key"
+      PAYMENT_METHODS_TABLE     = aws_dynamodb_table.payment_methods.name
+      CATALOG_VERSIONS_TABLE    = aws_dynamodb_table.catalog_versions.name
+      LOCK_TABLE_NAME           = aws_dynamodb_table.locks.name
+      EDIT_LEASE_SECONDS        = "120"
+      CATALOG_CACHE_TTL_SECONDS = "5"
+      CATALOG_STORAGE_MODE      = "document"
+      CATALOG_SNAPSHOT_BUCKET   = aws_s3_bucket.catalog_snapshots.bucket
+      JWT_SECRET                = "super-secret-key"
     }
   }
 
@@ -313,8 +455,9 @@ resource "aws_lambda_function" "lock_handler" {
 
   environment {
     variables = {
-      LOCK_TABLE_NAME = aws_dynamodb_table.locks.name
-      JWT_SECRET      = "super-secret-key"
+      LOCK_TABLE_NAME    = aws_dynamodb_table.locks.name
+      EDIT_LEASE_SECONDS = "120"
+      JWT_SECRET         = "super-secret-key"
     }
   }
 
@@ -341,8 +484,48 @@ resource "aws_lambda_function" "feature_toggles_handler" {
 
   environment {
     variables = {
-      FEATURE_TOGGLES_TABLE_NAME = aws_dynamodb_table.feature_toggles.name
-      JWT_SECRET                 = "super-secret-key"
+      CONFIG_TABLE_NAME           = aws_dynamodb_table.config.name
+      FEATURE_TOGGLES_TABLE_NAME  = aws_dynamodb_table.feature_toggles.name
+      PLANTPASS_ACCESS_TABLE_NAME = aws_dynamodb_table.plantpass_access.name
+      CATALOG_VERSIONS_TABLE      = aws_dynamodb_table.catalog_versions.name
+      JWT_SECRET                  = "super-secret-key"
+    }
+  }
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+resource "aws_lambda_function" "bootstrap_handler" {
+  function_name    = "BootstrapHandler"
+  filename         = var.bootstrap_lambda_zip_path
+  handler          = "lambda_handler.lambda_handler"
+  runtime          = "python3.11"
+  role             = aws_iam_role.lambda_exec.arn
+  source_code_hash = filebase64sha256(var.bootstrap_lambda_zip_path)
+  depends_on = [
+    aws_cloudwatch_log_group.bootstrap_handler_logs
+  ]
+
+  layers = [
+    aws_lambda_layer_version.auth_deps.arn,
+    aws_lambda_layer_version.shared_utils.arn
+  ]
+
+  environment {
+    variables = {
+      PRODUCTS_TABLE              = aws_dynamodb_table.products.name
+      DISCOUNTS_TABLE             = aws_dynamodb_table.discounts.name
+      PAYMENT_METHODS_TABLE       = aws_dynamodb_table.payment_methods.name
+      CONFIG_TABLE_NAME           = aws_dynamodb_table.config.name
+      FEATURE_TOGGLES_TABLE_NAME  = aws_dynamodb_table.feature_toggles.name
+      PLANTPASS_ACCESS_TABLE_NAME = aws_dynamodb_table.plantpass_access.name
+      CATALOG_VERSIONS_TABLE      = aws_dynamodb_table.catalog_versions.name
+      CATALOG_CACHE_TTL_SECONDS   = "5"
+      CONFIG_CACHE_TTL_SECONDS    = "5"
+      CATALOG_STORAGE_MODE        = "document"
+      JWT_SECRET                  = "super-secret-key"
     }
   }
 
@@ -369,7 +552,91 @@ resource "aws_lambda_function" "plantpass_access_handler" {
 
   environment {
     variables = {
+      CONFIG_TABLE_NAME           = aws_dynamodb_table.config.name
+      PLANTPASS_ACCESS_TABLE_NAME = aws_dynamodb_table.plantpass_access.name
+      CATALOG_VERSIONS_TABLE      = aws_dynamodb_table.catalog_versions.name
+      CONFIG_CACHE_TTL_SECONDS    = "30"
+      PASSPHRASE_BURST            = "30"
+      PASSPHRASE_RATE_PER_SECOND  = "0.5"
+      JWT_SECRET                  = "super-secret-key"
+    }
+  }
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+# -------------------------
+# Single-function API (optional)
+# -------------------------
+# With api_monolith = true every API route is sent to this one function,
+# which mounts all the API handlers (src/lambda/MonolithHandler) so they
+# share one pool of warm containers. The per-handler functions stay
+# deployed; setting it back to false routes to them again.
+resource "aws_cloudwatch_log_group" "api_monolith_logs" {
+  count             = var.api_monolith ? 1 : 0
+  name              = "/aws/lambda/PlantPassApi"
+  retention_in_days = 14
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+resource "aws_lambda_function" "api_monolith" {
+  count            = var.api_monolith ? 1 : 0
+  function_name    = "PlantPassApi"
+  filename         = var.monolith_lambda_zip_path
+  handler          = "MonolithHandler.lambda_handler.lambda_handler"
+  runtime          = "python3.11"
+  role             = aws_iam_role.lambda_exec.arn
+  timeout          = 30
+  source_code_hash = filebase64sha256(var.monolith_lambda_zip_path)
+  depends_on = [
+    aws_cloudwatch_log_group.api_monolith_logs
+  ]
+
+  layers = [
+    aws_lambda_layer_version.auth_deps.arn,
+    aws_lambda_layer_version.shared_utils.arn
+  ]
+
+  # Union of the handlers' settings; where they differ (config cache TTL)
+  # the shorter value is used
+  environment {
+    variables = {
+      TRANSACTIONS_TABLE          = aws_dynamodb_table.transactions.name
+      PRODUCTS_TABLE              = aws_dynamodb_table.products.name
+      DISCOUNTS_TABLE             = aws_dynamodb_table.discounts.name
+      PAYMENT_METHODS_TABLE       = aws_dynamodb_table.payment_methods.name
+      CATALOG_VERSIONS_TABLE      = aws_dynamodb_table.catalog_versions.name
+      LOCK_TABLE_NAME             = aws_dynamodb_table.locks.name
+      CONFIG_TABLE_NAME           = aws_dynamodb_table.config.name
+      FEATURE_TOGGLES_TABLE_NAME  = aws_dynamodb_table.feature_toggles.name
       PLANTPASS_ACCESS_TABLE_NAME = aws_dynamodb_table.plantpass_access.name
+      TEMP_PASSWORD_TABLE         = aws_dynamodb_table.temp_passwords.name
+      ADMIN_SESSIONS_TABLE        = aws_dynamodb_table.admin_sessions.name
+      CONNECTIONS_TABLE           = aws_dynamodb_table.websocket_connections.name
+      WEBSOCKET_ENDPOINT          = "https://${aws_apigatewayv2_api.websocket_api.id}.execute-api.${var.aws_region}.amazonaws.com/${aws_apigatewayv2_stage.websocket_stage.name}"
+      EMAIL_LAMBDA_ARN            = aws_lambda_function.email_handler.arn
+      CATALOG_SNAPSHOT_BUCKET     = aws_s3_bucket.catalog_snapshots.bucket
+      CATALOG_IMPORT_BUCKET       = aws_s3_bucket.catalog_imports.bucket
+      PASSWORD_BUCKET             = aws_s3_bucket.admin_password.bucket
+      PASSWORD_KEY                = "password.json"
+      SENDER_EMAIL                = var.sender_email
+      UIUC_HORT_CLUB_EMAIL        = var.uiuc_hort_club_email
+      CATALOG_CACHE_TTL_SECONDS   = "5"
+      CONFIG_CACHE_TTL_SECONDS    = "5"
+      CATALOG_STORAGE_MODE        = "document"
+      EDIT_LEASE_SECONDS          = "120"
+      ABANDONED_ORDER_AGE_HOURS   = "12"
+      PASSPHRASE_BURST            = "30"
+      PASSPHRASE_RATE_PER_SECOND  = "0.5"
+      ACCESS_TOKEN_MINUTES        = "15"
+      REFRESH_TOKEN_DAYS          = "30"
+      MAX_FAILED_LOGINS           = "5"
+      LOGIN_WINDOW_SECONDS        = "900"
       JWT_SECRET                  = "super-secret-key"
     }
   }
@@ -379,6 +646,15 @@ resource "aws_lambda_function" "plantpass_access_handler" {
   }
 }
 
+resource "aws_lambda_permission" "apigw_api_monolith" {
+  count         = var.api_monolith ? 1 : 0
+  statement_id  = "AllowAPIGatewayInvokeApiMonolith"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.api_monolith[0].function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.frontend_api.execution_arn}/*/*"
+}
+
 resource "aws_lambda_permission" "apigw_transaction" {
   statement_id  = "AllowAPIGatewayInvokeTransaction"
   action        = "lambda:InvokeFunction"
@@ -403,6 +679,14 @@ resource "aws_lambda_permission" "apigw_products" {
   source_arn    = "${aws_apigatewayv2_api.frontend_api.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "s3_product_import" {
+  statement_id  = "AllowS3InvokeProductImport"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.product_import_worker.function_name
+  principal     = "s3.amazonaws.com"
+  source_arn    = aws_s3_bucket.catalog_imports.arn
+}
+
 resource "aws_lambda_permission" "apigw_discounts" {
   statement_id  = "AllowAPIGatewayInvokeDiscounts"
   action        = "lambda:InvokeFunction"
@@ -435,6 +719,14 @@ resource "aws_lambda_permission" "apigw_feature_toggles" {
   source_arn    = "${aws_apigatewayv2_api.frontend_api.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "apigw_bootstrap" {
+  statement_id  = "AllowAPIGatewayInvokeBootstrap"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.bootstrap_handler.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.frontend_api.execution_arn}/*/*"
+}
+
 resource "aws_lambda_permission" "apigw_plantpass_access" {
   statement_id  = "AllowAPIGatewayInvokePlantPassAccess"
   action        = "lambda:InvokeFunction"
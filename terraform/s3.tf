@@ -35,6 +35,91 @@ resource "aws_s3_bucket_policy" "frontend_policy" {
   })
 }
 
+# -------------------------
+# Catalog Snapshots S3 Bucket
+# -------------------------
+# Kept apart from the frontend bucket, whose deploy sync uses --delete.
+# Served by CloudFront under /catalog/*
+resource "aws_s3_bucket" "catalog_snapshots" {
+  bucket = "plantpass-catalog-snapshots"
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+resource "aws_s3_bucket_policy" "catalog_snapshots_policy" {
+  bucket = aws_s3_bucket.catalog_snapshots.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Principal = {
+          AWS = aws_cloudfront_origin_access_identity.oai.iam_arn
+        }
+        Action   = "s3:GetObject"
+        Resource = "${aws_s3_bucket.catalog_snapshots.arn}/*"
+      }
+    ]
+  })
+}
+
+# -------------------------
+# Catalog Imports S3 Bucket
+# -------------------------
+# The admin UI uploads bulk-import CSVs here with presigned PUTs; each upload
+# triggers the import worker, which writes its report next to the CSV
+resource "aws_s3_bucket" "catalog_imports" {
+  bucket = "plantpass-catalog-imports"
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+resource "aws_s3_bucket_cors_configuration" "catalog_imports_cors" {
+  bucket = aws_s3_bucket.catalog_imports.id
+
+  cors_rule {
+    allowed_methods = ["PUT"]
+    allowed_origins = ["*"]
+    allowed_headers = ["content-type", "x-amz-meta-mode", "x-amz-meta-lease"]
+    max_age_seconds = 3000
+  }
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "catalog_imports_lifecycle" {
+  bucket = aws_s3_bucket.catalog_imports.id
+
+  rule {
+    id     = "expire-imports"
+    status = "Enabled"
+
+    filter {
+      prefix = "imports/"
+    }
+
+    expiration {
+      days = 7
+    }
+  }
+}
+
+resource "aws_s3_bucket_notification" "catalog_imports_notification" {
+  bucket = aws_s3_bucket.catalog_imports.id
+
+  lambda_function {
+    lambda_function_arn = aws_lambda_function.product_import_worker.arn
+    events              = ["s3:ObjectCreated:*"]
+    filter_prefix       = "imports/products/"
+    filter_suffix       = ".csv"
+  }
+
+  depends_on = [aws_lambda_permission.s3_product_import]
+}
+
 # -------------------------
 # Admin Password S3 Bucket
 # -------------------------
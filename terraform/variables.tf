@@ -57,6 +57,11 @@ variable "feature_toggles_lambda_zip_path" {
   description = "Path to FeatureTogglesHandler Lambda ZIP relative to Terraform working directory"
 }
 
+variable "bootstrap_lambda_zip_path" {
+  type        = string
+  description = "Path to BootstrapHandler Lambda ZIP relative to Terraform working directory"
+}
+
 variable "plantpass_access_lambda_zip_path" {
   type        = string
   description = "Path to PlantPassAccessHandler Lambda ZIP relative to Terraform working directory"
@@ -87,6 +92,17 @@ variable "enable_custom_domain" {
   description = "Set to true after ACM certificate is validated in Cloudflare"
 }
 
+variable "monolith_lambda_zip_path" {
+  type        = string
+  description = "Path to the single-function API Lambda ZIP (MonolithHandler plus every API handler) relative to Terraform working directory"
+}
+
+variable "api_monolith" {
+  type        = bool
+  default     = false
+  description = "Route every API call to one function mounting all handlers instead of one function per handler"
+}
+
 variable "email_lambda_zip_path" {
   type        = string
   description = "Path to EmailHandler Lambda ZIP relative to Terraform working directory"
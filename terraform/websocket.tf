@@ -64,9 +64,17 @@ resource "aws_apigatewayv2_route" "disconnect_route" {
 }
 
 resource "aws_apigatewayv2_route" "default_route" {
-  api_id    = aws_apigatewayv2_api.websocket_api.id
-  route_key = "$default"
-  target    = "integrations/${aws_apigatewayv2_integration.websocket_default.id}"
+  api_id                              = aws_apigatewayv2_api.websocket_api.id
+  route_key                           = "$default"
+  target                              = "integrations/${aws_apigatewayv2_integration.websocket_default.id}"
+  route_response_selection_expression = "$default"
+}
+
+# Two-way route so heartbeat pongs returned by the Lambda reach the client
+resource "aws_apigatewayv2_route_response" "default_route_response" {
+  api_id             = aws_apigatewayv2_api.websocket_api.id
+  route_id           = aws_apigatewayv2_route.default_route.id
+  route_response_key = "$default"
 }
 
 # -------------------------
@@ -93,7 +101,8 @@ resource "aws_lambda_function" "websocket_handler" {
 
   environment {
     variables = {
-      CONNECTIONS_TABLE = aws_dynamodb_table.websocket_connections.name
+      CONNECTIONS_TABLE          = aws_dynamodb_table.websocket_connections.name
+      CONNECTION_TIMEOUT_SECONDS = "300"
     }
   }
 
@@ -102,6 +111,32 @@ resource "aws_lambda_function" "websocket_handler" {
   }
 }
 
+# -------------------------
+# Scheduled Sweep of Stale WebSocket Connections
+# -------------------------
+resource "aws_cloudwatch_event_rule" "websocket_connection_sweep" {
+  name                = "plantpass-websocket-connection-sweep"
+  description         = "Remove WebSocket connections that stopped sending heartbeats"
+  schedule_expression = "rate(5 minutes)"
+
+  tags = {
+    application = "plantpass"
+  }
+}
+
+resource "aws_cloudwatch_event_target" "websocket_connection_sweep" {
+  rule = aws_cloudwatch_event_rule.websocket_connection_sweep.name
+  arn  = aws_lambda_function.websocket_handler.arn
+}
+
+resource "aws_lambda_permission" "websocket_connection_sweep" {
+  statement_id  = "AllowEventBridgeInvokeWebSocketSweep"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.websocket_handler.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.websocket_connection_sweep.arn
+}
+
 # -------------------------
 # CloudWatch Log Group for WebSocket Lambda
 # -------------------------